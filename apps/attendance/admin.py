@@ -6,11 +6,13 @@ from django.db.models import Sum, Count, Q
 from datetime import timedelta
 from django.utils import timezone
 
+from .exports import AttendanceExporter
 from .models import Attendance, GuestVisit
+from core.exports import ExportAdminMixin
 
 
 @admin.register(Attendance)
-class AttendanceAdmin(admin.ModelAdmin):
+class AttendanceAdmin(ExportAdminMixin, admin.ModelAdmin):
     """لوحة إدارة سجلات الحضور والحضور"""
     
     list_display = [
@@ -21,7 +23,6 @@ class AttendanceAdmin(admin.ModelAdmin):
     list_filter = [
         'sport', 'trainer', 'is_manual_entry',
         ('check_in', admin.DateFieldListFilter),
-        ('check_in__date', admin.AllValuesFieldListFilter)
     ]
     search_fields = [
         'member__user__phone', 'member__user__first_name',
@@ -243,7 +244,8 @@ class AttendanceAdmin(admin.ModelAdmin):
             'member__user', 'sport', 'trainer__user', 'subscription'
         )
     
-    actions = ['mark_checked_out', 'export_attendance_csv']
+    actions = ['mark_checked_out', 'export_csv', 'export_xlsx']
+    exporter_class = AttendanceExporter
     
     @admin.action(description=_('🔚 تسجيل الخروج للحاضرين (بدون خروج)'))
     def mark_checked_out(self, request, queryset):
@@ -252,36 +254,6 @@ class AttendanceAdmin(admin.ModelAdmin):
             check_out=timezone.now()
         )
         self.message_user(request, f'🔚 تم تسجيل خروج {count} عضو')
-    
-    @admin.action(description=_('📥 تصدير إلى CSV'))
-    def export_attendance_csv(self, request, queryset):
-        """إجراء: تصدير الحضور إلى CSV"""
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = 'attachment; filename="attendance.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'العضو', 'الهاتف', 'الرياضة', 'المدرب',
-            'وقت الدخول', 'وقت الخروج', 'المدة (دقيقة)', 'النوع'
-        ])
-        
-        for attendance in queryset:
-            writer.writerow([
-                attendance.member.user.get_full_name(),
-                attendance.member.user.phone,
-                attendance.sport.name,
-                attendance.trainer.user.get_full_name() if attendance.trainer else '—',
-                attendance.check_in.strftime('%H:%M %d-%m-%Y'),
-                attendance.check_out.strftime('%H:%M') if attendance.check_out else '—',
-                attendance.duration_minutes or '—',
-                'يدوي' if attendance.is_manual_entry else 'تلقائي'
-            ])
-        
-        return response
-    export_attendance_csv.short_description = _('تصدير إلى CSV')
 
 
 @admin.register(GuestVisit)
@@ -0,0 +1,28 @@
+from core.exports import EMPTY, Column, Exporter, local_datetime, yes_no
+from core.serializers import full_name
+
+
+def duration_minutes(check_in, check_out):
+    """نفس Attendance.duration_minutes"""
+    if check_out is None:
+        return EMPTY
+    return int((check_out - check_in).total_seconds() / 60)
+
+
+class AttendanceExporter(Exporter):
+    """تصدير سجل الحضور"""
+
+    filename = 'attendance'
+    columns = (
+        Column('العضو', 'member__user__first_name', 'member__user__last_name', format=full_name),
+        Column('الهاتف', 'member__user__phone'),
+        Column('الرياضة', 'sport__name'),
+        Column(
+            'المدرب', 'trainer__user__first_name', 'trainer__user__last_name',
+            format=full_name, empty=EMPTY
+        ),
+        Column('وقت الدخول', 'check_in', format=local_datetime('%H:%M %d-%m-%Y')),
+        Column('وقت الخروج', 'check_out', format=local_datetime('%H:%M'), empty=EMPTY),
+        Column('المدة (دقيقة)', 'check_in', 'check_out', format=duration_minutes),
+        Column('النوع', 'is_manual_entry', format=yes_no('يدوي', 'تلقائي')),
+    )
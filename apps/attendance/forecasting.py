@@ -0,0 +1,210 @@
+from datetime import date, time, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+from core import refdata
+
+
+DEFAULT_CONFIG = {
+    'HISTORY_WEEKS': 8,
+    'HORIZON_DAYS': 14,
+    'ALPHA': 0.3,
+    'MAX_VISIT_HOURS': 4,
+    'CACHE_TIMEOUT': 2 * 24 * 3600,
+}
+
+# مفتاح الجيم كاملاً (كل الرياضات)
+ALL_SPORTS = 0
+
+
+def get_config() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG, **getattr(settings, 'ATTENDANCE_FORECAST', {})}
+
+
+def _days(values) -> np.ndarray:
+    """تواريخ بايثون -> أيام منذ 1970 (int64)"""
+    return np.array(values, dtype='datetime64[D]').astype(np.int64)
+
+
+def _weekday(days) -> np.ndarray:
+    """يوم الأسبوع بترقيم ClassSchedule.DayOfWeek (السبت = 0) لأيام منذ 1970 (الخميس)"""
+    return (np.asarray(days) + 5) % 7
+
+
+class DemandForecastService:
+    """
+    توقع الإشغال بالساعة لكل رياضة (يوم الأسبوع × الساعة)
+
+    - الإشغال التاريخي: كل زيارة تشغل الساعات من الدخول إلى الخروج
+      (مصفوفة فروق + cumsum على خط زمني بالساعة لكل رياضة)
+    - الملف الأسبوعي: تمهيد أُسّي عبر الأسابيع (الأسابيع الأحدث أثقل وزناً)
+    - التوقع لـ HORIZON_DAYS يوماً يُخزن في الذاكرة المؤقتة؛ الاستعلام فهرسة مباشرة O(1)
+    """
+
+    CACHE_KEY = 'attendance:forecast'
+
+    @staticmethod
+    def _occupancy(today: date, weeks: int, max_hours: int):
+        """(معرفات الرياضات، مصفوفة الإشغال [رياضة، يوم، ساعة]، أول يوم)"""
+        from .models import Attendance
+
+        start_day = today - timedelta(days=weeks * 7)
+        rows = list(
+            Attendance.objects.in_local_range(start_day, today - timedelta(days=1)).values_list(
+                'sport_id',
+                TruncDate('check_in'), ExtractHour('check_in'),
+                TruncDate('check_out'), ExtractHour('check_out')
+            )
+        )
+
+        n_slots = weeks * 7 * 24
+        first = int(_days([start_day])[0])
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, weeks * 7, 24)), start_day
+
+        sport, in_day, in_hour, out_day, out_hour = zip(*rows)
+        sport_ids, codes = np.unique(np.array(sport, dtype=np.int64), return_inverse=True)
+        start = (_days(in_day) - first) * 24 + np.array(in_hour, dtype=np.int64)
+
+        # بدون خروج: ساعة الدخول فقط؛ الزيارة لا تتجاوز MAX_VISIT_HOURS
+        has_out = np.array([day is not None for day in out_day])
+        end = start.copy()
+        if has_out.any():
+            out_days = _days([day for day in out_day if day is not None])
+            out_hours = np.array([h for h in out_hour if h is not None], dtype=np.int64)
+            end[has_out] = (out_days - first) * 24 + out_hours
+        end = np.clip(end, start, start + max_hours - 1)
+
+        diff = np.zeros((len(sport_ids), n_slots + 1), dtype=np.int64)
+        np.add.at(diff, (codes, start), 1)
+        np.add.at(diff, (codes, np.minimum(end + 1, n_slots)), -1)
+        occupancy = np.cumsum(diff[:, :-1], axis=1).reshape(len(sport_ids), weeks * 7, 24)
+        return sport_ids, occupancy, start_day
+
+    @staticmethod
+    def weekly_profile(occupancy: np.ndarray, start_day: date, weeks: int, alpha: float) -> np.ndarray:
+        """
+        [رياضة، يوم الأسبوع، ساعة] بمتوسط أُسّي عبر الأسابيع
+
+        الوزن alpha × (1 - alpha)^k للأسبوع قبل الأخير بـ k أسابيع
+        """
+        by_week = occupancy.reshape(occupancy.shape[0], weeks, 7, 24)
+        weights = alpha * (1 - alpha) ** np.arange(weeks - 1, -1, -1)
+        weights /= weights.sum()
+        profile = np.tensordot(weights, by_week, axes=([0], [1]))
+
+        # ترتيب الأيام من يوم البداية إلى السبت = 0
+        first_weekday = int(_weekday(_days([start_day]))[0])
+        return np.roll(profile, first_weekday, axis=1)
+
+    @staticmethod
+    def compute(today: Optional[date] = None) -> Dict[str, Any]:
+        """بناء الملفات والتوقع من التاريخ الكامل حتى أمس"""
+        config = get_config()
+        today = today or timezone.localdate()
+        weeks = config['HISTORY_WEEKS']
+
+        sport_ids, occupancy, start_day = DemandForecastService._occupancy(
+            today, weeks, config['MAX_VISIT_HOURS']
+        )
+        profiles = DemandForecastService.weekly_profile(occupancy, start_day, weeks, config['ALPHA'])
+
+        horizon = _weekday(_days([today]) + np.arange(config['HORIZON_DAYS']))
+        forecast = np.round(profiles[:, horizon, :], 1)
+
+        names = refdata.sports.values_map('name')
+        sports = {
+            int(sport_id): {
+                'name': names.get(int(sport_id), str(sport_id)),
+                'profile': np.round(profiles[index], 1),
+                'forecast': forecast[index],
+            }
+            for index, sport_id in enumerate(sport_ids)
+        }
+        sports[ALL_SPORTS] = {
+            'name': 'كل الرياضات',
+            'profile': np.round(profiles.sum(axis=0), 1) if len(sport_ids) else np.zeros((7, 24)),
+            'forecast': np.round(forecast.sum(axis=0), 1) if len(sport_ids) else np.zeros(
+                (config['HORIZON_DAYS'], 24)
+            ),
+        }
+
+        return {
+            'computed_at': timezone.now(),
+            'start_date': today,
+            'horizon_days': config['HORIZON_DAYS'],
+            'history_weeks': weeks,
+            'sports': sports,
+        }
+
+    @staticmethod
+    def refresh() -> Dict[str, Any]:
+        result = DemandForecastService.compute()
+        cache.set(DemandForecastService.CACHE_KEY, result, get_config()['CACHE_TIMEOUT'])
+        return result
+
+    @staticmethod
+    def get_forecast() -> Dict[str, Any]:
+        """التوقع المخزن (يُحسب مرة واحدة إذا لم يوجد أو كان من يوم سابق)"""
+        result = cache.get(DemandForecastService.CACHE_KEY)
+        if result is None or result['start_date'] != timezone.localdate():
+            result = DemandForecastService.refresh()
+        return result
+
+    @staticmethod
+    def _sport(result, sport_id) -> Optional[Dict[str, Any]]:
+        return result['sports'].get(int(sport_id or ALL_SPORTS))
+
+    @staticmethod
+    def expected(sport_id: Optional[int], day: date, hour: int) -> float:
+        """الإشغال المتوقع في ساعة محددة (0 لرياضة بلا تاريخ)"""
+        result = DemandForecastService.get_forecast()
+        sport = DemandForecastService._sport(result, sport_id)
+        if sport is None:
+            return 0.0
+
+        offset = (day - result['start_date']).days
+        if 0 <= offset < result['horizon_days']:
+            return float(sport['forecast'][offset, hour])
+        # خارج الأفق: الملف الأسبوعي لنفس اليوم والساعة
+        return float(sport['profile'][int(_weekday(_days([day]))[0]), hour])
+
+    @staticmethod
+    def expected_peak(sport_id: Optional[int], day: date, start_time: time, end_time: time) -> float:
+        """أعلى إشغال متوقع خلال فترة (لتحديد سعة حصة أو عدد المدربين)"""
+        start = start_time.hour
+        end = end_time.hour + (1 if (end_time.minute, end_time.second, end_time.microsecond) != (0, 0, 0) else 0)
+        if end_time < start_time:
+            # فترة تعبر منتصف الليل: ساعاتها الأخيرة من اليوم التالي
+            end += 24
+        return max(
+            DemandForecastService.expected(sport_id, day + timedelta(days=hour // 24), hour % 24)
+            for hour in range(start, max(end, start + 1))
+        )
+
+    @staticmethod
+    def daily(sport_id: Optional[int] = None, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """التوقع بالساعة لكل يوم من الأفق"""
+        result = DemandForecastService.get_forecast()
+        sport = DemandForecastService._sport(result, sport_id)
+        if sport is None:
+            return []
+
+        days = min(days or result['horizon_days'], result['horizon_days'])
+        rows = []
+        for offset in range(days):
+            hourly = sport['forecast'][offset]
+            peak_hour = int(hourly.argmax())
+            rows.append({
+                'date': result['start_date'] + timedelta(days=offset),
+                'hourly': hourly.tolist(),
+                'peak_hour': peak_hour,
+                'peak': float(hourly[peak_hour]),
+                'total_hours': round(float(hourly.sum()), 1),
+            })
+        return rows
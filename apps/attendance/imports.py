@@ -0,0 +1,71 @@
+from django.db.models import Max
+
+from apps.members.models import Member
+from apps.sports.models import Sport
+from apps.subscriptions.models import Subscription
+from core.imports import ImportRowError, Importer, to_bool, to_datetime, value
+
+from .models import Attendance
+
+
+class AttendanceImporter(Importer):
+    """
+    استيراد سجل الحضور
+
+    الأعمدة: member_id*, sport* (الاسم أو الرابط), check_in*, check_out,
+    subscription_number (افتراضي: أحدث اشتراك للعضو), is_manual_entry, notes
+    """
+
+    name = 'attendance'
+    model = Attendance
+
+    def prepare(self):
+        self.members = self.session.key_map(Member, 'member_id')
+        self.subscriptions = self.session.key_map(Subscription, 'subscription_number')
+        self.sports = dict(Sport.objects.values_list('name', 'pk'))
+        self.sports.update(Sport.objects.values_list('slug', 'pk'))
+        # أحدث اشتراك لكل عضو (استعلام واحد) للصفوف بدون رقم اشتراك
+        self.latest_subscription = dict(
+            Subscription.objects.values('member_id').annotate(latest=Max('pk'))
+            .values_list('member_id', 'latest')
+        )
+
+    def build(self, row):
+        member_id = self.members.get(value(row, 'member_id', required=True), 'العضو')
+
+        sport = value(row, 'sport', required=True)
+        if sport not in self.sports:
+            raise ImportRowError(f'الرياضة غير موجودة: {sport}')
+
+        number = value(row, 'subscription_number')
+        if number:
+            subscription_id = self.subscriptions.get(number, 'الاشتراك')
+        else:
+            subscription_id = self.latest_subscription.get(member_id)
+            if subscription_id is None:
+                raise ImportRowError('لا يوجد اشتراك للعضو')
+
+        check_in = to_datetime(row, 'check_in', required=True)
+        check_out = to_datetime(row, 'check_out')
+        if check_out is not None and check_out < check_in:
+            raise ImportRowError('وقت الخروج قبل وقت الدخول')
+
+        return Attendance(
+            member_id=member_id,
+            subscription_id=subscription_id,
+            sport_id=self.sports[sport],
+            check_in=check_in,
+            check_out=check_out,
+            is_manual_entry=to_bool(row, 'is_manual_entry'),
+            notes=value(row, 'notes'),
+            created_at=check_in,
+        )
+
+    def finalize(self):
+        from apps.attendance.forecasting import DemandForecastService
+        from apps.payments.imports import refresh_dashboard
+        from apps.reports.analytics import RetentionAnalytics
+
+        self.session.defer('attendance.forecast', DemandForecastService.refresh)
+        self.session.defer('reports.retention', RetentionAnalytics.refresh)
+        self.session.defer('dashboard.snapshot', refresh_dashboard)
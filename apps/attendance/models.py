@@ -3,6 +3,11 @@ from apps.members.models import Member
 from apps.subscriptions.models import Subscription
 from apps.sports.models import Sport
 from apps.trainers.models import Trainer
+from core.dates import LocalDateQuerySetMixin
+
+
+class AttendanceQuerySet(LocalDateQuerySetMixin, models.QuerySet):
+    local_date_field = 'check_in'
 
 
 class Attendance(models.Model):
@@ -45,10 +50,24 @@ class Attendance(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = AttendanceQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'حضور'
         verbose_name_plural = 'سجل الحضور'
         ordering = ['-check_in']
+        indexes = [
+            models.Index(fields=['check_in'], name='attendance_check_in_idx'),
+            # الزيارات المفتوحة فقط (الموجودون حالياً) - فهارس جزئية صغيرة
+            models.Index(
+                fields=['member'], name='attendance_open_member_idx',
+                condition=models.Q(check_out__isnull=True)
+            ),
+            models.Index(
+                fields=['check_in'], name='attendance_open_check_in_idx',
+                condition=models.Q(check_out__isnull=True)
+            ),
+        ]
     
     def __str__(self):
         return f"{self.member} - {self.sport} - {self.check_in.date()}"
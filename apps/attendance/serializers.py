@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from core import refdata
+from core.serializers import FastSerializer, full_name, model_property
 from .models import Attendance, GuestVisit
 
 
@@ -18,6 +20,17 @@ class AttendanceListSerializer(serializers.ModelSerializer):
         ]
 
 
+class AttendanceListFastSerializer(FastSerializer):
+    """المسار السريع لـ AttendanceListSerializer (قراءة فقط)"""
+    
+    serializer_class = AttendanceListSerializer
+    computed = {
+        'member_name': (('member__user__first_name', 'member__user__last_name'), full_name),
+        'duration_minutes': model_property(Attendance, 'duration_minutes', 'check_in', 'check_out'),
+        'is_checked_out': model_property(Attendance, 'is_checked_out', 'check_out'),
+    }
+
+
 class AttendanceDetailSerializer(serializers.ModelSerializer):
     """سيريلايزر تفاصيل الحضور"""
     
@@ -66,11 +79,8 @@ class CheckInSerializer(serializers.Serializer):
         return value
     
     def validate_sport_id(self, value):
-        """التحقق من وجود الرياضة"""
-        from apps.sports.models import Sport
-        try:
-            Sport.objects.get(id=value, is_active=True)
-        except Sport.DoesNotExist:
+        """التحقق من وجود الرياضة (من الذاكرة المرجعية)"""
+        if not refdata.sports.exists(value, is_active=True):
             raise serializers.ValidationError("الرياضة غير موجودة")
         return value
     
@@ -183,3 +193,22 @@ class AttendanceRateSerializer(serializers.Serializer):
     days_period = serializers.IntegerField()
     attendance_rate_percentage = serializers.FloatField()
     average_per_week = serializers.FloatField()
+
+
+class DemandForecastQuerySerializer(serializers.Serializer):
+    """سيريلايزر معاملات توقع الإشغال"""
+    
+    sport_id = serializers.IntegerField(required=False, min_value=1)
+    date = serializers.DateField(required=False)
+    days = serializers.IntegerField(required=False, min_value=1, max_value=14)
+    start_time = serializers.TimeField(required=False)
+    end_time = serializers.TimeField(required=False)
+    
+    def validate(self, data):
+        """الفترة تتطلب تاريخاً ووقتي بداية ونهاية"""
+        window = [key for key in ('date', 'start_time', 'end_time') if key in data]
+        if ('start_time' in data or 'end_time' in data) and len(window) != 3:
+            raise serializers.ValidationError("الفترة تتطلب date و start_time و end_time معاً")
+        if 'start_time' in data and data['start_time'] >= data['end_time']:
+            raise serializers.ValidationError("وقت البداية يجب أن يكون قبل وقت النهاية")
+        return data
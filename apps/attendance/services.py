@@ -11,6 +11,7 @@ from apps.sports.models import Sport
 from apps.trainers.models import Trainer
 from apps.subscriptions.services import SubscriptionService
 from apps.rewards.services import RewardService
+from core import refdata
 from .models import Attendance, GuestVisit
 
 
@@ -95,12 +96,13 @@ class AttendanceService:
         """
         queryset = Attendance.objects.filter(
             check_out__isnull=True
-        ).select_related('member', 'sport', 'trainer')
+        ).select_related('member', 'trainer')
         
         if sport:
             queryset = queryset.filter(sport=sport)
         
-        return list(queryset)
+        # الرياضة من الذاكرة المرجعية بدل JOIN
+        return refdata.prefetch(queryset, 'sport')
     
     @staticmethod
     def get_member_attendance_history(
@@ -115,12 +117,8 @@ class AttendanceService:
         """
         queryset = Attendance.objects.filter(
             member=member
-        ).select_related('sport', 'trainer')
+        ).in_local_range(start_date, end_date).select_related('sport', 'trainer')
         
-        if start_date:
-            queryset = queryset.filter(check_in__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(check_in__date__lte=end_date)
         if sport:
             queryset = queryset.filter(sport=sport)
         
@@ -135,12 +133,8 @@ class AttendanceService:
         """
         إحصائيات الحضور
         """
-        queryset = Attendance.objects.all()
+        queryset = Attendance.objects.in_local_range(start_date, end_date)
         
-        if start_date:
-            queryset = queryset.filter(check_in__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(check_in__date__lte=end_date)
         if sport:
             queryset = queryset.filter(sport=sport)
         
@@ -291,12 +285,9 @@ class AttendanceService:
         """
         عدد مرات حضور العضو اليوم
         """
-        today = timezone.now().date()
-        
         return Attendance.objects.filter(
-            member=member,
-            check_in__date=today
-        ).count()
+            member=member
+        ).on_local_date(timezone.localdate()).count()
     
     @staticmethod
     def get_attendance_rate(
@@ -306,12 +297,11 @@ class AttendanceService:
         """
         معدل حضور العضو
         """
-        start_date = timezone.now().date() - timedelta(days=days)
+        start_date = timezone.localdate() - timedelta(days=days)
         
         attendance_count = Attendance.objects.filter(
-            member=member,
-            check_in__date__gte=start_date
-        ).count()
+            member=member
+        ).in_local_range(start_date).count()
         
         attendance_rate = round((attendance_count / days) * 100, 2) if days > 0 else 0
         
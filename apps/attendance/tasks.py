@@ -43,34 +43,35 @@ def auto_checkout_expired_attendance():
 @shared_task
 def send_attendance_reminders():
     """
-    إرسال تذكيرات الحضور للأعضاء غير النشطين
+    إرسال تذكيرات الحضور للأعضاء المعرضين للتسرب (من درجات RetentionAnalytics)
     يتم تشغيله يومياً الساعة 6 صباحاً
     """
     try:
         from apps.members.models import Member
         from apps.notifications.models import Notification
-        from datetime import timedelta
+        from apps.reports.analytics import RetentionAnalytics
         
-        # الأعضاء الذين لم يحضروا لمدة أسبوع
-        week_ago = timezone.now() - timedelta(days=7)
-        inactive_members = Member.objects.filter(
-            is_active=True,
-            attendance__isnull=True
-        ) | Member.objects.filter(
-            is_active=True,
-            attendance__date__lt=week_ago.date()
-        ).distinct()
+        title = 'تذكير: حان وقت الرياضة!'
+        member_ids = [row['member_id'] for row in RetentionAnalytics.at_risk()]
         
-        count = 0
-        for member in inactive_members:
-            Notification.objects.create(
-                user=member.user,
-                type='REMINDER',
-                title='تذكير: حان وقت الرياضة!',
-                message='لم نرك منذ فترة... نشتاق لك في الجيم! 💪',
-                link='/attendance/'
+        # تذكير واحد أسبوعياً لكل عضو
+        reminded = Notification.objects.filter(
+            title=title,
+            created_at__gte=timezone.now() - timedelta(days=7)
+        ).values('user_id')
+        user_ids = Member.objects.filter(
+            id__in=member_ids, is_active=True
+        ).exclude(user_id__in=reminded).values_list('user_id', flat=True)
+        
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                user_id=user_id,
+                title=title,
+                body='لم نرك منذ فترة... نشتاق لك في الجيم! 💪'
             )
-            count += 1
+            for user_id in user_ids
+        ])
+        count = len(notifications)
         
         logger.info(f"✓ تذكيرات الحضور: {count} عضو")
         return f"تم إرسال تذكيرات لـ {count} عضو"
@@ -89,7 +90,7 @@ def calculate_attendance_achievements():
     try:
         from apps.members.models import Member
         from apps.notifications.models import Notification
-        from django.db.models import Count
+        from django.db.models import Count, Q
         from datetime import timedelta
         
         month_ago = timezone.now() - timedelta(days=30)
@@ -97,8 +98,8 @@ def calculate_attendance_achievements():
         # الأعضاء بـ 10 جلسات في الشهر
         active_this_month = Member.objects.annotate(
             month_attendance=Count(
-                'attendance',
-                filter=models.Q(attendance__date__gte=month_ago)
+                'attendances',
+                filter=Q(attendances__check_in__gte=month_ago)
             )
         ).filter(month_attendance__gte=10)
         
@@ -106,10 +107,8 @@ def calculate_attendance_achievements():
         for member in active_this_month:
             Notification.objects.create(
                 user=member.user,
-                type='ACHIEVEMENT',
                 title='🏆 إنجاز: نشيط جداً!',
-                message=f'أنت من أكثر الأعضاء نشاطاً! لديك {member.month_attendance} جلسة هذا الشهر.',
-                link='/achievements/'
+                body=f'أنت من أكثر الأعضاء نشاطاً! لديك {member.month_attendance} جلسة هذا الشهر.'
             )
             count += 1
         
@@ -119,3 +118,22 @@ def calculate_attendance_achievements():
     except Exception as e:
         logger.error(f"✗ خطأ في حساب الإنجازات: {str(e)}")
         raise
+
+
+@shared_task
+def refresh_attendance_forecast():
+    """
+    إعادة حساب توقع الإشغال (يوم الأسبوع × الساعة) لكل رياضة للأيام القادمة
+    يتم تشغيله يومياً الساعة 3:30 صباحاً
+    """
+    try:
+        from .forecasting import DemandForecastService
+        
+        result = DemandForecastService.refresh()
+        
+        logger.info(f"✓ تحديث توقع الإشغال: {len(result['sports']) - 1} رياضة")
+        return f"تم تحديث توقع الإشغال لـ {result['horizon_days']} يوماً"
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في تحديث توقع الإشغال: {str(e)}")
+        raise
@@ -0,0 +1,38 @@
+from datetime import date, time
+
+import pytest
+
+from .forecasting import DemandForecastService
+
+
+@pytest.mark.unit
+class TestExpectedPeak:
+    """ساعات الفترة التي يُحسب منها أعلى إشغال متوقع"""
+
+    DAY = date(2024, 1, 1)
+
+    @pytest.fixture
+    def hours(self, monkeypatch):
+        calls = []
+
+        def expected(sport_id, day, hour):
+            calls.append((day.day, hour))
+            return float(hour)
+
+        monkeypatch.setattr(DemandForecastService, 'expected', staticmethod(expected))
+        return calls
+
+    @pytest.mark.parametrize('start, end, expected', [
+        (time(9, 0), time(10, 0), [(1, 9)]),
+        (time(9, 0), time(10, 30), [(1, 9), (1, 10)]),
+        (time(9, 30), time(9, 45), [(1, 9)]),
+        (time(22, 0), time(0, 0), [(1, 22), (1, 23)]),
+        (time(23, 0), time(1, 30), [(1, 23), (2, 0), (2, 1)]),
+    ])
+    def test_hours(self, hours, start, end, expected):
+        DemandForecastService.expected_peak(None, self.DAY, start, end)
+
+        assert hours == expected
+
+    def test_crossing_midnight_returns_peak(self, hours):
+        assert DemandForecastService.expected_peak(None, self.DAY, time(22, 0), time(2, 0)) == 23.0
@@ -1,8 +1,7 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q, Count
+from django.db.models import Count
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
 from django.utils import timezone
@@ -10,13 +9,15 @@ from datetime import timedelta
 
 from apps.attendance.models import Attendance
 from apps.members.models import Member
+from apps.members.services import MemberSearchService
+from core.pagination import InvalidCursor, KeysetPaginator
 from .forms import AttendanceCheckInForm, AttendanceSearchForm, AttendanceStatsForm
 
 
 @login_required(login_url='login')
 def attendance_list(request):
     """عرض سجل الحضور مع الفلترة والبحث"""
-    attendances = Attendance.objects.select_related('member__user').all().order_by('-check_in_time')
+    attendances = Attendance.objects.select_related('member__user').all()
     
     # البحث والفلترة
     search = request.GET.get('search', '')
@@ -25,30 +26,30 @@ def attendance_list(request):
     date_to = request.GET.get('date_to', '')
     
     if search:
-        attendances = attendances.filter(
-            Q(member__user__first_name__icontains=search) |
-            Q(member__user__last_name__icontains=search) |
-            Q(member__user__email__icontains=search)
+        attendances = MemberSearchService.filter_queryset(
+            attendances, search, member_field='member_id'
         )
     
     if member_id:
         attendances = attendances.filter(member_id=member_id)
     
-    if date_from:
-        attendances = attendances.filter(check_in_time__date__gte=date_from)
+    if date_from or date_to:
+        attendances = attendances.in_local_range(date_from or None, date_to or None)
     
-    if date_to:
-        attendances = attendances.filter(check_in_time__date__lte=date_to)
-    
-    # التصفح
-    paginator = Paginator(attendances, 15)
-    page = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page)
+    # التصفح بالمؤشر (بدون OFFSET) مع عدد تقديري
+    paginator = KeysetPaginator(
+        attendances, 15, ordering=('-check_in', '-id'), count_mode='estimate'
+    )
+    try:
+        page_obj = paginator.get_page(request.GET.get('cursor'))
+    except InvalidCursor:
+        page_obj = paginator.get_page()
     
     form = AttendanceSearchForm(request.GET)
     
     context = {
         'attendances': page_obj,
+        'page_obj': page_obj,
         'form': form,
         'total_count': paginator.count
     }
@@ -111,10 +112,8 @@ def attendance_detail(request, pk):
     member = attendance.member
     total_sessions = Attendance.objects.filter(member=member).count()
     this_month = Attendance.objects.filter(
-        member=member,
-        check_in_time__month=timezone.now().month,
-        check_in_time__year=timezone.now().year
-    ).count()
+        member=member
+    ).in_local_month(timezone.localdate()).count()
     
     context = {
         'attendance': attendance,
@@ -133,7 +132,7 @@ def attendance_stats(request):
     member_id = request.GET.get('member', '')
     
     # حساب الفترة الزمنية
-    today = timezone.now().date()
+    today = timezone.localdate()
     
     if period == 'week':
         date_from = today - timedelta(days=7)
@@ -143,9 +142,7 @@ def attendance_stats(request):
         date_from = today - timedelta(days=30)
     
     # الاستعلام
-    query = Attendance.objects.filter(
-        check_in_time__date__gte=date_from
-    ).select_related('member__user')
+    query = Attendance.objects.in_local_range(date_from).select_related('member__user')
     
     if member_id:
         query = query.filter(member_id=member_id)
@@ -162,7 +159,7 @@ def attendance_stats(request):
     # أكثر يوم ازدحاماً
     from django.db.models.functions import TruncDate
     busiest = query.annotate(
-        date=TruncDate('check_in_time')
+        date=TruncDate('check_in')
     ).values('date').annotate(count=Count('id')).order_by('-count').first()
     
     if busiest:
@@ -184,28 +181,21 @@ def attendance_quick_info(request, member_id):
     try:
         member = Member.objects.get(pk=member_id)
         
-        today = timezone.now().date()
+        today = timezone.localdate()
         
         # هل تم التسجيل اليوم؟
-        today_attendance = Attendance.objects.filter(
-            member=member,
-            check_in_time__date=today
-        ).first()
+        today_attendance = Attendance.objects.filter(member=member).on_local_date(today).first()
         
         # الإحصائيات
-        this_month = Attendance.objects.filter(
-            member=member,
-            check_in_time__month=today.month,
-            check_in_time__year=today.year
-        ).count()
+        this_month = Attendance.objects.filter(member=member).in_local_month(today).count()
         
         data = {
             'success': True,
             'member_name': f"{member.user.first_name} {member.user.last_name}",
             'today_checked_in': today_attendance is not None,
             'this_month_sessions': this_month,
-            'check_in_time': today_attendance.check_in_time.isoformat() if today_attendance else None,
-            'is_checked_out': today_attendance.check_out_time is not None if today_attendance else False
+            'check_in_time': today_attendance.check_in.isoformat() if today_attendance else None,
+            'is_checked_out': today_attendance.check_out is not None if today_attendance else False
         }
     except Member.DoesNotExist:
         data = {'success': False, 'error': 'العضو غير موجود'}
@@ -7,6 +7,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from .models import Attendance, GuestVisit
 from .serializers import (
     AttendanceListSerializer,
+    AttendanceListFastSerializer,
     AttendanceDetailSerializer,
     CheckInSerializer,
     CheckOutSerializer,
@@ -15,15 +16,23 @@ from .serializers import (
     GuestCheckInSerializer,
     GuestCheckOutSerializer,
     AttendanceStatisticsSerializer,
-    AttendanceRateSerializer
+    AttendanceRateSerializer,
+    DemandForecastQuerySerializer
 )
+from .exports import AttendanceExporter
+from .forecasting import DemandForecastService
 from .services import AttendanceService
+from core import refdata
+from core.exports import ExportViewMixin
+from core.pagination import KeysetPagination
+from core.serializers import FastSerializerMixin
 from apps.members.models import Member
+from apps.members.services import MemberScanLookupService
 from apps.sports.models import Sport
 from apps.trainers.models import Trainer
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(ExportViewMixin, FastSerializerMixin, viewsets.ModelViewSet):
     """API الحضور - تسجيل الدخول والخروج والإحصائيات"""
     
     queryset = Attendance.objects.select_related(
@@ -32,6 +41,10 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['member', 'sport', 'trainer']
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-check_in', '-id')
+    fast_serializer_classes = {'list': AttendanceListFastSerializer}
+    exporter_class = AttendanceExporter
     
     def get_serializer_class(self):
         """اختيار الـ Serializer بناءً على الـ Action"""
@@ -79,7 +92,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         
         try:
             member = Member.objects.get(id=serializer.validated_data['member_id'])
-            sport = Sport.objects.get(id=serializer.validated_data['sport_id'])
+            sport = refdata.sports.require(serializer.validated_data['sport_id'])
             trainer = None
             notes = serializer.validated_data.get('notes', '')
             
@@ -176,6 +189,42 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    @action(detail=False, methods=['get'])
+    def scan(self, request):
+        """التعرف على العضو من جهاز الدخول
+        
+        Parameters:
+        - code: رقم الهاتف أو رقم العضوية أو رمز البطاقة (GYM-00042)
+        - sport_id (اختياري): للتحقق من شمول الاشتراك للرياضة
+        """
+        code = request.query_params.get('code', '')
+        result = MemberScanLookupService.resolve(code)
+        
+        if not result:
+            return Response(
+                {'error': 'العضو غير موجود'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        sport_id = request.query_params.get('sport_id')
+        if sport_id:
+            try:
+                sport_id = int(sport_id)
+            except ValueError:
+                return Response(
+                    {'error': 'معرف الرياضة يجب أن يكون رقماً'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            subscription = result['subscription']
+            result['can_attend'] = bool(
+                result['can_attend'] and subscription and sport_id in subscription['sport_ids']
+            )
+        
+        return Response({
+            'message': 'تم التعرف على العضو',
+            'data': result
+        }, status=status.HTTP_200_OK)
+    
     @action(detail=False, methods=['get'])
     def current(self, request):
         """الأعضاء الموجودون حالياً في الجيم"""
@@ -184,7 +233,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         
         try:
             if sport_id:
-                sport = Sport.objects.get(id=sport_id)
+                sport = refdata.sports.require(sport_id)
             
             attendees = AttendanceService.get_current_attendees(sport)
             serializer = AttendanceListSerializer(attendees, many=True)
@@ -221,7 +270,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             
             sport = None
             if sport_id:
-                sport = Sport.objects.get(id=sport_id)
+                sport = refdata.sports.require(sport_id)
             
             stats = AttendanceService.get_attendance_statistics(
                 start_date=start_date,
@@ -273,6 +322,55 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    @action(detail=False, methods=['get'])
+    def forecast(self, request):
+        """توقع الإشغال بالساعة للأيام القادمة (لجدولة الحصص وتوزيع المدربين)
+        
+        Parameters:
+        - sport_id (اختياري): معرف الرياضة (افتراضي: كل الرياضات)
+        - days (اختياري): عدد الأيام (افتراضي والحد الأقصى: 14)
+        - date, start_time, end_time (اختياري): أعلى إشغال متوقع خلال فترة محددة
+        """
+        query = DemandForecastQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = query.validated_data
+        sport_id = params.get('sport_id')
+        
+        if 'start_time' in params:
+            return Response({
+                'message': 'الإشغال المتوقع للفترة',
+                'data': {
+                    'sport_id': sport_id,
+                    'date': params['date'],
+                    'start_time': params['start_time'],
+                    'end_time': params['end_time'],
+                    'expected_peak': DemandForecastService.expected_peak(
+                        sport_id, params['date'], params['start_time'], params['end_time']
+                    ),
+                }
+            }, status=status.HTTP_200_OK)
+        
+        result = DemandForecastService.get_forecast()
+        if 'date' in params:
+            days = [
+                day for day in DemandForecastService.daily(sport_id)
+                if day['date'] == params['date']
+            ]
+        else:
+            days = DemandForecastService.daily(sport_id, params.get('days'))
+        
+        return Response({
+            'message': 'توقع الإشغال',
+            'data': {
+                'sport_id': sport_id,
+                'computed_at': result['computed_at'],
+                'history_weeks': result['history_weeks'],
+                'days': days,
+            }
+        }, status=status.HTTP_200_OK)
+    
     @action(detail=False, methods=['get'])
     def member_attendance(self, request):
         """سجل حضور العضو
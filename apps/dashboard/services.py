@@ -0,0 +1,234 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+from typing import Optional, Dict, Any
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from core.dates import local_day_start
+
+
+DEFAULT_CONFIG = {
+    'REFRESH_SECONDS': 60,
+    'MAX_AGE_SECONDS': 300,
+    'LOCK_SECONDS': 30,
+    'WAIT_SECONDS': 2,
+}
+
+
+def get_config() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG, **getattr(settings, 'DASHBOARD_SNAPSHOT', {})}
+
+
+def _delta(current, previous) -> Optional[float]:
+    """نسبة التغير % (None عند عدم وجود قيمة سابقة)"""
+    if not previous:
+        return None
+    return round(float(current - previous) / float(previous) * 100, 1)
+
+
+class DashboardSnapshotService:
+    """
+    لقطة مؤشرات لوحة التحكم محسوبة في الخلفية ومخزنة في الذاكرة المؤقتة
+
+    - مهمة Celery تعيد الحساب كل REFRESH_SECONDS
+    - الصفحة تقرأ اللقطة فقط؛ إذا تجاوز عمرها MAX_AGE_SECONDS تطلب تحديثاً في الخلفية
+    - قفل cache.add يمنع أكثر من عامل من إعادة الحساب في نفس الوقت
+    """
+
+    CACHE_KEY = 'dashboard:snapshot'
+    LOCK_KEY = 'dashboard:snapshot:lock'
+
+    @staticmethod
+    def compute() -> Dict[str, Any]:
+        """
+        حساب المؤشرات باستعلام تجميعي واحد لكل جدول (مع مقارنة الأسبوع السابق)
+        """
+        from apps.attendance.models import Attendance
+        from apps.lockers.models import Locker
+        from apps.members.models import Member
+        from apps.payments.models import Payment
+        from apps.subscriptions.models import Subscription
+
+        now = timezone.now()
+        today = timezone.localdate()
+        day_start = local_day_start
+        today_start = day_start(today)
+        tomorrow_start = day_start(today + timedelta(days=1))
+        last_week_day = day_start(today - timedelta(days=7))
+        week_start = day_start(today - timedelta(days=6))
+        previous_week_start = day_start(today - timedelta(days=13))
+        month_start = day_start(today.replace(day=1))
+
+        members = Member.objects.aggregate(
+            total=Count('id', filter=Q(is_active=True)),
+            new_week=Count('id', filter=Q(created_at__gte=week_start)),
+            new_previous_week=Count('id', filter=Q(
+                created_at__gte=previous_week_start, created_at__lt=week_start
+            )),
+        )
+
+        subscriptions = Subscription.objects.filter(
+            status=Subscription.Status.ACTIVE,
+            end_date__gte=today
+        ).aggregate(
+            active=Count('id'),
+            expiring_soon=Count('id', filter=Q(end_date__lte=today + timedelta(days=7))),
+        )
+
+        attendance = Attendance.objects.filter(
+            check_in__gte=min(previous_week_start, last_week_day),
+            check_in__lt=tomorrow_start
+        ).aggregate(
+            today=Count('id', filter=Q(check_in__gte=today_start)),
+            in_gym=Count('id', filter=Q(check_in__gte=today_start, check_out__isnull=True)),
+            same_day_last_week=Count('id', filter=Q(
+                check_in__gte=last_week_day, check_in__lt=last_week_day + timedelta(days=1)
+            )),
+            week=Count('id', filter=Q(check_in__gte=week_start)),
+            previous_week=Count('id', filter=Q(check_in__lt=week_start)),
+        )
+
+        revenue = Payment.objects.filter(
+            status=Payment.PaymentStatus.COMPLETED,
+            created_at__gte=min(previous_week_start, month_start),
+            created_at__lt=tomorrow_start
+        ).aggregate(
+            today=Sum('total', filter=Q(created_at__gte=today_start)),
+            week=Sum('total', filter=Q(created_at__gte=week_start)),
+            previous_week=Sum('total', filter=Q(
+                created_at__gte=previous_week_start, created_at__lt=week_start
+            )),
+            month=Sum('total', filter=Q(created_at__gte=month_start)),
+        )
+        revenue = {key: value or Decimal('0') for key, value in revenue.items()}
+
+        lockers = Locker.objects.aggregate(
+            total=Count('id'),
+            occupied=Count('id', filter=Q(status=Locker.Status.OCCUPIED)),
+        )
+
+        expiring_subscriptions = [
+            {
+                'member': {'full_name': f'{first_name} {last_name}'.strip()},
+                'plan': {'name': plan_name},
+                'end_date': end_date,
+                'days_remaining': (end_date - today).days,
+            }
+            for first_name, last_name, plan_name, end_date in Subscription.objects.filter(
+                status=Subscription.Status.ACTIVE,
+                end_date__range=(today, today + timedelta(days=7))
+            ).order_by('end_date').values_list(
+                'member__user__first_name', 'member__user__last_name', 'plan__name', 'end_date'
+            )[:5]
+        ]
+
+        recent_members = [
+            {
+                'id': member_id,
+                'full_name': f'{first_name} {last_name}'.strip(),
+                'phone': phone,
+                'created_at': created_at,
+            }
+            for member_id, first_name, last_name, phone, created_at in Member.objects.order_by(
+                '-created_at'
+            ).values_list('id', 'user__first_name', 'user__last_name', 'user__phone', 'created_at')[:5]
+        ]
+
+        recent_payments = [
+            {
+                'id': payment_id,
+                'payment_number': payment_number,
+                'member_name': f'{first_name} {last_name}'.strip(),
+                'total': total,
+                'created_at': created_at,
+            }
+            for payment_id, payment_number, first_name, last_name, total, created_at in Payment.objects.filter(
+                status=Payment.PaymentStatus.COMPLETED
+            ).order_by('-created_at').values_list(
+                'id', 'payment_number', 'member__user__first_name', 'member__user__last_name',
+                'total', 'created_at'
+            )[:5]
+        ]
+
+        return {
+            'computed_at': now,
+            'total_members': members['total'],
+            'new_members_week': members['new_week'],
+            'new_members_delta': _delta(members['new_week'], members['new_previous_week']),
+            'active_subscriptions': subscriptions['active'],
+            'expiring_soon': subscriptions['expiring_soon'],
+            'today_attendance': attendance['today'],
+            'today_attendance_delta': _delta(attendance['today'], attendance['same_day_last_week']),
+            'week_attendance': attendance['week'],
+            'week_attendance_delta': _delta(attendance['week'], attendance['previous_week']),
+            'in_gym_now': attendance['in_gym'],
+            'today_revenue': revenue['today'],
+            'week_revenue': revenue['week'],
+            'week_revenue_delta': _delta(revenue['week'], revenue['previous_week']),
+            'monthly_revenue': revenue['month'],
+            'locker_occupancy': round(lockers['occupied'] * 100 / lockers['total'], 1) if lockers['total'] else 0,
+            'expiring_subscriptions': expiring_subscriptions,
+            'recent_members': recent_members,
+            'recent_payments': recent_payments,
+        }
+
+    @staticmethod
+    def refresh() -> Optional[Dict[str, Any]]:
+        """
+        إعادة الحساب وتخزين اللقطة (لا شيء إذا كان عامل آخر يحسبها الآن)
+        """
+        config = get_config()
+        if not cache.add(DashboardSnapshotService.LOCK_KEY, True, config['LOCK_SECONDS']):
+            return None
+
+        try:
+            snapshot = DashboardSnapshotService.compute()
+            # صلاحية أطول من فترة التحديث حتى تبقى اللقطة متاحة إذا تأخرت المهمة
+            cache.set(DashboardSnapshotService.CACHE_KEY, snapshot, config['MAX_AGE_SECONDS'] * 10)
+            return snapshot
+        finally:
+            cache.delete(DashboardSnapshotService.LOCK_KEY)
+
+    @staticmethod
+    def _request_refresh() -> None:
+        """طلب تحديث في الخلفية (مرة واحدة مهما تعددت الطلبات)"""
+        from .tasks import refresh_dashboard_snapshot
+
+        if cache.get(DashboardSnapshotService.LOCK_KEY) is None:
+            refresh_dashboard_snapshot.delay()
+
+    @staticmethod
+    def get_snapshot() -> Dict[str, Any]:
+        """
+        اللقطة الحالية فوراً من الذاكرة المؤقتة
+
+        عند عدم وجودها (أول تشغيل) يحسبها طلب واحد وينتظر الباقون نتيجته
+        """
+        config = get_config()
+        snapshot = cache.get(DashboardSnapshotService.CACHE_KEY)
+
+        if snapshot is not None:
+            age = (timezone.now() - snapshot['computed_at']).total_seconds()
+            if age > config['MAX_AGE_SECONDS']:
+                try:
+                    DashboardSnapshotService._request_refresh()
+                except Exception:
+                    # الوسيط غير متاح: نعرض اللقطة القديمة ونترك التحديث للمهمة المجدولة
+                    pass
+            return snapshot
+
+        snapshot = DashboardSnapshotService.refresh()
+        if snapshot is not None:
+            return snapshot
+
+        deadline = time.monotonic() + config['WAIT_SECONDS']
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            snapshot = cache.get(DashboardSnapshotService.CACHE_KEY)
+            if snapshot is not None:
+                return snapshot
+
+        return DashboardSnapshotService.compute()
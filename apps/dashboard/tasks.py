@@ -0,0 +1,25 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_dashboard_snapshot():
+    """
+    إعادة حساب لقطة مؤشرات لوحة التحكم
+    يتم تشغيله كل DASHBOARD_SNAPSHOT['REFRESH_SECONDS'] ثانية
+    """
+    try:
+        from .services import DashboardSnapshotService
+        
+        snapshot = DashboardSnapshotService.refresh()
+        if snapshot is None:
+            return "تحديث آخر قيد التنفيذ"
+        
+        logger.info(f"✓ تحديث لوحة التحكم: {snapshot['computed_at']:%H:%M:%S}")
+        return f"تم تحديث لوحة التحكم {snapshot['computed_at'].isoformat()}"
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في تحديث لوحة التحكم: {str(e)}")
+        raise
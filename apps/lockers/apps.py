@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class LockersConfig(AppConfig):
+    """تكوين تطبيق الخزائن"""
+    
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.lockers'
+    verbose_name = 'الخزائن'
+    
+    def ready(self):
+        """استدعاء الإشارات عند تحميل التطبيق"""
+        import apps.lockers.signals  # noqa
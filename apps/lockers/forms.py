@@ -45,7 +45,7 @@ class LockerRentalForm(forms.ModelForm):
     
     class Meta:
         model = LockerRental
-        fields = ['locker', 'member', 'rental_type', 'start_date', 'end_date', 'price']
+        fields = ['locker', 'member', 'rental_type', 'start_date', 'end_date', 'price', 'renew_automatically']
         widgets = {
             'locker': forms.Select(attrs={
                 'class': 'form-select'
@@ -69,6 +69,9 @@ class LockerRentalForm(forms.ModelForm):
                 'class': 'form-control',
                 'id': 'rental-price'
             }),
+            'renew_automatically': forms.CheckboxInput(attrs={
+                'class': 'form-check-input'
+            }),
         }
 
     def __init__(self, *args, **kwargs):
@@ -122,3 +125,8 @@ class QuickRentalForm(forms.Form):
         label='تاريخ البداية',
         widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
     )
+    renew_automatically = forms.BooleanField(
+        required=False,
+        label='تجديد تلقائي (للإيجار الشهري)',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
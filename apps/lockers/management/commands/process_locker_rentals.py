@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from apps.lockers.services import LockerRentalBatchService
+
+
+class Command(BaseCommand):
+    """المعالجة الليلية لإيجارات الخزائن"""
+
+    help = 'تجديد الإيجارات الشهرية التلقائية، إنهاء المتأخرة وتحرير خزائنها، وإرسال تذكيرات الانتهاء'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=date.fromisoformat,
+            help='تاريخ التشغيل YYYY-MM-DD (افتراضي: اليوم)'
+        )
+
+    def handle(self, *args, **options):
+        report = LockerRentalBatchService.process(today=options['date'])
+        timings = report['timings_ms']
+
+        self.stdout.write(
+            f"تجديد: {report['renewed']} ({report['payments']} دفعة) - {timings['renew']} ms"
+        )
+        self.stdout.write(
+            f"إنهاء: {report['expired']} (تحرير {report['lockers_freed']} خزانة) - {timings['expire']} ms"
+        )
+        self.stdout.write(f"تذكيرات: {report['reminders']} - {timings['remind']} ms")
+        self.stdout.write(self.style.SUCCESS(f"✓ اكتملت المعالجة خلال {timings['total']} ms"))
@@ -55,8 +55,11 @@ class Locker(models.Model):
     
     @property
     def is_available(self):
-        """هل الخزانة متاحة للإيجار"""
-        return self.status == self.Status.AVAILABLE and self.current_rental is None
+        """هل الخزانة متاحة للإيجار (يستخدم has_active_rental إن كان محسوباً في الاستعلام)"""
+        has_active_rental = getattr(self, 'has_active_rental', None)
+        if has_active_rental is None:
+            has_active_rental = self.current_rental is not None
+        return self.status == self.Status.AVAILABLE and not has_active_rental
 
 
 class LockerRental(models.Model):
@@ -85,6 +88,7 @@ class LockerRental(models.Model):
     
     price = models.DecimalField('السعر', max_digits=8, decimal_places=2)
     is_active = models.BooleanField('نشط', default=True)
+    renew_automatically = models.BooleanField('تجديد تلقائي', default=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,455 @@
+import re
+import time
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional, List, Dict, Any, Tuple
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import Locker, LockerRental
+
+
+_NUMBER_PARTS_RE = re.compile(r'(\d+)')
+
+
+def natural_key(locker_number: str) -> Tuple:
+    """ترتيب طبيعي لأرقام الخزائن (A2 قبل A10)"""
+    return tuple(
+        (0, int(part), '') if part.isdigit() else (1, 0, part.casefold())
+        for part in _NUMBER_PARTS_RE.split(locker_number or '') if part
+    )
+
+
+class LockerAllocationService:
+    """
+    تأجير الخزائن وحجزها ذرياً مع فهرس توفر لكل (حجم، موقع)
+
+    - الفهرس: أرقام خزائن المجموعة مرتبة طبيعياً + قناع بت للخزائن المتاحة،
+      مخزن في الذاكرة المؤقتة ويحدث بعد كل حجز أو تحرير (تلميح فقط)
+    - الحجز: UPDATE ... SET status='occupied' WHERE status='available'
+      فلا يمكن لمكتبين حجز نفس الخزانة
+    """
+
+    INDEX_KEY = 'lockers:availability-index'
+    INDEX_TIMEOUT = 10 * 60
+
+    RENTAL_DAYS = {
+        LockerRental.RentalType.DAILY: 1,
+        LockerRental.RentalType.MONTHLY: 30,
+    }
+
+    # ==================== فهرس التوفر ====================
+
+    @staticmethod
+    def active_rental_filter(today: Optional[date] = None) -> Q:
+        today = today or timezone.localdate()
+        return Q(is_active=True, start_date__lte=today, end_date__gte=today)
+
+    @staticmethod
+    def build_index() -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """بناء الفهرس باستعلام واحد لكل الخزائن"""
+        groups = {}
+        rows = Locker.objects.values_list('id', 'locker_number', 'size', 'location', 'status')
+
+        for locker_id, number, size, location, status in rows:
+            groups.setdefault((size, location), []).append(
+                (natural_key(number), locker_id, status == Locker.Status.AVAILABLE)
+            )
+
+        index = {}
+        for key, lockers in groups.items():
+            lockers.sort()
+            mask = 0
+            for position, (_, _, free) in enumerate(lockers):
+                if free:
+                    mask |= 1 << position
+            index[key] = {
+                'keys': [locker[0] for locker in lockers],
+                'ids': [locker[1] for locker in lockers],
+                'free': mask,
+            }
+        return index
+
+    @staticmethod
+    def get_index() -> Dict[Tuple[str, str], Dict[str, Any]]:
+        index = cache.get(LockerAllocationService.INDEX_KEY)
+        if index is None:
+            index = LockerAllocationService.build_index()
+            cache.set(LockerAllocationService.INDEX_KEY, index, LockerAllocationService.INDEX_TIMEOUT)
+        return index
+
+    @staticmethod
+    def invalidate_index() -> None:
+        cache.delete(LockerAllocationService.INDEX_KEY)
+
+    @staticmethod
+    def _mark(locker: Locker, free: bool) -> None:
+        """تحديث بت الخزانة في الفهرس بعد نجاح المعاملة"""
+        def update():
+            index = cache.get(LockerAllocationService.INDEX_KEY)
+            if index is None:
+                return
+
+            group = index.get((locker.size, locker.location))
+            if group is None or locker.pk not in group['ids']:
+                LockerAllocationService.invalidate_index()
+                return
+
+            bit = 1 << group['ids'].index(locker.pk)
+            group['free'] = group['free'] | bit if free else group['free'] & ~bit
+            cache.set(LockerAllocationService.INDEX_KEY, index, LockerAllocationService.INDEX_TIMEOUT)
+
+        transaction.on_commit(update)
+
+    @staticmethod
+    def availability_summary() -> Dict[str, Dict[str, Dict[str, int]]]:
+        """عدد الخزائن المتاحة لكل حجم وموقع من الفهرس"""
+        summary = {}
+        for (size, location), group in LockerAllocationService.get_index().items():
+            summary.setdefault(size, {})[location] = {
+                'total': len(group['ids']),
+                'available': bin(group['free']).count('1'),
+            }
+        return summary
+
+    @staticmethod
+    def _candidates(size: str, location: Optional[str] = None,
+                    near: Optional[str] = None) -> List[int]:
+        """
+        الخزائن المتاحة حسب الفهرس مرتبة بالقرب
+
+        موقع الخزانة near (أو location) أولاً بالأقرب رقماً إليها، ثم بقية المواقع
+        """
+        index = LockerAllocationService.get_index()
+        groups = [(key, group) for key, group in index.items() if key[0] == size]
+
+        anchor = None
+        if near:
+            anchor = Locker.objects.filter(locker_number=near).values_list(
+                'location', 'locker_number'
+            ).first()
+            if anchor:
+                location = location or anchor[0]
+
+        candidates = []
+        for (_, group_location), group in sorted(groups, key=lambda item: item[0][1] != location):
+            if location and group_location != location and near is None:
+                continue
+
+            free_positions = [
+                position for position in range(len(group['ids']))
+                if group['free'] >> position & 1
+            ]
+            if anchor and group_location == anchor[0]:
+                target = bisect_left(group['keys'], natural_key(anchor[1]))
+                free_positions.sort(key=lambda position: abs(position - target))
+
+            candidates.extend(group['ids'][position] for position in free_positions)
+
+        return candidates
+
+    # ==================== الحجز والتحرير ====================
+
+    @staticmethod
+    def _claim(locker_id: int) -> bool:
+        """حجز ذري: ينجح لطلب واحد فقط من الطلبات المتزامنة"""
+        active_rental = LockerRental.objects.filter(
+            LockerAllocationService.active_rental_filter(),
+            locker_id=OuterRef('pk')
+        )
+        return Locker.objects.filter(
+            pk=locker_id,
+            status=Locker.Status.AVAILABLE
+        ).exclude(Exists(active_rental)).update(
+            status=Locker.Status.OCCUPIED,
+            updated_at=timezone.now()
+        ) == 1
+
+    @staticmethod
+    def rental_terms(locker: Locker, rental_type: str, start_date: date) -> Tuple[date, Decimal]:
+        """(تاريخ النهاية، السعر) حسب نوع الإيجار"""
+        days = LockerAllocationService.RENTAL_DAYS.get(rental_type)
+        if days is None:
+            raise ValidationError("نوع الإيجار غير صحيح")
+        price = locker.daily_rate if rental_type == LockerRental.RentalType.DAILY else locker.monthly_rate
+        return start_date + timedelta(days=days), price
+
+    @staticmethod
+    @transaction.atomic
+    def rent(locker: Locker, member, rental_type: str, start_date: Optional[date] = None,
+             end_date: Optional[date] = None, price: Optional[Decimal] = None,
+             renew_automatically: bool = False) -> LockerRental:
+        """تأجير خزانة محددة (يفشل إذا سبق حجزها)"""
+        start_date = start_date or timezone.localdate()
+        default_end, default_price = LockerAllocationService.rental_terms(locker, rental_type, start_date)
+
+        if not LockerAllocationService._claim(locker.pk):
+            raise ValidationError("هذه الخزانة غير متاحة للإيجار")
+
+        rental = LockerRental.objects.create(
+            locker=locker,
+            member=member,
+            rental_type=rental_type,
+            start_date=start_date,
+            end_date=end_date or default_end,
+            price=default_price if price is None else price,
+            renew_automatically=renew_automatically
+        )
+
+        locker.status = Locker.Status.OCCUPIED
+        LockerAllocationService._mark(locker, free=False)
+        return rental
+
+    @staticmethod
+    @transaction.atomic
+    def allocate(size: str, member, rental_type: str, location: Optional[str] = None,
+                 near: Optional[str] = None, start_date: Optional[date] = None) -> LockerRental:
+        """
+        تأجير أي خزانة متاحة بالحجم المطلوب (الأقرب إلى near أو في location)
+        """
+        for locker_id in LockerAllocationService._candidates(size, location, near):
+            if LockerAllocationService._claim(locker_id):
+                break
+            # الفهرس متأخر عن قاعدة البيانات لهذه الخزانة
+            LockerAllocationService.invalidate_index()
+        else:
+            # الفهرس قد يكون قديماً: محاولة أخيرة من قاعدة البيانات مباشرة
+            fallback = Locker.objects.filter(size=size, status=Locker.Status.AVAILABLE)
+            if location and not near:
+                fallback = fallback.filter(location=location)
+            for locker_id in fallback.values_list('id', flat=True)[:20]:
+                if LockerAllocationService._claim(locker_id):
+                    break
+            else:
+                raise ValidationError("لا توجد خزانة متاحة بهذه المواصفات")
+
+        locker = Locker.objects.get(pk=locker_id)
+        start_date = start_date or timezone.localdate()
+        end_date, price = LockerAllocationService.rental_terms(locker, rental_type, start_date)
+
+        rental = LockerRental.objects.create(
+            locker=locker,
+            member=member,
+            rental_type=rental_type,
+            start_date=start_date,
+            end_date=end_date,
+            price=price
+        )
+
+        LockerAllocationService._mark(locker, free=False)
+        return rental
+
+    @staticmethod
+    @transaction.atomic
+    def release(rental: LockerRental) -> None:
+        """إنهاء الإيجار وإتاحة الخزانة إن لم يكن عليها إيجار نشط آخر"""
+        LockerRental.objects.filter(pk=rental.pk).update(is_active=False, updated_at=timezone.now())
+        rental.is_active = False
+
+        other_rentals = LockerRental.objects.filter(
+            LockerAllocationService.active_rental_filter(),
+            locker_id=OuterRef('pk')
+        )
+        released = Locker.objects.filter(
+            pk=rental.locker_id,
+            status=Locker.Status.OCCUPIED
+        ).exclude(Exists(other_rentals)).update(
+            status=Locker.Status.AVAILABLE,
+            updated_at=timezone.now()
+        )
+
+        if released:
+            rental.locker.status = Locker.Status.AVAILABLE
+            LockerAllocationService._mark(rental.locker, free=True)
+
+    # ==================== شبكة الخزائن ====================
+
+    @staticmethod
+    def grid_queryset(search: str = '', status: str = '', size: str = ''):
+        """الخزائن مع وجود إيجار نشط كعمود محسوب (بدون استعلام لكل خزانة)"""
+        lockers = Locker.objects.annotate(
+            has_active_rental=Exists(
+                LockerRental.objects.filter(
+                    LockerAllocationService.active_rental_filter(),
+                    locker_id=OuterRef('pk')
+                )
+            )
+        )
+        if search:
+            lockers = lockers.filter(
+                Q(locker_number__icontains=search) |
+                Q(location__icontains=search)
+            )
+        if status:
+            lockers = lockers.filter(status=status)
+        if size:
+            lockers = lockers.filter(size=size)
+        return lockers
+
+    @staticmethod
+    def status_counts() -> Dict[str, int]:
+        """إحصائيات الحالات باستعلام تجميعي واحد"""
+        return Locker.objects.aggregate(
+            total=Count('id'),
+            available=Count('id', filter=Q(status=Locker.Status.AVAILABLE)),
+            occupied=Count('id', filter=Q(status=Locker.Status.OCCUPIED)),
+            maintenance=Count('id', filter=Q(status=Locker.Status.MAINTENANCE)),
+        )
+
+
+class LockerRentalBatchService:
+    """
+    المعالجة الليلية لإيجارات الخزائن بعمليات جماعية:
+    تجديد الشهري التلقائي (مع إنشاء الدفعات)، إنهاء المتأخر وتحرير خزائنه،
+    وتذكير من قارب إيجاره على الانتهاء
+    """
+
+    REMINDER_DAYS = (3, 1)
+    REMINDER_TITLE = 'تذكير: إيجار الخزانة ينتهي قريباً'
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def _renewal_payment_number(rental_id: int, today: date) -> str:
+        """رقم دفعة ثابت لكل (إيجار، يوم) فلا تتكرر الدفعة عند إعادة التشغيل"""
+        return f"LKR{today:%Y%m%d}{rental_id:08d}"
+
+    @staticmethod
+    @transaction.atomic
+    def renew_due(today: date) -> Dict[str, int]:
+        """
+        تجديد الإيجارات الشهرية المنتهية المفعل فيها التجديد التلقائي
+
+        يمدد الإيجار بعدد الفترات اللازمة ليغطي اليوم، وتنشأ دفعة معلقة بقيمتها
+        """
+        from apps.payments.models import Payment
+
+        days = LockerAllocationService.RENTAL_DAYS[LockerRental.RentalType.MONTHLY]
+        due = list(
+            LockerRental.objects.select_for_update(of=('self',)).filter(
+                is_active=True,
+                renew_automatically=True,
+                rental_type=LockerRental.RentalType.MONTHLY,
+                end_date__lt=today,
+                member__is_active=True
+            ).exclude(
+                locker__status=Locker.Status.MAINTENANCE
+            ).select_related('locker').only(
+                'id', 'member_id', 'end_date', 'locker__locker_number', 'locker__monthly_rate'
+            )
+        )
+
+        now = timezone.now()
+        payments = []
+        for rental in due:
+            periods = (today - rental.end_date).days // days + 1
+            rental.end_date += timedelta(days=days * periods)
+            rental.updated_at = now
+
+            total = rental.locker.monthly_rate * periods
+            payments.append(Payment(
+                payment_number=LockerRentalBatchService._renewal_payment_number(rental.pk, today),
+                member_id=rental.member_id,
+                payment_type=Payment.PaymentType.LOCKER,
+                payment_method=Payment.PaymentMethod.CASH,
+                status=Payment.PaymentStatus.PENDING,
+                amount=total,
+                total=total,
+                amount_paid=0,
+                amount_remaining=total,
+                notes=f"تجديد تلقائي للخزانة {rental.locker.locker_number} حتى {rental.end_date}"
+            ))
+
+        LockerRental.objects.bulk_update(
+            due, ['end_date', 'updated_at'], batch_size=LockerRentalBatchService.BATCH_SIZE
+        )
+        Payment.objects.bulk_create(
+            payments, batch_size=LockerRentalBatchService.BATCH_SIZE, ignore_conflicts=True
+        )
+
+        return {'renewed': len(due), 'payments': len(payments)}
+
+    @staticmethod
+    @transaction.atomic
+    def expire_due(today: date) -> Dict[str, int]:
+        """إنهاء الإيجارات المتأخرة وتحرير خزائنها إن لم يكن عليها إيجار آخر"""
+        expired = LockerRental.objects.filter(is_active=True, end_date__lt=today)
+        locker_ids = set(expired.values_list('locker_id', flat=True))
+
+        now = timezone.now()
+        expired_count = expired.update(is_active=False, updated_at=now)
+
+        remaining_rentals = LockerRental.objects.filter(
+            locker_id=OuterRef('pk'),
+            is_active=True,
+            end_date__gte=today
+        )
+        freed = Locker.objects.filter(
+            pk__in=locker_ids,
+            status=Locker.Status.OCCUPIED
+        ).exclude(Exists(remaining_rentals)).update(
+            status=Locker.Status.AVAILABLE,
+            updated_at=now
+        )
+
+        if freed:
+            transaction.on_commit(LockerAllocationService.invalidate_index)
+
+        return {'expired': expired_count, 'lockers_freed': freed}
+
+    @staticmethod
+    def queue_reminders(today: date) -> Dict[str, int]:
+        """إشعار الأعضاء بقرب انتهاء الإيجارات غير المجددة تلقائياً"""
+        from apps.notifications.models import Notification
+
+        rows = LockerRental.objects.filter(
+            is_active=True,
+            renew_automatically=False,
+            end_date__in=[today + timedelta(days=d) for d in LockerRentalBatchService.REMINDER_DAYS]
+        ).values_list('member__user_id', 'locker__locker_number', 'end_date')
+
+        # عدم تكرار التذكير عند إعادة التشغيل في نفس اليوم
+        tz = timezone.get_current_timezone()
+        already_sent = set(Notification.objects.filter(
+            title=LockerRentalBatchService.REMINDER_TITLE,
+            created_at__gte=datetime.combine(today, datetime.min.time(), tzinfo=tz)
+        ).values_list('user_id', flat=True))
+
+        notifications = [
+            Notification(
+                user_id=user_id,
+                title=LockerRentalBatchService.REMINDER_TITLE,
+                body=f'ينتهي إيجار الخزانة {locker_number} بتاريخ {end_date}. '
+                     f'يرجى التجديد من الاستقبال للاحتفاظ بها.'
+            )
+            for user_id, locker_number, end_date in rows
+            if user_id not in already_sent
+        ]
+        Notification.objects.bulk_create(
+            notifications, batch_size=LockerRentalBatchService.BATCH_SIZE
+        )
+
+        return {'reminders': len(notifications)}
+
+    @staticmethod
+    def process(today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        تشغيل كل المراحل بالترتيب (التجديد قبل الإنهاء) مع أزمنة كل مرحلة بالمللي ثانية
+        """
+        today = today or timezone.localdate()
+        report = {'date': today.isoformat(), 'timings_ms': {}}
+
+        for name, stage in (
+            ('renew', LockerRentalBatchService.renew_due),
+            ('expire', LockerRentalBatchService.expire_due),
+            ('remind', LockerRentalBatchService.queue_reminders),
+        ):
+            started = time.perf_counter()
+            report.update(stage(today))
+            report['timings_ms'][name] = round((time.perf_counter() - started) * 1000, 1)
+
+        report['timings_ms']['total'] = round(sum(report['timings_ms'].values()), 1)
+        return report
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+import logging
+
+from .models import Locker
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Locker)
+@receiver(post_delete, sender=Locker)
+def locker_availability_index_invalidate(sender, instance, **kwargs):
+    """
+    إبطال فهرس التوفر عند إضافة خزانة أو تعديلها (الحجم، الموقع، الحالة) أو حذفها
+    """
+    try:
+        from .services import LockerAllocationService
+        
+        LockerAllocationService.invalidate_index()
+    
+    except Exception as e:
+        logger.error(f"خطأ في إبطال فهرس الخزائن: {str(e)}")
@@ -0,0 +1,22 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_locker_rentals():
+    """
+    تجديد الإيجارات التلقائية وإنهاء المتأخرة وإرسال التذكيرات
+    يتم تشغيله يومياً الساعة 12:30 صباحاً
+    """
+    try:
+        from .services import LockerRentalBatchService
+        
+        result = LockerRentalBatchService.process()
+        logger.info(f"✓ معالجة إيجارات الخزائن: {result}")
+        return result
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في معالجة إيجارات الخزائن: {str(e)}")
+        raise
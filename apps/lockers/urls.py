@@ -12,6 +12,8 @@ urlpatterns = [
     path('<int:pk>/delete/', views.locker_delete, name='locker_delete'),
     path('<int:locker_pk>/quick-rent/', views.quick_rent, name='quick_rent'),
     path('<int:pk>/price/', views.get_locker_price, name='get_locker_price'),
+    path('availability/', views.availability_summary, name='availability_summary'),
+    path('allocate/', views.allocate_locker, name='allocate_locker'),
     
     # الإيجارات
     path('rentals/', views.rental_list, name='rental_list'),
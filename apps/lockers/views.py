@@ -3,34 +3,24 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.db.models import Q, Count
+from django.core.exceptions import ValidationError
 from django.http import JsonResponse
 from django.utils import timezone
+from django.views.decorators.http import require_POST
 from datetime import timedelta
+from apps.members.models import Member
 from .models import Locker, LockerRental
 from .forms import LockerForm, LockerRentalForm, QuickRentalForm
+from .services import LockerAllocationService
 
 
 @login_required
 def locker_list(request):
-    lockers = Locker.objects.all()
     search = request.GET.get('search', '')
-    if search:
-        lockers = lockers.filter(
-            Q(locker_number__icontains=search) |
-            Q(location__icontains=search)
-        )
     status = request.GET.get('status', '')
-    if status:
-        lockers = lockers.filter(status=status)
     size = request.GET.get('size', '')
-    if size:
-        lockers = lockers.filter(size=size)
-    stats = {
-        'total': Locker.objects.count(),
-        'available': Locker.objects.filter(status=Locker.Status.AVAILABLE).count(),
-        'occupied': Locker.objects.filter(status=Locker.Status.OCCUPIED).count(),
-        'maintenance': Locker.objects.filter(status=Locker.Status.MAINTENANCE).count(),
-    }
+    lockers = LockerAllocationService.grid_queryset(search=search, status=status, size=size)
+    stats = LockerAllocationService.status_counts()
     paginator = Paginator(lockers, 12)
     page = request.GET.get('page')
     lockers = paginator.get_page(page)
@@ -129,11 +119,21 @@ def rental_create(request):
     if request.method == 'POST':
         form = LockerRentalForm(request.POST)
         if form.is_valid():
-            rental = form.save()
-            rental.locker.status = Locker.Status.OCCUPIED
-            rental.locker.save()
-            messages.success(request, 'تم تسجيل الإيجار بنجاح')
-            return redirect('lockers:rental_list')
+            try:
+                LockerAllocationService.rent(
+                    locker=form.cleaned_data['locker'],
+                    member=form.cleaned_data['member'],
+                    rental_type=form.cleaned_data['rental_type'],
+                    start_date=form.cleaned_data['start_date'],
+                    end_date=form.cleaned_data['end_date'],
+                    price=form.cleaned_data['price'],
+                    renew_automatically=form.cleaned_data['renew_automatically']
+                )
+            except ValidationError as e:
+                form.add_error('locker', e)
+            else:
+                messages.success(request, 'تم تسجيل الإيجار بنجاح')
+                return redirect('lockers:rental_list')
     else:
         form = LockerRentalForm()
     return render(request, 'lockers/rental_form.html', {'form': form, 'title': 'تسجيل إيجار جديد'})
@@ -147,12 +147,9 @@ def rental_detail(request, pk):
 
 @login_required
 def rental_end(request, pk):
-    rental = get_object_or_404(LockerRental, pk=pk)
+    rental = get_object_or_404(LockerRental.objects.select_related('locker'), pk=pk)
     if request.method == 'POST':
-        rental.is_active = False
-        rental.save()
-        rental.locker.status = Locker.Status.AVAILABLE
-        rental.locker.save()
+        LockerAllocationService.release(rental)
         messages.success(request, 'تم إنهاء الإيجار بنجاح')
         return redirect('lockers:rental_list')
     return render(request, 'lockers/rental_end_confirm.html', {'rental': rental})
@@ -167,25 +164,18 @@ def quick_rent(request, locker_pk):
     if request.method == 'POST':
         form = QuickRentalForm(request.POST)
         if form.is_valid():
-            rental_type = form.cleaned_data['rental_type']
-            start_date = form.cleaned_data['start_date']
-            if rental_type == LockerRental.RentalType.DAILY:
-                end_date = start_date + timedelta(days=1)
-                price = locker.daily_rate
+            try:
+                LockerAllocationService.rent(
+                    locker=locker,
+                    member=form.cleaned_data['member'],
+                    rental_type=form.cleaned_data['rental_type'],
+                    start_date=form.cleaned_data['start_date'],
+                    renew_automatically=form.cleaned_data['renew_automatically']
+                )
+            except ValidationError as e:
+                messages.error(request, ' '.join(e.messages))
             else:
-                end_date = start_date + timedelta(days=30)
-                price = locker.monthly_rate
-            rental = LockerRental.objects.create(
-                locker=locker,
-                member=form.cleaned_data['member'],
-                rental_type=rental_type,
-                start_date=start_date,
-                end_date=end_date,
-                price=price
-            )
-            locker.status = Locker.Status.OCCUPIED
-            locker.save()
-            messages.success(request, f'تم تأجير الخزانة {locker.locker_number} بنجاح')
+                messages.success(request, f'تم تأجير الخزانة {locker.locker_number} بنجاح')
             return redirect('lockers:locker_detail', pk=locker_pk)
     else:
         form = QuickRentalForm(initial={'start_date': timezone.now().date()})
@@ -203,3 +193,40 @@ def get_locker_price(request, pk):
         'daily_rate': str(locker.daily_rate),
         'monthly_rate': str(locker.monthly_rate),
     })
+
+
+@login_required
+def availability_summary(request):
+    """عدد الخزائن المتاحة لكل حجم وموقع - AJAX"""
+    return JsonResponse({
+        'success': True,
+        'availability': LockerAllocationService.availability_summary()
+    })
+
+
+@login_required
+@require_POST
+def allocate_locker(request):
+    """تأجير أي خزانة متاحة بالحجم المطلوب بالقرب من خزانة أو في موقع - AJAX"""
+    try:
+        rental = LockerAllocationService.allocate(
+            size=request.POST.get('size', ''),
+            member=Member.objects.get(pk=request.POST.get('member')),
+            rental_type=request.POST.get('rental_type', LockerRental.RentalType.MONTHLY),
+            location=request.POST.get('location') or None,
+            near=request.POST.get('near') or None
+        )
+    except (Member.DoesNotExist, ValueError):
+        return JsonResponse({'success': False, 'error': 'العضو غير موجود'}, status=404)
+    except ValidationError as e:
+        return JsonResponse({'success': False, 'error': ' '.join(e.messages)}, status=409)
+
+    return JsonResponse({
+        'success': True,
+        'rental_id': rental.pk,
+        'locker_id': rental.locker_id,
+        'locker_number': rental.locker.locker_number,
+        'location': rental.locker.location,
+        'end_date': rental.end_date.isoformat(),
+        'price': str(rental.price),
+    })
@@ -5,7 +5,11 @@ from django.urls import reverse
 from django.db.models import Q
 from datetime import date
 
+from .analytics import BodyMetricsService, bmi_category, calculate_bmi
+from .exports import MemberExporter
 from .models import Member, MemberBodyMetrics
+from .services import MemberSearchService, MemberService
+from core.exports import ExportAdminMixin
 
 
 class MemberBodyMetricsInline(admin.TabularInline):
@@ -19,22 +23,9 @@ class MemberBodyMetricsInline(admin.TabularInline):
     
     def get_bmi(self, obj):
         """حساب وعرض BMI"""
-        if obj.member.height and obj.weight:
-            bmi = (obj.weight / ((obj.member.height / 100) ** 2))
-            color = '#28a745'  # أخضر
-            
-            if bmi < 18.5:
-                category = 'ناقص وزن'
-            elif bmi < 25:
-                category = 'وزن طبيعي'
-                color = '#198754'
-            elif bmi < 30:
-                category = 'زيادة وزن'
-                color = '#ffc107'
-            else:
-                category = 'سمنة'
-                color = '#dc3545'
-            
+        bmi = calculate_bmi(obj.weight, obj.member.height)
+        if bmi is not None:
+            category, color = bmi_category(bmi)
             return format_html(
                 '<span style="background-color: {}; color: white; '
                 'padding: 3px 8px; border-radius: 3px; font-weight: bold;">'
@@ -42,11 +33,14 @@ class MemberBodyMetricsInline(admin.TabularInline):
                 color, bmi, category
             )
         return '—'
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('member')
     get_bmi.short_description = 'BMI'
 
 
 @admin.register(Member)
-class MemberAdmin(admin.ModelAdmin):
+class MemberAdmin(ExportAdminMixin, admin.ModelAdmin):
     """لوحة إدارة الأعضاء - عرض وتحديث بيانات الأعضاء"""
     
     list_display = [
@@ -151,40 +145,26 @@ class MemberAdmin(admin.ModelAdmin):
     
     def get_current_weight(self, obj):
         """أحدث وزن"""
-        latest_metric = obj.body_metrics.latest('date')
-        if latest_metric and latest_metric.weight:
+        latest_metric = BodyMetricsService.latest(obj.pk)
+        if latest_metric and latest_metric['weight']:
             return format_html(
                 '<strong>{} كغ</strong> <br/><small>({}</small>',
-                latest_metric.weight,
-                latest_metric.date.strftime('%d-%m-%Y')
+                latest_metric['weight'],
+                latest_metric['date'].strftime('%d-%m-%Y')
             )
         return 'لا توجد بيانات'
     get_current_weight.short_description = _('الوزن الحالي')
     
     def get_bmi_current(self, obj):
         """BMI الحالي"""
-        latest_metric = obj.body_metrics.latest('date')
-        if latest_metric and latest_metric.height and latest_metric.weight:
-            bmi = (latest_metric.weight / ((latest_metric.height / 100) ** 2))
-            
-            if bmi < 18.5:
-                category = 'ناقص وزن'
-                color = '#0dcaf0'
-            elif bmi < 25:
-                category = 'وزن طبيعي'
-                color = '#198754'
-            elif bmi < 30:
-                category = 'زيادة وزن'
-                color = '#ffc107'
-            else:
-                category = 'سمنة'
-                color = '#dc3545'
-            
+        latest_metric = BodyMetricsService.latest(obj.pk)
+        if latest_metric and latest_metric['bmi'] is not None:
+            category, color = bmi_category(latest_metric['bmi'])
             return format_html(
                 '<span style="background-color: {}; color: white; '
                 'padding: 5px 10px; border-radius: 5px; font-weight: bold;">'
                 '{:.1f} - {}</span>',
-                color, bmi, category
+                color, latest_metric['bmi'], category
             )
         return 'لا توجد بيانات'
     get_bmi_current.short_description = _('BMI الحالي')
@@ -214,16 +194,30 @@ class MemberAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """تحسين الـ Query"""
         qs = super().get_queryset(request)
-        return qs.select_related('user').prefetch_related('body_metrics')
+        return qs.select_related('user')
+    
+    def get_search_results(self, request, queryset, search_term):
+        """البحث عبر فهرس البحث بدلاً من icontains على جدول المستخدمين"""
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return MemberSearchService.filter_queryset(queryset, search_term), False
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        was_active = form.initial.get('is_active') if change else None
+        MemberService.saved(obj, created=not change, was_active=was_active)
     
     actions = [
         'activate_members', 'deactivate_members',
-        'reset_reward_points', 'export_members_csv'
+        'reset_reward_points', 'export_csv', 'export_xlsx'
     ]
+    exporter_class = MemberExporter
     
     def activate_members(self, request, queryset):
         """إجراء: تفعيل الأعضاء"""
+        member_ids = list(queryset.values_list('pk', flat=True))
         count = queryset.update(is_active=True)
+        MemberSearchService.set_active(member_ids, True)
         self.message_user(
             request,
             f'✓ تم تفعيل {count} عضو'
@@ -232,7 +226,9 @@ class MemberAdmin(admin.ModelAdmin):
     
     def deactivate_members(self, request, queryset):
         """إجراء: تعطيل الأعضاء"""
+        member_ids = list(queryset.values_list('pk', flat=True))
         count = queryset.update(is_active=False)
+        MemberSearchService.set_active(member_ids, False)
         self.message_user(
             request,
             f'✓ تم تعطيل {count} عضو'
@@ -247,36 +243,6 @@ class MemberAdmin(admin.ModelAdmin):
             f'✓ تم إعادة تعيين نقاط {count} عضو'
         )
     reset_reward_points.short_description = _('إعادة تعيين النقاط')
-    
-    def export_members_csv(self, request, queryset):
-        """إجراء: تصدير إلى CSV"""
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = 'attachment; filename="members.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'معرف العضو', 'الاسم', 'الهاتف', 'البريد الإلكتروني',
-            'النوع', 'العمر', 'تاريخ الانضمام', 'النقاط', 'الحالة'
-        ])
-        
-        for member in queryset:
-            writer.writerow([
-                member.member_id,
-                member.user.get_full_name(),
-                member.user.phone,
-                member.user.email,
-                member.get_gender_display(),
-                member.age or '—',
-                member.join_date.strftime('%d-%m-%Y'),
-                member.reward_points,
-                'نشط' if member.is_active else 'معطل'
-            ])
-        
-        return response
-    export_members_csv.short_description = _('تصدير إلى CSV')
 
 
 @admin.register(MemberBodyMetrics)
@@ -318,49 +284,25 @@ class MemberBodyMetricsAdmin(admin.ModelAdmin):
     
     def get_bmi_badge(self, obj):
         """شارة BMI"""
-        if obj.member.height and obj.weight:
-            bmi = (obj.weight / ((obj.member.height / 100) ** 2))
-            
-            if bmi < 18.5:
-                category = 'ناقص'
-                color = '#0dcaf0'
-            elif bmi < 25:
-                category = 'طبيعي'
-                color = '#198754'
-            elif bmi < 30:
-                category = 'زيادة'
-                color = '#ffc107'
-            else:
-                category = 'سمنة'
-                color = '#dc3545'
-            
+        bmi = calculate_bmi(obj.weight, obj.member.height)
+        if bmi is not None:
             return format_html(
                 '<span style="background-color: {}; color: white; '
                 'padding: 3px 8px; border-radius: 3px; font-weight: bold;">'
                 '{:.1f}</span>',
-                color, bmi
+                bmi_category(bmi)[1], bmi
             )
         return '—'
     get_bmi_badge.short_description = _('BMI')
     
     def get_bmi_display(self, obj):
         """عرض مفصل للـ BMI"""
-        if obj.member.height and obj.weight:
-            bmi = (obj.weight / ((obj.member.height / 100) ** 2))
-            
-            if bmi < 18.5:
-                category = 'ناقص وزن'
-            elif bmi < 25:
-                category = 'وزن طبيعي'
-            elif bmi < 30:
-                category = 'زيادة وزن'
-            else:
-                category = 'سمنة'
-            
+        bmi = calculate_bmi(obj.weight, obj.member.height)
+        if bmi is not None:
             return format_html(
                 '<strong>BMI: {:.1f}</strong> ({}) <br/>'
                 '<small>الطول: {} سم | الوزن: {} كغ</small>',
-                bmi, category, obj.member.height, obj.weight
+                bmi, bmi_category(bmi)[0], obj.member.height, obj.weight
             )
         return 'بيانات غير كافية لحساب BMI'
     get_bmi_display.short_description = _('مؤشر كتلة الجسم')
@@ -0,0 +1,295 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+DEFAULT_CONFIG = {
+    'CACHE_TIMEOUT': 24 * 3600,
+    'MOVING_AVERAGE_WINDOW': 4,
+    'TREND_DAYS': 90,
+    'ROSTER_DAYS': 90,
+}
+
+METRIC_FIELDS = (
+    'weight', 'body_fat_percentage', 'muscle_mass',
+    'chest', 'waist', 'hips', 'arms', 'thighs',
+)
+
+# القياسات التي يُحسب لها الاتجاه في ملخصات المدرب
+TREND_FIELDS = ('weight', 'bmi', 'body_fat_percentage', 'muscle_mass', 'waist')
+
+# (الحد الأعلى، التصنيف، اللون)
+BMI_CATEGORIES = (
+    (Decimal('18.5'), 'ناقص وزن', '#0dcaf0'),
+    (Decimal('25'), 'وزن طبيعي', '#198754'),
+    (Decimal('30'), 'زيادة وزن', '#ffc107'),
+    (None, 'سمنة', '#dc3545'),
+)
+
+PERIODS = ('week', 'month')
+
+
+def get_config() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG, **getattr(settings, 'BODY_METRICS', {})}
+
+
+def calculate_bmi(weight, height) -> Optional[Decimal]:
+    """مؤشر كتلة الجسم بدقة عشرية (الطول بالسنتيمتر)"""
+    if not weight or not height:
+        return None
+    height_m = Decimal(height) / 100
+    return (Decimal(weight) / (height_m * height_m)).quantize(Decimal('0.01'))
+
+
+def bmi_category(bmi) -> Tuple[str, str]:
+    """(التصنيف، اللون)"""
+    for upper, label, color in BMI_CATEGORIES:
+        if upper is None or bmi < upper:
+            return label, color
+
+
+def _days(values) -> np.ndarray:
+    """تواريخ -> أيام منذ 1970"""
+    return np.array(values, dtype='datetime64[D]').astype(np.int64)
+
+
+def _floats(column) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in column], dtype=float)
+
+
+def _clean(value, digits=2):
+    """قيمة JSON (None بدل NaN)"""
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+class BodyMetricsService:
+    """
+    سلاسل قياسات الجسم واتجاهاتها
+
+    - series: متوسطات أسبوعية/شهرية مع متوسط متحرك وفرق عن الفترة السابقة
+    - latest / latest_many: آخر قياس لكل عضو من الذاكرة المؤقتة (يُبطل عند التعديل)
+    - trends / roster: ميل الانحدار لكل عضو دفعة واحدة (bincount) لكل أعضاء المدرب
+    """
+
+    CACHE_KEY = 'body-metrics:latest:{}'
+
+    @staticmethod
+    def _load(member_ids: Iterable[int], since=None):
+        """(أعضاء، أيام، مصفوفة القيم [صف، قياس] مع عمود bmi) مرتبة حسب العضو ثم التاريخ"""
+        from .models import Member, MemberBodyMetrics
+
+        member_ids = list(member_ids)
+        queryset = MemberBodyMetrics.objects.filter(member_id__in=member_ids)
+        if since is not None:
+            queryset = queryset.filter(date__gte=since)
+        rows = list(queryset.order_by('member_id', 'date', 'pk').values_list(
+            'member_id', 'date', *METRIC_FIELDS
+        ))
+
+        fields = METRIC_FIELDS + ('bmi',)
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros((0, len(fields))), fields
+
+        columns = list(zip(*rows))
+        members = np.array(columns[0], dtype=np.int64)
+        values = np.column_stack([_floats(column) for column in columns[2:]])
+
+        heights = dict(Member.objects.filter(pk__in=member_ids).values_list('pk', 'height'))
+        height_m = _floats([heights.get(member_id) for member_id in columns[0]]) / 100
+        bmi = values[:, 0] / (height_m * height_m)
+
+        return members, _days(columns[1]), np.column_stack([values, bmi]), fields
+
+    @staticmethod
+    def _buckets(days: np.ndarray, period: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(رقم الفترة لكل صف، تاريخ بداية كل فترة)"""
+        if period == 'month':
+            months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+            keys, inverse = np.unique(months, return_inverse=True)
+            starts = keys.astype('datetime64[M]').astype('datetime64[D]')
+        else:
+            # الأسبوع يبدأ السبت (مثل ClassSchedule.DayOfWeek)؛ يوم 0 (1970-01-01) خميس
+            weeks = (days + 5) // 7
+            keys, inverse = np.unique(weeks, return_inverse=True)
+            starts = (keys * 7 - 5).astype('datetime64[D]')
+        return inverse, starts
+
+    @staticmethod
+    def series(member_id: int, period: str = 'week', window: Optional[int] = None) -> Dict[str, Any]:
+        """متوسط كل فترة + متوسط متحرك لآخر window فترات + الفرق عن الفترة السابقة"""
+        if period not in PERIODS:
+            raise ValueError(f'الفترة يجب أن تكون: {", ".join(PERIODS)}')
+        window = window or get_config()['MOVING_AVERAGE_WINDOW']
+
+        _, days, values, fields = BodyMetricsService._load([member_id])
+        if not len(days):
+            return {'member_id': member_id, 'period': period, 'window': window, 'points': []}
+
+        inverse, starts = BodyMetricsService._buckets(days, period)
+        valid = ~np.isnan(values)
+        sums = np.zeros((len(starts), values.shape[1]))
+        counts = np.zeros_like(sums)
+        np.add.at(sums, inverse, np.where(valid, values, 0))
+        np.add.at(counts, inverse, valid)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+
+            # متوسط متحرك يتجاهل الفترات بدون قياس
+            has = ~np.isnan(means)
+            cum_sum = np.vstack([np.zeros(means.shape[1]), np.cumsum(np.where(has, means, 0), axis=0)])
+            cum_count = np.vstack([np.zeros(means.shape[1]), np.cumsum(has, axis=0)])
+            lag = np.maximum(np.arange(1, len(means) + 1) - window, 0)
+            moving = (cum_sum[1:] - cum_sum[lag]) / (cum_count[1:] - cum_count[lag])
+
+        delta = np.vstack([np.full(means.shape[1], np.nan), np.diff(means, axis=0)])
+        samples = np.bincount(inverse, minlength=len(starts))
+
+        points = []
+        for index, start in enumerate(starts.tolist()):
+            point = {'period_start': start, 'samples': int(samples[index])}
+            for column, field in enumerate(fields):
+                point[field] = _clean(means[index, column])
+                point[f'{field}_avg'] = _clean(moving[index, column])
+                point[f'{field}_delta'] = _clean(delta[index, column])
+            points.append(point)
+
+        return {'member_id': member_id, 'period': period, 'window': window, 'points': points}
+
+    @staticmethod
+    def trends(member_ids: Iterable[int], days: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        لكل عضو ولكل قياس: التغير خلال الفترة والميل الأسبوعي (مربعات صغرى)
+
+        كل الأعضاء في مرور واحد: مجاميع n, Σx, Σy, Σxy, Σx² بـ bincount حسب العضو
+        """
+        days = days or get_config()['TREND_DAYS']
+        today = timezone.localdate()
+        members, day_numbers, values, fields = BodyMetricsService._load(
+            member_ids, since=today - timedelta(days=days)
+        )
+        if not len(members):
+            return {}
+
+        keys, codes = np.unique(members, return_inverse=True)
+        x = (day_numbers - day_numbers.max()).astype(float)
+        positions = np.arange(len(members))
+        counts = np.bincount(codes, minlength=len(keys))
+        result = {int(key): {'samples': int(counts[index])} for index, key in enumerate(keys)}
+
+        for field in TREND_FIELDS:
+            column = values[:, fields.index(field)]
+            valid = ~np.isnan(column)
+            c, xv, yv = codes[valid], x[valid], column[valid]
+
+            n = np.bincount(c, minlength=len(keys)).astype(float)
+            sx = np.bincount(c, xv, minlength=len(keys))
+            sy = np.bincount(c, yv, minlength=len(keys))
+            sxy = np.bincount(c, xv * yv, minlength=len(keys))
+            sxx = np.bincount(c, xv * xv, minlength=len(keys))
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                denominator = n * sxx - sx * sx
+                slope = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, np.nan)
+
+            # أول وآخر قياس صالح لكل عضو (الصفوف مرتبة بالتاريخ)
+            first = np.full(len(keys), len(members))
+            last = np.full(len(keys), -1)
+            np.minimum.at(first, c, positions[valid])
+            np.maximum.at(last, c, positions[valid])
+            has = last >= 0
+            change = np.full(len(keys), np.nan)
+            change[has] = column[last[has]] - column[first[has]]
+
+            for index, key in enumerate(keys):
+                result[int(key)][field] = {
+                    'change': _clean(change[index]),
+                    'per_week': _clean(slope[index] * 7, 3),
+                }
+
+        return result
+
+    @staticmethod
+    def _snapshot(row: Dict[str, Any], height) -> Dict[str, Any]:
+        bmi = calculate_bmi(row['weight'], height)
+        snapshot = {'date': row['date']}
+        snapshot.update({field: row[field] for field in METRIC_FIELDS})
+        snapshot['bmi'] = bmi
+        snapshot['bmi_category'] = bmi_category(bmi)[0] if bmi is not None else None
+        return snapshot
+
+    @staticmethod
+    def latest_many(member_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """آخر قياس لكل عضو (قراءة جماعية من الذاكرة ثم استعلام واحد للناقص)"""
+        from .models import Member, MemberBodyMetrics
+
+        member_ids = list(member_ids)
+        keys = {BodyMetricsService.CACHE_KEY.format(member_id): member_id for member_id in member_ids}
+        cached = cache.get_many(list(keys))
+        result = {keys[key]: (snapshot or None) for key, snapshot in cached.items()}
+
+        missing = [member_id for member_id in member_ids if member_id not in result]
+        if missing:
+            heights = dict(Member.objects.filter(pk__in=missing).values_list('pk', 'height'))
+            rows = MemberBodyMetrics.objects.filter(member_id__in=missing).order_by(
+                'member_id', '-date', '-pk'
+            ).values('member_id', 'date', *METRIC_FIELDS)
+
+            fresh = {member_id: None for member_id in missing}
+            for row in rows:
+                if fresh[row['member_id']] is None:
+                    fresh[row['member_id']] = BodyMetricsService._snapshot(row, heights.get(row['member_id']))
+
+            # {} بدل None حتى يُخزن العضو بدون قياسات أيضاً
+            cache.set_many(
+                {BodyMetricsService.CACHE_KEY.format(member_id): snapshot or {} for member_id, snapshot in fresh.items()},
+                get_config()['CACHE_TIMEOUT']
+            )
+            result.update(fresh)
+
+        return result
+
+    @staticmethod
+    def latest(member_id: int) -> Optional[Dict[str, Any]]:
+        return BodyMetricsService.latest_many([member_id])[member_id]
+
+    @staticmethod
+    def invalidate(member_id: int) -> None:
+        cache.delete(BodyMetricsService.CACHE_KEY.format(member_id))
+
+    @staticmethod
+    def roster(trainer_id: int, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """ملخص القياسات لكل أعضاء المدرب (جلسات خاصة خلال ROSTER_DAYS) في طلب واحد"""
+        from apps.trainers.models import Session
+        from .models import Member
+
+        config = get_config()
+        since = timezone.localdate() - timedelta(days=config['ROSTER_DAYS'])
+        member_ids = list(
+            Session.objects.filter(trainer_id=trainer_id, member__isnull=False, date__gte=since)
+            .order_by().values_list('member_id', flat=True).distinct()
+        )
+        if not member_ids:
+            return []
+
+        members = Member.objects.filter(pk__in=member_ids).order_by('pk').values_list(
+            'pk', 'member_id', 'user__first_name', 'user__last_name'
+        )
+        latest = BodyMetricsService.latest_many(member_ids)
+        trends = BodyMetricsService.trends(member_ids, days)
+
+        return [
+            {
+                'member': pk,
+                'member_id': member_id,
+                'name': f'{first_name} {last_name}'.strip(),
+                'latest': latest.get(pk),
+                'trend': trends.get(pk),
+            }
+            for pk, member_id, first_name, last_name in members
+        ]
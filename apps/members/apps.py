@@ -9,5 +9,6 @@ class MembersConfig(AppConfig):
     verbose_name = 'الأعضاء'
     
     def ready(self):
-        """استدعاء الإشارات عند تحميل التطبيق"""
+        """استدعاء الإشارات ومعالجات الأحداث عند تحميل التطبيق"""
         import apps.members.signals  # noqa
+        import apps.members.handlers  # noqa
@@ -0,0 +1,19 @@
+from core.events import DomainEvent
+
+
+class MemberCreated(DomainEvent):
+    """عضو جديد"""
+
+    name = 'members.member_created'
+    fields = ('member_id',)
+
+
+class MemberActivationChanged(DomainEvent):
+    """تفعيل أو تعطيل عضو"""
+
+    name = 'members.activation_changed'
+    fields = ('member_id', 'is_active')
+
+    def coalesce_key(self):
+        # التفعيل ثم التعطيل في نفس المعاملة: الحالة الأخيرة فقط
+        return (self.name, self.member_id)
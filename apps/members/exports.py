@@ -0,0 +1,31 @@
+from datetime import date
+
+from core.exports import EMPTY, Column, Exporter, choice_display, date_format, yes_no
+from core.serializers import full_name
+
+from .models import Member
+
+
+def age(date_of_birth):
+    """نفس Member.age"""
+    today = date.today()
+    return today.year - date_of_birth.year - (
+        (today.month, today.day) < (date_of_birth.month, date_of_birth.day)
+    )
+
+
+class MemberExporter(Exporter):
+    """تصدير بيانات الأعضاء"""
+
+    filename = 'members'
+    columns = (
+        Column('معرف العضو', 'member_id'),
+        Column('الاسم', 'user__first_name', 'user__last_name', format=full_name),
+        Column('الهاتف', 'user__phone'),
+        Column('البريد الإلكتروني', 'user__email'),
+        Column('النوع', 'gender', format=choice_display(Member, 'gender')),
+        Column('العمر', 'date_of_birth', format=age, empty=EMPTY),
+        Column('تاريخ الانضمام', 'join_date', format=date_format('%d-%m-%Y')),
+        Column('النقاط', 'reward_points'),
+        Column('الحالة', 'is_active', format=yes_no('نشط', 'معطل')),
+    )
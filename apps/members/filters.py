@@ -1,7 +1,7 @@
 import django_filters
 from datetime import date
-from django.db.models import Q
 from .models import Member
+from .services import MemberSearchService
 
 
 class MemberFilter(django_filters.FilterSet):
@@ -67,10 +67,5 @@ class MemberFilter(django_filters.FilterSet):
             return queryset
     
     def filter_search(self, queryset, name, value):
-        """البحث في الاسم والهاتف والبريد"""
-        return queryset.filter(
-            Q(user__first_name__icontains=value) |
-            Q(user__last_name__icontains=value) |
-            Q(user__phone__icontains=value) |
-            Q(user__email__icontains=value)
-        )
+        """البحث في الاسم والهاتف والبريد (عبر فهرس البحث)"""
+        return MemberSearchService.filter_queryset(queryset, value)
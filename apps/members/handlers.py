@@ -0,0 +1,61 @@
+import logging
+
+from core.events import EventBus
+from .events import MemberActivationChanged, MemberCreated
+
+logger = logging.getLogger(__name__)
+
+
+WELCOME_POINTS = 50
+
+
+@EventBus.subscribe(MemberCreated, background=True)
+def send_welcome_notification(event):
+    """إشعار ترحيب للعضو الجديد"""
+    from apps.notifications.models import Notification
+    from .models import Member
+    
+    member = Member.objects.only('user_id', 'member_id').get(pk=event.member_id)
+    Notification.objects.create(
+        user_id=member.user_id,
+        title="مرحباً بك في GymPro! 🎉",
+        body="تم إنشاء حسابك بنجاح. استمتع برحلة اللياقة معنا!"
+    )
+    
+    logger.info(f"تم إرسال إشعار ترحيب للعضو {member.member_id}")
+
+
+@EventBus.subscribe(MemberCreated)
+def grant_welcome_points(event):
+    """منح نقاط الترحيب للعضو الجديد"""
+    from apps.rewards.services import RewardService
+    from .models import Member
+    
+    member = Member.objects.get(pk=event.member_id)
+    RewardService.add_points(
+        member=member,
+        points=WELCOME_POINTS,
+        description='نقاط الترحيب - مرحباً بك! 🎉'
+    )
+    
+    logger.info(f"تم منح نقاط الترحيب للعضو {member.member_id}")
+
+
+@EventBus.subscribe(MemberActivationChanged, background=True)
+def send_activation_notification(event):
+    """إشعار تفعيل/تعطيل الحساب"""
+    from apps.notifications.models import Notification
+    from .models import Member
+    
+    member = Member.objects.only('user_id', 'member_id').get(pk=event.member_id)
+    
+    if event.is_active:
+        title = "تم تفعيل حسابك ✓"
+        body = "حسابك تم تفعيله بنجاح. يمكنك الآن الوصول لجميع الخدمات!"
+    else:
+        title = "تم تعطيل حسابك"
+        body = "تم تعطيل حسابك. يرجى التواصل مع الإدارة للمزيد من المعلومات."
+    
+    Notification.objects.create(user_id=member.user_id, title=title, body=body)
+    
+    logger.info(f"تم {'تفعيل' if event.is_active else 'تعطيل'} العضو {member.member_id}")
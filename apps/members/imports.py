@@ -0,0 +1,104 @@
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from apps.accounts.models import User
+from core.imports import (
+    ImportRowError, Importer, reset_pk, to_bool, to_choice, to_date, to_datetime, to_int, value
+)
+
+from .models import Member
+
+
+class MemberImporter(Importer):
+    """
+    استيراد الأعضاء مع حساباتهم (مستخدم لكل هاتف)
+
+    الأعمدة: phone*, first_name*, last_name, email, member_id, gender*, date_of_birth*,
+    national_id, emergency_contact_name, emergency_contact_phone, is_active,
+    join_date, reward_points, notes, created_at
+    """
+
+    name = 'members'
+    model = Member
+    key_field = 'member_id'
+    number_prefix = 'GYM'
+    manual_fields = ('join_date', 'created_at')
+
+    def prepare(self):
+        self.users = self.session.key_map(User, 'phone')
+        # البريد فريد أيضاً: يُفحص قبل الحفظ حتى لا تفشل الدفعة كاملة
+        self.emails = self.session.key_map(User, 'email', User.objects.exclude(email=None))
+        # المستخدمون الذين لديهم عضوية بالفعل
+        self.member_users = set(Member.objects.values_list('user_id', flat=True))
+        self.today = timezone.localdate()
+
+    def build(self, row):
+        phone = value(row, 'phone', required=True)
+        user_id = self.users.keys.get(phone)
+        if user_id in self.member_users:
+            raise ImportRowError(f'العضو موجود بالفعل: {phone}')
+
+        user = None
+        if user_id is None:
+            self.users.reserve(phone, 'الهاتف')
+            email = value(row, 'email')
+            if email is not None:
+                self.emails.reserve(email, 'البريد الإلكتروني')
+            user = User(
+                phone=phone,
+                first_name=value(row, 'first_name', required=True),
+                last_name=value(row, 'last_name', default=''),
+                email=email,
+                user_type=User.UserType.MEMBER,
+                # بدون كلمة مرور (الدخول برمز التحقق)
+                password=make_password(None),
+            )
+
+        member = Member(
+            user_id=user_id,
+            member_id=self.key_value(row),
+            gender=to_choice(row, 'gender', Member),
+            date_of_birth=to_date(row, 'date_of_birth', required=True),
+            national_id=value(row, 'national_id'),
+            emergency_contact_name=value(row, 'emergency_contact_name', default=''),
+            emergency_contact_phone=value(row, 'emergency_contact_phone', default=''),
+            is_active=to_bool(row, 'is_active', default=True),
+            join_date=to_date(row, 'join_date', default=self.today),
+            reward_points=to_int(row, 'reward_points'),
+            notes=value(row, 'notes'),
+            created_at=to_datetime(row, 'created_at', default=timezone.now()),
+        )
+        member._import_user = user
+        return member
+
+    def save(self, objects):
+        users = [member._import_user for member in objects if member._import_user is not None]
+        if users:
+            User.objects.bulk_create(users, batch_size=len(users))
+            self.users.add(users)
+            self.emails.add([user for user in users if user.email is not None])
+
+        for member in objects:
+            if member._import_user is not None:
+                member.user_id = self.users.get(member._import_user.phone)
+            self.member_users.add(member.user_id)
+
+        super().save(objects)
+
+    def rollback(self, objects):
+        users = [member._import_user for member in objects if member._import_user is not None]
+        self.users.discard(users)
+        self.emails.discard(users)
+        reset_pk(users)
+        self.member_users.difference_update(member.user_id for member in objects)
+        super().rollback(objects)
+
+    def after_save(self, objects):
+        self.session.member_ids.update(member.pk for member in objects)
+
+    def finalize(self):
+        from .services import MemberSearchService
+
+        self.session.defer('members.search_index', lambda: MemberSearchService.rebuild_index(
+            Member.objects.filter(pk__in=self.session.member_ids)
+        ))
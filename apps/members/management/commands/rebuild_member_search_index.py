@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.members.services import MemberSearchService
+
+
+class Command(BaseCommand):
+    """إعادة بناء فهرس البحث السريع للأعضاء"""
+    
+    help = 'إعادة بناء فهرس البحث السريع للأعضاء على دفعات'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='عدد الأعضاء في كل دفعة'
+        )
+    
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = MemberSearchService.rebuild_index(chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ تم فهرسة {result['indexed']} عضو خلال {elapsed:.2f} ثانية"
+        ))
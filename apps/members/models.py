@@ -106,10 +106,9 @@ class Member(models.Model):
     @property
     def bmi(self):
         """حساب مؤشر كتلة الجسم"""
-        if self.height and self.weight:
-            height_m = float(self.height) / 100
-            return round(float(self.weight) / (height_m ** 2), 2)
-        return None
+        from .analytics import calculate_bmi
+
+        return calculate_bmi(self.weight, self.height)
     
     @property
     def full_name(self):
@@ -170,3 +169,55 @@ class MemberBodyMetrics(models.Model):
     
     def __str__(self):
         return f"{self.member} - {self.date}"
+
+
+class MemberSearchIndex(models.Model):
+    """فهرس البحث السريع للأعضاء (بيانات موحدة بدون ربط مع المستخدم)"""
+    
+    member = models.OneToOneField(
+        Member,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_index',
+        verbose_name='العضو'
+    )
+    membership_number = models.CharField('رقم العضوية', max_length=20)
+    full_name = models.CharField('الاسم الكامل', max_length=301, blank=True)
+    phone = models.CharField('رقم الهاتف', max_length=15, blank=True)
+    search_text = models.TextField('نص البحث الموحد', blank=True)
+    is_active = models.BooleanField('نشط', default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'فهرس بحث عضو'
+        verbose_name_plural = 'فهرس بحث الأعضاء'
+    
+    def __str__(self):
+        return f"{self.full_name} - {self.membership_number}"
+
+
+class MemberSearchTerm(models.Model):
+    """كلمات وثلاثيات البحث المفهرسة لكل عضو"""
+    
+    class Kind(models.TextChoices):
+        WORD = 'word', 'كلمة'
+        TRIGRAM = 'trigram', 'ثلاثية'
+    
+    member = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+        verbose_name='العضو'
+    )
+    kind = models.CharField('النوع', max_length=10, choices=Kind.choices)
+    term = models.CharField('المصطلح', max_length=64)
+    
+    class Meta:
+        verbose_name = 'مصطلح بحث'
+        verbose_name_plural = 'مصطلحات البحث'
+        indexes = [
+            models.Index(fields=['kind', 'term'], name='member_search_term_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} ({self.kind})"
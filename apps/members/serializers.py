@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .analytics import PERIODS
 from .models import Member
 
 
@@ -14,3 +15,9 @@ class MemberSerializer(serializers.ModelSerializer):
             'national_id',
             'address',
         ]
+
+
+class BodyMetricsQuerySerializer(serializers.Serializer):
+    """Serializer معاملات سلسلة قياسات الجسم"""
+    period = serializers.ChoiceField(choices=PERIODS, required=False, default='week')
+    window = serializers.IntegerField(required=False, min_value=1, max_value=52)
@@ -0,0 +1,488 @@
+import re
+import time
+from datetime import date
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from django.core.cache import cache as shared_cache
+from django.db import transaction
+from django.db.models import Q, Count
+from django.utils import timezone
+
+from core.cache import TwoTierCache
+from core.events import EventBus
+from core.utils import (
+    search_tokens, trigrams, normalize_search_text, phone_variants,
+    normalize_digits, normalize_phone
+)
+from .events import MemberActivationChanged, MemberCreated
+from .models import Member, MemberSearchIndex, MemberSearchTerm
+
+
+# أعلى نقطة ترميز - تُستخدم لتحويل البحث بالبادئة إلى نطاق يستفيد من الفهرس
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+class MemberSearchService:
+    """خدمات فهرس البحث السريع عن الأعضاء (الاستقبال والبحث الفوري)"""
+
+    MIN_QUERY_LENGTH = 2
+    TRIGRAM_MIN_SIMILARITY = 0.5
+
+    @staticmethod
+    def build_document(member: Member) -> Dict[str, Any]:
+        """
+        بناء مستند البحث للعضو (الاسم، الهاتف، البريد، رقم العضوية، الهوية)
+        """
+        user = member.user
+        full_name = user.get_full_name()
+
+        parts = [
+            full_name,
+            user.email or '',
+            (user.email or '').split('@')[0],
+            member.member_id or '',
+            member.national_id or '',
+        ]
+        parts.extend(phone_variants(user.phone))
+        search_text = normalize_search_text(' '.join(parts))
+
+        words = set(search_tokens(search_text))
+        grams = trigrams(full_name) | trigrams(' '.join(phone_variants(user.phone)[:1]))
+
+        return {
+            'membership_number': member.member_id or '',
+            'full_name': full_name,
+            'phone': user.phone or '',
+            'search_text': search_text,
+            'is_active': member.is_active,
+            'words': {w[:64] for w in words},
+            'trigrams': grams,
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def index_member(member: Member) -> MemberSearchIndex:
+        """
+        تحديث فهرس البحث لعضو واحد
+        """
+        document = MemberSearchService.build_document(member)
+
+        index, _ = MemberSearchIndex.objects.update_or_create(
+            member=member,
+            defaults={
+                'membership_number': document['membership_number'],
+                'full_name': document['full_name'],
+                'phone': document['phone'],
+                'search_text': document['search_text'],
+                'is_active': document['is_active'],
+            }
+        )
+
+        MemberSearchTerm.objects.filter(member=member).delete()
+        MemberSearchTerm.objects.bulk_create(
+            MemberSearchService._build_terms(member.pk, document)
+        )
+
+        return index
+
+    @staticmethod
+    def _build_terms(member_pk: int, document: Dict[str, Any]) -> List[MemberSearchTerm]:
+        """تحويل المستند إلى صفوف المصطلحات"""
+        terms = [
+            MemberSearchTerm(member_id=member_pk, kind=MemberSearchTerm.Kind.WORD, term=word)
+            for word in document['words']
+        ]
+        terms.extend(
+            MemberSearchTerm(member_id=member_pk, kind=MemberSearchTerm.Kind.TRIGRAM, term=gram)
+            for gram in document['trigrams']
+        )
+        return terms
+
+    @staticmethod
+    def rebuild_index(
+        queryset: Optional[Iterable[Member]] = None,
+        chunk_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        إعادة بناء الفهرس بالكامل على دفعات
+        """
+        if queryset is None:
+            queryset = Member.objects.all()
+
+        queryset = queryset.select_related('user').order_by('pk')
+
+        indexed = 0
+        last_pk = 0
+        while True:
+            members = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+            if not members:
+                break
+
+            with transaction.atomic():
+                pks = [m.pk for m in members]
+                documents = {m.pk: MemberSearchService.build_document(m) for m in members}
+
+                MemberSearchIndex.objects.filter(member_id__in=pks).delete()
+                MemberSearchTerm.objects.filter(member_id__in=pks).delete()
+
+                MemberSearchIndex.objects.bulk_create([
+                    MemberSearchIndex(
+                        member_id=pk,
+                        membership_number=doc['membership_number'],
+                        full_name=doc['full_name'],
+                        phone=doc['phone'],
+                        search_text=doc['search_text'],
+                        is_active=doc['is_active'],
+                    )
+                    for pk, doc in documents.items()
+                ])
+
+                terms = []
+                for pk, doc in documents.items():
+                    terms.extend(MemberSearchService._build_terms(pk, doc))
+                MemberSearchTerm.objects.bulk_create(terms, batch_size=5000)
+
+            indexed += len(members)
+            last_pk = members[-1].pk
+
+        return {'indexed': indexed}
+
+    @staticmethod
+    def _prefix_q(token: str) -> Q:
+        """شرط البادئة كنطاق قابل لاستخدام الفهرس"""
+        return Q(
+            kind=MemberSearchTerm.Kind.WORD,
+            term__gte=token,
+            term__lt=token + PREFIX_UPPER_BOUND,
+            term__startswith=token
+        )
+
+    @staticmethod
+    def filter_queryset(queryset, query: str, member_field: str = 'pk'):
+        """
+        تصفية أي QuerySet بالبحث بالبادئة في الفهرس (بديل icontains)
+
+        member_field: اسم الحقل الذي يشير إلى العضو (مثل 'member_id' في الحضور)
+        """
+        tokens = search_tokens(query)
+        if not tokens:
+            return queryset
+
+        for token in tokens:
+            matching = MemberSearchTerm.objects.filter(
+                MemberSearchService._prefix_q(token)
+            ).values('member_id')
+            queryset = queryset.filter(**{f'{member_field}__in': matching})
+
+        return queryset
+
+    @staticmethod
+    def _prefix_member_ids(tokens: List[str], limit: int, active_only: bool) -> List[int]:
+        """الأعضاء المطابقون لكل الكلمات بالبادئة"""
+        queryset = MemberSearchService.filter_queryset(
+            MemberSearchIndex.objects.all(),
+            ' '.join(tokens),
+            member_field='member_id'
+        )
+        if active_only:
+            queryset = queryset.filter(is_active=True)
+
+        return list(
+            queryset.order_by('full_name').values_list('member_id', flat=True)[:limit]
+        )
+
+    @staticmethod
+    def _trigram_member_ids(query: str, limit: int, active_only: bool) -> List[int]:
+        """الأعضاء الأقرب بالتشابه الثلاثي (للأخطاء الإملائية والبحث داخل الرقم)"""
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        min_hits = max(1, int(len(grams) * MemberSearchService.TRIGRAM_MIN_SIMILARITY))
+
+        queryset = MemberSearchTerm.objects.filter(
+            kind=MemberSearchTerm.Kind.TRIGRAM,
+            term__in=grams
+        )
+        if active_only:
+            queryset = queryset.filter(member__search_index__is_active=True)
+
+        ranked = queryset.values('member_id').annotate(
+            hits=Count('id')
+        ).filter(
+            hits__gte=min_hits
+        ).order_by('-hits', 'member_id')[:limit]
+
+        return [row['member_id'] for row in ranked]
+
+    @staticmethod
+    def typeahead(
+        query: str,
+        limit: int = 10,
+        active_only: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        البحث الفوري: مطابقة البادئة أولاً ثم التشابه الثلاثي لإكمال النتائج
+        """
+        tokens = search_tokens(query)
+        if not tokens or len(''.join(tokens)) < MemberSearchService.MIN_QUERY_LENGTH:
+            return []
+
+        member_ids = MemberSearchService._prefix_member_ids(tokens, limit, active_only)
+
+        if len(member_ids) < limit:
+            seen = set(member_ids)
+            for member_id in MemberSearchService._trigram_member_ids(query, limit, active_only):
+                if member_id not in seen:
+                    member_ids.append(member_id)
+                    seen.add(member_id)
+                if len(member_ids) >= limit:
+                    break
+
+        rows = MemberSearchIndex.objects.filter(member_id__in=member_ids).values(
+            'member_id', 'membership_number', 'full_name', 'phone', 'is_active'
+        )
+        by_id = {row['member_id']: row for row in rows}
+
+        return [
+            {
+                'id': member_id,
+                'member_id': by_id[member_id]['membership_number'],
+                'name': by_id[member_id]['full_name'],
+                'phone': by_id[member_id]['phone'],
+                'is_active': by_id[member_id]['is_active'],
+            }
+            for member_id in member_ids
+            if member_id in by_id
+        ]
+
+    @staticmethod
+    def set_active(member_ids: Iterable[int], is_active: bool) -> int:
+        """مزامنة حالة النشاط بعد التحديثات الجماعية (queryset.update)"""
+        return MemberSearchIndex.objects.filter(
+            member_id__in=list(member_ids)
+        ).update(is_active=is_active)
+
+
+class MemberService:
+    """أحداث دورة حياة العضو (تُنشر من الواجهات بعد الحفظ بدل post_save)"""
+
+    @staticmethod
+    def saved(member: Member, created: bool, was_active: Optional[bool] = None) -> None:
+        """
+        نشر MemberCreated للعضو الجديد، أو MemberActivationChanged عند تغير is_active
+
+        was_active: الحالة قبل التعديل كما قرأها المستدعي (بدون استعلام إضافي)
+        """
+        if created:
+            EventBus.publish(MemberCreated(member_id=member.pk))
+        elif was_active is not None and was_active != member.is_active:
+            EventBus.publish(MemberActivationChanged(member_id=member.pk, is_active=member.is_active))
+
+
+class MemberScanLookupService:
+    """التعرف الفوري على العضو في أجهزة الدخول (هاتف / رقم عضوية / بطاقة)"""
+
+    # رمز البطاقة المطبوعة: GYM-00042 (رقم العضو الداخلي)
+    CARD_CODE_RE = re.compile(r'^GYM-0*(\d+)$')
+    # رقم العضوية: GYM + السنة + رقم عشوائي
+    MEMBER_ID_RE = re.compile(r'^GYM\d+$')
+    MIN_PHONE_DIGITS = 7
+
+    cache = TwoTierCache(
+        'member-scan',
+        local_maxsize=5000,
+        local_ttl=15,
+        shared_timeout=6 * 60 * 60
+    )
+
+    @staticmethod
+    def parse_code(code: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        تحديد نوع الرمز الممسوح وقيمته الموحدة
+        """
+        raw = normalize_digits(code or '').strip().upper().replace(' ', '')
+        if not raw:
+            return None, None
+
+        match = MemberScanLookupService.CARD_CODE_RE.match(raw)
+        if match:
+            return 'card', match.group(1)
+
+        if MemberScanLookupService.MEMBER_ID_RE.match(raw):
+            return 'member_id', raw
+
+        digits = normalize_phone(raw)
+        if len(digits) >= MemberScanLookupService.MIN_PHONE_DIGITS:
+            return 'phone', min(phone_variants(digits), key=len)
+
+        return None, None
+
+    @staticmethod
+    def resolve(code: str) -> Optional[Dict[str, Any]]:
+        """
+        التعرف على العضو من الرمز الممسوح (بدون قاعدة البيانات في الحالة الشائعة)
+
+        الرمز -> pk العضو (فهرس)، ثم بيانات العضو تحت مفتاح يحمل رقم نسخته؛
+        الإبطال يرفع النسخة فقط فلا تُقرأ البيانات القديمة مهما بقيت في الذاكرة
+        """
+        kind, value = MemberScanLookupService.parse_code(code)
+        if not kind:
+            return None
+
+        cache = MemberScanLookupService.cache
+        index_key = f'{kind}:{value}'
+        if kind == 'card':
+            member_pk = int(value)
+        else:
+            member_pk = cache.get(index_key)
+            if member_pk is None:
+                member_pk = MemberScanLookupService._find(kind, value)
+                if member_pk is None:
+                    return None
+                cache.set(index_key, member_pk)
+
+        # النسخة تُقرأ قبل التحميل: إبطال أثناء التحميل يجعل هذا المفتاح قديماً
+        entry_key = f'member:{member_pk}:{MemberScanLookupService._version(member_pk)}'
+        entry = cache.get(entry_key)
+        if entry is None:
+            entry = MemberScanLookupService._load(member_pk)
+            if entry is None:
+                return None
+            cache.set(entry_key, entry)
+
+        if not MemberScanLookupService._matches(kind, value, entry):
+            # تغير هاتف العضو أو رقمه بعد تسجيل الفهرس: بحث جديد بدون تخزين
+            cache.delete(index_key)
+            member_pk = MemberScanLookupService._find(kind, value)
+            entry = MemberScanLookupService._load(member_pk) if member_pk else None
+            if entry is None:
+                return None
+
+        return MemberScanLookupService._with_live_status(entry)
+
+    @staticmethod
+    def _find(kind: str, value: str) -> Optional[int]:
+        """pk العضو من رقم العضوية أو الهاتف"""
+        if kind == 'card':
+            return int(value)
+
+        queryset = Member.objects.order_by('pk')
+        if kind == 'member_id':
+            queryset = queryset.filter(member_id=value)
+        else:
+            # القيمة الموحدة هي الصيغة المحلية بدون صفر البداية
+            candidates = list(dict.fromkeys(phone_variants(value) + phone_variants(f'0{value}')))
+            candidates += [f'+{candidate}' for candidate in candidates]
+            queryset = queryset.filter(user__phone__in=candidates)
+
+        return queryset.values_list('pk', flat=True).first()
+
+    @staticmethod
+    def _matches(kind: str, value: str, entry: Dict[str, Any]) -> bool:
+        """البيانات المخزنة ما زالت لصاحب الرمز"""
+        if kind == 'member_id':
+            return entry['member_id'] == value
+        if kind == 'phone':
+            return MemberScanLookupService.parse_code(entry['phone']) == (kind, value)
+        return True
+
+    @staticmethod
+    def _load(member_pk: int) -> Optional[Dict[str, Any]]:
+        """تحميل بيانات العضو واشتراكاته النشطة (الحالية والقادمة) من قاعدة البيانات"""
+        from apps.subscriptions.models import Subscription
+
+        member = Member.objects.select_related('user').filter(pk=member_pk).first()
+        if not member:
+            return None
+
+        subscriptions = Subscription.objects.filter(
+            member=member,
+            status=Subscription.Status.ACTIVE,
+            end_date__gte=timezone.localdate()
+        ).select_related('plan').prefetch_related('sports').order_by('start_date', 'end_date')
+
+        return {
+            'member_pk': member.pk,
+            'user_pk': member.user_id,
+            'member_id': member.member_id,
+            'name': member.user.get_full_name(),
+            'phone': member.user.phone,
+            'is_active': member.is_active,
+            # القادمة تُخزن أيضاً حتى تصبح صالحة يوم بدايتها دون إبطال
+            'subscriptions': [
+                {
+                    'id': subscription.pk,
+                    'subscription_number': subscription.subscription_number,
+                    'plan_name': subscription.plan.name,
+                    'start_date': subscription.start_date.isoformat(),
+                    'end_date': subscription.end_date.isoformat(),
+                    'sport_ids': [sport.pk for sport in subscription.sports.all()],
+                }
+                for subscription in subscriptions
+            ],
+        }
+
+    @staticmethod
+    def _version_key(member_pk: int) -> str:
+        return MemberScanLookupService.cache.make_key(f'version:{member_pk}')
+
+    @staticmethod
+    def _version(member_pk: int) -> int:
+        """رقم نسخة بيانات العضو (المحلي قصير الصلاحية ثم المشترك)"""
+        key = MemberScanLookupService._version_key(member_pk)
+        local = MemberScanLookupService.cache.local
+
+        version = local.get(key)
+        if version is None:
+            version = shared_cache.get(key)
+            if version is None:
+                # بداية زمنية: لو حُذف المفتاح لا يعود لرقم قديم له بيانات مخزنة
+                shared_cache.add(key, int(time.time() * 1000), None)
+                version = shared_cache.get(key, 0)
+            local.set(key, version)
+        return version
+
+    @staticmethod
+    def _with_live_status(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """اختيار الاشتراك الساري وقت القراءة (بدأ ولم ينتهِ) - تجنب بيانات ما بعد منتصف الليل"""
+        result = {key: value for key, value in entry.items() if key != 'subscriptions'}
+        today = timezone.localdate().isoformat()
+
+        current = [
+            summary for summary in entry['subscriptions']
+            if summary['start_date'] <= today <= summary['end_date']
+        ]
+        if current:
+            summary = max(current, key=lambda item: item['end_date'])
+            end_date = date.fromisoformat(summary['end_date'])
+            result['subscription'] = dict(
+                summary, days_remaining=(end_date - timezone.localdate()).days
+            )
+            result['can_attend'] = entry['is_active']
+        else:
+            result['subscription'] = None
+            result['can_attend'] = False
+
+        return result
+
+    @staticmethod
+    def invalidate_member(member_pk: int) -> None:
+        """
+        إبطال بيانات المسح للعضو برفع رقم نسخته (عند تعديل العضو أو المستخدم أو الاشتراك)
+        """
+        key = MemberScanLookupService._version_key(member_pk)
+        try:
+            shared_cache.incr(key)
+        except ValueError:
+            shared_cache.set(key, int(time.time() * 1000), None)
+        MemberScanLookupService.cache.local.delete(key)
+
+    @staticmethod
+    def invalidate_on_commit(member_pk: int) -> None:
+        """
+        الإبطال بعد commit (فوراً خارج المعاملات): مسح يقرأ قبل commit لا يخزن
+        الصف القديم تحت النسخة الجديدة
+        """
+        transaction.on_commit(
+            lambda: MemberScanLookupService.invalidate_member(member_pk), robust=True
+        )
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.subscriptions.models import Subscription, SubscriptionPlan
+
+from .models import Member
+from .services import MemberScanLookupService, MemberSearchService
+
+
+def _member(phone='+966501112233', member_id='GYM000042', first_name='سالم'):
+    user = User.objects.create_user(phone=phone, first_name=first_name, last_name='العتيبي')
+    return Member.objects.create(
+        user=user, member_id=member_id, gender='male', date_of_birth='1990-01-01',
+        emergency_contact_name='-', emergency_contact_phone='-'
+    )
+
+
+def _subscribe(member, start, end, number='S1'):
+    plan = SubscriptionPlan.objects.get_or_create(
+        name='شهري', defaults={'duration_type': 'monthly', 'duration_days': 30}
+    )[0]
+    return Subscription.objects.create(
+        member=member, plan=plan, subscription_number=number, start_date=start, end_date=end,
+        original_price=100, final_price=100, status=Subscription.Status.ACTIVE
+    )
+
+
+@pytest.fixture
+def scan_cache():
+    cache.clear()
+    MemberScanLookupService.cache.clear_local()
+    yield MemberScanLookupService
+    cache.clear()
+    MemberScanLookupService.cache.clear_local()
+
+
+@pytest.mark.django_db
+class TestMemberScanLookup:
+    """ذاكرة المسح: نسخة لكل عضو تُرفع بعد commit، والاشتراك القادم لا يسمح بالدخول"""
+
+    def test_future_subscription_cannot_attend(self, scan_cache, django_capture_on_commit_callbacks):
+        today = timezone.localdate()
+        with django_capture_on_commit_callbacks(execute=True):
+            member = _member()
+            _subscribe(member, today + timedelta(days=3), today + timedelta(days=33))
+
+        result = scan_cache.resolve('GYM000042')
+
+        assert result['member_pk'] == member.pk
+        assert result['subscription'] is None
+        assert result['can_attend'] is False
+
+    def test_invalidation_waits_for_commit(self, scan_cache, django_capture_on_commit_callbacks):
+        today = timezone.localdate()
+        with django_capture_on_commit_callbacks(execute=True):
+            member = _member()
+        assert scan_cache.resolve('0501112233')['subscription'] is None
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            _subscribe(member, today, today + timedelta(days=30))
+            # قبل commit: مسح متزامن يرى الصف القديم ولا يُخزن تحت نسخة جديدة
+            assert scan_cache.resolve('0501112233')['subscription'] is None
+        assert callbacks
+
+        result = scan_cache.resolve('0501112233')
+        assert result['subscription']['subscription_number'] == 'S1'
+        assert result['can_attend'] is True
+
+    def test_changed_phone_does_not_resolve_old_code(self, scan_cache, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            member = _member()
+        assert scan_cache.resolve('0501112233')['member_pk'] == member.pk
+
+        with django_capture_on_commit_callbacks(execute=True):
+            member.user.phone = '+966509998877'
+            member.user.save()
+
+        assert scan_cache.resolve('0501112233') is None
+        assert scan_cache.resolve('0509998877')['member_pk'] == member.pk
+
+
+@pytest.mark.django_db
+class TestMemberSearch:
+    """البحث الفوري من فهرس الأعضاء بالاسم والهاتف"""
+
+    @pytest.fixture
+    def members(self):
+        return (
+            _member(),
+            _member(phone='+966557778899', member_id='GYM000043', first_name='خالد'),
+        )
+
+    def test_search_by_name(self, members):
+        results = MemberSearchService.typeahead('سال')
+
+        assert [row['id'] for row in results] == [members[0].pk]
+        assert results[0]['name'] == 'سالم العتيبي'
+
+    def test_search_by_phone(self, members):
+        for query in ('0557778899', '966557778899', '055777'):
+            results = MemberSearchService.typeahead(query)
+
+            assert [row['id'] for row in results] == [members[1].pk], query
+
+    def test_filter_queryset_by_name_and_phone(self, members):
+        queryset = Member.objects.all()
+
+        assert list(MemberSearchService.filter_queryset(queryset, 'سالم 0501112233')) == [members[0]]
+        assert list(MemberSearchService.filter_queryset(queryset, 'خالد 0501112233')) == []
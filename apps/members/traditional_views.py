@@ -2,17 +2,20 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q, Count, Sum, F
+from django.db.models import Count, Sum, F
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
 from datetime import date, timedelta
 
+from .analytics import BodyMetricsService
 from .models import Member, MemberBodyMetrics
 from .forms import MemberForm, MemberBodyMetricsForm, UserProfileForm, MemberSearchForm
+from .services import MemberSearchService, MemberService
 from apps.subscriptions.models import Subscription
 from apps.attendance.models import Attendance
 from apps.payments.models import Payment
+from core.pagination import InvalidCursor, KeysetPaginator
 
 
 @login_required(login_url='login')
@@ -25,12 +28,7 @@ def member_list(request):
     # البحث
     search = request.GET.get('search', '')
     if search:
-        members = members.filter(
-            Q(user__first_name__icontains=search) |
-            Q(user__last_name__icontains=search) |
-            Q(user__phone__icontains=search) |
-            Q(user__email__icontains=search)
-        )
+        members = MemberSearchService.filter_queryset(members, search)
     
     # الفلترة حسب النوع
     gender = request.GET.get('gender', '')
@@ -74,8 +72,8 @@ def member_detail(request, pk):
     
     member = get_object_or_404(Member, pk=pk)
     
-    # آخر القياسات
-    latest_metrics = member.body_metrics.order_by('-date').first()
+    # آخر القياسات (من الذاكرة المؤقتة)
+    latest_metrics = BodyMetricsService.latest(member.pk)
     
     # الاشتراكات النشطة
     active_subscriptions = member.subscriptions.filter(
@@ -84,15 +82,12 @@ def member_detail(request, pk):
     )
     
     # سجل الحضور (آخر 10 جلسات)
-    recent_attendance = member.attendance_set.order_by('-date')[:10]
+    recent_attendance = member.attendances.order_by('-check_in')[:10]
     
     # إحصائيات
     stats = {
-        'total_visits': member.attendance_set.count(),
-        'this_month': member.attendance_set.filter(
-            date__month=timezone.now().month,
-            date__year=timezone.now().year
-        ).count(),
+        'total_visits': member.attendances.count(),
+        'this_month': member.attendances.in_local_month(timezone.localdate()).count(),
         'total_paid': Payment.objects.filter(
             member=member,
             status='COMPLETED'
@@ -134,6 +129,7 @@ def member_create(request):
                     member.user = request.user
                 
                 member.save()
+                MemberService.saved(member, created=True)
                 
                 messages.success(request, f'تم إضافة العضو {member.user.get_full_name()} بنجاح!')
                 return redirect('member_detail', pk=member.pk)
@@ -159,6 +155,7 @@ def member_edit(request, pk):
     """تعديل بيانات العضو"""
     
     member = get_object_or_404(Member, pk=pk)
+    was_active = member.is_active
     
     if request.method == 'POST':
         form = MemberForm(request.POST, instance=member)
@@ -168,6 +165,7 @@ def member_edit(request, pk):
             try:
                 form.save()
                 user_form.save()
+                MemberService.saved(member, created=False, was_active=was_active)
                 messages.success(request, 'تم تحديث بيانات العضو بنجاح!')
                 return redirect('member_detail', pk=member.pk)
             except Exception as e:
@@ -269,31 +267,31 @@ def member_attendance(request, pk):
     """سجل الحضور"""
     
     member = get_object_or_404(Member, pk=pk)
-    attendance = member.attendance_set.select_related('sport').order_by('-date')
+    attendance = member.attendances.select_related('sport')
     
-    # الفلترة
+    # الفلترة (الأيام المحلية بنطاق قابل للفهرسة)
     from_date = request.GET.get('from_date')
     to_date = request.GET.get('to_date')
+    try:
+        attendance = attendance.in_local_range(from_date or None, to_date or None)
+    except ValueError:
+        messages.error(request, 'صيغة التاريخ غير صحيحة (YYYY-MM-DD)')
     
-    if from_date:
-        attendance = attendance.filter(date__gte=from_date)
-    if to_date:
-        attendance = attendance.filter(date__lte=to_date)
-    
-    # Pagination
-    paginator = Paginator(attendance, 20)
-    page = request.GET.get('page', 1)
-    
+    # التصفح بالمؤشر (بدون OFFSET)
+    paginator = KeysetPaginator(attendance, 20, ordering=('-check_in', '-id'))
     try:
-        attendance_page = paginator.page(page)
-    except PageNotAnInteger:
-        attendance_page = paginator.page(1)
-    except EmptyPage:
-        attendance_page = paginator.page(paginator.num_pages)
+        attendance_page = paginator.get_page(request.GET.get('cursor'))
+    except InvalidCursor:
+        attendance_page = paginator.get_page()
+    
+    querystring = request.GET.copy()
+    querystring.pop('cursor', None)
     
     context = {
         'member': member,
         'attendance': attendance_page,
+        'page_obj': attendance_page,
+        'querystring': querystring.urlencode(),
         'from_date': from_date,
         'to_date': to_date,
     }
@@ -366,23 +364,17 @@ def member_search(request):
     
     query = request.GET.get('q', '')
     
-    if len(query) < 2:
+    if len(query) < MemberSearchService.MIN_QUERY_LENGTH:
         return JsonResponse({'results': []})
     
-    members = Member.objects.select_related('user').filter(
-        Q(user__first_name__icontains=query) |
-        Q(user__last_name__icontains=query) |
-        Q(user__phone__icontains=query)
-    )[:10]
-    
     results = [
         {
-            'id': m.pk,
-            'name': m.user.get_full_name(),
-            'phone': m.user.phone,
-            'url': f'/members/{m.pk}/'
+            'id': m['id'],
+            'name': m['name'],
+            'phone': m['phone'],
+            'url': f"/members/{m['id']}/"
         }
-        for m in members
+        for m in MemberSearchService.typeahead(query, limit=10)
     ]
     
     return JsonResponse({'results': results})
@@ -1,8 +1,74 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .analytics import BodyMetricsService
+from .exports import MemberExporter
 from .models import Member
-from .serializers import MemberSerializer
+from .serializers import BodyMetricsQuerySerializer, MemberSerializer
+from .services import MemberSearchService, MemberService
+from core.exports import ExportViewMixin
 
 
-class MemberViewSet(viewsets.ModelViewSet):
+class MemberViewSet(ExportViewMixin, viewsets.ModelViewSet):
     queryset = Member.objects.select_related('user').all()
     serializer_class = MemberSerializer
+    exporter_class = MemberExporter
+    
+    def perform_create(self, serializer):
+        member = serializer.save()
+        MemberService.saved(member, created=True)
+    
+    def perform_update(self, serializer):
+        was_active = serializer.instance.is_active
+        member = serializer.save()
+        MemberService.saved(member, created=False, was_active=was_active)
+    
+    @action(detail=False, methods=['get'])
+    def typeahead(self, request):
+        """البحث الفوري عن الأعضاء (الاستقبال)
+        
+        Parameters:
+        - q: نص البحث (الاسم، الهاتف، البريد، رقم العضوية)
+        - limit (اختياري): عدد النتائج (افتراضي: 10، الحد الأقصى: 50)
+        - active (اختياري): الأعضاء النشطون فقط
+        """
+        query = request.query_params.get('q', '')
+        
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            return Response(
+                {'error': 'عدد النتائج يجب أن يكون رقماً'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        active_only = request.query_params.get('active') in ('1', 'true', 'True')
+        results = MemberSearchService.typeahead(query, limit=limit, active_only=active_only)
+        
+        return Response({
+            'count': len(results),
+            'results': results
+        }, status=status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['get'])
+    def metrics(self, request, pk=None):
+        """سلسلة قياسات الجسم (متوسطات أسبوعية/شهرية، متوسط متحرك، فروق) مع الاتجاه
+        
+        Parameters:
+        - period (اختياري): week أو month (افتراضي: week)
+        - window (اختياري): عدد الفترات في المتوسط المتحرك (افتراضي: 4)
+        """
+        member = self.get_object()
+        query = BodyMetricsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = query.validated_data
+        data = BodyMetricsService.series(member.pk, params['period'], params.get('window'))
+        data['latest'] = BodyMetricsService.latest(member.pk)
+        data['trend'] = BodyMetricsService.trends([member.pk]).get(member.pk)
+        
+        return Response({
+            'message': 'قياسات الجسم',
+            'data': data
+        }, status=status.HTTP_200_OK)
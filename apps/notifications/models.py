@@ -78,6 +78,14 @@ class Notification(models.Model):
         verbose_name = 'إشعار'
         verbose_name_plural = 'الإشعارات'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_user_idx'),
+            # غير المقروءة (العداد والقائمة)
+            models.Index(
+                fields=['user', '-created_at'], name='notification_unread_idx',
+                condition=models.Q(is_read=False)
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user} - {self.title}"
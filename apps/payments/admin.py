@@ -6,7 +6,9 @@ from django.db.models import Sum, Q
 from datetime import timedelta
 from django.utils import timezone
 
+from .exports import PaymentExporter
 from .models import Payment, Invoice, Installment
+from core.exports import ExportAdminMixin
 
 
 class InstallmentInline(admin.TabularInline):
@@ -48,7 +50,7 @@ class InvoiceInline(admin.StackedInline):
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(ExportAdminMixin, admin.ModelAdmin):
     """لوحة إدارة المدفوعات والدفعات"""
     
     list_display = [
@@ -246,8 +248,10 @@ class PaymentAdmin(admin.ModelAdmin):
     
     actions = [
         'mark_as_completed', 'mark_as_pending',
-        'mark_as_partial', 'generate_invoices'
+        'mark_as_partial', 'generate_invoices',
+        'export_csv', 'export_xlsx'
     ]
+    exporter_class = PaymentExporter
     
     @admin.action(description=_('✓ تحديد كمكتمل'))
     def mark_as_completed(self, request, queryset):
@@ -9,5 +9,5 @@ class PaymentsConfig(AppConfig):
     verbose_name = 'المدفوعات'
     
     def ready(self):
-        """استدعاء الإشارات عند تحميل التطبيق"""
-        import apps.payments.signals  # noqa
+        """استدعاء معالجات الأحداث عند تحميل التطبيق"""
+        import apps.payments.handlers  # noqa
@@ -0,0 +1,32 @@
+from core.events import DomainEvent
+
+
+class PaymentRecorded(DomainEvent):
+    """تسجيل دفعة جديدة بحالتها بعد المعاملة"""
+
+    name = 'payments.payment_recorded'
+    fields = ('payment_id', 'status')
+
+    def coalesce_key(self):
+        return ('payments.payment', self.payment_id)
+
+    def merge(self, later):
+        # الدفعة النقدية تُسجل وتكتمل في نفس المعاملة: إشعار واحد بالحالة النهائية
+        return PaymentRecorded(payment_id=self.payment_id, status=later.status)
+
+
+class PaymentStatusChanged(DomainEvent):
+    """تغير حالة دفعة (إكمال، استرداد...)"""
+
+    name = 'payments.status_changed'
+    fields = ('payment_id', 'old_status', 'status')
+
+    def coalesce_key(self):
+        return ('payments.payment', self.payment_id)
+
+    def merge(self, later):
+        if isinstance(later, PaymentStatusChanged):
+            return PaymentStatusChanged(
+                payment_id=self.payment_id, old_status=self.old_status, status=later.status
+            )
+        return later
@@ -0,0 +1,27 @@
+from core.exports import EMPTY, Column, Exporter, choice_display, local_datetime
+from core.serializers import full_name
+
+from .models import Payment
+
+
+class PaymentExporter(Exporter):
+    """تصدير الدفعات"""
+
+    filename = 'payments'
+    columns = (
+        Column('رقم العملية', 'payment_number'),
+        Column('العضو', 'member__user__first_name', 'member__user__last_name', format=full_name),
+        Column('الهاتف', 'member__user__phone'),
+        Column('الاشتراك', 'subscription__subscription_number', empty=EMPTY),
+        Column('نوع الدفع', 'payment_type', format=choice_display(Payment, 'payment_type')),
+        Column('طريقة الدفع', 'payment_method', format=choice_display(Payment, 'payment_method')),
+        Column('الحالة', 'status', format=choice_display(Payment, 'status')),
+        Column('المبلغ', 'amount'),
+        Column('الخصم', 'discount'),
+        Column('الضريبة', 'tax'),
+        Column('الإجمالي', 'total'),
+        Column('المدفوع', 'amount_paid'),
+        Column('المتبقي', 'amount_remaining'),
+        Column('رقم الإيصال', 'receipt_number', empty=EMPTY),
+        Column('التاريخ', 'created_at', format=local_datetime('%H:%M %d-%m-%Y')),
+    )
@@ -0,0 +1,56 @@
+import logging
+
+from core.events import EventBus
+from .events import PaymentRecorded, PaymentStatusChanged
+
+logger = logging.getLogger(__name__)
+
+
+RECORDED_LABELS = {
+    'completed': 'تم استقبالها',
+    'pending': 'قيد الانتظار',
+    'partial': 'تم استقبال جزء منها',
+    'failed': 'فشلت',
+    'refunded': 'تم استرجاعها'
+}
+
+STATUS_MESSAGES = {
+    'completed': ('تم استقبال الدفعة ✓', 'تم استقبال دفعتك بنجاح'),
+    'failed': ('فشلت الدفعة ✗', 'فشل معالجة دفعتك. يرجى المحاولة مرة أخرى'),
+    'refunded': ('تم استرجاع المبلغ', 'تم استرجاع مبلغ الدفعة إلى حسابك'),
+}
+
+
+@EventBus.subscribe(PaymentRecorded, background=True)
+def send_payment_notification(event):
+    """إشعار بالدفعة الجديدة"""
+    from apps.notifications.models import Notification
+    from .models import Payment
+    
+    payment = Payment.objects.select_related('member').get(pk=event.payment_id)
+    status_label = RECORDED_LABELS.get(event.status, 'مسجلة')
+    
+    Notification.objects.create(
+        user_id=payment.member.user_id,
+        title=f"دفعة {status_label} ✓",
+        body=f"تم تسجيل دفعة بقيمة {payment.total} ر.س ({payment.get_payment_type_display()})"
+    )
+    
+    logger.info(f"تم إرسال إشعار دفعة للعضو {payment.member.member_id}")
+
+
+@EventBus.subscribe(PaymentStatusChanged, background=True)
+def send_payment_status_notification(event):
+    """إشعار بتغير حالة الدفعة"""
+    from apps.notifications.models import Notification
+    from .models import Payment
+    
+    if event.status == event.old_status or event.status not in STATUS_MESSAGES:
+        return
+    
+    payment = Payment.objects.select_related('member').get(pk=event.payment_id)
+    title, body = STATUS_MESSAGES[event.status]
+    
+    Notification.objects.create(user_id=payment.member.user_id, title=title, body=body)
+    
+    logger.info(f"تم إرسال إشعار تغيير حالة دفعة للعضو {payment.member.member_id}")
@@ -0,0 +1,75 @@
+from django.db.models import F
+from django.utils import timezone
+
+from apps.members.models import Member
+from apps.subscriptions.models import Subscription
+from core.imports import Importer, to_choice, to_datetime, to_decimal, value
+
+from .models import Payment
+
+
+class PaymentImporter(Importer):
+    """
+    استيراد المدفوعات
+
+    الأعمدة: member_id*, subscription_number, payment_number, payment_type*, payment_method*,
+    status, amount*, discount, tax, total, amount_paid, transaction_id, receipt_number,
+    notes, created_at
+    """
+
+    name = 'payments'
+    model = Payment
+    key_field = 'payment_number'
+    number_prefix = 'PAY'
+
+    def prepare(self):
+        self.members = self.session.key_map(Member, 'member_id')
+        self.subscriptions = self.session.key_map(Subscription, 'subscription_number')
+
+    def build(self, row):
+        subscription = value(row, 'subscription_number')
+        amount = to_decimal(row, 'amount', required=True)
+        discount = to_decimal(row, 'discount')
+        tax = to_decimal(row, 'tax')
+        total = to_decimal(row, 'total', default=amount - discount + tax)
+        status = to_choice(row, 'status', Payment, default=Payment.PaymentStatus.COMPLETED)
+        amount_paid = to_decimal(
+            row, 'amount_paid',
+            default=total if status == Payment.PaymentStatus.COMPLETED else 0
+        )
+
+        # amount_remaining يُحسب في finalize بتحديث واحد (بدل Payment.save لكل صف)
+        return Payment(
+            payment_number=self.key_value(row),
+            member_id=self.members.get(value(row, 'member_id', required=True), 'العضو'),
+            subscription_id=self.subscriptions.get(subscription, 'الاشتراك') if subscription else None,
+            payment_type=to_choice(row, 'payment_type', Payment),
+            payment_method=to_choice(row, 'payment_method', Payment),
+            status=status,
+            amount=amount,
+            discount=discount,
+            tax=tax,
+            total=total,
+            amount_paid=amount_paid,
+            transaction_id=value(row, 'transaction_id'),
+            receipt_number=value(row, 'receipt_number'),
+            notes=value(row, 'notes'),
+            created_at=to_datetime(row, 'created_at', default=timezone.now()),
+        )
+
+    def finalize(self):
+        self.session.defer('payments.balances', update_payment_balances)
+        self.session.defer('dashboard.snapshot', refresh_dashboard)
+
+
+def update_payment_balances():
+    """المتبقي = الإجمالي - المدفوع لكل الدفعات غير المتطابقة (تحديث واحد)"""
+    return Payment.objects.exclude(
+        amount_remaining=F('total') - F('amount_paid')
+    ).update(amount_remaining=F('total') - F('amount_paid'))
+
+
+def refresh_dashboard():
+    from apps.dashboard.services import DashboardSnapshotService
+
+    DashboardSnapshotService.refresh()
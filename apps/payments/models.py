@@ -2,6 +2,11 @@ from django.db import models
 from apps.members.models import Member
 from apps.subscriptions.models import Subscription
 from apps.accounts.models import User
+from core.dates import LocalDateQuerySetMixin
+
+
+class PaymentQuerySet(LocalDateQuerySetMixin, models.QuerySet):
+    local_date_field = 'created_at'
 
 
 class Payment(models.Model):
@@ -79,10 +84,17 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PaymentQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'دفعة'
         verbose_name_plural = 'المدفوعات'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='payment_status_created_idx'),
+            # فترات بدون حالة (قوائم وتقارير الفترة)
+            models.Index(fields=['created_at'], name='payment_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.payment_number} - {self.member} - {self.total}"
@@ -169,6 +181,13 @@ class Installment(models.Model):
         verbose_name_plural = 'الأقساط'
         ordering = ['payment', 'installment_number']
         unique_together = ['payment', 'installment_number']
+        indexes = [
+            # الأقساط المتأخرة (غير المدفوعة فقط)
+            models.Index(
+                fields=['due_date'], name='installment_unpaid_due_idx',
+                condition=models.Q(is_paid=False)
+            ),
+        ]
     
     def __str__(self):
         return f"قسط {self.installment_number} - {self.payment}"
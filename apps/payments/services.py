@@ -7,6 +7,8 @@ from django.core.exceptions import ValidationError
 
 from apps.members.models import Member
 from apps.subscriptions.models import Subscription
+from core.events import EventBus
+from .events import PaymentRecorded, PaymentStatusChanged
 from .models import Payment, Invoice, Installment
 
 
@@ -44,6 +46,7 @@ class PaymentService:
             processed_by=processed_by,
             notes=notes
         )
+        EventBus.publish(PaymentRecorded(payment_id=payment.pk, status=payment.status))
         
         # إذا كان الدفع نقدي، نعتبره مكتملاً مباشرة
         if payment_method == 'cash':
@@ -63,6 +66,7 @@ class PaymentService:
         if payment.status == Payment.PaymentStatus.COMPLETED:
             raise ValidationError("هذه الدفعة مكتملة بالفعل")
         
+        old_status = payment.status
         payment.status = Payment.PaymentStatus.COMPLETED
         payment.amount_paid = payment.total
         payment.amount_remaining = Decimal('0.00')
@@ -72,8 +76,26 @@ class PaymentService:
         # إنشاء الفاتورة
         PaymentService.create_invoice(payment)
         
+        EventBus.publish(PaymentStatusChanged(
+            payment_id=payment.pk, old_status=old_status, status=payment.status
+        ))
+        
         return payment
     
+    @staticmethod
+    def saved(payment: Payment, created: bool, old_status: Optional[str] = None) -> None:
+        """
+        نشر أحداث الدفعة بعد الحفظ المباشر من الواجهات (API / النموذج) بدل post_save
+
+        old_status: الحالة قبل التعديل كما قرأها المستدعي (بدون استعلام إضافي)
+        """
+        if created:
+            EventBus.publish(PaymentRecorded(payment_id=payment.pk, status=payment.status))
+        elif old_status is not None and old_status != payment.status:
+            EventBus.publish(PaymentStatusChanged(
+                payment_id=payment.pk, old_status=old_status, status=payment.status
+            ))
+    
     @staticmethod
     def create_invoice(payment: Payment) -> Invoice:
         """
@@ -135,6 +157,7 @@ class PaymentService:
             amount_paid=first_payment_amount,
             amount_remaining=total - first_payment_amount
         )
+        EventBus.publish(PaymentRecorded(payment_id=payment.pk, status=payment.status))
         
         # حساب قيمة كل قسط
         remaining_after_first = total - first_payment_amount
@@ -186,12 +209,18 @@ class PaymentService:
         payment.amount_remaining -= installment.amount
         
         # التحقق من اكتمال جميع الأقساط
+        old_status = payment.status
         unpaid_installments = payment.installments.filter(is_paid=False)
         if not unpaid_installments.exists():
             payment.status = Payment.PaymentStatus.COMPLETED
         
         payment.save()
         
+        if payment.status != old_status:
+            EventBus.publish(PaymentStatusChanged(
+                payment_id=payment.pk, old_status=old_status, status=payment.status
+            ))
+        
         return installment
     
     @staticmethod
@@ -213,10 +242,15 @@ class PaymentService:
             raise ValidationError("مبلغ الاسترداد أكبر من المبلغ المدفوع")
         
         # إنشاء سجل الاسترداد (يمكن إنشاء نموذج Refund منفصل)
+        old_status = payment.status
         payment.status = Payment.PaymentStatus.REFUNDED
         payment.notes = f"{payment.notes}\n\nاسترداد: {refund_amount} - السبب: {reason}"
         payment.save()
         
+        EventBus.publish(PaymentStatusChanged(
+            payment_id=payment.pk, old_status=old_status, status=payment.status
+        ))
+        
         return payment
     
     @staticmethod
@@ -257,12 +291,7 @@ class PaymentService:
         
         queryset = Payment.objects.filter(
             status=Payment.PaymentStatus.COMPLETED
-        )
-        
-        if start_date:
-            queryset = queryset.filter(created_at__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(created_at__date__lte=end_date)
+        ).in_local_range(start_date, end_date)
         
         stats = queryset.aggregate(
             total_revenue=Sum('total'),
@@ -295,13 +324,12 @@ class PaymentService:
         إيرادات اليوم
         """
         if not date_obj:
-            date_obj = timezone.now().date()
+            date_obj = timezone.localdate()
         
         from django.db.models import Sum
         
         total = Payment.objects.filter(
-            status=Payment.PaymentStatus.COMPLETED,
-            created_at__date=date_obj
-        ).aggregate(total=Sum('total'))['total']
+            status=Payment.PaymentStatus.COMPLETED
+        ).on_local_date(date_obj).aggregate(total=Sum('total'))['total']
         
         return total or Decimal('0.00')
@@ -10,13 +10,15 @@ from datetime import timedelta
 
 from apps.payments.models import Payment, Invoice, InstallmentPlan
 from apps.members.models import Member
+from core.pagination import InvalidCursor, KeysetPaginator
 from .forms import PaymentForm, PaymentSearchForm, InvoiceForm, InstallmentPlanForm
+from .services import PaymentService
 
 
 @login_required(login_url='login')
 def payment_list(request):
     """عرض قائمة المدفوعات مع الفلترة والبحث"""
-    payments = Payment.objects.select_related('member__user').all().order_by('-created_at')
+    payments = Payment.objects.select_related('member__user').all()
     
     # البحث والفلترة
     search = request.GET.get('search', '')
@@ -37,24 +39,30 @@ def payment_list(request):
     if payment_method:
         payments = payments.filter(payment_method=payment_method)
     
-    if date_from:
-        payments = payments.filter(created_at__date__gte=date_from)
-    
-    if date_to:
-        payments = payments.filter(created_at__date__lte=date_to)
+    if date_from or date_to:
+        payments = payments.in_local_range(date_from or None, date_to or None)
     
     # الإحصائيات
     total_amount = payments.aggregate(Sum('amount'))['amount__sum'] or 0
     
-    # التصفح
-    paginator = Paginator(payments, 15)
-    page = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page)
+    # التصفح بالمؤشر (بدون OFFSET) مع عدد تقديري
+    paginator = KeysetPaginator(
+        payments, 15, ordering=('-created_at', '-id'), count_mode='estimate'
+    )
+    try:
+        page_obj = paginator.get_page(request.GET.get('cursor'))
+    except InvalidCursor:
+        page_obj = paginator.get_page()
     
     form = PaymentSearchForm(request.GET)
     
+    querystring = request.GET.copy()
+    querystring.pop('cursor', None)
+    
     context = {
         'payments': page_obj,
+        'page_obj': page_obj,
+        'querystring': querystring.urlencode(),
         'form': form,
         'total_count': paginator.count,
         'total_amount': total_amount
@@ -70,6 +78,7 @@ def payment_create(request):
         form = PaymentForm(request.POST)
         if form.is_valid():
             payment = form.save()
+            PaymentService.saved(payment, created=True)
             messages.success(request, 'تم تسجيل الدفعة بنجاح')
             return redirect('payments:detail', pk=payment.pk)
     else:
@@ -219,7 +228,7 @@ def installment_detail(request, pk):
 def payment_stats(request):
     """إحصائيات المدفوعات"""
     period = request.GET.get('period', 'month')
-    today = timezone.now().date()
+    today = timezone.localdate()
     
     # حساب الفترة الزمنية
     if period == 'week':
@@ -230,9 +239,7 @@ def payment_stats(request):
         date_from = today - timedelta(days=30)
     
     # الاستعلام
-    payments = Payment.objects.filter(
-        created_at__date__gte=date_from
-    )
+    payments = Payment.objects.in_local_range(date_from)
     
     # الإحصائيات
     stats = {
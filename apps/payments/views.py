@@ -1,4 +1,7 @@
 from rest_framework import viewsets
+from core.exports import ExportViewMixin
+from core.pagination import KeysetPagination
+from .exports import PaymentExporter
 from .models import Payment, Invoice, Installment, InstallmentPlan
 from .serializers import (
     PaymentSerializer,
@@ -6,11 +9,24 @@ from .serializers import (
     InstallmentSerializer,
     InstallmentPlanSerializer,
 )
+from .services import PaymentService
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(ExportViewMixin, viewsets.ModelViewSet):
     queryset = Payment.objects.select_related('member', 'subscription').all()
     serializer_class = PaymentSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
+    exporter_class = PaymentExporter
+
+    def perform_create(self, serializer):
+        payment = serializer.save()
+        PaymentService.saved(payment, created=True)
+
+    def perform_update(self, serializer):
+        old_status = serializer.instance.status
+        payment = serializer.save()
+        PaymentService.saved(payment, created=False, old_status=old_status)
 
 
 class InvoiceViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,320 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core import refdata
+from .services import get_config
+
+
+DIMENSIONS = {
+    'join': 'شهر الانضمام',
+    'plan': 'الخطة',
+    'sport': 'الرياضة',
+}
+
+# اشتراكات لا تُحسب نشاطاً (لم تبدأ أو أُلغيت)
+INACTIVE_STATUSES = ('pending', 'cancelled')
+
+
+def _days(values) -> np.ndarray:
+    """تواريخ بايثون -> أيام منذ 1970 (int64)"""
+    return np.array(values, dtype='datetime64[D]').astype(np.int64)
+
+
+def _months(days: np.ndarray) -> np.ndarray:
+    """أيام منذ 1970 -> أشهر منذ 1970"""
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def _month_label(month: int) -> str:
+    return str(np.datetime64(int(month), 'M'))
+
+
+class RetentionAnalytics:
+    """
+    تحليلات الاحتفاظ والتسرب بمصفوفات NumPy
+
+    - تحميل مضغوط: بضعة استعلامات values_list (أعضاء، اشتراكات، رياضات، حضور)
+    - مصفوفة النشاط (عضو × شهر) تُبنى بمصفوفة فروق + cumsum بدون حلقات لكل عضو
+    - النتائج تُخزن في الذاكرة المؤقتة لليوم الحالي
+    """
+
+    CACHE_KEY = 'reports:analytics:{}:{}:{}'
+
+    @staticmethod
+    def _load(months: int, today: date) -> Dict[str, Any]:
+        from apps.attendance.models import Attendance
+        from apps.members.models import Member
+        from apps.subscriptions.models import Subscription
+
+        first_month = int(_months(_days([today.replace(day=1)]))[0]) - (months - 1)
+        window_start = np.datetime64(first_month, 'M').astype('datetime64[D]').item()
+        # 90 يوماً على الأقل لحساب تراجع الزيارات
+        visits_start = min(window_start, today - timedelta(days=90))
+
+        member_rows = list(Member.objects.order_by('id').values_list('id', 'join_date', 'is_active'))
+        member_ids = np.array([row[0] for row in member_rows], dtype=np.int64)
+        join_days = _days([row[1] for row in member_rows])
+        is_active = np.array([row[2] for row in member_rows], dtype=bool)
+
+        sub_rows = list(
+            Subscription.objects.exclude(status__in=INACTIVE_STATUSES)
+            .order_by('member_id', 'start_date', 'id')
+            .values_list('id', 'member_id', 'plan_id', 'start_date', 'end_date')
+        )
+        sub_ids = np.array([row[0] for row in sub_rows], dtype=np.int64)
+        sub_member = np.searchsorted(member_ids, np.array([row[1] for row in sub_rows], dtype=np.int64))
+        sub_plan = np.array([row[2] for row in sub_rows], dtype=np.int64)
+        sub_start = _days([row[3] for row in sub_rows])
+        sub_end = _days([row[4] for row in sub_rows])
+
+        sport_rows = list(
+            Subscription.sports.through.objects.exclude(subscription__status__in=INACTIVE_STATUSES)
+            .order_by('subscription_id', 'sport_id')
+            .values_list('subscription_id', 'sport_id')
+        )
+        # أول رياضة لكل اشتراك
+        sub_sport = np.full(len(sub_ids), -1, dtype=np.int64)
+        if sport_rows:
+            pairs = np.array(sport_rows, dtype=np.int64)
+            _, first = np.unique(pairs[:, 0], return_index=True)
+            by_id = np.argsort(sub_ids)
+            sub_sport[by_id[np.searchsorted(sub_ids[by_id], pairs[first, 0])]] = pairs[first, 1]
+
+        attendance_rows = list(
+            Attendance.objects.in_local_range(visits_start).values_list('member_id', TruncDate('check_in'))
+        )
+        visit_member = np.searchsorted(
+            member_ids, np.array([row[0] for row in attendance_rows], dtype=np.int64)
+        )
+        visit_day = _days([row[1] for row in attendance_rows])
+
+        return {
+            'today': int(_days([today])[0]),
+            'first_month': first_month,
+            'months': months,
+            'member_ids': member_ids,
+            'join_days': join_days,
+            'is_active': is_active,
+            'sub_member': sub_member,
+            'sub_plan': sub_plan,
+            'sub_sport': sub_sport,
+            'sub_start': sub_start,
+            'sub_end': sub_end,
+            'visit_member': visit_member,
+            'visit_day': visit_day,
+            'plan_names': refdata.plans.values_map('name'),
+            'sport_names': refdata.sports.values_map('name'),
+        }
+
+    @staticmethod
+    def activity_matrix(data) -> np.ndarray:
+        """(عضو × شهر) True إذا غطى اشتراك أي يوم من الشهر"""
+        n_members, n_months = len(data['member_ids']), data['months']
+        start = _months(data['sub_start']) - data['first_month']
+        end = _months(data['sub_end']) - data['first_month']
+        keep = (end >= 0) & (start < n_months)
+
+        rows = data['sub_member'][keep]
+        diff = np.zeros((n_members, n_months + 1), dtype=np.int32)
+        np.add.at(diff, (rows, np.clip(start[keep], 0, n_months)), 1)
+        np.add.at(diff, (rows, np.clip(end[keep], -1, n_months - 1) + 1), -1)
+        return np.cumsum(diff[:, :-1], axis=1) > 0
+
+    @staticmethod
+    def _renewed(data) -> np.ndarray:
+        """لكل اشتراك: هل للعضو اشتراك لاحق (الاشتراكات مرتبة حسب العضو ثم البداية)"""
+        renewed = np.zeros(len(data['sub_member']), dtype=bool)
+        if len(renewed) > 1:
+            renewed[:-1] = (
+                (data['sub_member'][1:] == data['sub_member'][:-1])
+                & (data['sub_start'][1:] > data['sub_start'][:-1])
+            )
+        return renewed
+
+    @staticmethod
+    def _member_keys(data, dimension) -> tuple:
+        """مفتاح المجموعة لكل عضو (-1 = بدون مجموعة) مع دالة العنوان"""
+        n_members = len(data['member_ids'])
+        if dimension == 'join':
+            return _months(data['join_days']), _month_label
+
+        column = data['sub_plan'] if dimension == 'plan' else data['sub_sport']
+        names = data['plan_names'] if dimension == 'plan' else data['sport_names']
+        keys = np.full(n_members, -1, dtype=np.int64)
+        # الاشتراك الأول لكل عضو (مرتبة حسب العضو ثم البداية)
+        members, first = np.unique(data['sub_member'], return_index=True)
+        keys[members] = column[first]
+        return keys, lambda key: names.get(int(key), str(key))
+
+    @staticmethod
+    def compute_cohorts(data, dimension='join') -> Dict[str, Any]:
+        """
+        مصفوفة الاحتفاظ: نسبة أعضاء كل مجموعة النشطين بعد k شهر من الانضمام
+
+        تشمل الأعضاء المنضمين داخل النافذة فقط؛ الخلايا غير المرصودة بعد = None
+        """
+        n_months = data['months']
+        active = RetentionAnalytics.activity_matrix(data)
+        join_offset = _months(data['join_days']) - data['first_month']
+        keys, label = RetentionAnalytics._member_keys(data, dimension)
+
+        members = np.flatnonzero((join_offset >= 0) & (keys >= 0))
+        cohort_keys, codes = np.unique(keys[members], return_inverse=True)
+        codes = codes.reshape(-1)
+
+        offsets = join_offset[members, None] + np.arange(n_months)
+        observed = offsets < n_months
+        retained = active[members[:, None], np.minimum(offsets, n_months - 1)] & observed
+
+        sizes = np.bincount(codes, minlength=len(cohort_keys))
+        retained_n = np.zeros((len(cohort_keys), n_months), dtype=np.int64)
+        observed_n = np.zeros((len(cohort_keys), n_months), dtype=np.int64)
+        np.add.at(retained_n, codes, retained)
+        np.add.at(observed_n, codes, observed)
+        rates = np.divide(
+            retained_n * 100.0, observed_n,
+            out=np.full(retained_n.shape, np.nan), where=observed_n > 0
+        )
+
+        # نسبة التجديد للاشتراكات المنتهية حسب مجموعة العضو
+        renewed = RetentionAnalytics._renewed(data)
+        ended = data['sub_end'] < data['today']
+        member_code = np.full(len(data['member_ids']), -1, dtype=np.int64)
+        member_code[members] = codes
+        sub_code = member_code[data['sub_member']]
+        counted = ended & (sub_code >= 0)
+        ended_n = np.bincount(sub_code[counted], minlength=len(cohort_keys))
+        renewed_n = np.bincount(sub_code[counted & renewed], minlength=len(cohort_keys))
+
+        cohorts = []
+        for index, key in enumerate(cohort_keys):
+            cohorts.append({
+                'key': int(key),
+                'label': label(key),
+                'size': int(sizes[index]),
+                'retention': [None if np.isnan(v) else round(float(v), 1) for v in rates[index]],
+                'renewal_rate': round(float(renewed_n[index]) * 100 / ended_n[index], 1) if ended_n[index] else None,
+            })
+
+        total_ended = int(ended.sum())
+        return {
+            'dimension': dimension,
+            'dimension_label': DIMENSIONS[dimension],
+            'months_since_join': list(range(n_months)),
+            'window_start': _month_label(data['first_month']),
+            'cohorts': cohorts,
+            'renewal_rate': round(float((renewed & ended).sum()) * 100 / total_ended, 1) if total_ended else None,
+        }
+
+    @staticmethod
+    def compute_churn(data) -> Dict[str, Any]:
+        """
+        خطر التسرب (0..1) للأعضاء النشطين ذوي الاشتراك الساري
+
+        0.5 × الانقطاع عن الحضور + 0.3 × تراجع الزيارات + 0.2 × قرب الانتهاء بدون تجديد
+        """
+        config = get_config()
+        today = data['today']
+        n_members = len(data['member_ids'])
+        visit_member, visit_day = data['visit_member'], data['visit_day']
+
+        # آخر زيارة وأطول انقطاع
+        last_visit = np.full(n_members, -1, dtype=np.int64)
+        np.maximum.at(last_visit, visit_member, visit_day)
+        since_join = today - data['join_days']
+        days_since = np.where(last_visit >= 0, today - last_visit, np.minimum(since_join, 90))
+
+        longest_gap = np.zeros(n_members, dtype=np.int64)
+        if len(visit_day) > 1:
+            order = np.lexsort((visit_day, visit_member))
+            members, days = visit_member[order], visit_day[order]
+            same = members[1:] == members[:-1]
+            np.maximum.at(longest_gap, members[1:][same], (days[1:] - days[:-1])[same])
+        longest_gap = np.maximum(longest_gap, np.where(last_visit >= 0, days_since, 0))
+
+        recent = np.bincount(visit_member[visit_day > today - 30], minlength=n_members)
+        previous = np.bincount(
+            visit_member[(visit_day <= today - 30) & (visit_day > today - 90)], minlength=n_members
+        ) / 2.0
+        decline = np.clip(
+            np.divide(previous - recent, previous, out=np.zeros(n_members), where=previous > 0), 0, 1
+        )
+
+        # الاشتراك الساري وآخر تاريخ انتهاء لكل عضو
+        current = (data['sub_start'] <= today) & (data['sub_end'] >= today)
+        has_current = np.zeros(n_members, dtype=bool)
+        has_current[data['sub_member'][current]] = True
+        latest_end = np.full(n_members, np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(latest_end, data['sub_member'], data['sub_end'])
+        ending = (latest_end - today <= 14).astype(float)
+
+        inactivity = np.clip(days_since / (2.0 * config['CHURN_INACTIVE_DAYS']), 0, 1)
+        scores = np.round(0.5 * inactivity + 0.3 * decline + 0.2 * ending, 3)
+
+        eligible = data['is_active'] & has_current
+        return {
+            'member_ids': data['member_ids'][eligible],
+            'scores': scores[eligible],
+            'days_since_visit': days_since[eligible],
+            'longest_gap': longest_gap[eligible],
+            'recent_visits': recent[eligible],
+        }
+
+    @staticmethod
+    def _cached(kind, months, compute, refresh=False):
+        today = timezone.localdate()
+        key = RetentionAnalytics.CACHE_KEY.format(kind, months, today.isoformat())
+        if not refresh:
+            result = cache.get(key)
+            if result is not None:
+                return result
+        result = compute(RetentionAnalytics._load(months, today))
+        result['computed_at'] = timezone.now()
+        cache.set(key, result, get_config()['ANALYTICS_TIMEOUT'])
+        return result
+
+    @staticmethod
+    def cohorts(dimension='join', months: Optional[int] = None, refresh=False) -> Dict[str, Any]:
+        """مصفوفة الاحتفاظ لمجموعات شهر الانضمام أو الخطة أو الرياضة"""
+        months = months or get_config()['COHORT_MONTHS']
+        return RetentionAnalytics._cached(
+            f'cohorts-{dimension}', months,
+            lambda data: RetentionAnalytics.compute_cohorts(data, dimension), refresh
+        )
+
+    @staticmethod
+    def churn(refresh=False) -> Dict[str, Any]:
+        return RetentionAnalytics._cached(
+            'churn', 3, RetentionAnalytics.compute_churn, refresh
+        )
+
+    @staticmethod
+    def at_risk(threshold: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """الأعضاء الأعلى خطراً (مرتبة تنازلياً)"""
+        threshold = get_config()['CHURN_RISK_THRESHOLD'] if threshold is None else threshold
+        churn = RetentionAnalytics.churn()
+        indexes = np.flatnonzero(churn['scores'] >= threshold)
+        indexes = indexes[np.argsort(-churn['scores'][indexes], kind='stable')][:limit]
+        return [
+            {
+                'member_id': int(churn['member_ids'][i]),
+                'score': float(churn['scores'][i]),
+                'days_since_visit': int(churn['days_since_visit'][i]),
+                'longest_gap': int(churn['longest_gap'][i]),
+                'recent_visits': int(churn['recent_visits'][i]),
+            }
+            for i in indexes
+        ]
+
+    @staticmethod
+    def refresh() -> Dict[str, int]:
+        """إعادة حساب كل المصفوفات (المهمة الليلية)"""
+        for dimension in DIMENSIONS:
+            RetentionAnalytics.cohorts(dimension, refresh=True)
+        churn = RetentionAnalytics.churn(refresh=True)
+        return {'members_scored': len(churn['member_ids'])}
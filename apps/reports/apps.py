@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class ReportsConfig(AppConfig):
+    """تكوين تطبيق التقارير"""
+    
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.reports'
+    verbose_name = 'التقارير'
+    
+    def ready(self):
+        """تسجيل تعريفات التقارير"""
+        import apps.reports.definitions  # noqa
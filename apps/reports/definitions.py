@@ -0,0 +1,158 @@
+from django.db.models import CharField, Count, Exists, OuterRef, Q, Sum, Value
+from django.db.models.functions import (
+    Concat, ExtractHour, ExtractWeekDay, TruncDate, TruncMonth
+)
+
+from apps.attendance.models import Attendance
+from apps.payments.models import Payment
+from apps.subscriptions.models import Subscription
+from apps.trainers.models import Session
+
+from .services import Derived, Dimension, Filter, Measure, ReportDefinition, ratio
+
+
+def _full_name(prefix):
+    return Concat(
+        f'{prefix}__first_name', Value(' '), f'{prefix}__last_name', output_field=CharField()
+    )
+
+
+class FinancialReport(ReportDefinition):
+    """الإيرادات حسب اليوم/الشهر ونوع وطريقة الدفع"""
+
+    name = 'financial'
+    title = 'التقرير المالي'
+    model = Payment
+    date_field = 'created_at'
+    default_group_by = ('day',)
+
+    dimensions = {
+        'day': Dimension('اليوم', TruncDate('created_at')),
+        'month': Dimension('الشهر', TruncMonth('created_at')),
+        'payment_type': Dimension('نوع الدفع', 'payment_type', choices=Payment.PaymentType.choices),
+        'payment_method': Dimension('طريقة الدفع', 'payment_method', choices=Payment.PaymentMethod.choices),
+        'status': Dimension('الحالة', 'status', choices=Payment.PaymentStatus.choices),
+    }
+    measures = {
+        'payments': Measure('عدد العمليات', Count('id')),
+        'revenue': Measure('الإيرادات', Sum('total')),
+        'paid': Measure('المدفوع', Sum('amount_paid')),
+        'outstanding': Measure('المتبقي', Sum('amount_remaining')),
+        'discount': Measure('الخصومات', Sum('discount')),
+    }
+    derived = {
+        'average_payment': Derived('متوسط العملية', lambda row: ratio(row['revenue'], row['payments'])),
+    }
+    filters = {
+        'status': Filter(
+            'الحالة', 'status', Payment.PaymentStatus.choices, default=Payment.PaymentStatus.COMPLETED
+        ),
+        'payment_type': Filter('نوع الدفع', 'payment_type', Payment.PaymentType.choices),
+        'payment_method': Filter('طريقة الدفع', 'payment_method', Payment.PaymentMethod.choices),
+    }
+
+
+class AttendanceReport(ReportDefinition):
+    """الزيارات حسب اليوم/الساعة/الرياضة/المدرب"""
+
+    name = 'attendance'
+    title = 'تقرير الحضور'
+    model = Attendance
+    date_field = 'check_in'
+    default_group_by = ('day',)
+
+    dimensions = {
+        'day': Dimension('اليوم', TruncDate('check_in')),
+        'month': Dimension('الشهر', TruncMonth('check_in')),
+        # 1 = الأحد ... 7 = السبت
+        'weekday': Dimension('يوم الأسبوع', ExtractWeekDay('check_in')),
+        'hour': Dimension('الساعة', ExtractHour('check_in')),
+        'sport': Dimension('الرياضة', 'sport', extra={'sport_name': 'sport__name'}),
+        'trainer': Dimension('المدرب', 'trainer', extra={'trainer_name': _full_name('trainer__user')}),
+    }
+    measures = {
+        'visits': Measure('الزيارات', Count('id')),
+        'members': Measure('الأعضاء', Count('member', distinct=True), additive=False),
+        'manual_entries': Measure('تسجيل يدوي', Count('id', filter=Q(is_manual_entry=True))),
+    }
+    derived = {
+        'visits_per_member': Derived(
+            'زيارات لكل عضو', lambda row: ratio(row['visits'], row.get('members'))
+        ),
+    }
+    filters = {
+        'sport': Filter('الرياضة', 'sport_id', cast=int),
+        'trainer': Filter('المدرب', 'trainer_id', cast=int),
+    }
+
+
+class RetentionReport(ReportDefinition):
+    """
+    الاشتراكات المنتهية في الفترة ونسبة من جدد منها
+
+    التجديد: وجود اشتراك لاحق لنفس العضو (يبدأ بعد بداية الاشتراك المنتهي)
+    """
+
+    name = 'retention'
+    title = 'تقرير الاحتفاظ بالأعضاء'
+    model = Subscription
+    date_field = 'end_date'
+    default_group_by = ('month',)
+
+    dimensions = {
+        'month': Dimension('الشهر', TruncMonth('end_date')),
+        'plan': Dimension('الخطة', 'plan', extra={'plan_name': 'plan__name'}),
+        'status': Dimension('الحالة', 'status', choices=Subscription.Status.choices),
+    }
+    measures = {
+        'ended': Measure('الاشتراكات المنتهية', Count('id')),
+        'renewed': Measure('المجددة', Count('id', filter=Exists(
+            Subscription.objects.filter(
+                member=OuterRef('member'), start_date__gt=OuterRef('start_date')
+            )
+        ))),
+        'cancelled': Measure('الملغاة', Count('id', filter=Q(status=Subscription.Status.CANCELLED))),
+    }
+    derived = {
+        'churned': Derived('غير المجددة', lambda row: row['ended'] - row['renewed']),
+        'retention_rate': Derived(
+            'نسبة الاحتفاظ %', lambda row: ratio(row['renewed'], row['ended'], scale=100, digits=1)
+        ),
+    }
+    filters = {
+        'plan': Filter('الخطة', 'plan_id', cast=int),
+    }
+
+
+class TrainerReport(ReportDefinition):
+    """جلسات التدريب الخاص لكل مدرب"""
+
+    name = 'trainers'
+    title = 'تقرير المدربين'
+    model = Session
+    date_field = 'date'
+    default_group_by = ('trainer',)
+
+    dimensions = {
+        'trainer': Dimension('المدرب', 'trainer', extra={'trainer_name': _full_name('trainer__user')}),
+        'month': Dimension('الشهر', TruncMonth('date')),
+        'status': Dimension('الحالة', 'status', choices=Session.Status.choices),
+    }
+    measures = {
+        'sessions': Measure('الجلسات', Count('id')),
+        'completed': Measure('المكتملة', Count('id', filter=Q(status=Session.Status.COMPLETED))),
+        'cancelled': Measure('الملغاة', Count('id', filter=Q(status=Session.Status.CANCELLED))),
+        'minutes': Measure(
+            'دقائق التدريب', Sum('duration', filter=Q(status=Session.Status.COMPLETED), default=0)
+        ),
+        'members': Measure('الأعضاء', Count('member', distinct=True), additive=False),
+    }
+    derived = {
+        'completion_rate': Derived(
+            'نسبة الإكمال %', lambda row: ratio(row['completed'], row['sessions'], scale=100, digits=1)
+        ),
+    }
+    filters = {
+        'trainer': Filter('المدرب', 'trainer_id', cast=int),
+        'status': Filter('الحالة', 'status', Session.Status.choices),
+    }
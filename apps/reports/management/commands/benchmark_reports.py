@@ -0,0 +1,130 @@
+import copy
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.attendance.models import Attendance
+from apps.payments.models import Payment
+from apps.reports.services import ReportDefinition, ReportService
+from apps.subscriptions.models import Subscription
+from apps.trainers.models import Session
+from core.imports import manual_fields
+
+
+class Command(BaseCommand):
+    """قياس زمن التقارير (استعلام مجمّع واحد لكل تقرير) على بيانات مولدة"""
+
+    help = 'قياس زمن تشغيل كل تقرير وعدد استعلاماته لكل بُعد تجميع، مع زمن القراءة من الذاكرة المؤقتة'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='عدد السجلات المولدة لكل جدول (دفعات، حضور، اشتراكات، جلسات) قبل القياس'
+        )
+        parser.add_argument('--days', type=int, default=365, help='طول فترة التقرير بالأيام')
+        parser.add_argument('--repeat', type=int, default=3, help='عدد مرات تكرار كل قياس')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self._seed(options['seed'], options['days'])
+
+        today = timezone.localdate()
+        base = {
+            'date_from': (today - timedelta(days=options['days'] - 1)).isoformat(),
+            'date_to': today.isoformat(),
+        }
+
+        self.stdout.write(
+            f"{'التقرير':<12} {'التجميع':<22} {'صفوف':>6} {'استعلامات':>10} {'تنفيذ (ms)':>12} {'مخزن (ms)':>11}"
+        )
+
+        for name, definition in ReportDefinition.registry.items():
+            groupings = [','.join(definition.default_group_by)]
+            groupings += [d for d in definition.dimensions if d not in definition.default_group_by]
+            groupings.append('')
+
+            for group_by in groupings:
+                params = definition.clean({**base, 'group_by': group_by})
+
+                with CaptureQueriesContext(connection) as queries:
+                    result = definition.run(params)
+
+                run_ms = self._measure(options['repeat'], lambda: definition.run(params))
+                ReportService.execute(name, params)
+                cached_ms = self._measure(
+                    options['repeat'], lambda: ReportService.run(name, {**base, 'group_by': group_by})
+                )
+
+                self.stdout.write(
+                    f"{name:<12} {group_by or '—':<22} {len(result['rows']):>6} "
+                    f"{len(queries):>10} {run_ms:>12.2f} {cached_ms:>11.2f}"
+                )
+
+        self.stdout.write(self.style.SUCCESS('✓ اكتمل القياس'))
+
+    @staticmethod
+    def _measure(repeat, func):
+        """أفضل زمن من عدة تكرارات بالمللي ثانية"""
+        best = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def _seed(self, count, days, batch_size=5000):
+        """نسخ سجل موجود من كل جدول بتواريخ متفرقة على الفترة"""
+        templates = {
+            model: model.objects.order_by('id').first()
+            for model in (Payment, Attendance, Subscription, Session)
+        }
+        missing = [model.__name__ for model, obj in templates.items() if obj is None]
+        if missing:
+            raise CommandError(f"لا توجد سجلات لاستخدامها كنموذج للتوليد: {', '.join(missing)}")
+
+        token = uuid.uuid4().hex[:6].upper()
+        now = timezone.now()
+        today = timezone.localdate()
+
+        def clone(template, index):
+            obj = copy.copy(template)
+            obj.pk = obj.id = None
+            offset = timedelta(minutes=random.randint(0, days * 1440 - 1))
+
+            if isinstance(obj, Payment):
+                obj.payment_number = f'B{token}{index:08d}'
+                obj.created_at = now - offset
+                obj.payment_type = random.choice(Payment.PaymentType.values)
+                obj.payment_method = random.choice(Payment.PaymentMethod.values)
+            elif isinstance(obj, Attendance):
+                obj.check_in = now - offset
+                obj.check_out = obj.check_in + timedelta(minutes=random.randint(30, 120))
+            elif isinstance(obj, Subscription):
+                obj.subscription_number = f'B{token}{index:08d}'
+                obj.start_date = today - timedelta(days=offset.days + 30)
+                obj.end_date = today - timedelta(days=offset.days)
+            else:
+                obj.date = today - timedelta(days=offset.days)
+                obj.status = random.choice(Session.Status.values)
+            return obj
+
+        with manual_fields(Payment, 'created_at'), transaction.atomic():
+            for model, template in templates.items():
+                created = 0
+                while created < count:
+                    batch = [
+                        clone(template, created + i)
+                        for i in range(min(batch_size, count - created))
+                    ]
+                    model.objects.bulk_create(batch, batch_size=batch_size)
+                    created += len(batch)
+                self.stdout.write(f'تم توليد {created} سجل {model._meta.verbose_name}')
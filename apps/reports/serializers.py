@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+
+class ReportQuerySerializer(serializers.Serializer):
+    """Serializer معاملات تشغيل التقرير (الفلاتر الخاصة بكل تقرير تُمرر كما هي)"""
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    group_by = serializers.CharField(required=False, allow_blank=True)
+    refresh = serializers.BooleanField(required=False, default=False)
+
+
+class CohortQuerySerializer(serializers.Serializer):
+    """Serializer معاملات مصفوفة الاحتفاظ"""
+    dimension = serializers.ChoiceField(choices=['join', 'plan', 'sport'], required=False, default='join')
+    months = serializers.IntegerField(required=False, min_value=1, max_value=36)
+    refresh = serializers.BooleanField(required=False, default=False)
@@ -0,0 +1,361 @@
+import hashlib
+import json
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.dates import range_lookups
+
+
+DEFAULT_CONFIG = {
+    'CACHE_TIMEOUT': 600,
+    'DEFAULT_DAYS': 30,
+    'MAX_DAYS': 3 * 366,
+    'ASYNC_AFTER_DAYS': 92,
+    'JOB_TIMEOUT': 3600,
+    'COHORT_MONTHS': 12,
+    'ANALYTICS_TIMEOUT': 6 * 3600,
+    'CHURN_INACTIVE_DAYS': 14,
+    'CHURN_RISK_THRESHOLD': 0.5,
+}
+
+
+def get_config() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG, **getattr(settings, 'REPORTS', {})}
+
+
+class Dimension:
+    """
+    بُعد تجميع: تعبير ORM (أو مسار حقل) يدخل في GROUP BY
+
+    - extra: أعمدة إضافية تُجمع معه (مثل الاسم بجانب المعرف)
+    - choices: لإضافة {name}_display بالنص المعروض
+    """
+
+    def __init__(self, label, expression, extra=None, choices=None):
+        self.label = label
+        self.expression = expression
+        self.extra = extra or {}
+        self.choices = dict(choices) if choices else None
+
+
+class Measure:
+    """مقياس تجميعي (Sum/Count...). additive: يمكن جمعه عبر الصفوف للإجمالي"""
+
+    def __init__(self, label, aggregate, additive=True):
+        self.label = label
+        self.aggregate = aggregate
+        self.additive = additive
+
+
+class Derived:
+    """مقياس محسوب من مقاييس الصف بعد الاستعلام (نسب ومتوسطات)"""
+
+    def __init__(self, label, func):
+        self.label = label
+        self.func = func
+
+
+class Filter:
+    """
+    فلتر اختياري من معاملات الطلب
+
+    - cast: تحويل القيمة قبل الاستعلام (int لمعرفات المفاتيح الأجنبية)؛ فشله خطأ تحقق
+    """
+
+    def __init__(self, label, lookup, choices=None, default=None, cast=str):
+        self.label = label
+        self.lookup = lookup
+        self.choices = dict(choices) if choices else None
+        self.default = default
+        self.cast = cast
+
+
+def ratio(numerator, denominator, scale=1, digits=2):
+    """قسمة آمنة (None عند المقام صفر)"""
+    if not denominator:
+        return None
+    return round(float(numerator or 0) * scale / float(denominator), digits)
+
+
+class ReportDefinition:
+    """
+    تعريف تقرير تصريحي يُترجم إلى استعلام ORM مجمّع واحد
+
+    values(أبعاد group_by) + annotate(المقاييس) مع فلتر الفترة على date_field
+    """
+
+    name = None
+    title = ''
+    model = None
+    date_field = None
+    dimensions = {}
+    measures = {}
+    derived = {}
+    filters = {}
+    default_group_by = ()
+
+    registry = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.name:
+            ReportDefinition.registry[cls.name] = cls
+
+    @classmethod
+    def get_queryset(cls):
+        return cls.model._default_manager.all()
+
+    @classmethod
+    def describe(cls) -> Dict[str, Any]:
+        """وصف التقرير للواجهة (الأبعاد والمقاييس والفلاتر المتاحة)"""
+        return {
+            'name': cls.name,
+            'title': cls.title,
+            'dimensions': {name: d.label for name, d in cls.dimensions.items()},
+            'measures': {
+                name: m.label for name, m in list(cls.measures.items()) + list(cls.derived.items())
+            },
+            'filters': {
+                name: {'label': f.label, 'choices': f.choices, 'default': f.default}
+                for name, f in cls.filters.items()
+            },
+            'default_group_by': list(cls.default_group_by),
+        }
+
+    @classmethod
+    def clean(cls, params) -> Dict[str, Any]:
+        """
+        توحيد المعاملات (قابلة للتسلسل JSON حتى تُستخدم في المفتاح ومهمة Celery)
+        """
+        config = get_config()
+        errors = {}
+
+        def read_date(key, default):
+            value = params.get(key)
+            if not value:
+                return default
+            if isinstance(value, date):
+                return value
+            parsed = parse_date(str(value))
+            if parsed is None:
+                errors[key] = 'صيغة التاريخ يجب أن تكون YYYY-MM-DD'
+            return parsed
+
+        date_to = read_date('date_to', timezone.localdate())
+        date_from = read_date('date_from', (date_to or timezone.localdate()) - timedelta(
+            days=config['DEFAULT_DAYS'] - 1
+        ))
+
+        if date_from and date_to:
+            if date_from > date_to:
+                errors['date_from'] = 'تاريخ البداية بعد تاريخ النهاية'
+            elif (date_to - date_from).days > config['MAX_DAYS']:
+                errors['date_to'] = f"الفترة أطول من {config['MAX_DAYS']} يوماً"
+
+        group_by = params.get('group_by')
+        if group_by is None:
+            group_by = list(cls.default_group_by)
+        elif isinstance(group_by, str):
+            group_by = [name.strip() for name in group_by.split(',') if name.strip()]
+        unknown = [name for name in group_by if name not in cls.dimensions]
+        if unknown:
+            errors['group_by'] = f"أبعاد غير معروفة: {', '.join(unknown)}"
+
+        filters = {}
+        for name, definition in cls.filters.items():
+            value = params.get(name) or definition.default
+            if not value:
+                continue
+            if definition.choices is not None and value not in definition.choices:
+                errors[name] = f'قيمة غير صحيحة: {value}'
+                continue
+            try:
+                filters[name] = definition.cast(value)
+            except (TypeError, ValueError):
+                errors[name] = f'قيمة غير صحيحة: {value}'
+
+        if errors:
+            raise ValidationError(errors)
+
+        return {
+            'date_from': date_from.isoformat(),
+            'date_to': date_to.isoformat(),
+            'group_by': list(dict.fromkeys(group_by)),
+            'filters': filters,
+        }
+
+    @classmethod
+    def is_long(cls, params) -> bool:
+        """الفترات الطويلة تُنفذ في الخلفية"""
+        days = (date.fromisoformat(params['date_to']) - date.fromisoformat(params['date_from'])).days
+        return days > get_config()['ASYNC_AFTER_DAYS']
+
+    @classmethod
+    def _date_range(cls, queryset, params):
+        """فلتر الفترة بنطاق قابل للفهرسة (بدون __date)"""
+        return queryset.filter(**range_lookups(
+            cls.model, cls.date_field, params['date_from'], params['date_to']
+        ))
+
+    @classmethod
+    def build_queryset(cls, params):
+        """الاستعلام المجمّع الوحيد للتقرير"""
+        queryset = cls._date_range(cls.get_queryset(), params)
+        for name, value in params['filters'].items():
+            queryset = queryset.filter(**{cls.filters[name].lookup: value})
+
+        aggregates = {name: measure.aggregate for name, measure in cls.measures.items()}
+        if not params['group_by']:
+            return queryset, aggregates
+
+        fields = []
+        expressions = {}
+        for name in params['group_by']:
+            dimension = cls.dimensions[name]
+            for key, expression in [(name, dimension.expression), *dimension.extra.items()]:
+                if expression == key:
+                    fields.append(key)
+                else:
+                    expressions[key] = F(expression) if isinstance(expression, str) else expression
+
+        keys = fields + list(expressions)
+        return (
+            queryset.order_by().values(*fields, **expressions).annotate(**aggregates).order_by(*keys),
+            None
+        )
+
+    @classmethod
+    def _finish_row(cls, row, group_by):
+        for name in group_by:
+            choices = cls.dimensions[name].choices
+            if choices is not None:
+                row[f'{name}_display'] = str(choices.get(row[name], row[name]))
+        for name, derived in cls.derived.items():
+            row[name] = derived.func(row)
+        return row
+
+    @classmethod
+    def run(cls, params) -> Dict[str, Any]:
+        """تنفيذ التقرير وإرجاع الأعمدة والصفوف والإجماليات"""
+        started = time.perf_counter()
+        group_by = params['group_by']
+        queryset, aggregates = cls.build_queryset(params)
+
+        if aggregates is not None:
+            totals = cls._finish_row(queryset.aggregate(**aggregates), [])
+            rows = []
+        else:
+            rows = [cls._finish_row(row, group_by) for row in queryset]
+            totals = {
+                name: sum((row[name] or 0) for row in rows)
+                for name, measure in cls.measures.items() if measure.additive
+            }
+            totals = cls._finish_row(totals, []) if len(totals) == len(cls.measures) else totals
+
+        columns = [{'name': name, 'label': cls.dimensions[name].label} for name in group_by]
+        columns += [
+            {'name': name, 'label': item.label}
+            for name, item in list(cls.measures.items()) + list(cls.derived.items())
+        ]
+
+        return {
+            'report': cls.name,
+            'title': cls.title,
+            'params': params,
+            'columns': columns,
+            'rows': rows,
+            'totals': totals,
+            'generated_at': timezone.now(),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+
+
+class ReportService:
+    """
+    تشغيل التقارير مع تخزين النتائج حسب بصمة المعاملات
+
+    - النتيجة تُخزن في الذاكرة المؤقتة لمدة CACHE_TIMEOUT
+    - الفترات الأطول من ASYNC_AFTER_DAYS تُنفذ في Celery ويُستعلم عن حالتها بمعرف المهمة
+    - معرف المهمة هو بصمة المعاملات نفسها فالطلبات المتطابقة تشترك في مهمة واحدة
+    """
+
+    RESULT_KEY = 'reports:result:{}'
+    JOB_KEY = 'reports:job:{}'
+
+    @staticmethod
+    def get_definition(name):
+        try:
+            return ReportDefinition.registry[name]
+        except KeyError:
+            raise ValidationError(f'التقرير غير موجود: {name}')
+
+    @staticmethod
+    def definitions() -> List[Dict[str, Any]]:
+        return [definition.describe() for definition in ReportDefinition.registry.values()]
+
+    @staticmethod
+    def fingerprint(name, params) -> str:
+        payload = json.dumps({'report': name, **params}, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def execute(name, params) -> Dict[str, Any]:
+        """تنفيذ فعلي (المعاملات موحدة مسبقاً) وتخزين النتيجة"""
+        definition = ReportService.get_definition(name)
+        result = definition.run(params)
+        result['job_id'] = ReportService.fingerprint(name, params)
+        cache.set(ReportService.RESULT_KEY.format(result['job_id']), result, get_config()['CACHE_TIMEOUT'])
+        return result
+
+    @staticmethod
+    def run(name, raw_params, allow_async=True, refresh=False) -> Dict[str, Any]:
+        """
+        {'status': 'ready', 'result': ...} أو {'status': 'pending', 'job_id': ...}
+        """
+        definition = ReportService.get_definition(name)
+        params = definition.clean(raw_params)
+        job_id = ReportService.fingerprint(name, params)
+
+        if not refresh:
+            result = cache.get(ReportService.RESULT_KEY.format(job_id))
+            if result is not None:
+                return {'status': 'ready', 'job_id': job_id, 'result': result}
+
+        if allow_async and definition.is_long(params):
+            from .tasks import run_report
+
+            # cache.add: الطلبات المتطابقة المتزامنة لا تكرر المهمة
+            if cache.add(ReportService.JOB_KEY.format(job_id), {'status': 'pending'}, get_config()['JOB_TIMEOUT']):
+                run_report.delay(name, params)
+            return ReportService.job_status(job_id)
+
+        return {'status': 'ready', 'job_id': job_id, 'result': ReportService.execute(name, params)}
+
+    @staticmethod
+    def mark_failed(name, params, error) -> None:
+        job_id = ReportService.fingerprint(name, params)
+        cache.set(
+            ReportService.JOB_KEY.format(job_id),
+            {'status': 'failed', 'error': error},
+            get_config()['JOB_TIMEOUT']
+        )
+
+    @staticmethod
+    def job_status(job_id) -> Dict[str, Any]:
+        result = cache.get(ReportService.RESULT_KEY.format(job_id))
+        if result is not None:
+            cache.delete(ReportService.JOB_KEY.format(job_id))
+            return {'status': 'ready', 'job_id': job_id, 'result': result}
+
+        job = cache.get(ReportService.JOB_KEY.format(job_id))
+        if job is None:
+            return {'status': 'unknown', 'job_id': job_id}
+        return {'job_id': job_id, **job}
@@ -0,0 +1,40 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_report(name, params):
+    """
+    تنفيذ تقرير طويل في الخلفية وتخزين نتيجته للاستعلام عنها
+    """
+    from .services import ReportService
+    
+    try:
+        result = ReportService.execute(name, params)
+        logger.info(f"✓ تقرير {name}: {len(result['rows'])} صف خلال {result['duration_ms']}ms")
+        return result['job_id']
+    
+    except Exception as e:
+        ReportService.mark_failed(name, params, str(e))
+        logger.error(f"✗ خطأ في تقرير {name}: {str(e)}")
+        raise
+
+
+@shared_task
+def refresh_retention_analytics():
+    """
+    إعادة حساب مصفوفات الاحتفاظ ودرجات خطر التسرب
+    يتم تشغيله يومياً الساعة 5:30 صباحاً (قبل تذكيرات الحضور)
+    """
+    try:
+        from .analytics import RetentionAnalytics
+        
+        result = RetentionAnalytics.refresh()
+        logger.info(f"✓ تحليلات الاحتفاظ: {result}")
+        return result
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في تحليلات الاحتفاظ: {str(e)}")
+        raise
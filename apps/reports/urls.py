@@ -0,0 +1,14 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+from . import traditional_views
+
+app_name = 'reports'
+
+router = DefaultRouter()
+router.register('', views.ReportViewSet, basename='report')
+
+urlpatterns = [
+    path('financial/', traditional_views.financial_report, name='financial'),
+    path('api/v1/', include(router.urls)),
+]
@@ -0,0 +1,104 @@
+from django.core.exceptions import ValidationError
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .analytics import RetentionAnalytics
+from .serializers import CohortQuerySerializer, ReportQuerySerializer
+from .services import ReportDefinition, ReportService
+
+
+class ReportViewSet(viewsets.ViewSet):
+    """API التقارير - تشغيل التقارير المعرفة ومتابعة المهام الطويلة"""
+    
+    permission_classes = [IsAdminUser]
+    lookup_value_regex = '[a-z_]+'
+    
+    def list(self, request):
+        """التقارير المتاحة مع أبعادها ومقاييسها وفلاترها"""
+        return Response(ReportService.definitions())
+    
+    def retrieve(self, request, pk=None):
+        """تشغيل تقرير
+        
+        Parameters:
+        - date_from (اختياري): بداية الفترة YYYY-MM-DD (افتراضي: آخر 30 يوماً)
+        - date_to (اختياري): نهاية الفترة YYYY-MM-DD (افتراضي: اليوم)
+        - group_by (اختياري): أبعاد التجميع مفصولة بفواصل (مثل day,payment_type)
+        - refresh (اختياري): تجاهل النتيجة المخزنة
+        - فلاتر التقرير (اختياري): حسب filters في قائمة التقارير
+        
+        الفترات الطويلة تعيد 202 مع job_id للاستعلام عبر jobs/<job_id>/
+        """
+        if pk not in ReportDefinition.registry:
+            return Response(
+                {'error': 'التقرير غير موجود'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        query = ReportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = {**request.query_params.dict(), **query.validated_data}
+        
+        try:
+            outcome = ReportService.run(pk, params, refresh=params.pop('refresh'))
+        except ValidationError as e:
+            return Response(
+                {'error': e.message_dict if hasattr(e, 'error_dict') else e.messages},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if outcome['status'] == 'ready':
+            return Response(outcome, status=status.HTTP_200_OK)
+        return Response(outcome, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>[0-9a-f]{40})')
+    def job(self, request, job_id=None):
+        """حالة تقرير يُنفذ في الخلفية (pending / ready / failed / unknown)"""
+        outcome = ReportService.job_status(job_id)
+        if outcome['status'] == 'unknown':
+            return Response(outcome, status=status.HTTP_404_NOT_FOUND)
+        return Response(outcome, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def cohorts(self, request):
+        """مصفوفة الاحتفاظ حسب مجموعات الأعضاء
+        
+        Parameters:
+        - dimension (اختياري): join أو plan أو sport (افتراضي: join)
+        - months (اختياري): عدد الأشهر (افتراضي: 12)
+        - refresh (اختياري): إعادة الحساب بدل النتيجة المخزنة
+        """
+        query = CohortQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = query.validated_data
+        result = RetentionAnalytics.cohorts(
+            params['dimension'], months=params.get('months'), refresh=params['refresh']
+        )
+        return Response(result, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'], url_path='churn-risk')
+    def churn_risk(self, request):
+        """الأعضاء المعرضون للتسرب مرتبين حسب درجة الخطر
+        
+        Parameters:
+        - threshold (اختياري): الحد الأدنى للدرجة 0..1 (افتراضي: CHURN_RISK_THRESHOLD)
+        - limit (اختياري): عدد النتائج (افتراضي: 50)
+        """
+        try:
+            threshold = request.query_params.get('threshold')
+            threshold = float(threshold) if threshold else None
+            limit = min(int(request.query_params.get('limit', 50)), 500)
+        except ValueError:
+            return Response(
+                {'error': 'threshold و limit يجب أن تكون أرقاماً'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = RetentionAnalytics.at_risk(threshold=threshold, limit=limit)
+        return Response({'count': len(results), 'results': results}, status=status.HTTP_200_OK)
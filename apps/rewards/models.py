@@ -67,6 +67,9 @@ class PointTransaction(models.Model):
         verbose_name = 'حركة نقاط'
         verbose_name_plural = 'حركات النقاط'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['member', '-created_at'], name='point_txn_member_idx'),
+        ]
     
     def __str__(self):
         return f"{self.member} - {self.points} ({self.transaction_type})"
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 
 from apps.members.models import Member
 from apps.subscriptions.models import Subscription
+from core.dates import range_lookups
 from .models import RewardRule, PointTransaction, Reward, RewardRedemption
 
 
@@ -262,7 +263,7 @@ class RewardService:
         فحص وإرسال نقاط أعياد الميلاد
         يتم تشغيله يومياً عبر Celery
         """
-        today = timezone.now().date()
+        today = timezone.localdate()
         
         birthday_members = Member.objects.filter(
             date_of_birth__month=today.month,
@@ -276,7 +277,7 @@ class RewardService:
             existing = PointTransaction.objects.filter(
                 member=member,
                 rule__action_type=RewardRule.ActionType.BIRTHDAY,
-                created_at__year=today.year
+                **range_lookups(PointTransaction, 'created_at', today.replace(month=1, day=1))
             ).exists()
             
             if not existing:
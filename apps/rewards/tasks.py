@@ -87,13 +87,10 @@ def calculate_monthly_rewards():
         from .models import PointTransaction
         from django.db.models import Count
         
-        last_month = timezone.now().date().replace(day=1) - timedelta(days=1)
+        last_month = timezone.localdate().replace(day=1) - timedelta(days=1)
         
         # أعضاء أكثر انتظاماً (20+ جلسة)
-        active_members = Attendance.objects.filter(
-            date__month=last_month.month,
-            date__year=last_month.year
-        ).values('member').annotate(count=Count('id')).filter(count__gte=20)
+        active_members = Attendance.objects.in_local_month(last_month).values('member').annotate(count=Count('id')).filter(count__gte=20)
         
         count = 0
         for attendance in active_members:
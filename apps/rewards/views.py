@@ -1,5 +1,6 @@
 # apps/rewards/views.py
 from rest_framework import viewsets
+from core.pagination import KeysetPagination
 from .models import RewardRule, PointTransaction, Reward, RewardRedemption
 from .serializers import (
     RewardRuleSerializer,
@@ -17,6 +18,8 @@ class RewardRuleViewSet(viewsets.ModelViewSet):
 class PointTransactionViewSet(viewsets.ModelViewSet):
     queryset = PointTransaction.objects.select_related('member', 'rule').all()
     serializer_class = PointTransactionSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
 
 
 class RewardViewSet(viewsets.ModelViewSet):
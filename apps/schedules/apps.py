@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class SchedulesConfig(AppConfig):
+    """تكوين تطبيق جداول الحصص"""
+    
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.schedules'
+    verbose_name = 'جداول الحصص'
+    
+    def ready(self):
+        """استدعاء الإشارات عند تحميل التطبيق"""
+        import apps.schedules.signals  # noqa
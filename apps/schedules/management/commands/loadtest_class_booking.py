@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+
+from apps.members.models import Member
+from apps.schedules.models import ClassSession, ClassBooking
+from apps.schedules.services import ClassBookingService
+
+
+class Command(BaseCommand):
+    """اختبار حمل: حجوزات متزامنة كثيرة على حصة واحدة"""
+
+    help = 'حجز متزامن لعدد كبير من الأعضاء في حصة واحدة والتحقق من عدم تجاوز السعة وترتيب قائمة الانتظار'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--session', type=int, required=True, help='معرف الحصة')
+        parser.add_argument('--bookers', type=int, default=100, help='عدد الأعضاء المتزامنين')
+        parser.add_argument('--workers', type=int, default=16, help='عدد الخيوط')
+        parser.add_argument('--cancel', type=int, default=5, help='عدد الإلغاءات للتحقق من الترقية')
+        parser.add_argument('--keep', action='store_true', help='إبقاء الحجوزات بعد الاختبار')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                '⚠ SQLite يسلسل الكتابة؛ النتائج ذات معنى على PostgreSQL'
+            ))
+
+        try:
+            session = ClassSession.objects.select_related('schedule').get(id=options['session'])
+        except ClassSession.DoesNotExist:
+            raise CommandError('الحصة غير موجودة')
+
+        ClassBookingService._ensure_capacity(session)
+        ClassBookingService.sync_participants_count(session)
+
+        member_ids = list(
+            Member.objects.filter(is_active=True)
+            .exclude(class_bookings__session=session)
+            .values_list('id', flat=True)[:options['bookers']]
+        )
+        if not member_ids:
+            raise CommandError('لا يوجد أعضاء متاحون للاختبار')
+
+        free_seats = session.capacity - session.participants_count
+        results = {'booked': 0, 'waitlisted': 0, 'errors': []}
+        lock = threading.Lock()
+        start = threading.Event()
+
+        def book(member_id):
+            start.wait()
+            try:
+                booking = ClassBookingService.book(
+                    ClassSession.objects.get(pk=session.pk),
+                    Member.objects.get(pk=member_id)
+                )
+                with lock:
+                    results[booking.status] = results.get(booking.status, 0) + 1
+            except (ValidationError, DatabaseError) as e:
+                with lock:
+                    results['errors'].append(str(e))
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = [pool.submit(book, member_id) for member_id in member_ids]
+            started = time.perf_counter()
+            start.set()
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - started
+
+        session.refresh_from_db()
+        created = ClassBooking.objects.filter(session=session, member_id__in=member_ids)
+        seated = created.filter(status=ClassBooking.Status.BOOKED).count()
+        waitlisted = created.filter(status=ClassBooking.Status.WAITLISTED).count()
+
+        self.stdout.write(
+            f'الحجوزات: {len(member_ids)} خلال {elapsed:.2f} ثانية '
+            f'({len(member_ids) / elapsed:,.0f} حجز/ث)'
+        )
+        self.stdout.write(
+            f'مقاعد: {seated} | انتظار: {waitlisted} | أخطاء: {len(results["errors"])} | '
+            f'العدد: {session.participants_count}/{session.capacity}'
+        )
+
+        failures = []
+        if session.participants_count > session.capacity:
+            failures.append('تجاوز السعة')
+        if seated != min(free_seats, len(member_ids) - len(results['errors'])):
+            failures.append('عدد المقاعد المحجوزة غير متوقع')
+        if ClassBookingService.sync_participants_count(session) != session.participants_count:
+            failures.append('عدد المشاركين لا يطابق الحجوزات')
+
+        # الإلغاء يجب أن يرقّي المنتظرين بترتيب الوصول
+        queue = list(
+            created.filter(status=ClassBooking.Status.WAITLISTED)
+            .order_by('booked_at', 'id').values_list('id', flat=True)
+        )
+        to_cancel = created.filter(status=ClassBooking.Status.BOOKED)[:options['cancel']]
+        promoted = []
+        for booking in to_cancel:
+            next_booking = ClassBookingService.cancel(booking)
+            if next_booking:
+                promoted.append(next_booking.id)
+
+        if promoted != queue[:len(promoted)]:
+            failures.append('الترقية لم تتبع ترتيب قائمة الانتظار')
+        self.stdout.write(f'تمت ترقية {len(promoted)} من قائمة الانتظار')
+
+        if not options['keep']:
+            created.delete()
+            ClassBookingService.sync_participants_count(session)
+
+        if failures:
+            raise CommandError('✗ ' + ' | '.join(failures))
+
+        self.stdout.write(self.style.SUCCESS('✓ لا تجاوز للسعة وقائمة الانتظار بترتيب الوصول'))
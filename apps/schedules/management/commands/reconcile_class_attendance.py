@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.schedules.models import ClassSession
+from apps.schedules.services import AttendanceReconciliationService
+
+
+class Command(BaseCommand):
+    """مطابقة الحضور مع حجوزات الحصص، مع وضع ملء البيانات التاريخية"""
+
+    help = 'تحديد الحجوزات كـ "حضر" أو "لم يحضر" من سجلات الحضور وإعادة حساب عدد المشاركين'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help='يوم واحد (YYYY-MM-DD)')
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='مطابقة كل الفترة التاريخية (من أقدم حصة حتى اليوم)'
+        )
+        parser.add_argument('--from', dest='start', type=date.fromisoformat, help='بداية الفترة')
+        parser.add_argument('--to', dest='end', type=date.fromisoformat, help='نهاية الفترة')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='عدد الحصص في كل معاملة'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+
+        if options['date']:
+            start = end = options['date']
+        elif options['backfill'] or options['start']:
+            start = options['start'] or (
+                ClassSession.objects.order_by('date').values_list('date', flat=True).first()
+            )
+            end = options['end'] or today
+            if start is None:
+                self.stdout.write('لا توجد حصص')
+                return
+        else:
+            start, end = today - timedelta(days=1), today
+
+        if start > end:
+            raise CommandError('بداية الفترة بعد نهايتها')
+
+        result = AttendanceReconciliationService.reconcile_range(
+            start, end, chunk_size=options['chunk_size']
+        )
+
+        self.stdout.write(
+            f"الفترة: {start} → {end} ({result['days']} يوم) | "
+            f"حصص: {result['sessions']} | حضر: {result['attended']} | لم يحضر: {result['no_show']}"
+        )
+        self.stdout.write(self.style.SUCCESS('✓ تمت مطابقة الحضور'))
@@ -1,5 +1,4 @@
 from django.db import models
-from django.utils import timezone
 from apps.sports.models import Sport
 from apps.trainers.models import Trainer
 from apps.members.models import Member
@@ -94,6 +93,8 @@ class ClassSession(models.Model):
     )
     
     participants_count = models.PositiveIntegerField('عدد المشاركين', default=0)
+    # نسخة من max_participants وقت إنشاء الحصة حتى يتم حجز المقعد بتحديث شرطي على صف الحصة فقط
+    capacity = models.PositiveIntegerField('السعة', blank=True, null=True)
     notes = models.TextField('ملاحظات', blank=True, null=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
@@ -108,15 +109,27 @@ class ClassSession(models.Model):
     def __str__(self):
         return f"{self.schedule.sport.name} - {self.date}"
     
+    def save(self, *args, **kwargs):
+        if self.capacity is None:
+            self.capacity = self.schedule.max_participants
+        super().save(*args, **kwargs)
+    
+    @property
+    def seat_capacity(self):
+        """سعة الحصة (من الجدول إذا لم تحدد)"""
+        if self.capacity is not None:
+            return self.capacity
+        return self.schedule.max_participants
+    
     @property
     def available_spots(self):
         """المقاعد المتاحة"""
-        return self.schedule.max_participants - self.participants_count
+        return self.seat_capacity - self.participants_count
     
     @property
     def is_full(self):
         """هل الحصة ممتلئة"""
-        return self.participants_count >= self.schedule.max_participants
+        return self.participants_count >= self.seat_capacity
 
 
 class ClassBooking(models.Model):
@@ -124,6 +137,7 @@ class ClassBooking(models.Model):
     
     class Status(models.TextChoices):
         BOOKED = 'booked', 'محجوز'
+        WAITLISTED = 'waitlisted', 'قائمة الانتظار'
         ATTENDED = 'attended', 'حضر'
         NO_SHOW = 'no_show', 'لم يحضر'
         CANCELLED = 'cancelled', 'ملغى'
@@ -157,12 +171,17 @@ class ClassBooking(models.Model):
         verbose_name_plural = 'حجوزات الحصص'
         unique_together = ['session', 'member']
         ordering = ['-booked_at']
+        indexes = [
+            # قائمة الانتظار بترتيب الوصول لكل حصة
+            models.Index(fields=['session', 'status', 'booked_at'], name='class_booking_queue_idx'),
+        ]
     
     def __str__(self):
         return f"{self.member} - {self.session}"
     
     def cancel(self):
-        """إلغاء الحجز"""
-        self.status = self.Status.CANCELLED
-        self.cancelled_at = timezone.now()
-        self.save()
+        """إلغاء الحجز (مع تحرير المقعد وترقية أول المنتظرين)"""
+        from .services import ClassBookingService
+        
+        ClassBookingService.cancel(self)
+        self.refresh_from_db()
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.serializers import FastSerializer, full_name
 from .models import ClassSchedule, ClassSession, ClassBooking
 
 
@@ -17,6 +18,44 @@ class ClassScheduleSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+    
+    def validate(self, attrs):
+        """رفض تداخل وقت الحصة مع حصة أخرى في نفس القاعة أو لنفس المدرب"""
+        from .services import TimetableService
+        
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            return getattr(self.instance, field, None)
+        
+        start_time = current('start_time')
+        end_time = current('end_time')
+        if start_time and end_time and start_time >= end_time:
+            raise serializers.ValidationError({'end_time': 'وقت النهاية يجب أن يكون بعد وقت البداية'})
+        
+        # الجداول الموقوفة لا تدخل في الفهرس
+        if current('is_active') is False:
+            return attrs
+        
+        trainer = current('trainer')
+        conflicts = TimetableService.find_conflicts(
+            day_of_week=current('day_of_week'),
+            start_time=start_time,
+            end_time=end_time,
+            room=current('room'),
+            trainer_id=trainer.pk if trainer else None,
+            exclude_id=self.instance.pk if self.instance else None
+        )
+        
+        errors = {}
+        if 'room' in conflicts:
+            errors['room'] = f"القاعة محجوزة في هذا الوقت (الجدول {conflicts['room']})"
+        if 'trainer' in conflicts:
+            errors['trainer'] = f"المدرب لديه حصة في هذا الوقت (الجدول {conflicts['trainer']})"
+        if errors:
+            raise serializers.ValidationError(errors)
+        
+        return attrs
 
 
 class ClassSessionSerializer(serializers.ModelSerializer):
@@ -35,6 +74,38 @@ class ClassSessionSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', 'participants_count']
 
 
+class ClassScheduleFastSerializer(FastSerializer):
+    """المسار السريع لـ ClassScheduleSerializer (قراءة فقط)"""
+    
+    serializer_class = ClassScheduleSerializer
+    computed = {
+        'trainer_name': (('trainer__user__first_name', 'trainer__user__last_name'), full_name),
+    }
+
+
+class ClassSessionFastSerializer(FastSerializer):
+    """المسار السريع لـ ClassSessionSerializer (قراءة فقط)"""
+    
+    serializer_class = ClassSessionSerializer
+    computed = {
+        'available_spots': (
+            ('capacity', 'schedule__max_participants', 'participants_count'),
+            lambda capacity, max_participants, count: (
+                (max_participants if capacity is None else capacity) - count
+            )
+        ),
+        'is_full': (
+            ('capacity', 'schedule__max_participants', 'participants_count'),
+            lambda capacity, max_participants, count: (
+                count >= (max_participants if capacity is None else capacity)
+            )
+        ),
+    }
+    nested = {
+        'schedule_info': ClassScheduleFastSerializer,
+    }
+
+
 class ClassBookingSerializer(serializers.ModelSerializer):
     """Serializer لحجوزات الحصص"""
     session_info = ClassSessionSerializer(source='session', read_only=True)
@@ -46,4 +117,23 @@ class ClassBookingSerializer(serializers.ModelSerializer):
             'id', 'session', 'session_info', 'member', 'member_name',
             'status', 'booked_at', 'cancelled_at', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['booked_at', 'cancelled_at', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['booked_at', 'cancelled_at', 'created_at', 'updated_at']
+
+class ClassBookRequestSerializer(serializers.Serializer):
+    """Serializer طلب حجز حصة"""
+    session_id = serializers.IntegerField()
+    member_id = serializers.IntegerField(required=False)
+    allow_waitlist = serializers.BooleanField(required=False, default=True)
+
+
+class TimetableQuerySerializer(serializers.Serializer):
+    """Serializer معاملات الجدول الأسبوعي"""
+    week = serializers.DateField(required=False)
+    room = serializers.CharField(required=False, allow_blank=True)
+    trainer_id = serializers.IntegerField(required=False, min_value=1)
+    sport_id = serializers.IntegerField(required=False, min_value=1)
+
+
+class WaitlistQuerySerializer(serializers.Serializer):
+    """Serializer معاملات قائمة انتظار الحصة"""
+    session_id = serializers.IntegerField(min_value=1)
@@ -0,0 +1,649 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, time, timedelta
+from typing import Optional, Dict, Any, Iterable, List
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, ExtractWeekDay, Mod
+from django.utils import timezone
+from django.core.exceptions import ValidationError
+
+from apps.attendance.models import Attendance
+from apps.members.models import Member
+from core.dates import local_day_start
+from .models import ClassSchedule, ClassSession, ClassBooking
+
+
+class ClassBookingService:
+    """
+    خدمات حجز الحصص
+
+    - حجز المقعد بتحديث شرطي ذري:
+      UPDATE ... SET participants_count = participants_count + 1 WHERE participants_count < capacity
+    - قائمة انتظار بترتيب الوصول (booked_at, id) مع ترقية تلقائية عند الإلغاء
+    """
+
+    # الحالات التي تشغل مقعداً في الحصة
+    SEATED_STATUSES = (
+        ClassBooking.Status.BOOKED,
+        ClassBooking.Status.ATTENDED,
+        ClassBooking.Status.NO_SHOW,
+    )
+
+    @staticmethod
+    def claim_seat(session_id: int) -> bool:
+        """حجز مقعد إذا توفر (بدون قراءة مسبقة)"""
+        updated = ClassSession.objects.filter(
+            pk=session_id,
+            participants_count__lt=F('capacity')
+        ).update(participants_count=F('participants_count') + 1)
+        return updated == 1
+
+    @staticmethod
+    def release_seat(session_id: int) -> None:
+        """تحرير مقعد"""
+        ClassSession.objects.filter(
+            pk=session_id,
+            participants_count__gt=0
+        ).update(participants_count=F('participants_count') - 1)
+
+    @staticmethod
+    def _ensure_capacity(session: ClassSession) -> None:
+        """نسخ السعة من الجدول للحصص المنشأة بدون save (bulk_create)"""
+        if session.capacity is None:
+            session.capacity = session.schedule.max_participants
+            ClassSession.objects.filter(
+                pk=session.pk, capacity__isnull=True
+            ).update(capacity=session.capacity)
+
+    @staticmethod
+    def _lock_session(session_id: int) -> ClassSession:
+        """قفل صف الحصة لتسلسل عمليات قائمة الانتظار"""
+        return ClassSession.objects.select_for_update().get(pk=session_id)
+
+    @staticmethod
+    @transaction.atomic
+    def book(
+        session: ClassSession,
+        member: Member,
+        allow_waitlist: bool = True
+    ) -> ClassBooking:
+        """
+        حجز العضو في الحصة، أو إضافته لقائمة الانتظار إذا كانت ممتلئة
+        """
+        if session.status != ClassSession.Status.SCHEDULED:
+            raise ValidationError("لا يمكن الحجز في حصة غير مجدولة")
+
+        if session.date < timezone.localdate():
+            raise ValidationError("لا يمكن الحجز في حصة سابقة")
+
+        ClassBookingService._ensure_capacity(session)
+
+        booking = ClassBooking.objects.select_for_update().filter(
+            session=session, member=member
+        ).first()
+
+        if booking and booking.status != ClassBooking.Status.CANCELLED:
+            raise ValidationError("العضو مسجل مسبقاً في هذه الحصة")
+
+        seated = ClassBookingService.claim_seat(session.pk)
+
+        if not seated:
+            # إعادة المحاولة تحت قفل الحصة حتى لا يفوت مقعد حُرر للتو
+            ClassBookingService._lock_session(session.pk)
+            seated = ClassBookingService.claim_seat(session.pk)
+
+        if not seated and not allow_waitlist:
+            raise ValidationError("الحصة ممتلئة")
+
+        new_status = ClassBooking.Status.BOOKED if seated else ClassBooking.Status.WAITLISTED
+
+        if booking:
+            booking.status = new_status
+            booking.booked_at = timezone.now()
+            booking.cancelled_at = None
+            booking.save(update_fields=['status', 'booked_at', 'cancelled_at', 'updated_at'])
+            return booking
+
+        try:
+            with transaction.atomic():
+                return ClassBooking.objects.create(
+                    session=session,
+                    member=member,
+                    status=new_status
+                )
+        except IntegrityError:
+            # حجز متزامن لنفس العضو: يتم التراجع عن المقعد مع المعاملة
+            raise ValidationError("العضو مسجل مسبقاً في هذه الحصة")
+
+    @staticmethod
+    @transaction.atomic
+    def cancel(booking: ClassBooking) -> Optional[ClassBooking]:
+        """
+        إلغاء الحجز، وترقية أول المنتظرين إلى المقعد المحرر
+
+        يعيد الحجز المرقّى (إن وجد)
+        """
+        ClassBookingService._lock_session(booking.session_id)
+        booking = ClassBooking.objects.select_for_update().get(pk=booking.pk)
+
+        if booking.status not in (ClassBooking.Status.BOOKED, ClassBooking.Status.WAITLISTED):
+            raise ValidationError("لا يمكن إلغاء هذا الحجز")
+
+        was_seated = booking.status == ClassBooking.Status.BOOKED
+
+        booking.status = ClassBooking.Status.CANCELLED
+        booking.cancelled_at = timezone.now()
+        booking.save(update_fields=['status', 'cancelled_at', 'updated_at'])
+
+        if not was_seated:
+            return None
+
+        # المقعد ينتقل مباشرة لأول المنتظرين دون تغيير العدد
+        promoted = ClassBookingService._next_waitlisted(booking.session_id)
+        if promoted is None:
+            ClassBookingService.release_seat(booking.session_id)
+            return None
+
+        promoted.status = ClassBooking.Status.BOOKED
+        promoted.save(update_fields=['status', 'updated_at'])
+        return promoted
+
+    @staticmethod
+    def _next_waitlisted(session_id: int) -> Optional[ClassBooking]:
+        return ClassBooking.objects.select_for_update().filter(
+            session_id=session_id,
+            status=ClassBooking.Status.WAITLISTED
+        ).order_by('booked_at', 'id').first()
+
+    @staticmethod
+    @transaction.atomic
+    def promote_waitlist(session: ClassSession) -> int:
+        """
+        ملء المقاعد الشاغرة من قائمة الانتظار (بعد زيادة السعة مثلاً)
+        """
+        ClassBookingService._ensure_capacity(session)
+        ClassBookingService._lock_session(session.pk)
+
+        promoted = 0
+        while True:
+            waiting = ClassBookingService._next_waitlisted(session.pk)
+            if waiting is None or not ClassBookingService.claim_seat(session.pk):
+                break
+            waiting.status = ClassBooking.Status.BOOKED
+            waiting.save(update_fields=['status', 'updated_at'])
+            promoted += 1
+
+        return promoted
+
+    @staticmethod
+    def waitlist_position(booking: ClassBooking) -> Optional[int]:
+        """ترتيب الحجز في قائمة الانتظار (يبدأ من 1)"""
+        if booking.status != ClassBooking.Status.WAITLISTED:
+            return None
+
+        ahead = ClassBooking.objects.filter(
+            session_id=booking.session_id,
+            status=ClassBooking.Status.WAITLISTED,
+            booked_at__lte=booking.booked_at
+        ).exclude(booked_at=booking.booked_at, id__gte=booking.id).count()
+        return ahead + 1
+
+    @staticmethod
+    def sync_participants_count(session: ClassSession) -> int:
+        """إعادة حساب عدد المشاركين من الحجوزات (للإصلاح والتحقق)"""
+        count = ClassBooking.objects.filter(
+            session=session,
+            status__in=ClassBookingService.SEATED_STATUSES
+        ).count()
+        ClassSession.objects.filter(pk=session.pk).update(participants_count=count)
+        session.participants_count = count
+        return count
+
+
+class SessionMaterializerService:
+    """
+    توليد الحصص الفعلية من جداول الحصص لأفق متحرك (4 أسابيع افتراضياً)
+
+    كل تشغيل يضيف الفرق فقط (bulk_create مع ignore_conflicts على (schedule, date))
+    ويعالج تعديل الجداول وإيقافها بتحديثات جماعية على الحصص المستقبلية
+    """
+
+    DEFAULT_HORIZON_DAYS = 28
+
+    @staticmethod
+    def schedule_dates(day_of_week: int, start: date, end: date) -> Iterable[date]:
+        """
+        تواريخ يوم الجدول بين start و end (شاملة)
+
+        DayOfWeek يبدأ من السبت=0 بينما weekday() يبدأ من الاثنين=0
+        """
+        weekday = (day_of_week + 5) % 7
+        current = start + timedelta(days=(weekday - start.weekday()) % 7)
+        while current <= end:
+            yield current
+            current += timedelta(days=7)
+
+    @staticmethod
+    def _future_sessions(start: date, schedule_ids=None):
+        sessions = ClassSession.objects.filter(
+            date__gte=start,
+            status=ClassSession.Status.SCHEDULED
+        )
+        if schedule_ids is not None:
+            sessions = sessions.filter(schedule_id__in=schedule_ids)
+        return sessions
+
+    @staticmethod
+    def _retire(sessions) -> Dict[str, int]:
+        """
+        حذف الحصص المستقبلية بدون حجوزات وإلغاء المحجوزة (مع حجوزاتها)
+        """
+        has_bookings = ClassBooking.objects.filter(session=OuterRef('pk'))
+
+        deleted, _ = sessions.exclude(Exists(has_bookings)).delete()
+
+        booked_ids = list(sessions.filter(Exists(has_bookings)).values_list('id', flat=True))
+        cancelled = ClassSession.objects.filter(id__in=booked_ids).update(
+            status=ClassSession.Status.CANCELLED,
+            updated_at=timezone.now()
+        )
+        ClassBooking.objects.filter(
+            session_id__in=booked_ids,
+            status__in=[ClassBooking.Status.BOOKED, ClassBooking.Status.WAITLISTED]
+        ).update(
+            status=ClassBooking.Status.CANCELLED,
+            cancelled_at=timezone.now(),
+            updated_at=timezone.now()
+        )
+
+        return {'deleted': deleted, 'cancelled': cancelled}
+
+    @staticmethod
+    @transaction.atomic
+    def materialize(
+        horizon_days: int = DEFAULT_HORIZON_DAYS,
+        start: Optional[date] = None,
+        schedule_ids: Optional[Iterable[int]] = None
+    ) -> Dict[str, int]:
+        """
+        مزامنة الحصص المستقبلية مع الجداول
+
+        - إيقاف جدول: حذف/إلغاء حصصه المستقبلية
+        - تغيير اليوم: حذف/إلغاء الحصص التي لا تطابق اليوم الجديد
+        - تغيير السعة: تحديث capacity للحصص المستقبلية وترقية المنتظرين
+        - إضافة الحصص الناقصة فقط ضمن الأفق
+        """
+        start = start or timezone.localdate()
+        end = start + timedelta(days=horizon_days - 1)
+        if schedule_ids is not None:
+            schedule_ids = list(schedule_ids)
+
+        future = SessionMaterializerService._future_sessions(start, schedule_ids)
+
+        # الجداول الموقوفة
+        inactive = SessionMaterializerService._retire(
+            future.filter(schedule__is_active=False)
+        )
+
+        # الحصص التي لم يعد يومها يطابق الجدول (ExtractWeekDay: الأحد=1 ... السبت=7)
+        moved = SessionMaterializerService._retire(
+            future.annotate(
+                schedule_day=Mod(ExtractWeekDay('date'), 7)
+            ).exclude(schedule_day=F('schedule__day_of_week'))
+        )
+
+        # مزامنة السعة مع الجدول
+        max_participants = ClassSchedule.objects.filter(
+            pk=OuterRef('schedule_id')
+        ).values('max_participants')[:1]
+        resized = future.exclude(
+            capacity=Subquery(max_participants)
+        ).filter(capacity__isnull=False)
+        resized_ids = list(resized.values_list('id', flat=True))
+        capacity_updated = ClassSession.objects.filter(id__in=resized_ids).update(
+            capacity=Subquery(max_participants),
+            updated_at=timezone.now()
+        )
+
+        promoted = 0
+        waiting_sessions = ClassSession.objects.filter(
+            id__in=resized_ids,
+            participants_count__lt=F('capacity'),
+            bookings__status=ClassBooking.Status.WAITLISTED
+        ).distinct()
+        for session in waiting_sessions:
+            promoted += ClassBookingService.promote_waitlist(session)
+
+        # الحصص الناقصة فقط
+        schedules = ClassSchedule.objects.filter(is_active=True)
+        if schedule_ids is not None:
+            schedules = schedules.filter(id__in=schedule_ids)
+        schedules = list(schedules.values_list('id', 'day_of_week', 'max_participants'))
+
+        existing = set(
+            ClassSession.objects.filter(
+                schedule_id__in=[schedule_id for schedule_id, _, _ in schedules],
+                date__range=(start, end)
+            ).values_list('schedule_id', 'date')
+        )
+
+        missing = [
+            ClassSession(schedule_id=schedule_id, date=session_date, capacity=max_participants)
+            for schedule_id, day_of_week, max_participants in schedules
+            for session_date in SessionMaterializerService.schedule_dates(day_of_week, start, end)
+            if (schedule_id, session_date) not in existing
+        ]
+        ClassSession.objects.bulk_create(missing, batch_size=1000, ignore_conflicts=True)
+
+        return {
+            'created': len(missing),
+            'deleted': inactive['deleted'] + moved['deleted'],
+            'cancelled': inactive['cancelled'] + moved['cancelled'],
+            'capacity_updated': capacity_updated,
+            'promoted': promoted,
+        }
+
+
+class ScheduleIntervalIndex:
+    """
+    فهرس فترات في الذاكرة لجداول الحصص
+
+    لكل مفتاح (اليوم، القاعة) و (اليوم، المدرب) قائمة مرتبة بوقت البداية مع
+    أكبر وقت نهاية حتى كل موضع (prefix max). الفترات المخزنة قد تتداخل فيما
+    بينها (بيانات قديمة)، لذا يُرجع البحث من آخر فترة تبدأ قبل نهاية الفترة
+    الجديدة ويتوقف عندما لا تتجاوز أي فترة سابقة بدايتها (بحث ثنائي + المتداخلة فقط)
+    """
+
+    def __init__(self):
+        self._starts = defaultdict(list)
+        self._intervals = defaultdict(list)
+        self._max_ends = defaultdict(list)
+
+    @staticmethod
+    def room_key(day_of_week: int, room: Optional[str]):
+        room = (room or '').strip().casefold()
+        return ('room', day_of_week, room) if room else None
+
+    @staticmethod
+    def trainer_key(day_of_week: int, trainer_id: Optional[int]):
+        return ('trainer', day_of_week, trainer_id) if trainer_id else None
+
+    def add(self, key, start: time, end: time, schedule_id: int) -> None:
+        if key is None:
+            return
+        position = bisect_left(self._starts[key], start)
+        self._starts[key].insert(position, start)
+        self._intervals[key].insert(position, (start, end, schedule_id))
+        self._update_max_ends(key, position)
+
+    def _update_max_ends(self, key, position: int) -> None:
+        """إعادة حساب أكبر نهاية من الموضع المُدرج حتى آخر القائمة"""
+        max_ends = self._max_ends[key]
+        del max_ends[position:]
+        current = max_ends[-1] if max_ends else None
+        for _, end, _ in self._intervals[key][position:]:
+            current = end if current is None or end > current else current
+            max_ends.append(current)
+
+    def find_overlap(
+        self,
+        key,
+        start: time,
+        end: time,
+        exclude_id: Optional[int] = None
+    ) -> Optional[int]:
+        """معرف الجدول المتداخل مع [start, end) أو None"""
+        if key is None or key not in self._starts:
+            return None
+
+        intervals = self._intervals[key]
+        max_ends = self._max_ends[key]
+        position = bisect_left(self._starts[key], end) - 1
+
+        # كل الفترات قبل الموضع تبدأ قبل end؛ تتداخل إذا انتهت بعد start
+        while position >= 0 and max_ends[position] > start:
+            _, interval_end, schedule_id = intervals[position]
+            if interval_end > start and schedule_id != exclude_id:
+                return schedule_id
+            position -= 1
+        return None
+
+    @classmethod
+    def build(cls, rows) -> 'ScheduleIntervalIndex':
+        """بناء الفهرس من صفوف (id, day_of_week, start_time, end_time, room, trainer_id)"""
+        index = cls()
+        for schedule_id, day_of_week, start, end, room, trainer_id in rows:
+            index.add(cls.room_key(day_of_week, room), start, end, schedule_id)
+            index.add(cls.trainer_key(day_of_week, trainer_id), start, end, schedule_id)
+        return index
+
+
+class TimetableService:
+    """خدمات الجدول الأسبوعي وكشف تعارض القاعات والمدربين"""
+
+    VERSION_KEY = 'schedules:interval-index-version'
+
+    _lock = threading.Lock()
+    _index = None
+    _index_version = None
+
+    @staticmethod
+    def invalidate_index() -> None:
+        """رفع نسخة الفهرس حتى تعيد كل العمليات بناءه"""
+        try:
+            cache.incr(TimetableService.VERSION_KEY)
+        except ValueError:
+            cache.set(TimetableService.VERSION_KEY, 1, None)
+
+    @staticmethod
+    def get_index() -> ScheduleIntervalIndex:
+        """الفهرس الحالي (يعاد بناؤه باستعلام واحد عند تغير النسخة)"""
+        version = cache.get(TimetableService.VERSION_KEY, 0)
+
+        with TimetableService._lock:
+            if TimetableService._index is None or TimetableService._index_version != version:
+                rows = ClassSchedule.objects.filter(is_active=True).values_list(
+                    'id', 'day_of_week', 'start_time', 'end_time', 'room', 'trainer_id'
+                )
+                TimetableService._index = ScheduleIntervalIndex.build(rows)
+                TimetableService._index_version = version
+            return TimetableService._index
+
+    @staticmethod
+    def find_conflicts(
+        day_of_week: int,
+        start_time: time,
+        end_time: time,
+        room: Optional[str] = None,
+        trainer_id: Optional[int] = None,
+        exclude_id: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        تعارضات القاعة والمدرب للفترة المعطاة
+
+        يعيد {'room': schedule_id, 'trainer': schedule_id} للتعارضات الموجودة فقط
+        """
+        index = TimetableService.get_index()
+        conflicts = {}
+
+        room_conflict = index.find_overlap(
+            ScheduleIntervalIndex.room_key(day_of_week, room),
+            start_time, end_time, exclude_id
+        )
+        if room_conflict:
+            conflicts['room'] = room_conflict
+
+        trainer_conflict = index.find_overlap(
+            ScheduleIntervalIndex.trainer_key(day_of_week, trainer_id),
+            start_time, end_time, exclude_id
+        )
+        if trainer_conflict:
+            conflicts['trainer'] = trainer_conflict
+
+        return conflicts
+
+    @staticmethod
+    def week_start(day: date) -> date:
+        """بداية الأسبوع (السبت)"""
+        return day - timedelta(days=(day.weekday() - 5) % 7)
+
+    @staticmethod
+    def week_grid(
+        week_start: date,
+        room: Optional[str] = None,
+        trainer_id: Optional[int] = None,
+        sport_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        جدول الأسبوع (7 أيام من السبت) باستعلام واحد على الحصص
+        """
+        week_end = week_start + timedelta(days=6)
+
+        sessions = ClassSession.objects.filter(date__range=(week_start, week_end))
+        if room:
+            sessions = sessions.filter(schedule__room__iexact=room.strip())
+        if trainer_id:
+            sessions = sessions.filter(schedule__trainer_id=trainer_id)
+        if sport_id:
+            sessions = sessions.filter(schedule__sport_id=sport_id)
+
+        rows = sessions.order_by('date', 'schedule__start_time', 'schedule__room').values(
+            'id', 'date', 'status', 'participants_count', 'capacity',
+            'schedule_id', 'schedule__name', 'schedule__start_time', 'schedule__end_time',
+            'schedule__room', 'schedule__difficulty_level', 'schedule__max_participants',
+            'schedule__sport_id', 'schedule__sport__name',
+            'schedule__trainer_id', 'schedule__trainer__user__first_name',
+            'schedule__trainer__user__last_name',
+        )
+
+        days = {
+            week_start + timedelta(days=offset): {
+                'date': week_start + timedelta(days=offset),
+                'day_of_week': offset,
+                'day_name': ClassSchedule.DayOfWeek(offset).label,
+                'sessions': [],
+            }
+            for offset in range(7)
+        }
+
+        for row in rows:
+            capacity = row['capacity'] if row['capacity'] is not None else row['schedule__max_participants']
+            days[row['date']]['sessions'].append({
+                'session_id': row['id'],
+                'schedule_id': row['schedule_id'],
+                'name': row['schedule__name'],
+                'status': row['status'],
+                'start_time': row['schedule__start_time'],
+                'end_time': row['schedule__end_time'],
+                'room': row['schedule__room'],
+                'difficulty_level': row['schedule__difficulty_level'],
+                'sport_id': row['schedule__sport_id'],
+                'sport_name': row['schedule__sport__name'],
+                'trainer_id': row['schedule__trainer_id'],
+                'trainer_name': f"{row['schedule__trainer__user__first_name']} "
+                                f"{row['schedule__trainer__user__last_name']}".strip(),
+                'capacity': capacity,
+                'participants_count': row['participants_count'],
+                'available_spots': capacity - row['participants_count'],
+            })
+
+        return list(days.values())
+
+
+class AttendanceReconciliationService:
+    """
+    مطابقة سجلات الحضور مع حجوزات الحصص المنتهية
+
+    الحجز يعتبر حاضراً إذا وجد حضور لنفس العضو ونفس الرياضة في يوم الحصة
+    يتداخل مع وقتها (دخول قبل نهايتها، وخروج بعد بدايتها أو لم يسجل خروج).
+    المطابقة تتم بتحديثين جماعيين لكل يوم (ATTENDED ثم NO_SHOW)
+    """
+
+    @staticmethod
+    def _ended_sessions(day: date):
+        """حصص اليوم المنتهية وغير الملغاة"""
+        sessions = ClassSession.objects.filter(date=day).exclude(
+            status=ClassSession.Status.CANCELLED
+        )
+        now = timezone.localtime()
+        if day == now.date():
+            sessions = sessions.filter(schedule__end_time__lte=now.time())
+        elif day > now.date():
+            sessions = sessions.none()
+        return sessions
+
+    @staticmethod
+    @transaction.atomic
+    def reconcile_day(day: date, session_ids: Optional[List[int]] = None) -> Dict[str, int]:
+        """مطابقة حجوزات يوم واحد (أو دفعة حصص منه)"""
+        sessions = AttendanceReconciliationService._ended_sessions(day)
+        if session_ids is not None:
+            sessions = sessions.filter(id__in=session_ids)
+
+        bookings = ClassBooking.objects.filter(
+            session__in=sessions,
+            status=ClassBooking.Status.BOOKED
+        )
+
+        overlapping_attendance = Attendance.objects.on_local_date(day).filter(
+            member_id=OuterRef('member_id'),
+            sport_id=OuterRef('session__schedule__sport_id'),
+            check_in__time__lt=OuterRef('session__schedule__end_time'),
+        ).filter(
+            Q(check_out__isnull=True) |
+            Q(check_out__time__gt=OuterRef('session__schedule__start_time')) |
+            Q(check_out__gte=local_day_start(day + timedelta(days=1)))
+        )
+
+        now = timezone.now()
+        attended = bookings.filter(Exists(overlapping_attendance)).update(
+            status=ClassBooking.Status.ATTENDED,
+            updated_at=now
+        )
+        no_show = bookings.update(
+            status=ClassBooking.Status.NO_SHOW,
+            updated_at=now
+        )
+
+        # الحصة المنتهية تعرض من حضر فعلاً؛ SEATED_STATUSES (مع NO_SHOW) للمقاعد قبل المطابقة فقط
+        attendees = ClassBooking.objects.filter(
+            session_id=OuterRef('pk'),
+            status=ClassBooking.Status.ATTENDED
+        ).order_by().values('session_id').annotate(total=Count('id')).values('total')[:1]
+
+        completed = sessions.update(
+            status=ClassSession.Status.COMPLETED,
+            participants_count=Coalesce(Subquery(attendees), Value(0)),
+            updated_at=now
+        )
+
+        return {'attended': attended, 'no_show': no_show, 'sessions': completed}
+
+    @staticmethod
+    def reconcile_range(start: date, end: date, chunk_size: int = 500) -> Dict[str, int]:
+        """
+        مطابقة فترة تاريخية يوماً بيوم، مع تقسيم حصص اليوم الكبير إلى دفعات
+        (كل دفعة في معاملة مستقلة)
+        """
+        totals = {'attended': 0, 'no_show': 0, 'sessions': 0, 'days': 0}
+
+        day = start
+        while day <= end:
+            session_ids = list(
+                AttendanceReconciliationService._ended_sessions(day)
+                .order_by('id').values_list('id', flat=True)
+            )
+            for i in range(0, len(session_ids), chunk_size):
+                result = AttendanceReconciliationService.reconcile_day(
+                    day, session_ids=session_ids[i:i + chunk_size]
+                )
+                for key, value in result.items():
+                    totals[key] += value
+
+            totals['days'] += 1
+            day += timedelta(days=1)
+
+        return totals
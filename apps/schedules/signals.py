@@ -0,0 +1,64 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+import logging
+
+from .models import ClassSchedule
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=ClassSchedule)
+def class_schedule_post_save(sender, instance, created, **kwargs):
+    """
+    مزامنة حصص الجدول بعد إنشائه أو تعديله (اليوم، السعة، الإيقاف)
+    """
+    try:
+        from .services import SessionMaterializerService
+        
+        SessionMaterializerService.materialize(schedule_ids=[instance.pk])
+    
+    except Exception as e:
+        logger.error(f"خطأ في مزامنة حصص الجدول: {str(e)}")
+
+
+@receiver(post_save, sender=ClassSchedule)
+@receiver(post_delete, sender=ClassSchedule)
+def class_schedule_interval_index_invalidate(sender, instance, **kwargs):
+    """
+    إبطال فهرس فترات القاعات والمدربين بعد أي تعديل على الجداول
+    """
+    try:
+        from .services import TimetableService
+        
+        TimetableService.invalidate_index()
+    
+    except Exception as e:
+        logger.error(f"خطأ في إبطال فهرس الجداول: {str(e)}")
+
+
+@receiver(pre_save, sender=ClassSchedule)
+def class_schedule_pre_save(sender, instance, **kwargs):
+    """حفظ المدرب السابق لإبطال أوقاته عند نقل الجدول لمدرب آخر"""
+    
+    instance._previous_trainer_id = None
+    if instance.pk:
+        instance._previous_trainer_id = ClassSchedule.objects.filter(
+            pk=instance.pk
+        ).values_list('trainer_id', flat=True).first()
+
+
+@receiver(post_save, sender=ClassSchedule)
+@receiver(post_delete, sender=ClassSchedule)
+def class_schedule_trainer_slots_invalidate(sender, instance, **kwargs):
+    """
+    إبطال أوقات التدريب الخاص الحرة للمدرب المسند للجدول
+    """
+    try:
+        from apps.trainers.services import TrainerSlotService
+        
+        trainer_ids = {instance.trainer_id, getattr(instance, '_previous_trainer_id', None)}
+        for trainer_id in trainer_ids - {None}:
+            TrainerSlotService.invalidate_trainer(trainer_id)
+    
+    except Exception as e:
+        logger.error(f"خطأ في إبطال أوقات المدرب: {str(e)}")
@@ -0,0 +1,47 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def materialize_class_sessions(horizon_days=None):
+    """
+    توليد الحصص الفعلية من الجداول للأسابيع القادمة
+    يتم تشغيله يومياً الساعة 2 صباحاً
+    """
+    try:
+        from .services import SessionMaterializerService
+        
+        result = SessionMaterializerService.materialize(
+            horizon_days=horizon_days or SessionMaterializerService.DEFAULT_HORIZON_DAYS
+        )
+        logger.info(f"✓ توليد الحصص: {result}")
+        return result
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في توليد الحصص: {str(e)}")
+        raise
+
+
+@shared_task
+def reconcile_class_attendance(days_back=1):
+    """
+    مطابقة الحضور مع حجوزات الحصص المنتهية (حضر / لم يحضر)
+    يتم تشغيله كل ساعة ويغطي اليوم الحالي والأيام السابقة القريبة
+    """
+    try:
+        from datetime import timedelta
+        from django.utils import timezone
+        from .services import AttendanceReconciliationService
+        
+        today = timezone.localdate()
+        result = AttendanceReconciliationService.reconcile_range(
+            today - timedelta(days=days_back), today
+        )
+        logger.info(f"✓ مطابقة حضور الحصص: {result}")
+        return result
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في مطابقة حضور الحصص: {str(e)}")
+        raise
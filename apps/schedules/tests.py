@@ -0,0 +1,142 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.attendance.models import Attendance
+from apps.members.models import Member
+from apps.sports.models import Sport
+from apps.subscriptions.models import Subscription, SubscriptionPlan
+from apps.trainers.models import Trainer
+
+from .models import ClassBooking, ClassSchedule, ClassSession
+from .services import AttendanceReconciliationService, ScheduleIntervalIndex
+from .views import ClassBookingViewSet, ClassScheduleViewSet
+
+
+ROOM = ScheduleIntervalIndex.room_key(0, 'A')
+
+
+def _index(*intervals):
+    index = ScheduleIntervalIndex()
+    for schedule_id, (start, end) in enumerate(intervals, start=1):
+        index.add(ROOM, time(*start), time(*end), schedule_id)
+    return index
+
+
+@pytest.mark.unit
+class TestScheduleIntervalIndex:
+    """كشف التداخل في فهرس الفترات"""
+
+    def test_adjacent_intervals_do_not_overlap(self):
+        index = _index(((9, 0), (10, 0)))
+        assert index.find_overlap(ROOM, time(10, 0), time(11, 0)) is None
+        assert index.find_overlap(ROOM, time(8, 0), time(9, 0)) is None
+
+    def test_overlap_with_predecessor(self):
+        index = _index(((9, 0), (10, 0)))
+        assert index.find_overlap(ROOM, time(9, 30), time(10, 30)) == 1
+
+    def test_overlap_hidden_behind_nested_interval(self):
+        """09:00-12:00 و 10:00-11:00 موجودتان: 11:30-12:30 تتداخل مع الأولى"""
+        index = _index(((9, 0), (12, 0)), ((10, 0), (11, 0)))
+        assert index.find_overlap(ROOM, time(11, 30), time(12, 30)) == 1
+
+    def test_overlap_inserted_out_of_order(self):
+        index = _index(((10, 0), (11, 0)), ((9, 0), (12, 0)))
+        assert index.find_overlap(ROOM, time(11, 30), time(12, 30)) == 2
+
+    def test_exclude_self_keeps_searching(self):
+        index = _index(((9, 0), (12, 0)), ((10, 0), (11, 0)))
+        assert index.find_overlap(ROOM, time(10, 0), time(11, 0), exclude_id=2) == 1
+        assert index.find_overlap(ROOM, time(11, 30), time(12, 30), exclude_id=1) is None
+
+    def test_other_keys_are_independent(self):
+        index = _index(((9, 0), (12, 0)))
+        other_room = ScheduleIntervalIndex.room_key(0, 'B')
+        other_day = ScheduleIntervalIndex.room_key(1, 'A')
+        assert index.find_overlap(other_room, time(10, 0), time(11, 0)) is None
+        assert index.find_overlap(other_day, time(10, 0), time(11, 0)) is None
+
+
+@pytest.mark.api
+class TestTimetableParams:
+    """معاملات الجدول الأسبوعي غير الصحيحة تُرفض بـ 400"""
+
+    @pytest.mark.parametrize('params', [
+        {'trainer_id': 'abc'},
+        {'sport_id': 'x1'},
+        {'trainer_id': '0'},
+        {'week': '2024-13-40'},
+    ])
+    def test_invalid_params(self, params):
+        request = APIRequestFactory().get('/schedules/timetable/', params)
+        force_authenticate(request, user=get_user_model()(phone='+966500000000'))
+
+        response = ClassScheduleViewSet.as_view({'get': 'timetable'})(request)
+
+        assert response.status_code == 400
+
+
+@pytest.mark.api
+class TestWaitlistParams:
+    """معرف الحصة في قائمة الانتظار يجب أن يكون رقماً"""
+
+    @pytest.mark.parametrize('params', [{}, {'session_id': 'abc'}, {'session_id': '0'}])
+    def test_invalid_session_id(self, params):
+        request = APIRequestFactory().get('/schedules/bookings/waitlist/', params)
+        force_authenticate(request, user=get_user_model()(phone='+966500000000'))
+
+        response = ClassBookingViewSet.as_view({'get': 'waitlist'})(request)
+
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestAttendanceReconciliation:
+    """مطابقة حجوزات الحصص المنتهية مع سجلات الحضور"""
+
+    def test_reconcile_day(self, db):
+        day = timezone.localdate() - timedelta(days=1)
+        User = get_user_model()
+        sport = Sport.objects.create(name='سباحة', slug='swim')
+        trainer = Trainer.objects.create(
+            user=User.objects.create_user(phone='+966500000100', first_name='مدرب'),
+            trainer_id='TR0001', hire_date=day
+        )
+        schedule = ClassSchedule.objects.create(
+            sport=sport, trainer=trainer, day_of_week=day.weekday(),
+            start_time=time(9, 0), end_time=time(10, 0), room='A'
+        )
+        session = ClassSession.objects.create(schedule=schedule, date=day, participants_count=2)
+        plan = SubscriptionPlan.objects.create(name='شهري', duration_type='monthly', duration_days=30)
+
+        bookings, subscriptions = [], []
+        for n in (1, 2):
+            member = Member.objects.create(
+                user=User.objects.create_user(phone=f'+96650000000{n}', first_name='عضو'),
+                member_id=f'GYM00000{n}', gender='male', date_of_birth='1990-01-01',
+                emergency_contact_name='-', emergency_contact_phone='-'
+            )
+            subscriptions.append(Subscription.objects.create(
+                member=member, plan=plan, subscription_number=f'S{n}', start_date=day,
+                end_date=day + timedelta(days=30), original_price=100, final_price=100
+            ))
+            bookings.append(ClassBooking.objects.create(session=session, member=member))
+        # الأول حضر أثناء الحصة والثاني لم يحضر
+        Attendance.objects.create(
+            member=bookings[0].member, subscription=subscriptions[0], sport=sport, check_in=timezone.make_aware(datetime.combine(day, time(9, 15)))
+        )
+
+        result = AttendanceReconciliationService.reconcile_day(day)
+
+        assert result == {'attended': 1, 'no_show': 1, 'sessions': 1}
+        bookings[0].refresh_from_db()
+        bookings[1].refresh_from_db()
+        session.refresh_from_db()
+        assert bookings[0].status == ClassBooking.Status.ATTENDED
+        assert bookings[1].status == ClassBooking.Status.NO_SHOW
+        assert session.status == ClassSession.Status.COMPLETED
+        assert session.participants_count == 1
@@ -1,22 +1,157 @@
-from rest_framework import viewsets
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.serializers import FastSerializerMixin
+from apps.members.models import Member
 from .models import ClassSchedule, ClassSession, ClassBooking
 from .serializers import (
     ClassScheduleSerializer,
     ClassSessionSerializer,
+    ClassSessionFastSerializer,
     ClassBookingSerializer,
+    ClassBookRequestSerializer,
+    TimetableQuerySerializer,
+    WaitlistQuerySerializer,
 )
+from .services import ClassBookingService, TimetableService
 
 
 class ClassScheduleViewSet(viewsets.ModelViewSet):
-    queryset = ClassSchedule.objects.select_related('class_type', 'trainer', 'room').all()
+    queryset = ClassSchedule.objects.select_related('sport', 'trainer__user').all()
     serializer_class = ClassScheduleSerializer
+    
+    @action(detail=False, methods=['get'])
+    def timetable(self, request):
+        """جدول الأسبوع (من السبت إلى الجمعة)
+        
+        Parameters:
+        - week (اختياري): أي تاريخ داخل الأسبوع YYYY-MM-DD (افتراضي: الأسبوع الحالي)
+        - room (اختياري): القاعة
+        - trainer_id (اختياري): معرف المدرب
+        - sport_id (اختياري): معرف الرياضة
+        """
+        query = TimetableQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = query.validated_data
+        week_start = TimetableService.week_start(params.get('week') or timezone.localdate())
+        grid = TimetableService.week_grid(
+            week_start=week_start,
+            room=params.get('room'),
+            trainer_id=params.get('trainer_id'),
+            sport_id=params.get('sport_id')
+        )
+        
+        return Response({
+            'week_start': week_start,
+            'days': grid
+        })
 
 
-class ClassSessionViewSet(viewsets.ModelViewSet):
+class ClassSessionViewSet(FastSerializerMixin, viewsets.ModelViewSet):
     queryset = ClassSession.objects.select_related('schedule').all()
     serializer_class = ClassSessionSerializer
+    fast_serializer_classes = {'list': ClassSessionFastSerializer}
 
 
 class ClassBookingViewSet(viewsets.ModelViewSet):
     queryset = ClassBooking.objects.select_related('session', 'member').all()
-    serializer_class = ClassBookingSerializer
\ No newline at end of file
+    serializer_class = ClassBookingSerializer
+    # التعديل والحذف المباشران يتجاوزان عداد المقاعد: الحجز عبر create والإلغاء عبر cancel فقط
+    http_method_names = ['get', 'post', 'head', 'options']
+    
+    def create(self, request, *args, **kwargs):
+        """حجز حصة (أو الانضمام لقائمة الانتظار إذا كانت ممتلئة)
+        
+        Parameters:
+        - session_id: معرف الحصة
+        - member_id (اختياري): معرف العضو (افتراضي: العضو الحالي)
+        - allow_waitlist (اختياري): الانضمام لقائمة الانتظار عند الامتلاء (افتراضي: true)
+        """
+        serializer = ClassBookRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        try:
+            session = ClassSession.objects.select_related('schedule').get(id=data['session_id'])
+            
+            if data.get('member_id'):
+                member = Member.objects.get(id=data['member_id'])
+            elif hasattr(request.user, 'member_profile'):
+                member = request.user.member_profile
+            else:
+                return Response(
+                    {'error': 'يجب تحديد العضو'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            booking = ClassBookingService.book(
+                session=session,
+                member=member,
+                allow_waitlist=data['allow_waitlist']
+            )
+            
+            waitlisted = booking.status == ClassBooking.Status.WAITLISTED
+            return Response({
+                'message': 'تمت الإضافة لقائمة الانتظار' if waitlisted else 'تم الحجز بنجاح',
+                'data': ClassBookingSerializer(booking).data,
+                'waitlist_position': ClassBookingService.waitlist_position(booking)
+            }, status=status.HTTP_201_CREATED)
+            
+        except ClassSession.DoesNotExist:
+            return Response(
+                {'error': 'الحصة غير موجودة'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Member.DoesNotExist:
+            return Response(
+                {'error': 'العضو غير موجود'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': e.messages[0]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """إلغاء الحجز مع ترقية أول المنتظرين"""
+        booking = self.get_object()
+        
+        try:
+            promoted = ClassBookingService.cancel(booking)
+        except ValidationError as e:
+            return Response(
+                {'error': e.messages[0]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            'message': 'تم إلغاء الحجز',
+            'promoted_booking_id': promoted.id if promoted else None
+        })
+    
+    @action(detail=False, methods=['get'])
+    def waitlist(self, request):
+        """قائمة انتظار حصة بترتيب الوصول
+        
+        Parameters:
+        - session_id: معرف الحصة
+        """
+        query = WaitlistQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        bookings = self.get_queryset().filter(
+            session_id=query.validated_data['session_id'],
+            status=ClassBooking.Status.WAITLISTED
+        ).order_by('booked_at', 'id')
+        
+        return Response({
+            'count': len(bookings),
+            'data': ClassBookingSerializer(bookings, many=True).data
+        })
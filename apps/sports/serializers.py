@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core import refdata
 from .models import SportCategory, Sport, Belt
 
 
@@ -97,8 +98,8 @@ class SportCategoryListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
     
     def get_sports_count(self, obj):
-        """عدد الرياضات النشطة في التصنيف"""
-        return obj.sports.filter(is_active=True).count()
+        """عدد الرياضات النشطة في التصنيف (محسوب في الذاكرة المرجعية)"""
+        return refdata.categories.sports_count(obj.id)
 
 
 class SportCategoryDetailSerializer(serializers.ModelSerializer):
@@ -117,7 +118,7 @@ class SportCategoryDetailSerializer(serializers.ModelSerializer):
     
     def get_sports_count(self, obj):
         """عدد الرياضات"""
-        return obj.sports.filter(is_active=True).count()
+        return refdata.categories.sports_count(obj.id)
 
 
 class SportCategoryCreateSerializer(serializers.ModelSerializer):
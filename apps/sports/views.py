@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Count, Q
 
+from core import refdata
 from .models import SportCategory, Sport, Belt
 from .serializers import (
     SportCategoryListSerializer,
@@ -20,9 +21,8 @@ from .serializers import (
 class SportCategoryViewSet(viewsets.ModelViewSet):
     """API تصنيفات الرياضات - عرض وإدارة التصنيفات"""
     
-    queryset = SportCategory.objects.annotate(
-        sports_count=Count('sports', filter=Q(sports__is_active=True))
-    ).filter(is_active=True)
+    # عدد الرياضات من الذاكرة المرجعية بدل annotate في كل طلب
+    queryset = SportCategory.objects.filter(is_active=True)
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['is_active']
@@ -61,8 +61,8 @@ class SportCategoryViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def active_categories(self, request):
-        """التصنيفات النشطة فقط"""
-        categories = self.queryset.filter(is_active=True)
+        """التصنيفات النشطة فقط (من الذاكرة المرجعية)"""
+        categories = refdata.categories.filter(is_active=True)
         serializer = SportCategoryListSerializer(categories, many=True)
         
         return Response({
@@ -183,7 +183,7 @@ class SportViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            belts = sport.belts.all().order_by('order')
+            belts = refdata.belts.for_sport(sport.id)
             serializer = BeltSerializer(belts, many=True)
             
             return Response({
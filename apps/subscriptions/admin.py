@@ -14,6 +14,10 @@ from .models import (
     Subscription,
     SubscriptionFreeze
 )
+from .events import SubscriptionCreated
+from .exports import SubscriptionExporter
+from core.events import EventBus
+from core.exports import ExportAdminMixin
 
 
 class PlanSportPriceInline(admin.TabularInline):
@@ -216,7 +220,7 @@ class SubscriptionFreezeInline(admin.TabularInline):
 
 
 @admin.register(Subscription)
-class SubscriptionAdmin(admin.ModelAdmin):
+class SubscriptionAdmin(ExportAdminMixin, admin.ModelAdmin):
     """لوحة إدارة الاشتراكات"""
     
     list_display = [
@@ -243,6 +247,15 @@ class SubscriptionAdmin(admin.ModelAdmin):
     
     inlines = [SubscriptionFreezeInline]
     
+    def save_model(self, request, obj, form, change):
+        # الاشتراك الجديد يُفعّل وينشر SubscriptionCreated كما في create_subscription
+        # (الإرسال بعد commit فتكون الرياضات من save_related محفوظة)
+        if not change and obj.status == Subscription.Status.PENDING:
+            obj.status = Subscription.Status.ACTIVE
+        super().save_model(request, obj, form, change)
+        if not change:
+            EventBus.publish(SubscriptionCreated(subscription_id=obj.pk))
+    
     fieldsets = (
         (_('معلومات الاشتراك'), {
             'fields': (
@@ -407,8 +420,9 @@ class SubscriptionAdmin(admin.ModelAdmin):
     actions = [
         'activate_subscriptions', 'freeze_subscriptions',
         'expire_subscriptions', 'cancel_subscriptions',
-        'extend_subscriptions'
+        'extend_subscriptions', 'export_csv', 'export_xlsx'
     ]
+    exporter_class = SubscriptionExporter
     
     @admin.action(description=_('✓ تفعيل الاشتراكات المحددة'))
     def activate_subscriptions(self, request, queryset):
@@ -9,5 +9,6 @@ class SubscriptionsConfig(AppConfig):
     verbose_name = 'الاشتراكات'
     
     def ready(self):
-        """استدعاء الإشارات عند تحميل التطبيق"""
+        """استدعاء الإشارات ومعالجات الأحداث عند تحميل التطبيق"""
         import apps.subscriptions.signals  # noqa
+        import apps.subscriptions.handlers  # noqa
@@ -0,0 +1,8 @@
+from core.events import DomainEvent
+
+
+class SubscriptionCreated(DomainEvent):
+    """اشتراك جديد (بما فيه التجديد)"""
+
+    name = 'subscriptions.subscription_created'
+    fields = ('subscription_id',)
@@ -0,0 +1,25 @@
+from core.exports import EMPTY, Column, Exporter, choice_display, date_format, local_datetime
+from core.serializers import full_name
+
+from .models import Subscription
+
+
+class SubscriptionExporter(Exporter):
+    """تصدير الاشتراكات"""
+
+    filename = 'subscriptions'
+    columns = (
+        Column('رقم الاشتراك', 'subscription_number'),
+        Column('العضو', 'member__user__first_name', 'member__user__last_name', format=full_name),
+        Column('الهاتف', 'member__user__phone'),
+        Column('الخطة', 'plan__name'),
+        Column('الباقة', 'package__name', empty=EMPTY),
+        Column('تاريخ البداية', 'start_date', format=date_format('%d-%m-%Y')),
+        Column('تاريخ الانتهاء', 'end_date', format=date_format('%d-%m-%Y')),
+        Column('الحالة', 'status', format=choice_display(Subscription, 'status')),
+        Column('السعر الأصلي', 'original_price'),
+        Column('الخصم', 'discount_amount'),
+        Column('السعر النهائي', 'final_price'),
+        Column('أيام التجميد المتبقية', 'freeze_days_remaining'),
+        Column('تاريخ الإنشاء', 'created_at', format=local_datetime('%d-%m-%Y')),
+    )
@@ -0,0 +1,43 @@
+import logging
+
+from core.events import EventBus
+from .events import SubscriptionCreated
+
+logger = logging.getLogger(__name__)
+
+
+@EventBus.subscribe(SubscriptionCreated, background=True)
+def send_subscription_notification(event):
+    """إشعار باشتراك جديد"""
+    from apps.notifications.models import Notification
+    from .models import Subscription
+    
+    subscription = Subscription.objects.select_related('member').get(pk=event.subscription_id)
+    sports_list = ', '.join(subscription.sports.values_list('name', flat=True))
+    
+    Notification.objects.create(
+        user_id=subscription.member.user_id,
+        title="اشتراك جديد ✓",
+        body=f"تم تفعيل اشتراكك الجديد في {sports_list}. استمتع بالجلسات!"
+    )
+    
+    logger.info(f"تم إرسال إشعار اشتراك للعضو {subscription.member.member_id}")
+
+
+@EventBus.subscribe(SubscriptionCreated)
+def grant_subscription_points(event):
+    """منح نقاط الاشتراك (1 نقطة لكل 10 ريالات من السعر النهائي)"""
+    from apps.rewards.services import RewardService
+    from .models import Subscription
+    
+    subscription = Subscription.objects.select_related('member', 'plan').get(pk=event.subscription_id)
+    points = int(subscription.final_price / 10)
+    
+    if points > 0:
+        RewardService.add_points(
+            member=subscription.member,
+            points=points,
+            description=f'نقاط الاشتراك - {subscription.plan.name}'
+        )
+        
+        logger.info(f"تم منح {points} نقطة للعضو {subscription.member.member_id}")
@@ -0,0 +1,91 @@
+from django.utils import timezone
+
+from apps.members.models import Member
+from apps.sports.models import Sport
+from core.imports import (
+    ImportRowError, Importer, to_choice, to_date, to_datetime, to_decimal, to_int, value
+)
+
+from .models import Subscription, SubscriptionPlan
+
+
+class SubscriptionImporter(Importer):
+    """
+    استيراد الاشتراكات
+
+    الأعمدة: member_id*, plan* (اسم الخطة), sports (أسماء أو روابط مفصولة بـ |),
+    subscription_number, start_date*, end_date*, status, original_price, discount_amount,
+    final_price*, freeze_days_used, freeze_days_remaining, notes, created_at
+    """
+
+    name = 'subscriptions'
+    model = Subscription
+    key_field = 'subscription_number'
+    number_prefix = 'SUB'
+
+    def prepare(self):
+        self.members = self.session.key_map(Member, 'member_id')
+        self.plans = dict(SubscriptionPlan.objects.values_list('name', 'pk'))
+        self.sports = dict(Sport.objects.values_list('name', 'pk'))
+        self.sports.update(Sport.objects.values_list('slug', 'pk'))
+
+    def build(self, row):
+        plan = value(row, 'plan', required=True)
+        if plan not in self.plans:
+            raise ImportRowError(f'الخطة غير موجودة: {plan}')
+
+        sport_ids = []
+        for sport in str(value(row, 'sports', default='')).split('|'):
+            sport = sport.strip()
+            if not sport:
+                continue
+            if sport not in self.sports:
+                raise ImportRowError(f'الرياضة غير موجودة: {sport}')
+            sport_ids.append(self.sports[sport])
+
+        final_price = to_decimal(row, 'final_price', required=True)
+        subscription = Subscription(
+            subscription_number=self.key_value(row),
+            member_id=self.members.get(value(row, 'member_id', required=True), 'العضو'),
+            plan_id=self.plans[plan],
+            start_date=to_date(row, 'start_date', required=True),
+            end_date=to_date(row, 'end_date', required=True),
+            status=to_choice(row, 'status', Subscription, default=Subscription.Status.ACTIVE),
+            original_price=to_decimal(row, 'original_price', default=final_price),
+            discount_amount=to_decimal(row, 'discount_amount'),
+            final_price=final_price,
+            freeze_days_used=to_int(row, 'freeze_days_used'),
+            freeze_days_remaining=to_int(row, 'freeze_days_remaining'),
+            notes=value(row, 'notes'),
+            created_at=to_datetime(row, 'created_at', default=timezone.now()),
+        )
+        subscription._import_sports = list(dict.fromkeys(sport_ids))
+        return subscription
+
+    def after_save(self, objects):
+        Through = Subscription.sports.through
+        Through.objects.bulk_create([
+            Through(subscription_id=subscription.pk, sport_id=sport_id)
+            for subscription in objects
+            for sport_id in subscription._import_sports
+        ])
+        self.session.member_ids.update(subscription.member_id for subscription in objects)
+
+    def finalize(self):
+        self.session.defer('subscriptions.expire', expire_imported_subscriptions)
+        self.session.defer('members.scan_cache', lambda: invalidate_scan_cache(self.session.member_ids))
+
+
+def expire_imported_subscriptions():
+    """الاشتراكات النشطة التي انتهى تاريخها في البيانات القديمة (تحديث واحد)"""
+    return Subscription.objects.filter(
+        status=Subscription.Status.ACTIVE,
+        end_date__lt=timezone.localdate()
+    ).update(status=Subscription.Status.EXPIRED)
+
+
+def invalidate_scan_cache(member_ids):
+    from apps.members.services import MemberScanLookupService
+
+    for member_pk in member_ids:
+        MemberScanLookupService.invalidate_member(member_pk)
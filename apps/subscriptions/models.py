@@ -168,6 +168,15 @@ class Subscription(models.Model):
         verbose_name = 'اشتراك'
         verbose_name_plural = 'الاشتراكات'
         ordering = ['-created_at']
+        indexes = [
+            # الاشتراك الحالي للعضو (الدخول، إنشاء اشتراك جديد)
+            models.Index(fields=['member', 'status', 'end_date'], name='subscription_member_idx'),
+            # الاشتراكات النشطة حسب تاريخ الانتهاء (المنتهية، قريبة الانتهاء)
+            models.Index(
+                fields=['end_date'], name='subscription_active_end_idx',
+                condition=models.Q(status='active')
+            ),
+        ]
     
     def __str__(self):
         return f"{self.member} - {self.plan} ({self.status})"
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from core import refdata
+from core.serializers import FastSerializer, full_name, model_property
 from .models import (
     SubscriptionPlan, 
     PlanSportPrice, 
@@ -90,6 +92,17 @@ class SubscriptionListSerializer(serializers.ModelSerializer):
         ]
 
 
+class SubscriptionListFastSerializer(FastSerializer):
+    """المسار السريع لـ SubscriptionListSerializer (قراءة فقط)"""
+    
+    serializer_class = SubscriptionListSerializer
+    computed = {
+        'member_name': (('member__user__first_name', 'member__user__last_name'), full_name),
+        'days_remaining': model_property(Subscription, 'days_remaining', 'status', 'end_date'),
+        'is_expiring_soon': model_property(Subscription, 'is_expiring_soon', 'status', 'end_date'),
+    }
+
+
 class SubscriptionDetailSerializer(serializers.ModelSerializer):
     """سيريلايزر تفاصيل الاشتراك"""
     
@@ -146,16 +159,13 @@ class SubscriptionCreateSerializer(serializers.Serializer):
         return value
     
     def validate_plan_id(self, value):
-        try:
-            SubscriptionPlan.objects.get(id=value, is_active=True)
-        except SubscriptionPlan.DoesNotExist:
+        if not refdata.plans.exists(value, is_active=True):
             raise serializers.ValidationError("خطة الاشتراك غير موجودة أو غير نشطة")
         return value
     
     def validate_sport_ids(self, value):
-        from apps.sports.models import Sport
-        sports = Sport.objects.filter(id__in=value, is_active=True)
-        if sports.count() != len(value):
+        sports = [sport for sport in refdata.sports.get_many(value).values() if sport.is_active]
+        if len(sports) != len(value):
             raise serializers.ValidationError("بعض الرياضات غير موجودة أو غير نشطة")
         return value
 
@@ -186,15 +196,12 @@ class CalculatePriceSerializer(serializers.Serializer):
     promo_code = serializers.CharField(required=False, allow_blank=True)
     
     def validate_plan_id(self, value):
-        try:
-            SubscriptionPlan.objects.get(id=value, is_active=True)
-        except SubscriptionPlan.DoesNotExist:
+        if not refdata.plans.exists(value, is_active=True):
             raise serializers.ValidationError("خطة الاشتراك غير موجودة")
         return value
     
     def validate_sport_ids(self, value):
-        from apps.sports.models import Sport
-        sports = Sport.objects.filter(id__in=value, is_active=True)
-        if sports.count() != len(value):
+        sports = [sport for sport in refdata.sports.get_many(value).values() if sport.is_active]
+        if len(sports) != len(value):
             raise serializers.ValidationError("بعض الرياضات غير موجودة")
         return value
@@ -7,11 +7,13 @@ from django.core.exceptions import ValidationError
 
 from apps.members.models import Member
 from apps.sports.models import Sport
+from core import refdata
+from core.events import EventBus
+from .events import SubscriptionCreated
 from .models import (
     Subscription, 
     SubscriptionPlan, 
     Package, 
-    PlanSportPrice,
     SubscriptionFreeze
 )
 
@@ -33,14 +35,10 @@ class SubscriptionService:
         
         # حساب سعر كل رياضة
         for sport in sports:
-            try:
-                sport_price = PlanSportPrice.objects.get(
-                    plan=plan, 
-                    sport=sport
-                )
-                original_price += sport_price.price
-            except PlanSportPrice.DoesNotExist:
+            sport_price = refdata.plan_prices.get((plan.id, sport.id))
+            if sport_price is None:
                 raise ValidationError(f"لا يوجد سعر محدد لـ {sport.name} في هذه الخطة")
+            original_price += sport_price.price
         
         discount_amount = Decimal('0.00')
         
@@ -139,13 +137,16 @@ class SubscriptionService:
             freeze_days_remaining=plan.freeze_days_allowed,
             guest_passes_remaining=plan.guest_passes,
             pt_sessions_remaining=plan.personal_training_sessions,
-            status=Subscription.Status.PENDING,
+            # التفعيل مباشرة (كان يتم بحفظ ثانٍ داخل post_save)
+            status=Subscription.Status.ACTIVE,
             notes=notes
         )
         
         # إضافة الرياضات
         subscription.sports.set(sports)
         
+        EventBus.publish(SubscriptionCreated(subscription_id=subscription.pk))
+        
         return subscription
     
     @staticmethod
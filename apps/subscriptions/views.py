@@ -11,38 +11,47 @@ from .serializers import (
     SubscriptionPlanSerializer,
     PackageSerializer,
     SubscriptionListSerializer,
+    SubscriptionListFastSerializer,
     SubscriptionDetailSerializer,
     SubscriptionCreateSerializer,
     SubscriptionFreezeCreateSerializer,
     SubscriptionRenewSerializer,
     CalculatePriceSerializer
 )
+from .exports import SubscriptionExporter
 from .services import SubscriptionService
+from core import refdata
+from core.exports import ExportViewMixin
+from core.refdata import RefDataViewMixin
+from core.serializers import FastSerializerMixin
 from apps.members.models import Member
-from apps.sports.models import Sport
 
 
-class SubscriptionPlanViewSet(viewsets.ReadOnlyModelViewSet):
-    """API خطط الاشتراك"""
+class SubscriptionPlanViewSet(RefDataViewMixin, viewsets.ReadOnlyModelViewSet):
+    """API خطط الاشتراك (من الذاكرة المرجعية مع أسعار الرياضات)"""
     
     queryset = SubscriptionPlan.objects.filter(is_active=True)
     serializer_class = SubscriptionPlanSerializer
     permission_classes = [IsAuthenticated]
+    refdata_table = refdata.plans
+    refdata_filter = {'is_active': True}
     
     def list(self, request, *args, **kwargs):
         """عرض جميع خطط الاشتراك النشطة"""
         return super().list(request, *args, **kwargs)
 
 
-class PackageViewSet(viewsets.ReadOnlyModelViewSet):
-    """API الباقات"""
+class PackageViewSet(RefDataViewMixin, viewsets.ReadOnlyModelViewSet):
+    """API الباقات (من الذاكرة المرجعية)"""
     
     queryset = Package.objects.filter(is_active=True)
     serializer_class = PackageSerializer
     permission_classes = [IsAuthenticated]
+    refdata_table = refdata.packages
+    refdata_filter = {'is_active': True}
 
 
-class SubscriptionViewSet(viewsets.ModelViewSet):
+class SubscriptionViewSet(ExportViewMixin, FastSerializerMixin, viewsets.ModelViewSet):
     """API الاشتراكات"""
     
     queryset = Subscription.objects.select_related(
@@ -51,6 +60,8 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['status', 'member', 'plan']
+    fast_serializer_classes = {'list': SubscriptionListFastSerializer}
+    exporter_class = SubscriptionExporter
     
     def get_serializer_class(self):
         """اختيار Serializer حسب الـ Action"""
@@ -90,11 +101,11 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         
         try:
             member = Member.objects.get(id=data['member_id'])
-            plan = SubscriptionPlan.objects.get(id=data['plan_id'])
-            sports = list(Sport.objects.filter(id__in=data['sport_ids']))
+            plan = refdata.plans.require(data['plan_id'])
+            sports = list(refdata.sports.get_many(data['sport_ids']).values())
             package = None
             if data.get('package_id'):
-                package = Package.objects.get(id=data['package_id'])
+                package = refdata.packages.require(data['package_id'])
             
             subscription = SubscriptionService.create_subscription(
                 member=member,
@@ -126,11 +137,11 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         data = serializer.validated_data
         
         try:
-            plan = SubscriptionPlan.objects.get(id=data['plan_id'])
-            sports = list(Sport.objects.filter(id__in=data['sport_ids']))
+            plan = refdata.plans.require(data['plan_id'])
+            sports = list(refdata.sports.get_many(data['sport_ids']).values())
             package = None
             if data.get('package_id'):
-                package = Package.objects.get(id=data['package_id'])
+                package = refdata.packages.require(data['package_id'])
             
             pricing = SubscriptionService.calculate_price(
                 plan=plan,
@@ -6,7 +6,7 @@ from django.db.models import Count, Avg, Q
 from datetime import timedelta
 from django.utils import timezone
 
-from .models import Trainer, TrainerAvailability
+from .models import Trainer, TrainerAvailability, TrainerPerformanceSnapshot, TrainerRating
 
 
 class TrainerAvailabilityInline(admin.TabularInline):
@@ -192,35 +192,50 @@ class TrainerAdmin(admin.ModelAdmin):
         return format_html('<em>لا توجد صورة</em>')
     photo_preview_large.short_description = _('معاينة الصورة')
     
+    def _latest_snapshot(self, obj):
+        """آخر لقطة أداء (مرة واحدة لكل صفحة)"""
+        if not hasattr(obj, '_latest_snapshot'):
+            obj._latest_snapshot = obj.performance_snapshots.order_by('-period_start').first()
+        return obj._latest_snapshot
+    
     def get_trainer_stats(self, obj):
-        """إحصائيات المدرب"""
-        # عدد الجلسات
-        sessions = obj.classchedule_set.count()
-        
-        # عدد الأعضاء المتدربين
-        members = obj.attendance_set.values('member').distinct().count()
-        
-        # متوسط التقييم
+        """إحصائيات المدرب (من آخر لقطة أداء شهرية)"""
+        snapshot = self._latest_snapshot(obj)
         avg_rating = obj.rating or 0
         
+        if not snapshot:
+            return format_html(
+                '<em>لا توجد لقطة أداء بعد</em><br/>'
+                '<strong>التقييم:</strong> {}/5',
+                f'{avg_rating:.1f}'
+            )
+        
         return format_html(
-            '<strong>الجلسات:</strong> {}<br/>'
-            '<strong>الأعضاء:</strong> {}<br/>'
-            '<strong>التقييم:</strong> {:.1f}/5',
-            sessions, members, avg_rating
+            '<strong>الفترة:</strong> {}<br/>'
+            '<strong>الحضور:</strong> {} ({} عضو)<br/>'
+            '<strong>جلسات خاصة:</strong> {}<br/>'
+            '<strong>حصص منفذة:</strong> {} ({} حضور)<br/>'
+            '<strong>التقييم:</strong> {}/5',
+            snapshot.period_start.strftime('%Y-%m'),
+            snapshot.attendance_count, snapshot.members_count,
+            snapshot.pt_sessions_completed,
+            snapshot.class_sessions_conducted, snapshot.class_attendees,
+            f'{avg_rating:.1f}'
         )
     get_trainer_stats.short_description = _('الإحصائيات')
     
     def get_salary_info(self, obj):
-        """معلومات الراتب والعمولة"""
-        commission_amount = (obj.salary * obj.commission_percentage / 100) if obj.commission_percentage else 0
-        total_income = obj.salary + commission_amount
+        """معلومات الراتب والعمولة (العمولة من آخر لقطة أداء شهرية)"""
+        snapshot = self._latest_snapshot(obj)
+        salary = obj.salary or 0
+        commission_amount = snapshot.commission_amount if snapshot else 0
+        total_income = salary + commission_amount
         
         return format_html(
             '<strong>الراتب الأساسي:</strong> {} ر.س<br/>'
             '<strong>العمولة:</strong> {}% ({} ر.س)<br/>'
             '<strong>الإجمالي:</strong> {} ر.س',
-            obj.salary, obj.commission_percentage, commission_amount, total_income
+            salary, obj.commission_percentage, commission_amount, total_income
         )
     get_salary_info.short_description = _('الراتب والعمولة')
     
@@ -366,3 +381,43 @@ class TrainerAvailabilityAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related('trainer__user')
     
     actions = []
+
+
+@admin.register(TrainerPerformanceSnapshot)
+class TrainerPerformanceSnapshotAdmin(admin.ModelAdmin):
+    """لوحة لقطات أداء وعمولات المدربين (للقراءة فقط)"""
+    
+    list_display = [
+        'trainer', 'period_start', 'attendance_count', 'members_count',
+        'pt_sessions_completed', 'class_sessions_conducted', 'class_attendees',
+        'revenue_attributed', 'commission_percentage', 'commission_amount'
+    ]
+    list_filter = ['period_start']
+    search_fields = ['trainer__trainer_id', 'trainer__user__first_name', 'trainer__user__phone']
+    date_hierarchy = 'period_start'
+    ordering = ['-period_start', 'trainer']
+    list_select_related = ['trainer__user']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TrainerRating)
+class TrainerRatingAdmin(admin.ModelAdmin):
+    """لوحة تقييمات المدربين (الإضافة والحذف عبر خدمة التقييم فقط)"""
+    
+    list_display = ['trainer', 'member', 'score', 'created_at']
+    list_filter = ['score', 'created_at']
+    search_fields = ['trainer__trainer_id', 'trainer__user__first_name', 'member__member_id']
+    ordering = ['-created_at']
+    list_select_related = ['trainer__user', 'member__user']
+    readonly_fields = ['trainer', 'member', 'session', 'score', 'comment', 'created_at']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
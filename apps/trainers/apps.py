@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class TrainersConfig(AppConfig):
+    """تكوين تطبيق المدربين"""
+    
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.trainers'
+    verbose_name = 'المدربون'
+    
+    def ready(self):
+        """استدعاء الإشارات عند تحميل التطبيق"""
+        import apps.trainers.signals  # noqa
@@ -132,3 +132,10 @@ class SessionBookingForm(forms.Form):
         }),
         label='الملاحظات'
     )
+
+
+class TrainerAvailabilityQueryForm(forms.Form):
+    """معاملات أوقات المدرب المتاحة (نفس حدود TrainerSlotQuerySerializer)"""
+    days = forms.IntegerField(required=False, min_value=1, max_value=31, label='عدد الأيام')
+    duration = forms.IntegerField(required=False, min_value=15, max_value=240, label='مدة الجلسة')
+    limit = forms.IntegerField(required=False, min_value=1, max_value=200, label='عدد الأوقات')
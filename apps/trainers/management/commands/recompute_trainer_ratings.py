@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.trainers.services import TrainerRatingService
+
+
+class Command(BaseCommand):
+    """إعادة حساب تقييمات المدربين من أحداث التقييم"""
+
+    help = 'إعادة حساب مجموع وعدد ومتوسط التقييمات لكل المدربين من سجل التقييمات'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trainer',
+            type=int,
+            action='append',
+            help='معرف مدرب (يمكن تكراره، افتراضي: كل المدربين)'
+        )
+
+    def handle(self, *args, **options):
+        count = TrainerRatingService.recompute(trainer_ids=options['trainer'])
+        self.stdout.write(self.style.SUCCESS(f'✓ تم إعادة حساب تقييمات {count} مدرب'))
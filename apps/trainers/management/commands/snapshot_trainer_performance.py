@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.trainers.services import TrainerPerformanceService
+
+
+class Command(BaseCommand):
+    """إنشاء لقطات أداء وعمولات المدربين لشهر منتهٍ"""
+
+    help = 'حساب أداء وعمولات المدربين لشهر وتخزينها كلقطات ثابتة'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month',
+            type=str,
+            help='الشهر بصيغة YYYY-MM (افتراضي: الشهر السابق)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='إعادة إنشاء لقطات الشهر إن كانت موجودة'
+        )
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m')
+            except ValueError:
+                raise CommandError('صيغة الشهر غير صحيحة (YYYY-MM)')
+            period_start, period_end = TrainerPerformanceService.month_bounds(month.year, month.month)
+        else:
+            period_start, period_end = TrainerPerformanceService.previous_month()
+
+        try:
+            result = TrainerPerformanceService.snapshot_period(
+                period_start, period_end, force=options['force']
+            )
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+
+        if not result['created']:
+            self.stdout.write(self.style.WARNING(
+                f'⚠ لقطات {period_start:%Y-%m} موجودة مسبقاً (استخدم --force لإعادة الإنشاء)'
+            ))
+            return
+
+        self.stdout.write(
+            f"المدربون: {result['created']} | لقطات مستبدلة: {result['replaced']} | "
+            f"إيراد غير منسوب: {result['unattributed_revenue']} ر.س"
+        )
+        self.stdout.write(self.style.SUCCESS(f'✓ تم إنشاء لقطات {period_start:%Y-%m}'))
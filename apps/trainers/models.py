@@ -1,3 +1,6 @@
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from apps.accounts.models import User
 from apps.members.models import Member
@@ -47,14 +50,20 @@ class Trainer(models.Model):
     certifications = models.TextField('الشهادات والمؤهلات', blank=True, null=True)
     years_of_experience = models.PositiveIntegerField('سنوات الخبرة', default=0)
     
-    # التقييم
+    # التقييم: المجموع والعدد يحدثان ذرياً مع كل تقييم (TrainerRatingService)
+    # و rating نسخة مقربة من المتوسط للعرض والترتيب
     rating = models.DecimalField(
         'التقييم', 
         max_digits=3, 
         decimal_places=2, 
         default=0.00
     )
+    rating_sum = models.PositiveIntegerField('مجموع التقييمات', default=0)
     total_ratings = models.PositiveIntegerField('عدد التقييمات', default=0)
+    # أساس التقييمات السابقة لسجل الأحداث (rating × total_ratings القديمين)
+    # يُملأ مرة واحدة بـ TrainerRatingService.backfill_legacy ويُضاف إليه ما في السجل
+    legacy_rating_sum = models.PositiveIntegerField('مجموع التقييمات السابقة', default=0)
+    legacy_ratings = models.PositiveIntegerField('عدد التقييمات السابقة', default=0)
     
     # العمل
     hire_date = models.DateField('تاريخ التعيين')
@@ -78,12 +87,17 @@ class Trainer(models.Model):
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.trainer_id}"
     
+    @property
+    def average_rating(self):
+        """المتوسط الدقيق من المجموع والعدد"""
+        if not self.total_ratings:
+            return Decimal('0')
+        return Decimal(self.rating_sum) / Decimal(self.total_ratings)
+    
     def update_rating(self, new_rating):
-        """تحديث التقييم"""
-        total = (self.rating * self.total_ratings) + new_rating
-        self.total_ratings += 1
-        self.rating = total / self.total_ratings
-        self.save()
+        """تحديث التقييم (يسجل حدث تقييم ويحدث المجموع والعدد ذرياً)"""
+        from .services import TrainerRatingService
+        return TrainerRatingService.rate(self, new_rating)
 
 
 class TrainerAvailability(models.Model):
@@ -162,3 +176,90 @@ class Session(models.Model):
 
     def __str__(self):
         return f"{self.trainer} - {self.date} {self.time.strftime('%H:%M')}"
+
+
+class TrainerRating(models.Model):
+    """حدث تقييم مدرب (مصدر الحقيقة لمجموع وعدد التقييمات)"""
+
+    trainer = models.ForeignKey(
+        Trainer,
+        on_delete=models.CASCADE,
+        related_name='ratings',
+        verbose_name='المدرب'
+    )
+    member = models.ForeignKey(
+        Member,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='trainer_ratings',
+        verbose_name='العضو'
+    )
+    session = models.ForeignKey(
+        Session,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ratings',
+        verbose_name='الجلسة'
+    )
+    score = models.PositiveSmallIntegerField(
+        'التقييم',
+        validators=[MinValueValidator(1), MaxValueValidator(5)]
+    )
+    comment = models.TextField('التعليق', blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'تقييم مدرب'
+        verbose_name_plural = 'تقييمات المدربين'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.trainer} - {self.score}/5"
+
+
+class TrainerPerformanceSnapshot(models.Model):
+    """
+    لقطة أداء وعمولة المدرب لفترة (شهر) - لا تعدل بعد إنشائها
+
+    إعادة الحساب تتم بحذف لقطات الفترة وإنشائها من جديد (TrainerPerformanceService)
+    """
+
+    trainer = models.ForeignKey(
+        Trainer,
+        on_delete=models.CASCADE,
+        related_name='performance_snapshots',
+        verbose_name='المدرب'
+    )
+    period_start = models.DateField('بداية الفترة')
+    period_end = models.DateField('نهاية الفترة')
+
+    # الأداء
+    attendance_count = models.PositiveIntegerField('عدد الحضور', default=0)
+    members_count = models.PositiveIntegerField('عدد الأعضاء', default=0)
+    pt_sessions_completed = models.PositiveIntegerField('جلسات التدريب الخاص المكتملة', default=0)
+    pt_minutes = models.PositiveIntegerField('دقائق التدريب الخاص', default=0)
+    class_sessions_conducted = models.PositiveIntegerField('الحصص المنفذة', default=0)
+    class_attendees = models.PositiveIntegerField('حضور الحصص', default=0)
+
+    # العمولة
+    revenue_attributed = models.DecimalField('الإيراد المنسوب', max_digits=12, decimal_places=2, default=0)
+    commission_percentage = models.DecimalField('نسبة العمولة %', max_digits=4, decimal_places=2, default=0)
+    commission_amount = models.DecimalField('العمولة', max_digits=12, decimal_places=2, default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'لقطة أداء مدرب'
+        verbose_name_plural = 'لقطات أداء المدربين'
+        ordering = ['-period_start', 'trainer']
+        unique_together = ['trainer', 'period_start']
+
+    def __str__(self):
+        return f"{self.trainer} - {self.period_start.strftime('%Y-%m')}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("لا يمكن تعديل لقطة أداء بعد إنشائها")
+        super().save(*args, **kwargs)
@@ -27,3 +27,35 @@ class TrainerAvailabilitySerializer(serializers.ModelSerializer):
             'start_time',
             'end_time',
         ]
+
+
+class TrainerSlotQuerySerializer(serializers.Serializer):
+    """Serializer معاملات البحث عن أوقات التدريب الخاص المتاحة"""
+    sport_id = serializers.IntegerField(required=False)
+    trainer_id = serializers.IntegerField(required=False)
+    date = serializers.DateField(required=False)
+    days = serializers.IntegerField(required=False, default=7, min_value=1, max_value=31)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=200)
+    duration = serializers.IntegerField(required=False, default=60, min_value=15, max_value=240)
+
+
+class RosterMetricsQuerySerializer(serializers.Serializer):
+    """Serializer معاملات ملخص قياسات أعضاء المدرب"""
+    days = serializers.IntegerField(required=False, min_value=1, max_value=365)
+
+
+class TrainerSlotSerializer(serializers.Serializer):
+    """Serializer وقت متاح لدى مدرب"""
+    trainer_id = serializers.IntegerField()
+    trainer_name = serializers.CharField()
+    date = serializers.DateField()
+    start_time = serializers.TimeField(format='%H:%M')
+    end_time = serializers.TimeField(format='%H:%M')
+
+
+class TrainerRateSerializer(serializers.Serializer):
+    """Serializer طلب تقييم مدرب"""
+    score = serializers.IntegerField(min_value=1, max_value=5)
+    member_id = serializers.IntegerField(required=False)
+    session_id = serializers.IntegerField(required=False)
+    comment = serializers.CharField(required=False, allow_blank=True)
@@ -0,0 +1,617 @@
+import calendar
+import heapq
+import time as time_module
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+from django.core.cache import cache as shared_cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.utils import timezone
+
+from core.cache import TwoTierCache
+from .models import Trainer, TrainerAvailability, Session, TrainerPerformanceSnapshot, TrainerRating
+
+
+MINUTES_PER_DAY = 24 * 60
+
+# فترة بالدقائق منذ منتصف الليل [start, end)
+Interval = Tuple[int, int]
+
+
+def to_minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def to_time(minutes: int) -> time:
+    minutes = min(minutes, MINUTES_PER_DAY - 1)
+    return time(minutes // 60, minutes % 60)
+
+
+def day_of_week(day: date) -> int:
+    """ترقيم أيام الأسبوع في النماذج (السبت = 0)"""
+    return (day.weekday() + 2) % 7
+
+
+def sweep_free_intervals(available: Iterable[Interval], busy: Iterable[Interval]) -> List[Interval]:
+    """
+    دمج فترات التوفر والانشغال بخط مسح واحد
+
+    الفترة حرة إذا غطاها توفر واحد على الأقل ولم يغطها أي انشغال.
+    الفترات المتداخلة أو المتلاصقة في الناتج تُدمج.
+    """
+    events = []
+    for start, end in available:
+        if start < end:
+            events.append((start, 0, 1))
+            events.append((end, 0, -1))
+    for start, end in busy:
+        if start < end:
+            events.append((start, 1, 1))
+            events.append((end, 1, -1))
+    events.sort()
+
+    free = []
+    depth = [0, 0]
+    previous = None
+
+    for position, kind, delta in events:
+        if previous is not None and position > previous and depth[0] > 0 and depth[1] == 0:
+            if free and free[-1][1] == previous:
+                free[-1] = (free[-1][0], position)
+            else:
+                free.append((previous, position))
+        depth[kind] += delta
+        previous = position
+
+    return free
+
+
+class TrainerSlotService:
+    """
+    البحث عن أوقات التدريب الخاص المتاحة لدى المدربين
+
+    الأوقات الحرة لكل مدرب في كل يوم = أوقات التوفر (TrainerAvailability)
+    ناقص الجلسات الخاصة (Session) وحصص الجداول النشطة المسندة للمدرب.
+    النتيجة تخزن لكل (مدرب، يوم) ويتم إبطالها عند أي كتابة على هذه المصادر.
+    """
+
+    DEFAULT_DAYS = 7
+    DEFAULT_DURATION = 60
+    SLOT_STEP = 30
+
+    cache = TwoTierCache(
+        'trainer-slots',
+        local_maxsize=10000,
+        local_ttl=30,
+        shared_timeout=6 * 60 * 60
+    )
+
+    # ==================== الذاكرة المؤقتة ====================
+
+    @staticmethod
+    def _version_key(trainer_id: int) -> str:
+        return f'trainer-slots:version:{trainer_id}'
+
+    @staticmethod
+    def _versions(trainer_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        إصدار كل مدرب (يتغير عند تعديل التوفر أو الجداول فيبطل كل أيامه)
+        """
+        keys = {TrainerSlotService._version_key(tid): tid for tid in trainer_ids}
+        found = shared_cache.get_many(list(keys))
+
+        versions = {}
+        for key, trainer_id in keys.items():
+            version = found.get(key)
+            if version is None:
+                shared_cache.add(key, time_module.time_ns(), None)
+                version = shared_cache.get(key)
+            versions[trainer_id] = version
+        return versions
+
+    @staticmethod
+    def _day_key(trainer_id: int, version: int, day: date) -> str:
+        return f'{trainer_id}:{version}:{day.isoformat()}'
+
+    @staticmethod
+    def invalidate_trainer(trainer_id: int) -> None:
+        """إبطال كل الأيام المخزنة للمدرب"""
+        shared_cache.set(
+            TrainerSlotService._version_key(trainer_id), time_module.time_ns(), None
+        )
+
+    @staticmethod
+    def invalidate_day(trainer_id: int, day: date) -> None:
+        """إبطال يوم واحد للمدرب (بعد حجز أو تعديل جلسة)"""
+        version = TrainerSlotService._versions([trainer_id])[trainer_id]
+        TrainerSlotService.cache.delete(
+            TrainerSlotService._day_key(trainer_id, version, day)
+        )
+
+    # ==================== حساب الأوقات الحرة ====================
+
+    @staticmethod
+    def _load(trainer_ids: List[int], days: List[date],
+              exclude_session_id: Optional[int] = None) -> Dict[Tuple[int, date], List[Interval]]:
+        """
+        حساب الأوقات الحرة من قاعدة البيانات بثلاثة استعلامات لكل المدربين والأيام
+        """
+        from apps.schedules.models import ClassSchedule
+
+        weekdays = {day_of_week(day) for day in days}
+        available = defaultdict(list)
+        busy = defaultdict(list)
+
+        for row in TrainerAvailability.objects.filter(
+            trainer_id__in=trainer_ids, day_of_week__in=weekdays
+        ).values_list('trainer_id', 'day_of_week', 'start_time', 'end_time'):
+            available[(row[0], row[1])].append((to_minutes(row[2]), to_minutes(row[3])))
+
+        for row in ClassSchedule.objects.filter(
+            trainer_id__in=trainer_ids, day_of_week__in=weekdays, is_active=True
+        ).values_list('trainer_id', 'day_of_week', 'start_time', 'end_time'):
+            busy[(row[0], row[1])].append((to_minutes(row[2]), to_minutes(row[3])))
+
+        sessions = Session.objects.filter(
+            trainer_id__in=trainer_ids, date__in=days
+        ).exclude(status=Session.Status.CANCELLED)
+        if exclude_session_id:
+            sessions = sessions.exclude(pk=exclude_session_id)
+
+        booked = defaultdict(list)
+        for trainer_id, session_date, session_time, duration in sessions.values_list(
+            'trainer_id', 'date', 'time', 'duration'
+        ):
+            start = to_minutes(session_time)
+            booked[(trainer_id, session_date)].append(
+                (start, min(start + duration, MINUTES_PER_DAY))
+            )
+
+        result = {}
+        for trainer_id in trainer_ids:
+            for day in days:
+                weekday = day_of_week(day)
+                result[(trainer_id, day)] = sweep_free_intervals(
+                    available[(trainer_id, weekday)],
+                    busy[(trainer_id, weekday)] + booked[(trainer_id, day)]
+                )
+        return result
+
+    @staticmethod
+    def free_intervals(trainer_ids: Iterable[int], days: Iterable[date]) -> Dict[Tuple[int, date], List[Interval]]:
+        """
+        الأوقات الحرة لكل (مدرب، يوم) من الذاكرة المؤقتة مع حساب الناقص دفعة واحدة
+        """
+        trainer_ids = list(trainer_ids)
+        days = list(days)
+        versions = TrainerSlotService._versions(trainer_ids)
+
+        result = {}
+        missing_trainers = set()
+        missing_days = set()
+        for trainer_id in trainer_ids:
+            for day in days:
+                intervals = TrainerSlotService.cache.get(
+                    TrainerSlotService._day_key(trainer_id, versions[trainer_id], day)
+                )
+                if intervals is None:
+                    missing_trainers.add(trainer_id)
+                    missing_days.add(day)
+                else:
+                    result[(trainer_id, day)] = intervals
+
+        if missing_trainers:
+            loaded = TrainerSlotService._load(sorted(missing_trainers), sorted(missing_days))
+            for (trainer_id, day), intervals in loaded.items():
+                if (trainer_id, day) not in result:
+                    TrainerSlotService.cache.set(
+                        TrainerSlotService._day_key(trainer_id, versions[trainer_id], day),
+                        intervals
+                    )
+                    result[(trainer_id, day)] = intervals
+
+        return result
+
+    # ==================== البحث ====================
+
+    @staticmethod
+    def trainers_for_sport(sport_id: Optional[int] = None):
+        """المدربون النشطون المختصون بالرياضة أو المسند لهم حصص فيها"""
+        trainers = Trainer.objects.filter(is_active=True)
+        if sport_id:
+            trainers = trainers.filter(
+                Q(specializations__sport_id=sport_id) |
+                Q(class_schedules__sport_id=sport_id, class_schedules__is_active=True)
+            ).distinct()
+        return trainers
+
+    @staticmethod
+    def _split(intervals: List[Interval], duration: int, step: int,
+               not_before: int = 0) -> Iterator[int]:
+        """بدايات الفترات بطول duration داخل الأوقات الحرة، مصفوفة على step دقيقة"""
+        for start, end in intervals:
+            start = max(start, not_before)
+            slot = -(-start // step) * step
+            while slot + duration <= end:
+                yield slot
+                slot += step
+
+    @staticmethod
+    def search(sport_id: Optional[int] = None, start_date: Optional[date] = None,
+               days: int = DEFAULT_DAYS, limit: int = 10,
+               duration: int = DEFAULT_DURATION, step: int = SLOT_STEP,
+               trainer_ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        أول N أوقات متاحة لكل المدربين مرتبة زمنياً (دمج k-طريقة بين المدربين)
+        """
+        if duration <= 0 or step <= 0:
+            raise ValidationError("المدة والخطوة يجب أن تكون أكبر من صفر")
+
+        now = timezone.localtime()
+        start_date = max(start_date or now.date(), now.date())
+        dates = [start_date + timedelta(days=i) for i in range(days)]
+
+        trainers = TrainerSlotService.trainers_for_sport(sport_id)
+        if trainer_ids is not None:
+            trainers = trainers.filter(id__in=list(trainer_ids))
+        names = {
+            row[0]: f'{row[1]} {row[2]}'.strip()
+            for row in trainers.values_list('id', 'user__first_name', 'user__last_name')
+        }
+        if not names:
+            return []
+
+        free = TrainerSlotService.free_intervals(names, dates)
+        now_minutes = to_minutes(now.time()) + 1
+
+        def trainer_slots(trainer_id):
+            for day in dates:
+                not_before = now_minutes if day == now.date() else 0
+                for start in TrainerSlotService._split(
+                    free[(trainer_id, day)], duration, step, not_before
+                ):
+                    yield day, start, trainer_id
+
+        slots = []
+        for day, start, trainer_id in heapq.merge(*(trainer_slots(tid) for tid in names)):
+            slots.append({
+                'trainer_id': trainer_id,
+                'trainer_name': names[trainer_id],
+                'date': day,
+                'start_time': to_time(start),
+                'end_time': to_time(start + duration),
+            })
+            if len(slots) >= limit:
+                break
+
+        return slots
+
+    # ==================== الحجز ====================
+
+    @staticmethod
+    def is_free(trainer_id: int, day: date, start: time, duration: int,
+                exclude_session_id: Optional[int] = None) -> bool:
+        """التحقق من قاعدة البيانات مباشرة (بدون الذاكرة المؤقتة)"""
+        begin = to_minutes(start)
+        intervals = TrainerSlotService._load(
+            [trainer_id], [day], exclude_session_id=exclude_session_id
+        )[(trainer_id, day)]
+        return any(s <= begin and begin + duration <= e for s, e in intervals)
+
+    @staticmethod
+    @transaction.atomic
+    def book_session(trainer: Trainer, member, day: date, start: time,
+                     duration: int, notes: str = '') -> Session:
+        """
+        حجز جلسة تدريب خاص بعد التحقق من عدم التعارض
+
+        قفل صف المدرب يسلسل الحجوزات المتزامنة لنفس المدرب
+        """
+        Trainer.objects.select_for_update().filter(pk=trainer.pk).first()
+
+        if datetime.combine(day, start) < timezone.localtime().replace(tzinfo=None):
+            raise ValidationError("لا يمكن الحجز في وقت سابق")
+
+        if not TrainerSlotService.is_free(trainer.pk, day, start, duration):
+            raise ValidationError("الوقت المطلوب غير متاح لدى المدرب")
+
+        return Session.objects.create(
+            trainer=trainer,
+            member=member,
+            date=day,
+            time=start,
+            duration=duration,
+            notes=notes
+        )
+
+
+class TrainerPerformanceService:
+    """
+    حساب أداء المدربين وعمولاتهم لفترة باستعلامات مجمعة وتخزينها كلقطات ثابتة
+
+    الإيراد المنسوب: مدفوعات التدريب الخاص لكل عضو في الفترة موزعة على
+    مدربيه بنسبة جلساته المكتملة مع كل منهم في نفس الفترة
+    """
+
+    CENT = Decimal('0.01')
+
+    METRICS = (
+        'attendance_count', 'members_count', 'pt_sessions_completed', 'pt_minutes',
+        'class_sessions_conducted', 'class_attendees',
+    )
+
+    @staticmethod
+    def month_bounds(year: int, month: int) -> Tuple[date, date]:
+        return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+    @staticmethod
+    def previous_month(today: Optional[date] = None) -> Tuple[date, date]:
+        first = (today or timezone.localdate()).replace(day=1)
+        last_month_end = first - timedelta(days=1)
+        return TrainerPerformanceService.month_bounds(last_month_end.year, last_month_end.month)
+
+    @staticmethod
+    def _allocate(amount: Decimal, weights: Dict[int, int]) -> Dict[int, Decimal]:
+        """توزيع مبلغ بنسبة الأوزان مع إعطاء فرق التقريب لصاحب الوزن الأكبر"""
+        total = sum(weights.values())
+        shares = {
+            key: (amount * weight / total).quantize(TrainerPerformanceService.CENT, ROUND_HALF_UP)
+            for key, weight in weights.items()
+        }
+        remainder = amount - sum(shares.values())
+        if remainder:
+            shares[max(weights, key=lambda key: (weights[key], -key))] += remainder
+        return shares
+
+    @staticmethod
+    def compute(period_start: date, period_end: date) -> Dict[str, Any]:
+        """
+        مؤشرات كل مدرب في الفترة (5 استعلامات مجمعة بغض النظر عن عدد المدربين)
+        """
+        from apps.attendance.models import Attendance
+        from apps.payments.models import Payment
+        from apps.schedules.models import ClassSession, ClassBooking
+
+        stats = defaultdict(lambda: dict.fromkeys(TrainerPerformanceService.METRICS, 0))
+
+        for row in Attendance.objects.in_local_range(period_start, period_end).filter(
+            trainer__isnull=False
+        ).values('trainer_id').annotate(
+            total=Count('id'),
+            members=Count('member_id', distinct=True)
+        ).order_by():
+            stats[row['trainer_id']]['attendance_count'] = row['total']
+            stats[row['trainer_id']]['members_count'] = row['members']
+
+        # الجلسات الخاصة لكل (مدرب، عضو) - تستخدم للعدد وللنسبة في توزيع الإيراد
+        member_sessions = defaultdict(dict)
+        for row in Session.objects.filter(
+            status=Session.Status.COMPLETED,
+            date__range=(period_start, period_end)
+        ).values('trainer_id', 'member_id').annotate(
+            total=Count('id'),
+            minutes=Sum('duration')
+        ).order_by():
+            stats[row['trainer_id']]['pt_sessions_completed'] += row['total']
+            stats[row['trainer_id']]['pt_minutes'] += row['minutes'] or 0
+            if row['member_id']:
+                member_sessions[row['member_id']][row['trainer_id']] = row['total']
+
+        conducted = ClassSession.objects.filter(
+            status=ClassSession.Status.COMPLETED,
+            date__range=(period_start, period_end)
+        ).annotate(
+            conducted_by=Coalesce('actual_trainer_id', 'schedule__trainer_id')
+        ).values('conducted_by').annotate(total=Count('id')).order_by()
+        for row in conducted:
+            stats[row['conducted_by']]['class_sessions_conducted'] = row['total']
+
+        attendees = ClassBooking.objects.filter(
+            status=ClassBooking.Status.ATTENDED,
+            session__status=ClassSession.Status.COMPLETED,
+            session__date__range=(period_start, period_end)
+        ).annotate(
+            conducted_by=Coalesce('session__actual_trainer_id', 'session__schedule__trainer_id')
+        ).values('conducted_by').annotate(total=Count('id')).order_by()
+        for row in attendees:
+            stats[row['conducted_by']]['class_attendees'] = row['total']
+
+        revenue = defaultdict(Decimal)
+        unattributed = Decimal('0')
+        for row in Payment.objects.in_local_range(period_start, period_end).filter(
+            payment_type=Payment.PaymentType.PERSONAL_TRAINING,
+            status__in=[Payment.PaymentStatus.COMPLETED, Payment.PaymentStatus.PARTIAL]
+        ).values('member_id').annotate(paid=Sum('amount_paid')).order_by():
+            paid = row['paid'] or Decimal('0')
+            weights = member_sessions.get(row['member_id'])
+            if not weights:
+                unattributed += paid
+                continue
+            for trainer_id, share in TrainerPerformanceService._allocate(paid, weights).items():
+                revenue[trainer_id] += share
+
+        return {
+            'stats': dict(stats),
+            'revenue': dict(revenue),
+            'unattributed_revenue': unattributed,
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def snapshot_period(period_start: date, period_end: date, force: bool = False) -> Dict[str, Any]:
+        """
+        إنشاء لقطات الفترة لكل المدربين النشطين ومن لهم نشاط فيها
+
+        الفترة يجب أن تكون منتهية. اللقطات الموجودة لا تتغير إلا مع force
+        """
+        if period_end >= timezone.localdate():
+            raise ValidationError("لا يمكن إنشاء لقطة لفترة لم تنته بعد")
+
+        existing = TrainerPerformanceSnapshot.objects.filter(period_start=period_start)
+        if existing.exists():
+            if not force:
+                return {'created': 0, 'replaced': 0, 'unattributed_revenue': None}
+            replaced = existing.delete()[0]
+        else:
+            replaced = 0
+
+        result = TrainerPerformanceService.compute(period_start, period_end)
+        stats, revenue = result['stats'], result['revenue']
+
+        trainers = Trainer.objects.filter(
+            Q(is_active=True) | Q(id__in=set(stats) | set(revenue))
+        ).values_list('id', 'commission_percentage')
+
+        snapshots = []
+        for trainer_id, percentage in trainers:
+            metrics = stats.get(trainer_id) or dict.fromkeys(TrainerPerformanceService.METRICS, 0)
+            attributed = revenue.get(trainer_id, Decimal('0'))
+            snapshots.append(TrainerPerformanceSnapshot(
+                trainer_id=trainer_id,
+                period_start=period_start,
+                period_end=period_end,
+                revenue_attributed=attributed,
+                commission_percentage=percentage,
+                commission_amount=(attributed * percentage / 100).quantize(
+                    TrainerPerformanceService.CENT, ROUND_HALF_UP
+                ),
+                **metrics
+            ))
+
+        TrainerPerformanceSnapshot.objects.bulk_create(snapshots)
+
+        return {
+            'created': len(snapshots),
+            'replaced': replaced,
+            'unattributed_revenue': result['unattributed_revenue'],
+        }
+
+    @staticmethod
+    def snapshot_month(year: int, month: int, force: bool = False) -> Dict[str, Any]:
+        period_start, period_end = TrainerPerformanceService.month_bounds(year, month)
+        return TrainerPerformanceService.snapshot_period(period_start, period_end, force=force)
+
+    @staticmethod
+    def latest_snapshot(trainer_id: int) -> Optional[TrainerPerformanceSnapshot]:
+        return TrainerPerformanceSnapshot.objects.filter(
+            trainer_id=trainer_id
+        ).order_by('-period_start').first()
+
+
+class TrainerRatingService:
+    """
+    تقييمات المدربين: حدث لكل تقييم مع تحديث المجموع والعدد بتعبيرات F
+    في UPDATE واحد (بدون قراءة ثم كتابة، فلا تضيع التقييمات المتزامنة)
+
+    المدربون المقيَّمون قبل سجل الأحداث (total_ratings بدون rating_sum) يُحوَّل
+    متوسطهم وعددهم إلى أساس legacy_* قبل أي تعديل، والأحداث تُضاف فوقه
+    """
+
+    MIN_SCORE = 1
+    MAX_SCORE = 5
+
+    @staticmethod
+    def _average(rating_sum, total_ratings):
+        """المتوسط داخل قاعدة البيانات (صفر عند عدم وجود تقييمات)"""
+        return Coalesce(
+            Cast(rating_sum, FloatField()) / NullIf(total_ratings, Value(0)),
+            Value(0.0)
+        )
+
+    @staticmethod
+    def backfill_legacy(trainers=None) -> int:
+        """
+        تحويل التقييمات السابقة لسجل الأحداث إلى أساس ثابت (UPDATE واحد)
+
+        rating_sum = round(rating × total_ratings)؛ لا يتكرر لأن legacy_ratings يصبح موجباً
+        """
+        trainers = trainers if trainers is not None else Trainer.objects.all()
+        legacy_sum = Cast(Round(F('rating') * F('total_ratings')), IntegerField())
+        return trainers.filter(total_ratings__gt=0, rating_sum=0, legacy_ratings=0).update(
+            legacy_rating_sum=legacy_sum,
+            legacy_ratings=F('total_ratings'),
+            rating_sum=legacy_sum
+        )
+
+    @staticmethod
+    def _apply(trainer_id: int, score_delta: int, count_delta: int) -> int:
+        """
+        تعديل المجموع والعدد ذرياً
+
+        قيم الأعمدة في الطرف الأيمن هي القيم قبل التحديث في نفس العبارة،
+        لذلك يُحسب المتوسط من المجموع والعدد الجديدين صراحة
+        """
+        TrainerRatingService.backfill_legacy(Trainer.objects.filter(pk=trainer_id))
+        new_sum = F('rating_sum') + score_delta
+        new_count = F('total_ratings') + count_delta
+        return Trainer.objects.filter(pk=trainer_id).update(
+            rating_sum=new_sum,
+            total_ratings=new_count,
+            rating=TrainerRatingService._average(new_sum, new_count)
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def rate(trainer: Trainer, score: int, member=None, session: Optional[Session] = None,
+             comment: str = '') -> TrainerRating:
+        """تسجيل تقييم جديد للمدرب"""
+        score = int(score)
+        if not TrainerRatingService.MIN_SCORE <= score <= TrainerRatingService.MAX_SCORE:
+            raise ValidationError(
+                f"التقييم يجب أن يكون بين {TrainerRatingService.MIN_SCORE} و {TrainerRatingService.MAX_SCORE}"
+            )
+
+        rating = TrainerRating.objects.create(
+            trainer=trainer,
+            member=member,
+            session=session,
+            score=score,
+            comment=comment or None
+        )
+        TrainerRatingService._apply(trainer.pk, score, 1)
+        trainer.refresh_from_db(fields=['rating', 'rating_sum', 'total_ratings'])
+
+        return rating
+
+    @staticmethod
+    @transaction.atomic
+    def remove(rating: TrainerRating) -> None:
+        """حذف تقييم وطرحه من المجموع والعدد"""
+        trainer_id, score = rating.trainer_id, rating.score
+        rating.delete()
+        TrainerRatingService._apply(trainer_id, -score, -1)
+
+    @staticmethod
+    @transaction.atomic
+    def recompute(trainer_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        إعادة حساب المجموع والعدد والمتوسط: الأساس السابق + أحداث التقييم
+
+        عبارات UPDATE ثابتة العدد بغض النظر عن عدد المدربين
+        """
+        trainers = Trainer.objects.all()
+        if trainer_ids is not None:
+            trainers = trainers.filter(pk__in=list(trainer_ids))
+        TrainerRatingService.backfill_legacy(trainers)
+
+        totals = TrainerRating.objects.filter(
+            trainer_id=OuterRef('pk')
+        ).order_by().values('trainer_id')
+
+        updated = trainers.update(
+            rating_sum=F('legacy_rating_sum') + Coalesce(
+                Subquery(totals.annotate(total=Sum('score')).values('total')[:1]), Value(0)
+            ),
+            total_ratings=F('legacy_ratings') + Coalesce(
+                Subquery(totals.annotate(total=Count('id')).values('total')[:1]), Value(0)
+            )
+        )
+        trainers.update(
+            rating=TrainerRatingService._average(F('rating_sum'), F('total_ratings'))
+        )
+
+        return updated
@@ -0,0 +1,52 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+import logging
+
+from .models import TrainerAvailability, Session
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_save, sender=Session)
+def session_pre_save(sender, instance, **kwargs):
+    """حفظ المدرب والتاريخ السابقين لإبطال اليوم القديم عند نقل الجلسة"""
+    
+    instance._slot_previous = None
+    if instance.pk:
+        instance._slot_previous = Session.objects.filter(pk=instance.pk).values_list(
+            'trainer_id', 'date'
+        ).first()
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def session_slot_cache_invalidate(sender, instance, **kwargs):
+    """إبطال الأوقات الحرة لليوم المتأثر بالجلسة"""
+    
+    try:
+        from .services import TrainerSlotService
+        
+        days = {(instance.trainer_id, instance.date)}
+        previous = getattr(instance, '_slot_previous', None)
+        if previous:
+            days.add(previous)
+        
+        for trainer_id, day in days:
+            TrainerSlotService.invalidate_day(trainer_id, day)
+    
+    except Exception as e:
+        logger.error(f"خطأ في إبطال أوقات المدرب: {str(e)}")
+
+
+@receiver(post_save, sender=TrainerAvailability)
+@receiver(post_delete, sender=TrainerAvailability)
+def availability_slot_cache_invalidate(sender, instance, **kwargs):
+    """إبطال كل الأيام المخزنة للمدرب عند تعديل أوقات توفره"""
+    
+    try:
+        from .services import TrainerSlotService
+        
+        TrainerSlotService.invalidate_trainer(instance.trainer_id)
+    
+    except Exception as e:
+        logger.error(f"خطأ في إبطال أوقات المدرب: {str(e)}")
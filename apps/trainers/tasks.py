@@ -0,0 +1,46 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def snapshot_trainer_performance():
+    """
+    إنشاء لقطات أداء وعمولات المدربين للشهر السابق
+    يتم تشغيله أول كل شهر الساعة 1 صباحاً
+    """
+    try:
+        from .services import TrainerPerformanceService
+        
+        period_start, period_end = TrainerPerformanceService.previous_month()
+        result = TrainerPerformanceService.snapshot_period(period_start, period_end)
+        
+        logger.info(f"✓ لقطات أداء المدربين ({period_start:%Y-%m}): {result['created']} مدرب")
+        return {
+            'period': period_start.strftime('%Y-%m'),
+            'created': result['created'],
+            'unattributed_revenue': str(result['unattributed_revenue'] or 0),
+        }
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في لقطات أداء المدربين: {str(e)}")
+        raise
+
+
+@shared_task
+def recompute_trainer_ratings():
+    """
+    إعادة حساب تقييمات المدربين من أحداث التقييم (إصلاح أي انحراف)
+    يتم تشغيله أسبوعياً
+    """
+    try:
+        from .services import TrainerRatingService
+        
+        count = TrainerRatingService.recompute()
+        logger.info(f"✓ إعادة حساب التقييمات: {count} مدرب")
+        return f"تم إعادة حساب تقييمات {count} مدرب"
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في إعادة حساب التقييمات: {str(e)}")
+        raise
@@ -0,0 +1,62 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from apps.accounts.models import User
+
+from .models import Trainer
+from .services import TrainerRatingService
+
+
+def _trainer(rating='0.00', total_ratings=0, phone='+966500000010'):
+    """مدرب بتقييم سابق لسجل الأحداث (rating و total_ratings فقط)"""
+    user = User.objects.create_user(phone=phone, first_name='مدرب')
+    return Trainer.objects.create(
+        user=user, trainer_id=f'T{phone[-4:]}', hire_date=date(2020, 1, 1),
+        rating=Decimal(rating), total_ratings=total_ratings
+    )
+
+
+@pytest.mark.django_db
+class TestTrainerRatings:
+    """التقييمات السابقة لسجل الأحداث تبقى أساساً تُضاف إليه التقييمات الجديدة"""
+
+    def test_rate_keeps_legacy_ratings(self):
+        trainer = _trainer('4.50', 10)
+
+        TrainerRatingService.rate(trainer, 5)
+
+        trainer.refresh_from_db()
+        assert (trainer.rating_sum, trainer.total_ratings) == (50, 11)
+        assert trainer.rating == Decimal('4.55')
+        assert (trainer.legacy_rating_sum, trainer.legacy_ratings) == (45, 10)
+
+    def test_recompute_adds_events_to_legacy_baseline(self):
+        trainer = _trainer('4.80', 25)
+        TrainerRatingService.rate(trainer, 5)
+
+        TrainerRatingService.recompute()
+        TrainerRatingService.recompute()
+
+        trainer.refresh_from_db()
+        assert (trainer.rating_sum, trainer.total_ratings) == (125, 26)
+        assert trainer.rating == Decimal('4.81')
+
+    def test_recompute_without_ratings(self):
+        trainer = _trainer()
+
+        TrainerRatingService.recompute()
+
+        trainer.refresh_from_db()
+        assert (trainer.rating_sum, trainer.total_ratings, trainer.rating) == (0, 0, Decimal('0'))
+
+    def test_remove_returns_to_legacy_average(self):
+        trainer = _trainer('4.00', 4)
+        rating = TrainerRatingService.rate(trainer, 1)
+
+        TrainerRatingService.remove(rating)
+
+        trainer.refresh_from_db()
+        assert (trainer.rating_sum, trainer.total_ratings) == (16, 4)
+        assert trainer.rating == Decimal('4.00')
@@ -5,12 +5,14 @@ from django.core.paginator import Paginator
 from django.db.models import Q, Count
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
-from django.utils import timezone
+from django.core.exceptions import ValidationError
 
-from apps.trainers.models import Trainer, TrainerAvailability, Specialization, Session
+from apps.trainers.models import Trainer, TrainerAvailability, Specialization
 from apps.members.models import Member
+from .services import TrainerSlotService
 from .forms import (
-    TrainerForm, TrainerAvailabilityForm, TrainerSearchForm, SessionBookingForm
+    TrainerForm, TrainerAvailabilityForm, TrainerSearchForm, SessionBookingForm,
+    TrainerAvailabilityQueryForm
 )
 
 
@@ -55,26 +57,20 @@ def trainer_list(request):
 def trainer_detail(request, pk):
     """عرض تفاصيل المدرب"""
     trainer = get_object_or_404(
-        Trainer.objects.select_related('user').prefetch_related(
-            'specialization', 'availability_set', 'session_set'
-        ),
+        Trainer.objects.select_related('user').prefetch_related('specializations'),
         pk=pk
     )
     
-    # الإحصائيات
-    total_sessions = trainer.session_set.count()
-    this_month_sessions = trainer.session_set.filter(
-        date__month=timezone.now().month,
-        date__year=timezone.now().year
-    ).count()
+    # الإحصائيات من لقطات الأداء الشهرية
+    performance = list(trainer.performance_snapshots.all()[:12])
     
     # ساعات العمل
-    availability = trainer.availability_set.all().order_by('day_of_week', 'start_time')
+    availability = trainer.availability.all().order_by('day_of_week', 'start_time')
     
     context = {
         'trainer': trainer,
-        'total_sessions': total_sessions,
-        'this_month_sessions': this_month_sessions,
+        'performance': performance,
+        'latest_performance': performance[0] if performance else None,
         'availability': availability
     }
     
@@ -211,16 +207,20 @@ def session_book(request, trainer_pk):
     if request.method == 'POST':
         form = SessionBookingForm(request.POST)
         if form.is_valid():
-            session = Session.objects.create(
-                trainer=form.cleaned_data['trainer'],
-                member=request.user.member if hasattr(request.user, 'member') else None,
-                date=form.cleaned_data['session_date'],
-                time=form.cleaned_data['session_time'],
-                duration=form.cleaned_data['duration'],
-                notes=form.cleaned_data.get('notes', '')
-            )
-            messages.success(request, 'تم حجز الجلسة بنجاح')
-            return redirect('trainers:detail', pk=trainer.pk)
+            try:
+                TrainerSlotService.book_session(
+                    trainer=form.cleaned_data['trainer'],
+                    member=getattr(request.user, 'member_profile', None),
+                    day=form.cleaned_data['session_date'],
+                    start=form.cleaned_data['session_time'],
+                    duration=int(form.cleaned_data['duration']),
+                    notes=form.cleaned_data.get('notes', '')
+                )
+            except ValidationError as e:
+                form.add_error(None, e)
+            else:
+                messages.success(request, 'تم حجز الجلسة بنجاح')
+                return redirect('trainers:detail', pk=trainer.pk)
     else:
         form = SessionBookingForm(initial={'trainer': trainer})
     
@@ -232,18 +232,40 @@ def session_book(request, trainer_pk):
 @require_http_methods(['GET'])
 def trainer_availability_api(request, trainer_id):
     """ساعات عمل المدرب - AJAX"""
+    form = TrainerAvailabilityQueryForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse(
+            {'success': False, 'error': 'قيم غير صحيحة', 'errors': form.errors},
+            status=400
+        )
+    query = form.cleaned_data
+    
     try:
         trainer = Trainer.objects.get(pk=trainer_id)
         
-        availability = trainer.availability_set.all().values(
+        availability = trainer.availability.all().values(
             'day_of_week', 'start_time', 'end_time'
         )
         
+        free_slots = TrainerSlotService.search(
+            trainer_ids=[trainer.pk],
+            days=query['days'] or TrainerSlotService.DEFAULT_DAYS,
+            duration=query['duration'] or TrainerSlotService.DEFAULT_DURATION,
+            limit=query['limit'] or 20
+        )
+        
         data = {
             'success': True,
             'trainer_name': f"{trainer.user.first_name} {trainer.user.last_name}",
             'availability': list(availability),
-            'hourly_rate': float(trainer.hourly_rate)
+            'free_slots': [
+                {
+                    'date': slot['date'].isoformat(),
+                    'start_time': slot['start_time'].strftime('%H:%M'),
+                    'end_time': slot['end_time'].strftime('%H:%M'),
+                }
+                for slot in free_slots
+            ]
         }
     except Trainer.DoesNotExist:
         data = {'success': False, 'error': 'المدرب غير موجود'}
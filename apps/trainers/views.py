@@ -1,11 +1,123 @@
-from rest_framework import viewsets
-from .models import Trainer, TrainerAvailability
-from .serializers import TrainerSerializer, TrainerAvailabilitySerializer
+from django.core.exceptions import ValidationError
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from apps.members.analytics import BodyMetricsService
+from apps.members.models import Member
+from .models import Trainer, TrainerAvailability, Session
+from .serializers import (
+    TrainerSerializer, TrainerAvailabilitySerializer, RosterMetricsQuerySerializer,
+    TrainerSlotQuerySerializer, TrainerSlotSerializer, TrainerRateSerializer
+)
+from .services import TrainerSlotService, TrainerRatingService
 
 
 class TrainerViewSet(viewsets.ModelViewSet):
     queryset = Trainer.objects.select_related('user').all()
     serializer_class = TrainerSerializer
+    
+    @action(detail=False, methods=['get'])
+    def slots(self, request):
+        """أول الأوقات المتاحة للتدريب الخاص لدى كل المدربين
+        
+        Parameters:
+        - sport_id (اختياري): معرف الرياضة
+        - trainer_id (اختياري): معرف المدرب
+        - date (اختياري): بداية البحث YYYY-MM-DD (افتراضي: اليوم)
+        - days (اختياري): عدد الأيام (افتراضي: 7)
+        - limit (اختياري): عدد الأوقات (افتراضي: 10)
+        - duration (اختياري): مدة الجلسة بالدقائق (افتراضي: 60)
+        """
+        query = TrainerSlotQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = query.validated_data
+        slots = TrainerSlotService.search(
+            sport_id=params.get('sport_id'),
+            start_date=params.get('date'),
+            days=params['days'],
+            limit=params['limit'],
+            duration=params['duration'],
+            trainer_ids=[params['trainer_id']] if params.get('trainer_id') else None
+        )
+        
+        return Response(TrainerSlotSerializer(slots, many=True).data)
+    
+    @action(detail=True, methods=['get'], url_path='roster-metrics')
+    def roster_metrics(self, request, pk=None):
+        """ملخص قياسات الجسم لكل أعضاء المدرب في طلب واحد
+        
+        أعضاء المدرب: من لهم جلسات تدريب خاص خلال ROSTER_DAYS
+        
+        Parameters:
+        - days (اختياري): فترة حساب الاتجاه بالأيام من 1 إلى 365 (افتراضي: 90)
+        """
+        trainer = self.get_object()
+        query = RosterMetricsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        roster = BodyMetricsService.roster(trainer.pk, query.validated_data.get('days'))
+        
+        return Response({
+            'message': 'ملخص قياسات أعضاء المدرب',
+            'data': {'count': len(roster), 'results': roster}
+        }, status=status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['post'])
+    def rate(self, request, pk=None):
+        """تقييم المدرب
+        
+        Parameters:
+        - score: التقييم من 1 إلى 5
+        - member_id (اختياري): معرف العضو (افتراضي: عضو المستخدم الحالي)
+        - session_id (اختياري): معرف جلسة التدريب الخاص
+        - comment (اختياري): تعليق
+        """
+        trainer = self.get_object()
+        serializer = TrainerRateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        try:
+            if data.get('member_id'):
+                member = Member.objects.get(pk=data['member_id'])
+            else:
+                member = getattr(request.user, 'member_profile', None)
+            
+            session = None
+            if data.get('session_id'):
+                session = Session.objects.get(pk=data['session_id'], trainer=trainer)
+            
+            TrainerRatingService.rate(
+                trainer,
+                data['score'],
+                member=member,
+                session=session,
+                comment=data.get('comment', '')
+            )
+        except Member.DoesNotExist:
+            return Response(
+                {'error': 'العضو غير موجود'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Session.DoesNotExist:
+            return Response(
+                {'error': 'الجلسة غير موجودة'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': ' '.join(e.messages)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            'rating': trainer.rating,
+            'average_rating': round(trainer.average_rating, 4),
+            'total_ratings': trainer.total_ratings
+        }, status=status.HTTP_201_CREATED)
 
 
 class TrainerAvailabilityViewSet(viewsets.ModelViewSet):
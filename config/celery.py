@@ -61,6 +61,54 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour=23, minute=0),  # يومياً الساعة 11 مساءً
         'options': {'queue': 'default'}
     },
+    'refresh-attendance-forecast': {
+        'task': 'apps.attendance.tasks.refresh_attendance_forecast',
+        'schedule': crontab(hour=3, minute=30),  # يومياً الساعة 3:30 صباحاً
+        'options': {'queue': 'default'}
+    },
+    
+    # مهام لوحة التحكم
+    'refresh-dashboard-snapshot': {
+        'task': 'apps.dashboard.tasks.refresh_dashboard_snapshot',
+        'schedule': float(settings.DASHBOARD_SNAPSHOT['REFRESH_SECONDS']),  # كل دقيقة افتراضياً
+        'options': {'queue': 'default'}
+    },
+    
+    # مهام الخزائن
+    'process-locker-rentals': {
+        'task': 'apps.lockers.tasks.process_locker_rentals',
+        'schedule': crontab(hour=0, minute=30),  # يومياً الساعة 12:30 صباحاً
+        'options': {'queue': 'default'}
+    },
+    
+    # مهام الحصص
+    'materialize-class-sessions': {
+        'task': 'apps.schedules.tasks.materialize_class_sessions',
+        'schedule': crontab(hour=2, minute=0),  # يومياً الساعة 2 صباحاً
+        'options': {'queue': 'default'}
+    },
+    'snapshot-trainer-performance': {
+        'task': 'apps.trainers.tasks.snapshot_trainer_performance',
+        'schedule': crontab(day_of_month=1, hour=1, minute=0),  # أول كل شهر الساعة 1 صباحاً
+        'options': {'queue': 'default'}
+    },
+    'recompute-trainer-ratings': {
+        'task': 'apps.trainers.tasks.recompute_trainer_ratings',
+        'schedule': crontab(day_of_week=5, hour=3, minute=0),  # أسبوعياً يوم الجمعة الساعة 3 صباحاً
+        'options': {'queue': 'default'}
+    },
+    'reconcile-class-attendance': {
+        'task': 'apps.schedules.tasks.reconcile_class_attendance',
+        'schedule': crontab(minute=15),  # كل ساعة
+        'options': {'queue': 'default'}
+    },
+    
+    # مهام التقارير
+    'refresh-retention-analytics': {
+        'task': 'apps.reports.tasks.refresh_retention_analytics',
+        'schedule': crontab(hour=5, minute=30),  # يومياً الساعة 5:30 صباحاً
+        'options': {'queue': 'default'}
+    },
 }
 
 # إعدادات Celery الأساسية
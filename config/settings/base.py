@@ -30,6 +30,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    'core',
     'apps.accounts',
     'apps.members',
     'apps.sports',
@@ -42,6 +43,7 @@ LOCAL_APPS = [
     'apps.lockers',
     'apps.notifications',
     'apps.reports',
+    'apps.dashboard',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -55,8 +57,82 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.QueryCountMiddleware',
 ]
 
+# مراقبة عدد الاستعلامات لكل طلب ومهمة Celery (كشف N+1)
+QUERY_INSTRUMENTATION = {
+    'ENABLED': True,
+    'RESPONSE_HEADERS': False,  # X-Query-Count / X-Query-Time-Ms / X-Query-Duplicates
+    'REQUEST_BUDGET': 50,
+    'TASK_BUDGET': 500,
+    'DUPLICATE_THRESHOLD': 5,  # تكرار نفس شكل الاستعلام يعتبر N+1
+}
+
+# لقطة مؤشرات لوحة التحكم (تحسب في الخلفية عبر Celery)
+DASHBOARD_SNAPSHOT = {
+    'REFRESH_SECONDS': 60,
+    'MAX_AGE_SECONDS': 300,  # بعدها تطلب الصفحة تحديثاً في الخلفية
+    'LOCK_SECONDS': 30,
+    'WAIT_SECONDS': 2,  # انتظار الطلبات المتزامنة عند أول حساب
+}
+
+# ناقل أحداث النطاق (core.events) - المعالجات بعد commit بدل post_save
+DOMAIN_EVENTS = {
+    'ENABLED': True,
+    'SLOW_HANDLER_MS': 200,
+}
+
+# تصدير CSV/XLSX (core.exports)
+EXPORTS = {
+    'CHUNK_SIZE': 2000,
+    'BACKGROUND_THRESHOLD': 50000,  # أكبر من ذلك يُنفذ في Celery ويُحفظ في MEDIA_ROOT
+    'DIRECTORY': 'exports',
+}
+
+# الاستيراد الجماعي (core.imports / manage.py bulk_import)
+IMPORTS = {
+    'CHUNK_SIZE': 1000,
+    'MAX_REPORTED_ERRORS': 50,
+}
+
+# ذاكرة البيانات المرجعية: الرياضات والخطط والباقات والأحزمة (core.refdata)
+REFDATA = {
+    'ENABLED': True,
+    'LOCAL_TTL': 10,  # أقصى تأخر للعمليات الأخرى بعد تعديل (الإبطال عبر أرقام الأجيال)
+    'SHARED_TIMEOUT': 24 * 3600,
+}
+
+# محرك التقارير (apps.reports)
+REPORTS = {
+    'CACHE_TIMEOUT': 600,  # صلاحية النتيجة المخزنة حسب بصمة المعاملات
+    'DEFAULT_DAYS': 30,
+    'MAX_DAYS': 3 * 366,
+    'ASYNC_AFTER_DAYS': 92,  # الفترات الأطول تُنفذ في Celery مع الاستعلام عن الحالة
+    'JOB_TIMEOUT': 3600,
+    'COHORT_MONTHS': 12,  # نافذة مصفوفات الاحتفاظ
+    'ANALYTICS_TIMEOUT': 6 * 3600,
+    'CHURN_INACTIVE_DAYS': 14,  # الانقطاع الذي يبلغ عنده نصف درجة الخطر
+    'CHURN_RISK_THRESHOLD': 0.5,
+}
+
+# توقع إشغال الجيم بالساعة لكل رياضة (apps.attendance.forecasting)
+ATTENDANCE_FORECAST = {
+    'HISTORY_WEEKS': 8,
+    'HORIZON_DAYS': 14,
+    'ALPHA': 0.3,  # وزن التمهيد الأسي (الأسابيع الأحدث أثقل)
+    'MAX_VISIT_HOURS': 4,  # حد أعلى لمدة الزيارة (جلسات بدون خروج صحيح)
+    'CACHE_TIMEOUT': 2 * 24 * 3600,
+}
+
+# تحليلات قياسات الجسم (السلاسل والاتجاهات)
+BODY_METRICS = {
+    'CACHE_TIMEOUT': 24 * 3600,
+    'MOVING_AVERAGE_WINDOW': 4,  # عدد الفترات في المتوسط المتحرك
+    'TREND_DAYS': 90,
+    'ROSTER_DAYS': 90,  # أعضاء المدرب = من لهم جلسات خلال هذه المدة
+}
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -166,5 +242,9 @@ LOGGING = {
             'handlers': ['console', 'file'],
             'level': 'INFO',
         },
+        'core.queries': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+        },
     },
 }
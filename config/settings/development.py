@@ -4,4 +4,6 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['localhost', '127.0.0.1']
 
+QUERY_INSTRUMENTATION = {**QUERY_INSTRUMENTATION, 'RESPONSE_HEADERS': True}
+
 # Override any settings for development here
\ No newline at end of file
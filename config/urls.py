@@ -15,6 +15,8 @@ urlpatterns = [
     path('payments/', include('apps.payments.urls', namespace='payments')),
     path('notifications/', include('apps.notifications.urls', namespace='notifications')),
     path('rewards/', include('apps.rewards.urls', namespace='rewards')),
+    path('reports/', include('apps.reports.urls', namespace='reports')),
+    path('schedules/', include('apps.schedules.urls', namespace='schedules')),
 ]
 
 if settings.DEBUG:
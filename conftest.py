@@ -1,6 +1,7 @@
 import os
 import django
 from django.conf import settings
+from django.core.management import call_command
 import pytest
 from django.test.utils import get_unique_databases_and_mirrors
 from django.db import connections
@@ -18,14 +19,19 @@ from apps.attendance.models import Attendance
 
 User = get_user_model()
 
+# حدود الاستعلامات (query_budget)
+pytest_plugins = ['core.pytest_plugin']
+
 
 @pytest.fixture(scope='session')
-def django_db_setup():
-    """إعداد قاعدة بيانات الاختبار"""
+def django_db_setup(django_db_blocker):
+    """إعداد قاعدة بيانات الاختبار (الجداول من النماذج مباشرة بدون ترحيلات)"""
     settings.DATABASES['default'] = {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
     }
+    with django_db_blocker.unblock():
+        call_command('migrate', run_syncdb=True, verbosity=0)
 
 
 @pytest.fixture
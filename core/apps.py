@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    """تكوين الأدوات المشتركة (التصفح، الذاكرة المؤقتة، أوامر القياس)"""
+    
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+    verbose_name = 'الأساسيات'
+    
+    def ready(self):
+        """ربط مراقبة استعلامات مهام Celery"""
+        import core.signals  # noqa
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache as shared_cache
+
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """ذاكرة مؤقتة محلية داخل العملية (LRU) مع مدة صلاحية قصيرة"""
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """قراءة قيمة مع تحديث ترتيب الاستخدام"""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """تخزين قيمة وإزالة الأقدم عند تجاوز الحجم"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TwoTierCache:
+    """
+    ذاكرة مؤقتة على مستويين: محلية داخل العملية ثم المشتركة (Redis/Memcached)
+
+    المستوى المحلي قصير الصلاحية حتى تلتقط العمليات الأخرى الإبطال خلال ثوانٍ
+    """
+
+    def __init__(self, prefix, local_maxsize=1024, local_ttl=30, shared_timeout=3600):
+        self.prefix = prefix
+        self.local = LocalLRUCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.shared_timeout = shared_timeout
+
+    def make_key(self, key):
+        return f'{self.prefix}:{key}'
+
+    def get(self, key, default=None):
+        """المحلي أولاً ثم المشترك (مع تعبئة المحلي)"""
+        full_key = self.make_key(key)
+
+        value = self.local.get(full_key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = shared_cache.get(full_key, _MISSING)
+        if value is _MISSING:
+            return default
+
+        self.local.set(full_key, value)
+        return value
+
+    def set(self, key, value, timeout=None):
+        full_key = self.make_key(key)
+        shared_cache.set(
+            full_key, value, self.shared_timeout if timeout is None else timeout
+        )
+        self.local.set(full_key, value)
+
+    def delete_many(self, keys):
+        full_keys = [self.make_key(key) for key in keys]
+        for full_key in full_keys:
+            self.local.delete(full_key)
+        shared_cache.delete_many(full_keys)
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def clear_local(self):
+        self.local.clear()
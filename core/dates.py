@@ -0,0 +1,89 @@
+"""
+فلترة الأيام المحلية بنطاقات قابلة للفهرسة
+
+field__date / __month / __year تغلف العمود بدالة (وتحويل منطقة زمنية مع USE_TZ)
+فلا يُستخدم فهرسه. البديل: اليوم المحلي [start, end] يتحول إلى نطاق نصف مفتوح
+من الأوقات المدركة [بداية start، بداية اليوم التالي لـ end) يُقارن به العمود مباشرة.
+
+    Attendance.objects.on_local_date(today)
+    Payment.objects.in_local_range(date_from, date_to)
+    Attendance.objects.in_local_month(today)
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.db import models
+from django.utils import timezone
+
+
+def _as_date(value):
+    """date أو نص ISO (من معاملات الطلب)"""
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return date.fromisoformat(str(value))
+
+
+def local_day_start(day, tz=None) -> datetime:
+    """بداية اليوم المحلي كوقت مدرك للمنطقة الزمنية"""
+    return timezone.make_aware(datetime.combine(_as_date(day), time.min), tz or timezone.get_current_timezone())
+
+
+def local_date_range(start=None, end=None, tz=None):
+    """الأيام المحلية [start, end] (شاملة) -> (بداية start، بداية اليوم التالي لـ end)"""
+    start, end = _as_date(start), _as_date(end)
+    return (
+        local_day_start(start, tz) if start is not None else None,
+        local_day_start(end + timedelta(days=1), tz) if end is not None else None,
+    )
+
+
+def month_bounds(day):
+    """أول وآخر يوم في شهر اليوم"""
+    day = _as_date(day)
+    first = day.replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    return first, next_month - timedelta(days=1)
+
+
+def range_lookups(model, field, start=None, end=None):
+    """
+    شروط filter() للأيام المحلية [start, end] على حقل تاريخ أو تاريخ ووقت
+
+    DateTimeField: field__gte / field__lt بأوقات مدركة، DateField: field__gte / field__lte
+    """
+    lookups = {}
+    if isinstance(model._meta.get_field(field), models.DateTimeField):
+        start, end = local_date_range(start, end)
+        if start is not None:
+            lookups[f'{field}__gte'] = start
+        if end is not None:
+            lookups[f'{field}__lt'] = end
+    else:
+        if start is not None:
+            lookups[f'{field}__gte'] = _as_date(start)
+        if end is not None:
+            lookups[f'{field}__lte'] = _as_date(end)
+    return lookups
+
+
+class LocalDateQuerySetMixin:
+    """
+    فلاتر الأيام المحلية للنماذج؛ local_date_field هو الحقل الافتراضي
+
+    class AttendanceQuerySet(LocalDateQuerySetMixin, models.QuerySet):
+        local_date_field = 'check_in'
+    """
+
+    local_date_field = None
+
+    def in_local_range(self, start=None, end=None, field=None):
+        """الأيام المحلية [start, end] (أي طرف None مفتوح)"""
+        return self.filter(**range_lookups(self.model, field or self.local_date_field, start, end))
+
+    def on_local_date(self, day, field=None):
+        return self.in_local_range(day, day, field)
+
+    def in_local_month(self, day, field=None):
+        """شهر اليوم المحلي كاملاً (بديل __month و __year)"""
+        return self.in_local_range(*month_bounds(day), field=field)
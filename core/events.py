@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+logger = logging.getLogger('core.events')
+
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'SLOW_HANDLER_MS': 200,  # تحذير عند تجاوز المعالج لهذا الزمن
+}
+
+
+def get_config() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG, **getattr(settings, 'DOMAIN_EVENTS', {})}
+
+
+class DomainEvent:
+    """
+    حدث نطاق: اسم ثابت + حمولة بسيطة (معرفات وقيم) قابلة للتسلسل JSON
+
+    الحقول المسموحة في fields؛ الحدث يحمل المعرفات فقط والمعالج يقرأ ما يحتاجه بعد الحفظ
+    """
+
+    name = None
+    fields = ()
+
+    registry = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.name:
+            DomainEvent.registry[cls.name] = cls
+
+    def __init__(self, **payload):
+        unknown = set(payload) - set(self.fields)
+        missing = set(self.fields) - set(payload)
+        if unknown or missing:
+            raise TypeError(
+                f'{type(self).__name__}: حقول غير معروفة {sorted(unknown)} / ناقصة {sorted(missing)}'
+            )
+        self.payload = payload
+
+    def __getattr__(self, item):
+        try:
+            return self.__dict__['payload'][item]
+        except KeyError:
+            raise AttributeError(item)
+
+    def __repr__(self):
+        return f'<{self.name} {self.payload}>'
+
+    def coalesce_key(self):
+        """الأحداث بنفس المفتاح في نفس المعاملة تُدمج في حدث واحد"""
+        return (self.name, tuple(sorted(self.payload.items())))
+
+    def merge(self, later: 'DomainEvent') -> 'DomainEvent':
+        """دمج حدث لاحق بنفس المفتاح (الافتراضي: الأحدث يحل محل الأقدم)"""
+        return later
+
+
+class _Batch:
+    """أحداث معاملة واحدة تُرسل مرة واحدة عند الـ commit بعد الدمج"""
+
+    def __init__(self):
+        self.events = {}
+
+    def add(self, event: DomainEvent) -> None:
+        key = event.coalesce_key()
+        existing = self.events.pop(key, None)
+        # pop ثم الإضافة: ترتيب الإرسال حسب آخر تعديل
+        self.events[key] = existing.merge(event) if existing is not None else event
+
+    def flush(self):
+        EventBus.dispatch(list(self.events.values()))
+
+
+class EventBus:
+    """
+    ناقل أحداث النطاق (بديل post_save للأعمال الجانبية)
+
+    - الخدمات تنشر الأحداث صراحة؛ الحفظ العادي والعمليات الجماعية لا تطلق أي معالج
+    - الإرسال بعد commit فقط (لا شيء عند التراجع) مع دمج الأحداث المتكررة في المعاملة
+    - المعالج إما داخل العملية أو في Celery (background=True)
+    - زمن كل معالج وعدد أخطائه يُسجل في stats
+    """
+
+    _handlers = defaultdict(list)
+    _by_path = {}
+    _local = threading.local()
+    stats = defaultdict(lambda: {'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+
+    @classmethod
+    def subscribe(cls, *event_classes, background: bool = False) -> Callable:
+        """ربط دالة معالجة بنوع أو أكثر من الأحداث (decorator)"""
+
+        def decorator(func):
+            path = f'{func.__module__}.{func.__qualname__}'
+            cls._by_path[path] = func
+            for event_class in event_classes:
+                entry = (path, background)
+                if entry not in cls._handlers[event_class.name]:
+                    cls._handlers[event_class.name].append(entry)
+            return func
+
+        return decorator
+
+    @classmethod
+    def publish(cls, event: DomainEvent, using: str = DEFAULT_DB_ALIAS) -> None:
+        """نشر حدث: يُضاف لدفعة المعاملة الحالية أو يُرسل فوراً خارج المعاملات"""
+        if not get_config()['ENABLED'] or getattr(cls._local, 'suppressed', 0):
+            logger.debug(f'تجاهل الحدث {event!r} (الأحداث معطلة)')
+            return
+
+        connection = connections[using]
+        if not connection.in_atomic_block:
+            # خارج المعاملات ينفذ on_commit فوراً؛ robust: خطأ الإرسال لا يصل للمستدعي بعد الحفظ
+            transaction.on_commit(lambda: cls.dispatch([event]), using=using, robust=True)
+            return
+
+        batch = getattr(cls._local, 'batches', {}).get(using)
+        # الدفعة السابقة أُرسلت أو أُلغيت مع تراجع المعاملة: دفعة جديدة
+        if batch is None or not any(item[1] == batch.flush for item in connection.run_on_commit):
+            batch = _Batch()
+            if not hasattr(cls._local, 'batches'):
+                cls._local.batches = {}
+            cls._local.batches[using] = batch
+            transaction.on_commit(batch.flush, using=using, robust=True)
+        batch.add(event)
+
+    @classmethod
+    @contextmanager
+    def suppressed(cls):
+        """تعطيل النشر مؤقتاً (الاستيراد والعمليات الجماعية)"""
+        cls._local.suppressed = getattr(cls._local, 'suppressed', 0) + 1
+        try:
+            yield
+        finally:
+            cls._local.suppressed -= 1
+
+    @classmethod
+    def dispatch(cls, events: List[DomainEvent]) -> None:
+        from .tasks import handle_domain_event
+
+        for event in events:
+            for path, background in cls._handlers.get(event.name, ()):
+                if background:
+                    cls.enqueue(handle_domain_event, path, event)
+                else:
+                    cls.run_handler(path, event)
+
+    @classmethod
+    def enqueue(cls, task, path: str, event: DomainEvent) -> bool:
+        """إرسال معالج الخلفية إلى Celery؛ تعذر الوسيط يُسجل ولا يوقف بقية المعالجات"""
+        try:
+            task.delay(path, event.name, event.payload)
+            return True
+        except Exception:
+            cls.stats[path]['errors'] += 1
+            logger.exception(f'✗ تعذر إرسال المعالج {path} للحدث {event!r} إلى Celery')
+            return False
+
+    @classmethod
+    def run_handler(cls, path: str, event: DomainEvent) -> bool:
+        """تنفيذ معالج واحد مع القياس؛ الخطأ يُسجل كاملاً ولا يوقف بقية المعالجات"""
+        stats = cls.stats[path]
+        started = time.perf_counter()
+        try:
+            cls._by_path[path](event)
+            return True
+        except Exception:
+            stats['errors'] += 1
+            logger.exception(f'✗ فشل المعالج {path} للحدث {event!r}')
+            return False
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            stats['calls'] += 1
+            stats['total_ms'] += elapsed
+            stats['max_ms'] = max(stats['max_ms'], elapsed)
+            if elapsed > get_config()['SLOW_HANDLER_MS']:
+                logger.warning(f'⚠ معالج بطيء {path} ({event.name}): {elapsed:.1f}ms')
+
+    @classmethod
+    def handle_serialized(cls, path: str, name: str, payload: Dict[str, Any]) -> bool:
+        """تنفيذ معالج من مهمة Celery"""
+        return cls.run_handler(path, DomainEvent.registry[name](**payload))
@@ -0,0 +1,356 @@
+import csv
+import secrets
+import tempfile
+from operator import itemgetter
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+
+DEFAULT_CONFIG = {
+    'CHUNK_SIZE': 2000,
+    'BACKGROUND_THRESHOLD': 50000,
+    'DIRECTORY': 'exports',
+}
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+EMPTY = '—'
+
+# بدايات تجعل برامج الجداول تفسر النص كصيغة (حقن الصيغ CSV/Excel)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def get_config():
+    """إعدادات التصدير مع القيم الافتراضية"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'EXPORTS', {})}
+
+
+# ===== منسقات القيم =====
+
+def local_datetime(fmt):
+    """تاريخ ووقت بالتوقيت المحلي"""
+    return lambda value: timezone.localtime(value).strftime(fmt)
+
+
+def date_format(fmt):
+    return lambda value: value.strftime(fmt)
+
+
+def choice_display(model, field_name):
+    """النص المعروض لقيمة من choices (مثل get_FOO_display)"""
+    choices = dict(model._meta.get_field(field_name).flatchoices)
+    return lambda value: str(choices.get(value, value))
+
+
+def yes_no(yes, no):
+    return lambda value: yes if value else no
+
+
+def escape_cell(value):
+    """نص يبدأ بحرف صيغة يُسبق بـ ' ليُعرض كنص (أسماء وملاحظات يُدخلها المستخدمون)"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+# ===== تمرير الاستعلام إلى المهام =====
+
+def pack_pks(queryset):
+    """معرفات الاستعلام كنطاقات متصلة [[من، إلى]...] (JSON مضغوط للوسيط)"""
+    ranges = []
+    for pk in sorted(queryset.order_by().values_list('pk', flat=True)):
+        if ranges and pk == ranges[-1][1] + 1:
+            ranges[-1][1] = pk
+        else:
+            ranges.append([pk, pk])
+    return ranges
+
+
+def unpack_pks(ranges):
+    """شرط Q لنفس المعرفات (pk__in للمفردة و pk__range للمتصلة)"""
+    condition = Q(pk__in=[start for start, end in ranges if start == end])
+    for start, end in ranges:
+        if start != end:
+            condition |= Q(pk__range=(start, end))
+    return condition
+
+
+class Column:
+    """
+    عمود تصدير: عنوان + أعمدة values_list + منسق اختياري
+
+    - format: دالة تستقبل قيم الأعمدة بالترتيب
+    - empty: القيمة المكتوبة عندما تكون كل القيم فارغة (NULL)
+    """
+
+    def __init__(self, header, *lookups, format=None, empty=''):
+        self.header = header
+        self.lookups = lookups
+        self.format = format
+        self.empty = empty
+
+
+class Exporter:
+    """
+    محرك تصدير مشترك يقرأ values_list بدفعات (iterator) ولا يحمّل النماذج
+
+    - CSV يُبث صفاً بصف عبر StreamingHttpResponse
+    - XLSX يُكتب بوضع write_only إلى ملف مؤقت ثم يُرسل (ذاكرة ثابتة)
+    - المهام الأكبر من BACKGROUND_THRESHOLD تُنفذ في Celery وتُحفظ في MEDIA_ROOT
+    """
+
+    filename = 'export'
+    columns = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._plan = None
+
+    @classmethod
+    def get_plan(cls):
+        """(أعمدة values_list، دوال الخلايا) محسوبة مرة واحدة لكل صنف"""
+        if cls._plan is None:
+            lookups = {}
+            cells = []
+            for column in cls.columns:
+                indexes = [lookups.setdefault(lookup, len(lookups)) for lookup in column.lookups]
+                cells.append((itemgetter(*indexes), len(indexes) > 1, column.format, column.empty))
+            cls._plan = (tuple(lookups), cells)
+        return cls._plan
+
+    @classmethod
+    def headers(cls):
+        return [column.header for column in cls.columns]
+
+    @classmethod
+    def rows(cls, queryset, chunk_size=None):
+        """صفوف جاهزة للكتابة بدون إنشاء نماذج"""
+        lookups, cells = cls.get_plan()
+        chunk_size = chunk_size or get_config()['CHUNK_SIZE']
+        values = queryset.select_related(None).prefetch_related(None).values_list(*lookups)
+
+        for row in values.iterator(chunk_size=chunk_size):
+            cells_out = []
+            for getter, many, fmt, empty in cells:
+                value = getter(row)
+                if value is None or (many and all(v is None for v in value)):
+                    cells_out.append(empty)
+                elif fmt is None:
+                    cells_out.append(escape_cell(value))
+                else:
+                    cells_out.append(escape_cell(fmt(*value) if many else fmt(value)))
+            yield cells_out
+
+    # ===== الكتابة =====
+
+    @classmethod
+    def stream_csv(cls, queryset):
+        """أسطر CSV متتالية (مع BOM حتى يفتحها Excel بالعربية)"""
+
+        class Echo:
+            def write(self, value):
+                return value
+
+        writer = csv.writer(Echo())
+        yield '\ufeff' + writer.writerow(cls.headers())
+        for row in cls.rows(queryset):
+            yield writer.writerow(row)
+
+    @classmethod
+    def write(cls, queryset, file_format, fileobj):
+        """كتابة الملف كاملاً إلى fileobj (ثنائي)"""
+        if file_format == 'csv':
+            for line in cls.stream_csv(queryset):
+                fileobj.write(line.encode('utf-8'))
+            return
+
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=cls.filename[:31])
+        sheet.append(cls.headers())
+        for row in cls.rows(queryset):
+            sheet.append(row)
+        workbook.save(fileobj)
+
+    @classmethod
+    def get_filename(cls, file_format):
+        return f'{cls.filename}-{timezone.localdate():%Y%m%d}.{FORMATS[file_format][1]}'
+
+    @classmethod
+    def response(cls, queryset, file_format='csv'):
+        """استجابة تنزيل فورية"""
+        content_type, _ = FORMATS[file_format]
+        filename = cls.get_filename(file_format)
+
+        if file_format == 'csv':
+            response = StreamingHttpResponse(cls.stream_csv(queryset), content_type=content_type)
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return response
+
+        fileobj = tempfile.TemporaryFile()
+        cls.write(queryset, file_format, fileobj)
+        fileobj.seek(0)
+        return FileResponse(fileobj, as_attachment=True, filename=filename, content_type=content_type)
+
+    # ===== التصدير في الخلفية =====
+
+    @classmethod
+    def is_large(cls, queryset):
+        return queryset.count() > get_config()['BACKGROUND_THRESHOLD']
+
+    @classmethod
+    def queue(cls, queryset, file_format, user=None):
+        """
+        جدولة التصدير في Celery
+
+        يُمرر اسم المُصدّر والمعرفات كنطاقات JSON مع الترتيب (بدون pickle عبر الوسيط)،
+        والمهمة تعيد بناء الاستعلام منها
+        """
+        from .tasks import run_export
+
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        return run_export.delay(
+            f'{cls.__module__}.{cls.__qualname__}',
+            queryset.model._meta.label,
+            pack_pks(queryset),
+            file_format,
+            user.pk if user is not None else None,
+            ordering
+        )
+
+    @classmethod
+    def save(cls, queryset, file_format):
+        """كتابة الملف إلى التخزين الافتراضي وإرجاع (الاسم، الرابط)"""
+        directory = get_config()['DIRECTORY']
+        filename = cls.get_filename(file_format)
+        # اسم غير قابل للتخمين لأن ملفات الوسائط متاحة بالرابط المباشر
+        name = f'{directory}/{secrets.token_hex(8)}-{filename}'
+
+        with tempfile.TemporaryFile() as fileobj:
+            cls.write(queryset, file_format, fileobj)
+            fileobj.seek(0)
+            name = default_storage.save(name, File(fileobj))
+
+        return name, default_storage.url(name)
+
+
+def run_export_job(exporter_path, model_label, pks, file_format, user_id=None, ordering=()):
+    """تنفيذ تصدير مجدول وإشعار المستخدم برابط التنزيل"""
+    exporter = import_string(exporter_path)
+    if not (isinstance(exporter, type) and issubclass(exporter, Exporter)):
+        raise ValueError(f'{exporter_path} ليس مُصدّراً')
+    if file_format not in FORMATS:
+        raise ValueError(f'صيغة غير مدعومة: {file_format}')
+
+    queryset = apps.get_model(model_label)._default_manager.filter(unpack_pks(pks))
+    if ordering:
+        queryset = queryset.order_by(*ordering)
+
+    name, url = exporter.save(queryset, file_format)
+
+    if user_id is not None:
+        from apps.notifications.models import Notification
+
+        Notification.objects.create(
+            user_id=user_id,
+            title='التصدير جاهز',
+            body=f'ملف {exporter.filename} جاهز للتنزيل: {url}'
+        )
+
+    return url
+
+
+def _requested_format(value):
+    return value if value in FORMATS else 'csv'
+
+
+class ExportAdminMixin:
+    """
+    إجراءات تصدير CSV و XLSX للوحة الإدارة
+
+    exporter_class = AttendanceExporter
+    actions = [..., 'export_csv', 'export_xlsx']
+    """
+
+    exporter_class = None
+
+    def _export(self, request, queryset, file_format):
+        exporter = self.exporter_class
+        if exporter.is_large(queryset):
+            try:
+                exporter.queue(queryset, file_format, request.user)
+            except Exception as e:
+                self.message_user(request, f'✗ تعذر جدولة التصدير: {str(e)}', messages.ERROR)
+                return None
+            self.message_user(
+                request,
+                '⏳ التصدير كبير وسيُنفذ في الخلفية، سيصلك إشعار برابط التنزيل عند الانتهاء'
+            )
+            return None
+        return exporter.response(queryset, file_format)
+
+    @admin.action(description='📥 تصدير إلى CSV')
+    def export_csv(self, request, queryset):
+        """إجراء: تصدير إلى CSV"""
+        return self._export(request, queryset, 'csv')
+
+    @admin.action(description='📊 تصدير إلى Excel')
+    def export_xlsx(self, request, queryset):
+        """إجراء: تصدير إلى Excel"""
+        return self._export(request, queryset, 'xlsx')
+
+
+class ExportViewMixin:
+    """
+    action تصدير لنفس نتائج القائمة (بعد التصفية والصلاحيات)
+
+    GET /api/.../export/?file_format=xlsx
+    """
+
+    exporter_class = None
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """
+        تصدير القائمة (للموظفين فقط)
+
+        Parameters:
+            - file_format: csv أو xlsx (الافتراضي csv)
+        """
+        exporter = self.exporter_class
+        file_format = _requested_format(request.query_params.get('file_format'))
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if exporter.is_large(queryset):
+            try:
+                result = exporter.queue(queryset, file_format, request.user)
+            except Exception as e:
+                return Response(
+                    {'error': f'تعذر جدولة التصدير: {str(e)}'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            return Response(
+                {
+                    'message': 'التصدير كبير وسيُنفذ في الخلفية، سيصلك إشعار برابط التنزيل',
+                    'task_id': result.id,
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+
+        return exporter.response(queryset, file_format)
@@ -0,0 +1,438 @@
+import csv
+import json
+import secrets
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .events import EventBus
+
+
+DEFAULT_CONFIG = {
+    'CHUNK_SIZE': 1000,
+    'MAX_REPORTED_ERRORS': 50,
+}
+
+# ترتيب الاستيراد حسب الاعتماديات (العضو قبل اشتراكه...)
+IMPORTERS = {
+    'members': 'apps.members.imports.MemberImporter',
+    'subscriptions': 'apps.subscriptions.imports.SubscriptionImporter',
+    'payments': 'apps.payments.imports.PaymentImporter',
+    'attendance': 'apps.attendance.imports.AttendanceImporter',
+}
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'نعم', 'نشط'}
+
+
+def get_config():
+    """إعدادات الاستيراد مع القيم الافتراضية"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'IMPORTS', {})}
+
+
+class ImportRowError(ValueError):
+    """صف غير صالح: يُتخطى ويُسجل في التقرير"""
+
+
+# ===== القراءة =====
+
+def read_rows(path):
+    """
+    قراءة الصفوف كقواميس بشكل متدفق
+
+    - CSV: الصف الأول عناوين الأعمدة (يدعم BOM)
+    - JSONL/NDJSON: كائن JSON في كل سطر
+    - JSON: مصفوفة كائنات (تُحمّل كاملة؛ للملفات الكبيرة استخدم JSONL)
+    """
+    suffix = str(path).rsplit('.', 1)[-1].lower()
+
+    with open(path, encoding='utf-8-sig', newline='') as handle:
+        if suffix == 'csv':
+            for row in csv.DictReader(handle):
+                yield {key.strip(): (value.strip() if isinstance(value, str) else value)
+                       for key, value in row.items() if key}
+        elif suffix in ('jsonl', 'ndjson'):
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        elif suffix == 'json':
+            yield from json.load(handle)
+        else:
+            raise ValueError(f'صيغة غير مدعومة: {suffix} (csv / jsonl / json)')
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ===== تحويل القيم =====
+
+def value(row, key, required=False, default=None):
+    result = row.get(key)
+    if result is None or result == '':
+        if required:
+            raise ImportRowError(f'الحقل {key} مطلوب')
+        return default
+    return result
+
+
+def to_date(row, key, required=False, default=None):
+    raw = value(row, key, required)
+    if raw is None:
+        return default
+    parsed = parse_date(str(raw)[:10])
+    if parsed is None:
+        raise ImportRowError(f'{key}: تاريخ غير صالح {raw}')
+    return parsed
+
+
+def to_datetime(row, key, required=False, default=None):
+    """تاريخ ووقت؛ القيم بدون منطقة زمنية تُعتبر بالتوقيت المحلي"""
+    raw = value(row, key, required)
+    if raw is None:
+        return default
+    parsed = parse_datetime(str(raw))
+    if parsed is None:
+        day = parse_date(str(raw))
+        if day is None:
+            raise ImportRowError(f'{key}: وقت غير صالح {raw}')
+        parsed = datetime.combine(day, datetime.min.time())
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def to_decimal(row, key, required=False, default=Decimal('0.00')):
+    raw = value(row, key, required)
+    if raw is None:
+        return default
+    try:
+        return Decimal(str(raw))
+    except InvalidOperation:
+        raise ImportRowError(f'{key}: رقم غير صالح {raw}')
+
+
+def to_int(row, key, required=False, default=0):
+    raw = value(row, key, required)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise ImportRowError(f'{key}: رقم غير صالح {raw}')
+
+
+def to_bool(row, key, default=False):
+    raw = value(row, key)
+    if raw is None:
+        return default
+    if isinstance(raw, bool):
+        return raw
+    return str(raw).strip().lower() in TRUE_VALUES
+
+
+def to_choice(row, key, model, field_name=None, default=None):
+    """قيمة من choices (تقبل القيمة أو النص المعروض)"""
+    raw = value(row, key, required=default is None)
+    if raw is None:
+        return default
+    choices = model._meta.get_field(field_name or key).flatchoices
+    for choice, label in choices:
+        if raw == choice or raw == str(label):
+            return choice
+    raise ImportRowError(f'{key}: قيمة غير معروفة {raw}')
+
+
+@contextmanager
+def manual_fields(model, *names):
+    """تعطيل auto_now/auto_now_add مؤقتاً حتى تُحفظ التواريخ القادمة من الملف"""
+    fields = [model._meta.get_field(name) for name in names]
+    originals = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, originals):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+# ===== الخرائط والجلسة =====
+
+class KeyMap:
+    """
+    مفتاح طبيعي (رقم العضوية، الهاتف، الاسم...) -> pk في الذاكرة
+
+    استعلام واحد عند التحميل؛ السجلات الجديدة تُضاف بعد كل دفعة.
+    الحجز أثناء البناء مؤقت (claims): يُحرر بعد حفظ الصف أو فشله
+    """
+
+    def __init__(self, model, field, queryset=None, claims=None):
+        self.model = model
+        self.field = field
+        queryset = queryset if queryset is not None else model._default_manager.all()
+        self.keys = dict(queryset.values_list(field, 'pk'))
+        self.reserved = set()
+        self.claims = claims if claims is not None else []
+
+    def __contains__(self, key):
+        return key in self.keys or key in self.reserved
+
+    def get(self, key, label=None):
+        """pk المفتاح أو خطأ صف"""
+        try:
+            return self.keys[key]
+        except KeyError:
+            raise ImportRowError(f'{label or self.field} غير موجود: {key}')
+
+    def reserve(self, key, label=None):
+        """حجز مفتاح جديد من الملف (رفض التكرار داخل الملف ومع قاعدة البيانات)"""
+        if key in self:
+            raise ImportRowError(f'{label or self.field} مكرر: {key}')
+        self.reserved.add(key)
+        self.claims.append((self, key))
+
+    def release(self, key):
+        self.reserved.discard(key)
+
+    def add(self, objects):
+        """تسجيل السجلات بعد bulk_create (استعلام فقط إذا لم تُرجع القاعدة المعرفات)"""
+        keys = [getattr(obj, self.field) for obj in objects]
+        if all(obj.pk for obj in objects):
+            self.keys.update((key, obj.pk) for key, obj in zip(keys, objects))
+        else:
+            self.keys.update(
+                self.model._default_manager.filter(**{f'{self.field}__in': keys})
+                .values_list(self.field, 'pk')
+            )
+
+    def discard(self, objects):
+        """إلغاء تسجيل سجلات لم تُثبت (تراجع الدفعة)"""
+        for obj in objects:
+            self.keys.pop(getattr(obj, self.field), None)
+
+
+class ImportSession:
+    """
+    حالة استيراد واحد: الخرائط المشتركة، الأرقام المولدة، الإحصاءات والأخطاء
+
+    الأعمال المشتقة (الفهارس، اللقطات...) تُسجل بـ defer وتُنفذ مرة واحدة في النهاية
+    """
+
+    def __init__(self, chunk_size=None, progress=None):
+        config = get_config()
+        self.chunk_size = chunk_size or config['CHUNK_SIZE']
+        self.max_errors = config['MAX_REPORTED_ERRORS']
+        self.progress = progress
+        self.token = secrets.token_hex(3).upper()
+        self.stats = {}
+        self.errors = []
+        self.error_count = 0
+        self.member_ids = set()
+        self.finalized = []
+        self.claims = []
+        self._maps = {}
+        self._deferred = {}
+        self._sequence = 0
+
+    def key_map(self, model, field, queryset=None):
+        key = (model, field)
+        if key not in self._maps:
+            self._maps[key] = KeyMap(model, field, queryset, self.claims)
+        return self._maps[key]
+
+    def take_claims(self):
+        """المفاتيح التي حجزها بناء الصف الأخير"""
+        claims = list(self.claims)
+        self.claims.clear()
+        return claims
+
+    @staticmethod
+    def release(claims):
+        for key_map, key in claims:
+            key_map.release(key)
+
+    def next_number(self, prefix):
+        """رقم فريد بدون محاولات تكرار (بادئة + رمز الجلسة + تسلسل)"""
+        self._sequence += 1
+        return f'{prefix}{self.token}{self._sequence:08d}'
+
+    def defer(self, name, func):
+        """عمل مشتق يُنفذ مرة واحدة بعد انتهاء كل الملفات"""
+        self._deferred.setdefault(name, func)
+
+    def error(self, name, line, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((name, line, str(message)))
+
+    def run(self, importer_class, rows):
+        return importer_class(self).run(rows)
+
+    def finish(self):
+        for name, func in self._deferred.items():
+            started = time.perf_counter()
+            func()
+            self.finalized.append((name, time.perf_counter() - started))
+        self._deferred = {}
+
+
+class Importer:
+    """
+    مستورد نموذج واحد: build() يحوّل الصف إلى كائن غير محفوظ، ثم bulk_create لكل دفعة
+
+    - key_field: المفتاح الطبيعي المسجل في خريطة الجلسة (للنماذج التي تعتمد عليه)
+    - number_prefix: توليد key_field عند غيابه من الملف
+    - manual_fields: حقول auto_now_add تُقبل قيمها من الملف
+    """
+
+    name = None
+    model = None
+    key_field = None
+    number_prefix = None
+    manual_fields = ('created_at',)
+
+    def __init__(self, session):
+        self.session = session
+
+    @property
+    def keys(self):
+        return self.session.key_map(self.model, self.key_field)
+
+    def prepare(self):
+        """تحميل الخرائط اللازمة قبل القراءة"""
+
+    def build(self, row):
+        raise NotImplementedError
+
+    def key_value(self, row):
+        """المفتاح الطبيعي من الملف أو رقم مولد"""
+        key = value(row, self.key_field)
+        if key is None:
+            return self.session.next_number(self.number_prefix)
+        self.keys.reserve(key)
+        return key
+
+    def save(self, objects):
+        self.model._default_manager.bulk_create(objects, batch_size=len(objects))
+
+    def after_save(self, objects):
+        """تحديثات تعتمد على المعرفات الجديدة (علاقات M2M...)"""
+
+    def rollback(self, objects):
+        """إلغاء ما سجلته دفعة فاشلة في الذاكرة (المعرفات المولدة لم تُثبت)"""
+        if self.key_field:
+            self.keys.discard(objects)
+        reset_pk(objects)
+
+    def finalize(self):
+        """تسجيل الأعمال المشتقة في الجلسة"""
+
+    def commit(self, objects):
+        """حفظ كائنات في معاملة واحدة؛ عند خطأ قيد في قاعدة البيانات تُلغى من الذاكرة"""
+        try:
+            with transaction.atomic():
+                self.save(objects)
+                if self.key_field:
+                    self.keys.add(objects)
+                self.after_save(objects)
+        except (IntegrityError, DataError):
+            self.rollback(objects)
+            raise
+
+    def save_chunk(self, objects, stats):
+        """
+        bulk_create للدفعة كاملة، وإن فشلت (قيد فريد لم يُكشف مسبقاً...)
+        يُعاد الحفظ صفاً صفاً ليُتخطى الصف المخالف وحده ويُسجل في التقرير
+        """
+        session = self.session
+        try:
+            self.commit(objects)
+        except (IntegrityError, DataError):
+            pass
+        else:
+            for obj in objects:
+                session.release(obj._import_claims)
+            stats['created'] += len(objects)
+            return
+
+        for obj in objects:
+            try:
+                self.commit([obj])
+            except (IntegrityError, DataError) as e:
+                stats['skipped'] += 1
+                session.error(self.name, obj._import_line, e)
+            else:
+                stats['created'] += 1
+            session.release(obj._import_claims)
+
+    def run(self, rows):
+        session = self.session
+        stats = session.stats.setdefault(self.name, {'rows': 0, 'created': 0, 'skipped': 0, 'seconds': 0.0})
+        started = time.perf_counter()
+        self.prepare()
+
+        with manual_fields(self.model, *self.manual_fields):
+            for chunk in chunked(rows, session.chunk_size):
+                objects = []
+                for row in chunk:
+                    stats['rows'] += 1
+                    try:
+                        obj = self.build(row)
+                    except (ImportRowError, ValueError, TypeError) as e:
+                        session.release(session.take_claims())
+                        stats['skipped'] += 1
+                        session.error(self.name, stats['rows'], e)
+                    else:
+                        obj._import_claims = session.take_claims()
+                        obj._import_line = stats['rows']
+                        objects.append(obj)
+
+                if objects:
+                    self.save_chunk(objects, stats)
+
+                stats['seconds'] = time.perf_counter() - started
+                if session.progress:
+                    session.progress(self.name, stats)
+
+        self.finalize()
+        stats['seconds'] = time.perf_counter() - started
+        return stats
+
+
+def reset_pk(objects):
+    """كائنات غير محفوظة من جديد بعد التراجع (bulk_create يضع المعرفات قبل commit)"""
+    for obj in objects:
+        obj.pk = None
+        obj._state.adding = True
+
+
+@contextmanager
+def bulk_import(chunk_size=None, progress=None):
+    """
+    وضع الاستيراد الجماعي
+
+    - بدون أحداث نطاق (لا إشعارات ولا نقاط لكل صف)
+    - كل دفعة في معاملة مستقلة (bulk_create)، والدفعة الفاشلة تُحفظ صفاً صفاً
+    - الأعمال المشتقة تُنفذ مرة واحدة عند الخروج، حتى عند التوقف بخطأ (لما حُفظ فعلاً)
+
+    with bulk_import() as session:
+        session.run(MemberImporter, read_rows('members.csv'))
+    """
+    session = ImportSession(chunk_size, progress)
+    try:
+        with EventBus.suppressed():
+            yield session
+    finally:
+        session.finish()
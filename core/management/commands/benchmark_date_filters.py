@@ -0,0 +1,125 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.attendance.models import Attendance
+from apps.payments.models import Payment
+from core.imports import manual_fields
+from core.query_plans import table_access
+
+
+class Command(BaseCommand):
+    """مقارنة فلاتر __date / __month بالنطاقات القابلة للفهرسة (core.dates) على الحضور والمدفوعات"""
+
+    help = 'قياس زمن كل فلتر تاريخ بالشكلين القديم والجديد مع الفهرس المستخدم في خطة الاستعلام'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='عدد سجلات الحضور والمدفوعات المولدة من سجل موجود قبل القياس'
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='عدد مرات تكرار كل قياس')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self._seed(options['seed'])
+
+        if connection.vendor in ('sqlite', 'postgresql'):
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        today = timezone.localdate()
+        month_ago = today - timedelta(days=30)
+        completed = Payment.objects.filter(status=Payment.PaymentStatus.COMPLETED)
+
+        # (الاسم، الاستعلام القديم، الاستعلام الجديد)
+        cases = [
+            ('حضور اليوم',
+             Attendance.objects.filter(check_in__date=today),
+             Attendance.objects.on_local_date(today)),
+            ('حضور 30 يوماً',
+             Attendance.objects.filter(check_in__date__gte=month_ago, check_in__date__lte=today),
+             Attendance.objects.in_local_range(month_ago, today)),
+            ('حضور الشهر',
+             Attendance.objects.filter(check_in__month=today.month, check_in__year=today.year),
+             Attendance.objects.in_local_month(today)),
+            ('إيراد اليوم',
+             completed.filter(created_at__date=today),
+             completed.on_local_date(today)),
+            ('مدفوعات 30 يوماً',
+             Payment.objects.filter(created_at__date__gte=month_ago, created_at__date__lte=today),
+             Payment.objects.in_local_range(month_ago, today)),
+        ]
+
+        self.stdout.write(f"{'الاستعلام':<16} {'__date (ms)':>12} {'النطاق (ms)':>12} {'صفوف':>8}")
+        for name, old, new in cases:
+            old_count, new_count = old.count(), new.count()
+            if old_count != new_count:
+                raise CommandError(f'{name}: نتائج مختلفة ({old_count} != {new_count})')
+
+            old_ms = self._measure(options['repeat'], lambda: old.count())
+            new_ms = self._measure(options['repeat'], lambda: new.count())
+            table = new.model._meta.db_table
+
+            self.stdout.write(f'{name:<16} {old_ms:>12.2f} {new_ms:>12.2f} {new_count:>8}')
+            self.stdout.write(f'    __date: {table_access(old.explain(), table)}')
+            self.stdout.write(f'    النطاق: {table_access(new.explain(), table)}')
+
+        self.stdout.write(self.style.SUCCESS('✓ اكتمل القياس'))
+
+    @staticmethod
+    def _measure(repeat, func):
+        """أفضل زمن من عدة تكرارات بالمللي ثانية"""
+        best = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def _seed(self, count, batch_size=5000):
+        """نسخ سجل حضور ودفعة موجودين بأوقات متفرقة على سنة"""
+        attendance = Attendance.objects.order_by('id').first()
+        payment = Payment.objects.order_by('id').first()
+        if attendance is None or payment is None:
+            raise CommandError('لا توجد سجلات حضور ومدفوعات لاستخدامها كنموذج للتوليد')
+
+        now = timezone.now()
+        token = random.randint(0, 999999)
+        with manual_fields(Payment, 'created_at'), transaction.atomic():
+            created = 0
+            while created < count:
+                size = min(batch_size, count - created)
+                Attendance.objects.bulk_create([
+                    Attendance(
+                        member_id=attendance.member_id,
+                        subscription_id=attendance.subscription_id,
+                        sport_id=attendance.sport_id,
+                        check_in=now - timedelta(minutes=random.randint(0, 525600)),
+                        check_out=now,
+                    )
+                    for _ in range(size)
+                ], batch_size=batch_size)
+                Payment.objects.bulk_create([
+                    Payment(
+                        member_id=payment.member_id,
+                        subscription_id=payment.subscription_id,
+                        payment_number=f'D{token:06d}{created + i:08d}',
+                        payment_type=payment.payment_type,
+                        payment_method=payment.payment_method,
+                        status=random.choice(Payment.PaymentStatus.values),
+                        amount=payment.amount,
+                        total=payment.total,
+                        created_at=now - timedelta(minutes=random.randint(0, 525600)),
+                    )
+                    for i in range(size)
+                ], batch_size=batch_size)
+                created += size
+        self.stdout.write(f'تم توليد {created} سجل حضور و{created} دفعة')
@@ -0,0 +1,117 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.db import transaction
+
+from apps.attendance.models import Attendance
+from core.pagination import KeysetPaginator, encode_cursor, row_values
+
+
+class Command(BaseCommand):
+    """مقارنة زمن الصفحات العميقة: OFFSET مقابل المؤشر المركب على سجل الحضور"""
+
+    help = 'قياس زمن الصفحات العميقة بتصفح OFFSET مقابل التصفح بالمؤشر (check_in, id)'
+
+    ORDERING = ('-check_in', '-id')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='عدد سجلات الحضور الإضافية المولدة من سجل موجود قبل القياس'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=20,
+            help='عدد النتائج في الصفحة'
+        )
+        parser.add_argument(
+            '--pages',
+            default='1,10,100,1000',
+            help='أرقام الصفحات المقاسة مفصولة بفواصل'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='عدد مرات تكرار كل قياس'
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            created = self._seed(options['seed'])
+            self.stdout.write(f'تم توليد {created} سجل حضور')
+
+        queryset = Attendance.objects.select_related('member__user', 'sport')
+        total = queryset.count()
+        page_size = options['page_size']
+
+        try:
+            pages = [int(p) for p in options['pages'].split(',') if p.strip()]
+        except ValueError:
+            raise CommandError('صيغة --pages غير صحيحة')
+
+        self.stdout.write(f'عدد السجلات: {total} | حجم الصفحة: {page_size}')
+        self.stdout.write(f"{'الصفحة':>8} {'OFFSET (ms)':>14} {'المؤشر (ms)':>14}")
+
+        for number in pages:
+            offset = (number - 1) * page_size
+            if offset >= total:
+                continue
+
+            # المؤشر الذي كان العميل سيحمله عند طلب هذه الصفحة (غير محسوب في الزمن)
+            cursor = None
+            if offset:
+                boundary = queryset.order_by(*self.ORDERING).values('check_in', 'id')[offset - 1]
+                cursor = encode_cursor(row_values(boundary, self.ORDERING))
+
+            offset_ms = self._measure(options['repeat'], lambda: list(
+                Paginator(queryset.order_by(*self.ORDERING), page_size).page(number)
+            ))
+            keyset_ms = self._measure(options['repeat'], lambda: list(
+                KeysetPaginator(queryset, page_size, ordering=self.ORDERING).get_page(cursor)
+            ))
+
+            self.stdout.write(f'{number:>8} {offset_ms:>14.2f} {keyset_ms:>14.2f}')
+
+        self.stdout.write(self.style.SUCCESS('✓ اكتمل القياس'))
+
+    @staticmethod
+    def _measure(repeat, func):
+        """أفضل زمن من عدة تكرارات بالمللي ثانية"""
+        best = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    @staticmethod
+    def _seed(count, batch_size=5000):
+        """نسخ سجل حضور موجود بأوقات دخول متفرقة"""
+        template = Attendance.objects.order_by('id').first()
+        if template is None:
+            raise CommandError('لا يوجد سجل حضور لاستخدامه كنموذج للتوليد')
+
+        created = 0
+        with transaction.atomic():
+            while created < count:
+                batch = [
+                    Attendance(
+                        member_id=template.member_id,
+                        subscription_id=template.subscription_id,
+                        sport_id=template.sport_id,
+                        trainer_id=template.trainer_id,
+                        check_in=template.check_in - timedelta(minutes=random.randint(0, 525600)),
+                    )
+                    for _ in range(min(batch_size, count - created))
+                ]
+                Attendance.objects.bulk_create(batch, batch_size=batch_size)
+                created += len(batch)
+        return created
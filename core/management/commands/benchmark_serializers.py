@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import autodiscover_modules
+from rest_framework.renderers import JSONRenderer
+
+from core.serializers import FastSerializer
+
+
+class Command(BaseCommand):
+    """مقارنة سرعة المسار السريع مع سيريلايزرات DRF والتحقق من تطابق الناتج"""
+
+    help = 'قياس عدد الصفوف في الثانية لكل FastSerializer مقابل سيريلايزر DRF الأصلي'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000,
+            help='عدد الصفوف المقاسة لكل سيريلايزر'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='عدد مرات تكرار كل قياس'
+        )
+
+    def handle(self, *args, **options):
+        autodiscover_modules('serializers')
+        renderer = JSONRenderer()
+
+        self.stdout.write(f"{'السيريلايزر':<32} {'الصفوف':>7} {'DRF صف/ث':>12} {'سريع صف/ث':>12} {'التطابق':>8}")
+
+        for fast_class in FastSerializer.registry:
+            serializer_class = fast_class.serializer_class
+            model = serializer_class.Meta.model
+            queryset = model._default_manager.select_related(
+                *fast_class.select_related_paths()
+            ).order_by('pk')[:options['rows']]
+
+            def drf():
+                return serializer_class(list(queryset), many=True).data
+
+            def fast():
+                return fast_class.serialize(fast_class.values_queryset(queryset))
+
+            drf_data, drf_seconds = self._measure(options['repeat'], drf)
+            fast_data, fast_seconds = self._measure(options['repeat'], fast)
+
+            rows = len(drf_data)
+            matches = renderer.render(drf_data) == renderer.render(fast_data)
+
+            self.stdout.write(
+                f'{serializer_class.__name__:<32} {rows:>7} '
+                f'{self._rate(rows, drf_seconds):>12} {self._rate(rows, fast_seconds):>12} '
+                f"{'✓' if matches else '✗':>8}"
+            )
+
+        self.stdout.write(self.style.SUCCESS('✓ اكتمل القياس'))
+
+    @staticmethod
+    def _measure(repeat, func):
+        """(الناتج، أفضل زمن بالثواني)"""
+        best = None
+        result = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    @staticmethod
+    def _rate(rows, seconds):
+        if not rows or not seconds:
+            return '-'
+        return f'{rows / seconds:,.0f}'
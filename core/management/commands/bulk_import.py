@@ -0,0 +1,66 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from core.imports import IMPORTERS, bulk_import, read_rows
+
+
+class Command(BaseCommand):
+    """استيراد بيانات جيم سابق (أعضاء، اشتراكات، مدفوعات، حضور) دفعة واحدة"""
+
+    help = (
+        'استيراد CSV/JSONL بدفعات bulk_create بدون إشعارات أو نقاط لكل صف، '
+        'ثم تحديث الفهارس والأرصدة واللقطات مرة واحدة'
+    )
+
+    def add_arguments(self, parser):
+        for name in IMPORTERS:
+            parser.add_argument(f'--{name}', metavar='PATH', help=f'ملف {name} (csv / jsonl / json)')
+        parser.add_argument('--chunk-size', type=int, default=None, help='عدد الصفوف في كل دفعة')
+
+    def handle(self, *args, **options):
+        files = {name: options[name] for name in IMPORTERS if options.get(name)}
+        if not files:
+            raise CommandError(f"حدد ملفاً واحداً على الأقل: {', '.join('--' + n for n in IMPORTERS)}")
+
+        missing = [path for path in files.values() if not os.path.exists(path)]
+        if missing:
+            raise CommandError(f"ملفات غير موجودة: {', '.join(missing)}")
+
+        with bulk_import(options['chunk_size'], progress=self._progress) as session:
+            # الترتيب حسب IMPORTERS (الاعتماديات) وليس ترتيب الخيارات
+            for name, path in files.items():
+                self.stdout.write(f'→ {name}: {path}')
+                session.run(import_string(IMPORTERS[name]), read_rows(path))
+
+        self._report(session)
+
+    def _progress(self, name, stats):
+        rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+        self.stdout.write(
+            f"  {name}: {stats['rows']} صف | {stats['created']} جديد | "
+            f"{stats['skipped']} متخطى | {rate:,.0f} صف/ث"
+        )
+
+    def _report(self, session):
+        self.stdout.write('')
+        self.stdout.write(f"{'النوع':<14} {'صفوف':>8} {'جديد':>8} {'متخطى':>8} {'ثوانٍ':>8} {'صف/ث':>10}")
+        for name, stats in session.stats.items():
+            rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+            self.stdout.write(
+                f"{name:<14} {stats['rows']:>8} {stats['created']:>8} {stats['skipped']:>8} "
+                f"{stats['seconds']:>8.2f} {rate:>10,.0f}"
+            )
+
+        for name, seconds in session.finalized:
+            self.stdout.write(f'  ✓ {name} ({seconds:.2f} ث)')
+
+        if session.error_count:
+            self.stdout.write(self.style.WARNING(f'⚠ {session.error_count} صف متخطى:'))
+            for name, line, message in session.errors:
+                self.stdout.write(f'  {name} #{line}: {message}')
+            if session.error_count > len(session.errors):
+                self.stdout.write(f'  ... و{session.error_count - len(session.errors)} أخرى')
+
+        self.stdout.write(self.style.SUCCESS('✓ اكتمل الاستيراد'))
@@ -0,0 +1,129 @@
+import copy
+import random
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.attendance.models import Attendance
+from apps.notifications.models import Notification
+from apps.payments.models import Installment, Payment
+from apps.rewards.models import PointTransaction
+from apps.subscriptions.models import Subscription
+from core.imports import manual_fields
+from core.query_plans import PLAN_CHECKS, verify_indexes
+
+
+class Command(BaseCommand):
+    """التحقق بـ EXPLAIN من أن الاستعلامات الساخنة في طبقة الخدمات تستخدم فهارسها"""
+
+    help = (
+        'تشغيل استعلامات الخدمات (الحضور المفتوح، الاشتراك الحالي، الإيرادات، الأقساط المتأخرة، '
+        'الإشعارات غير المقروءة، سجل النقاط) وفحص خططها؛ يفشل إذا لم يُستخدم الفهرس المتوقع'
+    )
+
+    SEEDED = (Attendance, Subscription, Payment, Installment, Notification, PointTransaction)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='عدد السجلات المولدة لكل جدول من سجل موجود قبل الفحص (تُلغى بعده)'
+        )
+        parser.add_argument('--check', action='append', help='تشغيل فحص محدد (يمكن تكراره)')
+        parser.add_argument('--plans', action='store_true', help='طباعة خطط الاستعلامات')
+
+    def handle(self, *args, **options):
+        names = options['check']
+        unknown = set(names or []) - {name for name, *_ in PLAN_CHECKS}
+        if unknown:
+            raise CommandError(f"فحوص غير معروفة: {', '.join(sorted(unknown))}")
+
+        # التوليد والإحصاءات والفحوص في معاملة واحدة تُلغى دائماً: لا يبقى أي سجل مولد
+        with transaction.atomic():
+            if options['seed']:
+                self._seed(options['seed'])
+
+            # إحصاءات المخطط حتى تعكس الخطط حجم البيانات الحالي
+            if connection.vendor in ('sqlite', 'postgresql'):
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+
+            results = verify_indexes(names)
+            transaction.set_rollback(True)
+
+        failures = 0
+        for name, index, plans, error in results:
+            if error == 'no data':
+                self.stdout.write(self.style.WARNING(f'- {name}: لا توجد بيانات (استخدم --seed)'))
+            elif error:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'✗ {name}: {error}'))
+            else:
+                self.stdout.write(f"✓ {name}: {index if isinstance(index, str) else ' / '.join(index)}")
+                if options['plans']:
+                    for plan in plans:
+                        for line in plan.splitlines():
+                            self.stdout.write(f'    {line}')
+
+        if failures:
+            raise CommandError(f'{failures} استعلام لا يستخدم فهرسه')
+        self.stdout.write(self.style.SUCCESS('✓ كل الاستعلامات تستخدم فهارسها'))
+
+    def _seed(self, count, batch_size=5000):
+        """نسخ سجل موجود من كل جدول بتواريخ وحالات متفرقة (داخل معاملة الفحص)"""
+        templates = {model: model.objects.order_by('id').first() for model in self.SEEDED}
+        missing = [model.__name__ for model, obj in templates.items() if obj is None]
+        if missing:
+            raise CommandError(f"لا توجد سجلات لاستخدامها كنموذج للتوليد: {', '.join(missing)}")
+
+        token = uuid.uuid4().hex[:6].upper()
+        now = timezone.now()
+        today = timezone.localdate()
+        start_number = Installment.objects.order_by('-installment_number').values_list(
+            'installment_number', flat=True
+        ).first()
+
+        def clone(template, index):
+            obj = copy.copy(template)
+            obj.pk = obj.id = None
+            offset = timedelta(minutes=random.randint(0, 365 * 1440 - 1))
+
+            if isinstance(obj, Attendance):
+                obj.check_in = now - offset
+                # نسبة صغيرة من الزيارات مفتوحة كما في الواقع
+                obj.check_out = None if random.random() < 0.02 else obj.check_in + timedelta(minutes=75)
+            elif isinstance(obj, Subscription):
+                obj.subscription_number = f'V{token}{index:08d}'
+                obj.end_date = today - timedelta(days=offset.days - 30)
+                obj.start_date = obj.end_date - timedelta(days=30)
+                obj.status = random.choice(Subscription.Status.values)
+            elif isinstance(obj, Payment):
+                obj.payment_number = f'V{token}{index:08d}'
+                obj.created_at = now - offset
+                obj.status = random.choice(Payment.PaymentStatus.values)
+            elif isinstance(obj, Installment):
+                obj.installment_number = start_number + index + 1
+                obj.due_date = today - timedelta(days=offset.days - 30)
+                obj.is_paid = random.random() < 0.9
+            else:
+                obj.created_at = now - offset
+                if isinstance(obj, Notification):
+                    obj.is_read = random.random() < 0.9
+            return obj
+
+        with manual_fields(Payment, 'created_at'), manual_fields(Notification, 'created_at'), \
+                manual_fields(PointTransaction, 'created_at'):
+            for model, template in templates.items():
+                created = 0
+                while created < count:
+                    batch = [
+                        clone(template, created + i)
+                        for i in range(min(batch_size, count - created))
+                    ]
+                    model.objects.bulk_create(batch, batch_size=batch_size)
+                    created += len(batch)
+                self.stdout.write(f'تم توليد {created} سجل {model._meta.verbose_name}')
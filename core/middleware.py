@@ -0,0 +1,29 @@
+from .queries import QueryProfile, get_config, report_profile
+
+
+class QueryCountMiddleware:
+    """
+    مراقبة استعلامات كل طلب: العدد والزمن والأشكال المكررة
+
+    تضاف النتائج كرؤوس X-Query-* عند تفعيل RESPONSE_HEADERS،
+    وتسجل في core.queries عند تجاوز REQUEST_BUDGET أو ظهور نمط N+1
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = get_config()
+        if not config['ENABLED']:
+            return self.get_response(request)
+
+        with QueryProfile(f'{request.method} {request.path}') as profile:
+            response = self.get_response(request)
+
+        if config['RESPONSE_HEADERS']:
+            response['X-Query-Count'] = str(profile.count)
+            response['X-Query-Time-Ms'] = str(profile.total_ms)
+            response['X-Query-Duplicates'] = str(profile.duplicate_count)
+
+        report_profile(profile, config['REQUEST_BUDGET'])
+        return response
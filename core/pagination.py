@@ -0,0 +1,351 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InvalidCursor(Exception):
+    """مؤشر صفحة غير صالح"""
+
+
+def _parse_ordering(ordering):
+    """تحويل ('-check_in', 'id') إلى [('check_in', True), ('id', False)]"""
+    return [
+        (field[1:], True) if field.startswith('-') else (field, False)
+        for field in ordering
+    ]
+
+
+def _to_json_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values, reverse=False):
+    """ترميز قيم آخر صف في مؤشر نصي"""
+    payload = json.dumps(
+        {'v': [_to_json_value(v) for v in values], 'r': int(reverse)},
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """فك ترميز المؤشر إلى (القيم، الاتجاه العكسي)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return list(payload['v']), bool(payload.get('r'))
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeDecodeError):
+        raise InvalidCursor('مؤشر الصفحة غير صالح')
+
+
+def keyset_filter(ordering, values, reverse=False):
+    """
+    شرط المقارنة المركبة (a, b) < (v1, v2) بصيغة قابلة لاستخدام الفهارس
+
+    (a < v1) OR (a = v1 AND b < v2)
+    """
+    fields = _parse_ordering(ordering)
+    if len(values) != len(fields):
+        raise InvalidCursor('مؤشر الصفحة لا يطابق ترتيب القائمة')
+
+    condition = Q()
+    for i, (name, descending) in enumerate(fields):
+        forward_lookup = 'lt' if descending else 'gt'
+        backward_lookup = 'gt' if descending else 'lt'
+        lookup = backward_lookup if reverse else forward_lookup
+
+        branch = Q(**{f'{name}__{lookup}': values[i]})
+        for j, (prev_name, _) in enumerate(fields[:i]):
+            branch &= Q(**{prev_name: values[j]})
+        condition |= branch
+
+    return condition
+
+
+def cursor_values(model, ordering, values):
+    """
+    تحويل قيم المؤشر بـ to_python لحقول الترتيب (المؤشر يأتي من العميل وقد يُعبث به)
+
+    القيم غير الصالحة لحقولها ترفع InvalidCursor بدل خطأ قاعدة بيانات أو 500
+    """
+    fields = _parse_ordering(ordering)
+    if len(values) != len(fields):
+        raise InvalidCursor('مؤشر الصفحة لا يطابق ترتيب القائمة')
+
+    converted = []
+    for (name, _), value in zip(fields, values):
+        if value is None:
+            # حقول الترتيب غير قابلة لـ NULL
+            raise InvalidCursor('مؤشر الصفحة غير صالح')
+        try:
+            field = _ordering_field(model, name)
+        except FieldDoesNotExist:
+            # حقل محسوب (annotate) - لا يوجد حقل نموذج للتحويل
+            converted.append(value)
+            continue
+        try:
+            converted.append(field.to_python(value))
+        except (ValidationError, ValueError, TypeError):
+            raise InvalidCursor('مؤشر الصفحة غير صالح')
+    return converted
+
+
+def _ordering_field(model, name):
+    """حقل النموذج لاسم ترتيب (يدعم العلاقات member__user__id و pk)"""
+    field = None
+    for part in name.split('__'):
+        field = model._meta.pk if part == 'pk' else model._meta.get_field(part)
+        if field.is_relation:
+            model = field.related_model
+    return field
+
+
+def reverse_ordering(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def row_values(obj, ordering):
+    """قيم حقول الترتيب لصف (كائن أو قاموس)"""
+    values = []
+    for name, _ in _parse_ordering(ordering):
+        if isinstance(obj, dict):
+            values.append(obj[name])
+            continue
+        value = obj
+        for part in name.split('__'):
+            value = getattr(value, part)
+        values.append(value)
+    return values
+
+
+def estimate_count(queryset):
+    """
+    عدد تقديري من مخطط التنفيذ (PostgreSQL) بدلاً من COUNT(*) الكامل
+
+    يعيد None في قواعد البيانات التي لا تدعم التقدير
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPage(Sequence):
+    """صفحة نتائج بمؤشرات للصفحة التالية والسابقة (بدون OFFSET)"""
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    تصفح بالمؤشر المركب (مثل (check_in, id)) لجداول الحضور والمدفوعات والنقاط
+
+    يجب أن تكون حقول الترتيب غير قابلة لـ NULL وأن يكون آخرها فريداً (عادة id)
+
+    count_mode:
+    - 'none': بدون عد
+    - 'estimate': عدد تقديري من مخطط التنفيذ (PostgreSQL)
+    - 'exact': COUNT(*) كامل
+    """
+
+    COUNT_MODES = ('none', 'estimate', 'exact')
+
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id'), count_mode='none'):
+        if count_mode not in self.COUNT_MODES:
+            count_mode = 'none'
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        self.count_mode = count_mode
+        self._count = None
+
+    @property
+    def count(self):
+        """العدد حسب الوضع المختار (قد يكون None)"""
+        if self._count is None:
+            if self.count_mode == 'exact':
+                self._count = self.queryset.count()
+            elif self.count_mode == 'estimate':
+                self._count = estimate_count(self.queryset)
+        return self._count
+
+    @property
+    def count_is_estimate(self):
+        return self.count_mode == 'estimate' and self.count is not None
+
+    def get_page(self, cursor=None):
+        """
+        جلب صفحة بعد/قبل المؤشر المعطى (صف إضافي واحد لمعرفة وجود صفحة تالية)
+        """
+        reverse = False
+        queryset = self.queryset
+
+        if cursor:
+            values, reverse = decode_cursor(cursor)
+            values = cursor_values(queryset.model, self.ordering, values)
+            queryset = queryset.filter(keyset_filter(self.ordering, values, reverse=reverse))
+
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        rows = list(queryset.order_by(*ordering)[:self.per_page + 1])
+
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        # في الاتجاه العكسي: الصف الإضافي يعني وجود صفحة سابقة، والتالية موجودة دائماً
+        has_next = reverse or has_more
+        has_previous = has_more if reverse else bool(cursor)
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(row_values(rows[-1], self.ordering))
+        if rows and has_previous:
+            previous_cursor = encode_cursor(row_values(rows[0], self.ordering), reverse=True)
+
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+
+class KeysetPagination(BasePagination):
+    """
+    تصفح REST بالمؤشر المركب بدلاً من PageNumberPagination (بدون COUNT و OFFSET)
+
+    يحدد الـ ViewSet ترتيبه عبر keyset_ordering، مثل ('-check_in', '-id')
+    """
+
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-created_at', '-id')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        ordering = getattr(view, 'keyset_ordering', None) or self.ordering
+        count_mode = request.query_params.get(self.count_query_param, 'none')
+
+        self.paginator = KeysetPaginator(
+            queryset,
+            self.get_page_size(request),
+            ordering=ordering,
+            count_mode=count_mode
+        )
+
+        try:
+            self.page = self.paginator.get_page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor as e:
+            raise NotFound(str(e))
+
+        return list(self.page)
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self._link(self.page.next_cursor)
+
+    def get_previous_link(self):
+        return self._link(self.page.previous_cursor)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.paginator.count_mode != 'none':
+            payload['count'] = self.paginator.count
+            payload['count_is_estimate'] = self.paginator.count_is_estimate
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer', 'nullable': True},
+                'count_is_estimate': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'مؤشر الصفحة',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'عدد النتائج في الصفحة',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'وضع العد: none / estimate / exact',
+                'schema': {'type': 'string', 'enum': list(KeysetPaginator.COUNT_MODES)},
+            },
+        ]
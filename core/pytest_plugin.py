@@ -0,0 +1,98 @@
+"""
+إضافة pytest لحدود الاستعلامات
+
+- الـ fixture ‏query_budget: حد لكل نقطة نهاية داخل الاختبار
+
+    def test_members_list(api_client, query_budget):
+        with query_budget(8, max_duplicates=0):
+            api_client.get('/members/')
+
+- العلامة query_budget: حد للاختبار كاملاً
+
+    @pytest.mark.query_budget(12)
+    def test_check_in(...):
+        ...
+
+- الـ fixture ‏refdata_reset (تلقائي): أجيال البيانات المرجعية تُرفع قبل كل اختبار
+  فلا تظهر لقطة من بيانات اختبار سابق تراجعت قاعدة البيانات عنها
+
+- الـ fixture ‏expect_index: استعلامات الخدمة تستخدم الفهرس المتوقع (EXPLAIN)
+
+    def test_open_visit(expect_index, member):
+        with expect_index(Attendance, 'attendance_open_member_idx'):
+            AttendanceService.check_out(member=member)
+"""
+from contextlib import contextmanager
+
+import pytest
+
+from .queries import QueryBudgetExceeded, QueryProfile
+from .query_plans import ExpectIndex, IndexNotUsed
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'query_budget(max_queries, max_duplicates=None): fail when the test exceeds the query budget'
+    )
+
+
+@contextmanager
+def _budget(max_queries=None, max_duplicates=None, label=''):
+    with QueryProfile(label) as profile:
+        yield profile
+    try:
+        profile.check_budget(max_queries, max_duplicates)
+    except QueryBudgetExceeded as e:
+        pytest.fail(str(e), pytrace=False)
+
+
+@pytest.fixture
+def query_budget(request):
+    """مدير سياق يفشل الاختبار عند تجاوز حد الاستعلامات"""
+    def _query_budget(max_queries=None, max_duplicates=None):
+        return _budget(max_queries, max_duplicates, label=request.node.nodeid)
+    return _query_budget
+
+
+@pytest.fixture(autouse=True)
+def refdata_reset():
+    """كل اختبار يبدأ بأجيال جديدة للبيانات المرجعية (core.refdata)"""
+    from . import refdata
+
+    refdata.reset()
+    yield
+
+
+@contextmanager
+def _expect_index(model, index):
+    expect = ExpectIndex(model, index)
+    try:
+        with expect:
+            yield expect
+    except IndexNotUsed as e:
+        pytest.fail(str(e), pytrace=False)
+
+
+@pytest.fixture
+def expect_index():
+    """مدير سياق يفشل الاختبار إذا لم تستخدم استعلامات الجدول الفهرس المتوقع"""
+    return _expect_index
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """تطبيق العلامة على جسم الاختبار فقط (بدون تجهيز الـ fixtures)"""
+    marker = item.get_closest_marker('query_budget')
+    if marker is None:
+        return (yield)
+
+    max_queries = marker.args[0] if marker.args else marker.kwargs.get('max_queries')
+    with QueryProfile(item.nodeid) as profile:
+        result = yield
+
+    try:
+        profile.check_budget(max_queries, marker.kwargs.get('max_duplicates'))
+    except QueryBudgetExceeded as e:
+        pytest.fail(str(e), pytrace=False)
+    return result
@@ -0,0 +1,126 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger('core.queries')
+
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'RESPONSE_HEADERS': False,
+    'REQUEST_BUDGET': 50,
+    'TASK_BUDGET': 500,
+    'DUPLICATE_THRESHOLD': 5,
+}
+
+# توحيد شكل الاستعلام: القيم الحرفية وقوائم IN الطويلة
+_IN_LIST_RE = re.compile(r'IN \((?:%s|\?)(?:,\s*(?:%s|\?))*\)')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def get_config():
+    """إعدادات المراقبة مع القيم الافتراضية"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'QUERY_INSTRUMENTATION', {})}
+
+
+def normalize_sql(sql):
+    """شكل الاستعلام بدون القيم حتى تتجمع استعلامات N+1 تحت مفتاح واحد"""
+    shape = _STRING_RE.sub('?', sql)
+    shape = _NUMBER_RE.sub('?', shape)
+    shape = _IN_LIST_RE.sub('IN (...)', shape)
+    return _WHITESPACE_RE.sub(' ', shape).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """تجاوز عدد الاستعلامات المسموح"""
+
+
+class QueryProfile:
+    """
+    عداد الاستعلامات لكل طلب أو مهمة عبر execute_wrapper
+
+    يسجل العدد والزمن الكلي وتكرار أشكال الاستعلامات (مؤشر N+1)
+    """
+
+    def __init__(self, label=''):
+        self.label = label
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.total_time += time.perf_counter() - started
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stack.close()
+        self._stack = None
+        return False
+
+    @property
+    def total_ms(self):
+        return round(self.total_time * 1000, 2)
+
+    def duplicates(self, threshold=2):
+        """الأشكال المتكررة (الأكثر تكراراً أولاً)"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    @property
+    def duplicate_count(self):
+        """عدد الاستعلامات الزائدة عن أول تنفيذ لكل شكل"""
+        return sum(n - 1 for n in self.shapes.values() if n > 1)
+
+    def summary(self, threshold=2, limit=3):
+        """ملخص نصي للسجلات ورسائل فشل الاختبارات"""
+        line = (
+            f'{self.label} queries={self.count} time={self.total_ms}ms '
+            f'duplicates={self.duplicate_count}'
+        )
+        for shape, n in self.duplicates(threshold)[:limit]:
+            line += f'\n  {n}x {shape[:300]}'
+        return line
+
+    def check_budget(self, max_queries=None, max_duplicates=None):
+        """رفع QueryBudgetExceeded عند تجاوز الحد"""
+        if max_queries is not None and self.count > max_queries:
+            raise QueryBudgetExceeded(
+                f'تجاوز عدد الاستعلامات {self.count} > {max_queries}\n{self.summary()}'
+            )
+        if max_duplicates is not None and self.duplicate_count > max_duplicates:
+            raise QueryBudgetExceeded(
+                f'استعلامات مكررة {self.duplicate_count} > {max_duplicates}\n{self.summary()}'
+            )
+
+
+def report_profile(profile, budget):
+    """تسجيل تحذير عند تجاوز الحد أو ظهور نمط N+1، وإلا سطر debug"""
+    config = get_config()
+    threshold = config['DUPLICATE_THRESHOLD']
+
+    over_budget = budget is not None and profile.count > budget
+    has_n_plus_one = bool(profile.duplicates(threshold))
+
+    if over_budget or has_n_plus_one:
+        logger.warning(f'⚠ budget={budget} {profile.summary(threshold)}')
+    else:
+        logger.debug(profile.summary(threshold))
@@ -0,0 +1,257 @@
+"""
+التحقق من استخدام الفهارس عبر EXPLAIN
+
+تُلتقط استعلامات SELECT التي تنفذها دالة من طبقة الخدمات (execute_wrapper)
+ثم يُعاد تشغيل كل منها بـ EXPLAIN، ويُشترط ظهور الفهرس المتوقع في خطة
+استعلام واحد على الأقل من استعلامات الجدول.
+
+    with ExpectIndex(Attendance, 'attendance_open_member_idx'):
+        AttendanceService.check_out(member=member)
+
+PLAN_CHECKS: الاستعلامات الساخنة والفهرس الذي يجب أن تستخدمه
+(يشغلها الأمر verify_indexes وتُستخدم في الاختبارات).
+"""
+import re
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.utils import timezone
+
+
+def table_access(plan, table):
+    """سطر الوصول إلى الجدول في الخطة (SEARCH/SCAN أو Index Scan/Seq Scan)"""
+    for line in plan.splitlines():
+        if table in line:
+            return re.sub(r'^[\d\s]*(?:->\s*)?', '', line).strip()
+    return ''
+
+
+class IndexNotUsed(AssertionError):
+    """الاستعلام لا يستخدم الفهرس المتوقع (مسح كامل أو فهرس آخر)"""
+
+
+class _Rollback(Exception):
+    pass
+
+
+class ExpectIndex:
+    """
+    التقاط استعلامات الجدول أثناء السياق والتحقق من خططها عند الخروج
+
+    - model: النموذج الذي يُفحص جدوله
+    - index: اسم الفهرس المتوقع (Meta.indexes) أو مجموعة فهارس يكفي أحدها
+    """
+
+    def __init__(self, model, index, using='default'):
+        self.model = model
+        self.index = index
+        self._indexes = (index,) if isinstance(index, str) else tuple(index)
+        self.using = using
+        self.statements = []
+        self.plans = []
+        self._stack = None
+        self._table = re.compile(rf'\bFROM\s+"?{re.escape(model._meta.db_table)}"?', re.IGNORECASE)
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT') and self._table.search(sql):
+            self.statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        self._stack.enter_context(connections[self.using].execute_wrapper(self))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stack.close()
+        self._stack = None
+        if exc_type is None:
+            self.check()
+        return False
+
+    def explain(self, sql, params):
+        """خطة الاستعلام كنص (كل الأعمدة لتشمل اسم الفهرس في كل القواعد)"""
+        connection = connections[self.using]
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return '\n'.join(' '.join(str(value) for value in row) for row in cursor.fetchall())
+
+    def matching_plans(self):
+        """الخطط التي تستخدم الفهرس المتوقع"""
+        return [
+            plan for plan in self.plans
+            if any(re.search(rf'\b{re.escape(index)}\b', plan) for index in self._indexes)
+        ]
+
+    def check(self):
+        if not self.statements:
+            raise IndexNotUsed(f'لم يُنفذ أي استعلام على {self.model._meta.db_table}')
+
+        self.plans = [self.explain(sql, params) for sql, params in self.statements]
+        if not self.matching_plans():
+            details = '\n\n'.join(
+                f'{sql[:300]}\n→ {plan}' for (sql, _), plan in zip(self.statements, self.plans)
+            )
+            raise IndexNotUsed(f"{' / '.join(self._indexes)} غير مستخدم:\n{details}")
+
+
+def _first(model, **filters):
+    return model._default_manager.filter(**filters).order_by().first()
+
+
+# ===== الاستعلامات الساخنة =====
+# كل دالة تختار بياناتها ثم تُرجع الدالة التي تُلتقط استعلاماتها
+
+def _open_visit():
+    from apps.attendance.models import Attendance
+    from apps.attendance.services import AttendanceService
+
+    member = (_first(Attendance, check_out__isnull=True) or _first(Attendance)).member
+    return lambda: AttendanceService.check_out(member=member)
+
+
+def _current_attendees():
+    from apps.attendance.services import AttendanceService
+
+    return lambda: list(AttendanceService.get_current_attendees())
+
+
+def _auto_checkout():
+    from apps.attendance.services import AttendanceService
+
+    return AttendanceService.auto_checkout_expired
+
+
+def _peak_hours():
+    from apps.attendance.services import AttendanceService
+
+    return lambda: AttendanceService.get_peak_hours(days=7)
+
+
+def _attendance_statistics():
+    from apps.attendance.services import AttendanceService
+
+    today = timezone.localdate()
+    return lambda: AttendanceService.get_attendance_statistics(today - timedelta(days=6), today)
+
+
+def _member_subscription():
+    from apps.subscriptions.models import Subscription
+    from apps.subscriptions.services import SubscriptionService
+
+    member = _first(Subscription).member
+    return lambda: SubscriptionService.get_member_active_subscription(member)
+
+
+def _expiring_subscriptions():
+    from apps.subscriptions.services import SubscriptionService
+
+    return SubscriptionService.check_expired_subscriptions
+
+
+def _payment_revenue():
+    from apps.trainers.services import TrainerPerformanceService
+
+    today = timezone.localdate()
+    return lambda: TrainerPerformanceService.compute(today.replace(day=1), today)
+
+
+def _payment_statistics():
+    from apps.payments.services import PaymentService
+
+    today = timezone.localdate()
+    return lambda: PaymentService.get_payment_statistics(today - timedelta(days=6), today)
+
+
+def _daily_revenue():
+    from apps.payments.services import PaymentService
+
+    return PaymentService.daily_revenue
+
+
+def _overdue_installments():
+    from apps.payments.services import PaymentService
+
+    return lambda: list(PaymentService.get_overdue_installments())
+
+
+def _unread_notifications():
+    from apps.notifications.models import Notification
+
+    user = _first(Notification).user
+    return lambda: Notification.objects.filter(user=user, is_read=False).count()
+
+
+def _points_history():
+    from apps.rewards.models import PointTransaction
+    from apps.rewards.services import RewardService
+
+    member = _first(PointTransaction).member
+    return lambda: list(RewardService.get_points_history(member))
+
+
+# (الاسم، النموذج، الفهرس أو الفهارس المقبولة، دالة التجهيز)
+PLAN_CHECKS = (
+    # كلا الفهرسين الجزئيين يحويان الزيارات المفتوحة فقط
+    ('attendance.open_visit', 'attendance.Attendance',
+     ('attendance_open_member_idx', 'attendance_open_check_in_idx'), _open_visit),
+    ('attendance.current', 'attendance.Attendance', 'attendance_open_check_in_idx', _current_attendees),
+    ('attendance.auto_checkout', 'attendance.Attendance', 'attendance_open_check_in_idx', _auto_checkout),
+    ('attendance.peak_hours', 'attendance.Attendance', 'attendance_check_in_idx', _peak_hours),
+    ('attendance.statistics', 'attendance.Attendance', 'attendance_check_in_idx', _attendance_statistics),
+    ('subscriptions.member', 'subscriptions.Subscription', 'subscription_member_idx', _member_subscription),
+    ('subscriptions.expiring', 'subscriptions.Subscription', 'subscription_active_end_idx', _expiring_subscriptions),
+    ('payments.revenue', 'payments.Payment', 'payment_status_created_idx', _payment_revenue),
+    ('payments.statistics', 'payments.Payment', 'payment_status_created_idx', _payment_statistics),
+    ('payments.daily_revenue', 'payments.Payment', 'payment_status_created_idx', _daily_revenue),
+    ('payments.overdue', 'payments.Installment', 'installment_unpaid_due_idx', _overdue_installments),
+    ('notifications.unread', 'notifications.Notification', 'notification_unread_idx', _unread_notifications),
+    ('rewards.history', 'rewards.PointTransaction', 'point_txn_member_idx', _points_history),
+)
+
+
+def run_check(model, index, setup):
+    """
+    تشغيل دالة الخدمة داخل معاملة تُلغى دائماً (الدوال التي تكتب لا تترك أثراً)
+
+    أخطاء التحقق من الخدمة مقبولة: المهم الاستعلامات التي نُفذت قبلها
+    """
+    expect = ExpectIndex(model, index)
+    try:
+        with transaction.atomic():
+            func = setup()
+            with expect:
+                try:
+                    func()
+                except ValidationError:
+                    pass
+            raise _Rollback
+    except _Rollback:
+        pass
+    return expect
+
+
+def verify_indexes(names=None):
+    """
+    تشغيل PLAN_CHECKS وإرجاع [(الاسم، الفهرس، الخطط المستخدمة للفهرس، الخطأ أو None)]
+
+    الفحوص التي لا توجد بيانات لجدولها تُرجع الخطأ 'no data'
+    """
+    from django.apps import apps
+
+    results = []
+    for name, label, index, setup in PLAN_CHECKS:
+        if names and name not in names:
+            continue
+        model = apps.get_model(label)
+        if not model._default_manager.exists():
+            results.append((name, index, [], 'no data'))
+            continue
+        try:
+            expect = run_check(model, index, setup)
+            results.append((name, index, expect.matching_plans(), None))
+        except IndexNotUsed as e:
+            results.append((name, index, [], str(e)))
+    return results
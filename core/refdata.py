@@ -0,0 +1,362 @@
+"""
+ذاكرة البيانات المرجعية (الرياضات، التصنيفات، الأحزمة، الخطط، الأسعار، الباقات)
+
+جداول صغيرة نادرة التغيير تُقرأ في كل طلب تقريباً، لذلك يُحمّل كل جدول كاملاً
+كلقطة واحدة {المعرّف: الكائن} وتُخزن على مستويين:
+- محلي داخل العملية لمدة قصيرة (LOCAL_TTL) - قراءة بدون أي شبكة
+- مشترك (Redis/Memcached) مفتاحه يحمل أرقام أجيال النماذج التي بُنيت منها
+
+لكل نموذج رقم جيل في الذاكرة المشتركة ترفعه post_save/post_delete/m2m_changed
+بعد commit (core.signals)، فتصبح اللقطات السابقة غير مرئية دون حذفها، وتُمسح
+النسخة المحلية فوراً في العملية الحالية وخلال LOCAL_TTL في العمليات الأخرى.
+
+داخل معاملة عدّلت نموذجاً مراقباً (رفع جيله ينتظر commit) تُقرأ اللقطة من
+قاعدة البيانات مباشرة ولا تُخزن في أي مستوى، فلا تصل صفوف غير مثبتة (أو تراجعت)
+إلى العمليات الأخرى.
+
+    refdata.sports.get(sport_id)
+    refdata.sports.exists(sport_id, is_active=True)
+    refdata.plan_prices.get((plan_id, sport_id))
+    refdata.prefetch(attendances, 'sport')  # ربط المفاتيح الأجنبية بدون استعلامات
+
+الكائنات المُرجعة مشتركة بين الطلبات: للقراءة فقط (التعديل عبر ORM ثم save).
+"""
+import time
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count, Q
+from django.http import Http404
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import LocalLRUCache
+
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'LOCAL_TTL': 10,
+    'SHARED_TIMEOUT': 24 * 3600,
+}
+
+GENERATION_KEY = 'refdata:gen:{}'
+SNAPSHOT_KEY = 'refdata:{}:{}'
+
+_MISSING = object()
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, 'REFDATA', {})}
+
+
+# ===== أرقام الأجيال =====
+
+def _initial_generation():
+    # بداية زمنية: لو حُذف المفتاح من الذاكرة المشتركة لا يعود لرقم قديم له لقطة مخزنة
+    return int(time.time() * 1000)
+
+
+def generations(labels):
+    """أجيال النماذج الحالية {label: رقم} (تُنشأ عند غيابها)"""
+    keys = {GENERATION_KEY.format(label): label for label in labels}
+    found = shared_cache.get_many(list(keys))
+    result = {}
+    for key, label in keys.items():
+        value = found.get(key)
+        if value is None:
+            shared_cache.add(key, _initial_generation(), None)
+            value = shared_cache.get(key, 0)
+        result[label] = value
+    return result
+
+
+def bump(label):
+    """رفع جيل النموذج وإسقاط النسخ المحلية للجداول التي تعتمد عليه"""
+    key = GENERATION_KEY.format(label)
+    try:
+        shared_cache.incr(key)
+    except ValueError:
+        shared_cache.set(key, _initial_generation(), None)
+
+    for table in RefTable.registry.values():
+        if label in table.labels:
+            table.clear_local()
+
+
+def bump_on_commit(label, using=DEFAULT_DB_ALIAS):
+    """رفع الجيل بعد commit (فوراً خارج المعاملات)؛ يبقى معلقاً في run_on_commit حتى ذلك"""
+    transaction.on_commit(partial(bump, label), using=using)
+
+
+def pending_labels(using=DEFAULT_DB_ALIAS):
+    """نماذج عُدلت في المعاملة الجارية ولم تُثبت بعد (تُلغى مع التراجع عن المعاملة أو نقطة الحفظ)"""
+    return {
+        func.args[0] for _, func, *_ in connections[using].run_on_commit
+        if isinstance(func, partial) and func.func is bump
+    }
+
+
+def reset():
+    """رفع كل الأجيال ومسح النسخ المحلية (بين الاختبارات أو بعد استعادة قاعدة البيانات)"""
+    for model in watched_models():
+        bump(model._meta.label)
+
+
+def _key(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RefTable:
+    """
+    جدول مرجعي كلقطة واحدة مرتبة حسب ترتيب الاستعلام
+
+    - label: النموذج ('sports.Sport')
+    - watch: نماذج أخرى تدخل أجيالها في مفتاح اللقطة (العلاقات المحملة معها)
+    - select_related / prefetch_related: ما يُحمّل مع الكائنات في اللقطة
+    """
+
+    registry = {}
+
+    label = None
+    watch = ()
+    select_related = ()
+    prefetch_related = ()
+
+    def __init__(self, name):
+        self.name = name
+        self.local = LocalLRUCache(maxsize=4, ttl=get_config()['LOCAL_TTL'])
+        RefTable.registry[name] = self
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    @property
+    def labels(self):
+        return (self.label, *self.watch)
+
+    def queryset(self):
+        queryset = self.model._default_manager.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def key(self, obj):
+        return obj.pk
+
+    def normalize(self, key):
+        return _key(key)
+
+    def build(self):
+        """{المفتاح: الكائن} من قاعدة البيانات"""
+        return {self.key(obj): obj for obj in self.queryset()}
+
+    def snapshot(self):
+        """اللقطة الحالية: المحلي، ثم المشترك حسب الأجيال، ثم قاعدة البيانات"""
+        if not get_config()['ENABLED']:
+            return self.build()
+
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block and pending_labels() & set(self.labels):
+            # تعديلات غير مثبتة في هذه المعاملة: لقطة خاصة بها دون تخزين
+            return self.build()
+
+        data = self.local.get(self.name, _MISSING)
+        if data is not _MISSING:
+            return data
+
+        # الأجيال تُقرأ قبل البناء: تعديل أثناء البناء يرفع الجيل فلا تُستخدم هذه اللقطة
+        version = ':'.join(str(value) for value in generations(self.labels).values())
+        shared_key = SNAPSHOT_KEY.format(self.name, version)
+
+        data = shared_cache.get(shared_key, _MISSING)
+        if data is _MISSING:
+            data = self.build()
+            shared_cache.set(shared_key, data, get_config()['SHARED_TIMEOUT'])
+
+        self.local.set(self.name, data)
+        return data
+
+    def clear_local(self):
+        self.local.clear()
+
+    def invalidate(self):
+        """إبطال يدوي (تعديلات خارج ORM مثل update() أو bulk_create) - بعد commit"""
+        bump_on_commit(self.label)
+
+    # ===== القراءة =====
+
+    def get(self, key, default=None):
+        return self.snapshot().get(self.normalize(key), default)
+
+    def require(self, key):
+        """مثل get لكن يرفع DoesNotExist للنموذج (بديل objects.get)"""
+        obj = self.get(key)
+        if obj is None:
+            raise self.model.DoesNotExist(f'{self.label} {key}')
+        return obj
+
+    def get_many(self, keys):
+        """{المفتاح: الكائن} للموجود فقط"""
+        data = self.snapshot()
+        result = {}
+        for key in keys:
+            obj = data.get(self.normalize(key))
+            if obj is not None:
+                result[self.key(obj)] = obj
+        return result
+
+    def all(self):
+        return list(self.snapshot().values())
+
+    def filter(self, **attrs):
+        """مطابقة بسيطة لقيم الحقول (is_active=True، sport_id=...)"""
+        return [
+            obj for obj in self.snapshot().values()
+            if all(getattr(obj, name) == value for name, value in attrs.items())
+        ]
+
+    def exists(self, key, **attrs):
+        obj = self.get(key)
+        return obj is not None and all(getattr(obj, name) == value for name, value in attrs.items())
+
+    def values_map(self, attr='name'):
+        """{المفتاح: قيمة الحقل} - بديل dict(values_list('id', attr))"""
+        return {key: getattr(obj, attr) for key, obj in self.snapshot().items()}
+
+
+class SportCategoryTable(RefTable):
+    """التصنيفات مع عدد الرياضات النشطة محسوباً مرة واحدة لكل جيل"""
+
+    label = 'sports.SportCategory'
+    watch = ('sports.Sport',)
+
+    def queryset(self):
+        return super().queryset().annotate(
+            sports_count=Count('sports', filter=Q(sports__is_active=True))
+        )
+
+    def sports_count(self, category_id):
+        category = self.get(category_id)
+        return category.sports_count if category is not None else 0
+
+
+class SportTable(RefTable):
+    label = 'sports.Sport'
+    watch = ('sports.SportCategory',)
+    select_related = ('category',)
+
+
+class BeltTable(RefTable):
+    label = 'sports.Belt'
+
+    def for_sport(self, sport_id):
+        """أحزمة الرياضة مرتبة حسب order"""
+        return sorted(self.filter(sport_id=_key(sport_id)), key=lambda belt: belt.order)
+
+
+class SubscriptionPlanTable(RefTable):
+    label = 'subscriptions.SubscriptionPlan'
+    watch = ('subscriptions.PlanSportPrice', 'sports.Sport')
+    prefetch_related = ('plansportprice_set__sport',)
+
+
+class PlanSportPriceTable(RefTable):
+    """الأسعار حسب (plan_id, sport_id)"""
+
+    label = 'subscriptions.PlanSportPrice'
+
+    def key(self, obj):
+        return obj.plan_id, obj.sport_id
+
+    def normalize(self, key):
+        plan_id, sport_id = key
+        return _key(plan_id), _key(sport_id)
+
+
+class PackageTable(RefTable):
+    label = 'subscriptions.Package'
+    watch = ('sports.Sport',)
+    prefetch_related = ('sports',)
+
+
+categories = SportCategoryTable('categories')
+sports = SportTable('sports')
+belts = BeltTable('belts')
+plans = SubscriptionPlanTable('plans')
+plan_prices = PlanSportPriceTable('plan_prices')
+packages = PackageTable('packages')
+
+
+def watched_models():
+    """كل النماذج التي يرفع تعديلها جيلاً (لربط الإشارات)"""
+    labels = {label for table in RefTable.registry.values() for label in table.labels}
+    return [apps.get_model(label) for label in sorted(labels)]
+
+
+def table_for(model):
+    """الجدول المرجعي للنموذج (أو None)"""
+    label = model._meta.label
+    for table in RefTable.registry.values():
+        if table.label == label:
+            return table
+    return None
+
+
+def prefetch(objects, *fields):
+    """
+    ربط المفاتيح الأجنبية المرجعية من اللقطات بدل select_related أو استعلام لكل صف
+
+        refdata.prefetch(subscriptions, 'plan', 'package')
+        subscriptions[0].plan.name  # بدون استعلام
+    """
+    objects = list(objects)
+    if not objects:
+        return objects
+
+    model = type(objects[0])
+    for field_name in fields:
+        field = model._meta.get_field(field_name)
+        table = table_for(field.related_model)
+        if table is None:
+            raise ValueError(f'{field.related_model._meta.label} ليس جدولاً مرجعياً')
+
+        data = table.snapshot()
+        for obj in objects:
+            related = data.get(getattr(obj, field.attname))
+            if related is not None:
+                field.set_cached_value(obj, related)
+    return objects
+
+
+class RefDataViewMixin:
+    """
+    list / retrieve من اللقطة المرجعية لـ ReadOnlyModelViewSet (بدون استعلامات)
+
+    - refdata_table: الجدول (refdata.plans)
+    - refdata_filter: شروط الظهور (مثل is_active=True كما في queryset)
+    """
+
+    refdata_table = None
+    refdata_filter = {}
+
+    def list(self, request, *args, **kwargs):
+        objects = self.refdata_table.filter(**self.refdata_filter)
+        page = self.paginate_queryset(objects)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(objects, many=True).data, status=status.HTTP_200_OK)
+
+    def get_object(self):
+        obj = self.refdata_table.get(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        if obj is None or any(getattr(obj, name) != value for name, value in self.refdata_filter.items()):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
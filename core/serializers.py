@@ -0,0 +1,236 @@
+import re
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils.encoding import force_str
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+from rest_framework.response import Response
+
+
+# قيمة يعيدها الحقل المحسوب لحذف المفتاح من الناتج (مثل SkipField في DRF)
+SKIP = object()
+
+_DISPLAY_RE = re.compile(r'^get_(\w+)_display$')
+
+
+def full_name(first_name, last_name):
+    """نفس ناتج AbstractUser.get_full_name"""
+    return f'{first_name} {last_name}'.strip()
+
+
+def model_property(model, name, *columns):
+    """
+    حقل محسوب من خاصية (property) في النموذج تعتمد على أعمدة محلية فقط
+
+    يعيد (columns, accessor) لاستخدامه في FastSerializer.computed
+    """
+    fget = getattr(model, name).fget
+
+    def accessor(*values):
+        obj = model.__new__(model)
+        obj.__dict__.update(zip(columns, values))
+        return fget(obj)
+
+    return columns, accessor
+
+
+def _resolve_source(model, source):
+    """
+    تحويل مصدر DRF مثل 'sport.name' إلى عمود values مثل 'sport__name'
+
+    يعيد (lookup, العلاقات القابلة لـ NULL في المسار، تحويل القيمة)
+    """
+    parts = source.split('.')
+    path = []
+    nullable_hops = []
+
+    for part in parts[:-1]:
+        field = model._meta.get_field(part)
+        if not field.concrete or not (field.many_to_one or field.one_to_one):
+            raise ImproperlyConfigured(f'المصدر {source} يمر بعلاقة غير مدعومة: {part}')
+        if field.null:
+            nullable_hops.append('__'.join(path + [part]))
+        path.append(part)
+        model = field.related_model
+
+    last = parts[-1]
+    transform = None
+
+    display = _DISPLAY_RE.match(last)
+    if display:
+        field = model._meta.get_field(display.group(1))
+        choices = dict(field.flatchoices)
+        transform = lambda value: force_str(choices.get(value, value), strings_only=True)  # noqa: E731
+    else:
+        field = model._meta.get_field(last)
+        if not field.concrete or field.many_to_many:
+            raise ImproperlyConfigured(f'المصدر {source} ليس عموداً في {model.__name__}')
+
+    return '__'.join(path + [field.name]), nullable_hops, transform
+
+
+class FastSerializer:
+    """
+    مسار قراءة سريع ومترجم مسبقاً لـ ModelSerializer
+
+    يبني الصفوف من values_list بمؤشرات أعمدة محسوبة مرة واحدة، ويستخدم
+    to_representation لنفس حقول DRF حتى يبقى الناتج مطابقاً حرفياً.
+
+    - computed: الحقول التي مصدرها دالة أو خاصية {name: (columns, func)}
+    - nested: المسار السريع للسيريلايزرات المتداخلة {name: FastSerializer}
+    """
+
+    serializer_class = None
+    computed = {}
+    nested = {}
+
+    registry = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._plan = None
+        if cls.serializer_class is not None:
+            FastSerializer.registry.append(cls)
+
+    @classmethod
+    def _compile(cls, columns, prefix=''):
+        """بناء دالة الصف مع تسجيل الأعمدة المطلوبة في columns"""
+        model = cls.serializer_class.Meta.model
+        plan = []
+
+        def column(name):
+            return columns.setdefault(prefix + name, len(columns))
+
+        for name, field in cls.serializer_class().fields.items():
+            guards = []
+            transform = None
+
+            if name in cls.computed:
+                cols, func = cls.computed[name]
+                getter = itemgetter(*[column(c) for c in cols])
+                if len(cols) == 1:
+                    getter = (lambda g, f: lambda row: f(g(row)))(getter, func)
+                else:
+                    getter = (lambda g, f: lambda row: f(*g(row)))(getter, func)
+                represent = field.to_representation
+
+            elif isinstance(field, serializers.BaseSerializer):
+                if name not in cls.nested:
+                    raise ImproperlyConfigured(
+                        f'{cls.__name__}: الحقل المتداخل {name} يحتاج مساراً سريعاً في nested'
+                    )
+                lookup, hops, _ = _resolve_source(model, field.source)
+                guards = [column(hop) for hop in hops]
+                guards.append(column(lookup))
+                getter = cls.nested[name]._compile(columns, f'{prefix}{lookup}__')
+                represent = None
+
+            elif isinstance(field, (ManyRelatedField, serializers.SerializerMethodField)) or (
+                isinstance(field, RelatedField) and not isinstance(field, PrimaryKeyRelatedField)
+            ):
+                raise ImproperlyConfigured(
+                    f'{cls.__name__}: الحقل {name} غير مدعوم في المسار السريع، عرّفه في computed'
+                )
+
+            else:
+                try:
+                    lookup, hops, transform = _resolve_source(model, field.source)
+                except FieldDoesNotExist:
+                    raise ImproperlyConfigured(
+                        f'{cls.__name__}: المصدر {field.source} ليس عموداً، عرّف {name} في computed'
+                    )
+                guards = [column(hop) for hop in hops]
+                getter = itemgetter(column(lookup))
+                if isinstance(field, PrimaryKeyRelatedField):
+                    represent = field.pk_field.to_representation if field.pk_field else None
+                else:
+                    represent = field.to_representation
+
+            plan.append((name, getter, transform, represent, tuple(guards), field.allow_null))
+
+        def build(row):
+            data = {}
+            for name, getter, transform, represent, guards, allow_null in plan:
+                if guards and any(row[i] is None for i in guards):
+                    # العلاقة الوسيطة فارغة: DRF يحذف الحقل أو يعيد None
+                    if allow_null or represent is None:
+                        data[name] = None
+                    continue
+
+                value = getter(row)
+                if value is SKIP:
+                    continue
+                if transform is not None:
+                    value = transform(value)
+                if value is None or represent is None:
+                    data[name] = value
+                else:
+                    data[name] = represent(value)
+            return data
+
+        return build
+
+    @classmethod
+    def get_plan(cls):
+        """(الأعمدة، دالة الصف) محسوبة مرة واحدة لكل صنف"""
+        if cls._plan is None:
+            columns = {}
+            build = cls._compile(columns)
+            cls._plan = (tuple(columns), build)
+        return cls._plan
+
+    @classmethod
+    def values_queryset(cls, queryset, extra=()):
+        """استعلام values_list بالأعمدة المطلوبة فقط (مع أعمدة الترتيب الإضافية)"""
+        columns = list(cls.get_plan()[0])
+        columns += [c for c in extra if c not in columns]
+        return queryset.select_related(None).prefetch_related(None).values_list(
+            *columns, named=True
+        )
+
+    @classmethod
+    def serialize(cls, rows):
+        build = cls.get_plan()[1]
+        return [build(row) for row in rows]
+
+    @classmethod
+    def select_related_paths(cls):
+        """مسارات العلاقات المستخدمة (لتجهيز استعلام المسار العادي في المقارنة)"""
+        paths = set()
+        for column in cls.get_plan()[0]:
+            parts = column.split('__')[:-1]
+            if parts:
+                paths.add('__'.join(parts))
+        return sorted(paths)
+
+
+class FastSerializerMixin:
+    """
+    تفعيل المسار السريع لكل action في الـ ViewSet
+
+    fast_serializer_classes = {'list': AttendanceListFastSerializer}
+    """
+
+    fast_serializer_classes = {}
+
+    def get_fast_serializer_class(self):
+        return self.fast_serializer_classes.get(self.action)
+
+    def fast_list(self, queryset, fast_serializer_class):
+        """قائمة (مع التصفح إن وجد) عبر المسار السريع"""
+        ordering = getattr(self, 'keyset_ordering', None) or ()
+        rows = fast_serializer_class.values_queryset(
+            queryset, extra=[field.lstrip('-') for field in ordering]
+        )
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast_serializer_class.serialize(page))
+        return Response(fast_serializer_class.serialize(rows))
+
+    def list(self, request, *args, **kwargs):
+        fast_serializer_class = self.get_fast_serializer_class()
+        if fast_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        return self.fast_list(self.filter_queryset(self.get_queryset()), fast_serializer_class)
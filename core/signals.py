@@ -0,0 +1,55 @@
+from celery.signals import task_postrun, task_prerun
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from . import refdata
+from .queries import QueryProfile, get_config, report_profile
+
+
+# ملفات القياس للمهام الجارية حسب task_id
+_task_profiles = {}
+
+
+@task_prerun.connect
+def task_query_profile_start(task_id=None, task=None, **kwargs):
+    """بدء عدّ استعلامات مهمة Celery"""
+    if not get_config()['ENABLED']:
+        return
+
+    profile = QueryProfile(f'task {task.name if task else task_id}')
+    profile.__enter__()
+    _task_profiles[task_id] = profile
+
+
+@task_postrun.connect
+def task_query_profile_finish(task_id=None, **kwargs):
+    """إنهاء العدّ وتسجيل ملخص المهمة"""
+    profile = _task_profiles.pop(task_id, None)
+    if profile is None:
+        return
+
+    profile.__exit__(None, None, None)
+    report_profile(profile, get_config()['TASK_BUDGET'])
+
+
+def refdata_bump(sender, using=None, **kwargs):
+    """رفع جيل البيانات المرجعية بعد commit (لا تُبنى لقطة من بيانات لم تُثبت)"""
+    refdata.bump_on_commit(sender._meta.label, using=using or DEFAULT_DB_ALIAS)
+
+
+def refdata_m2m_bump(sender, action, instance, model, using=None, **kwargs):
+    """تعديل علاقة ManyToMany (Package.sports، SubscriptionPlan.sports)"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        for label in {sender._meta.label, type(instance)._meta.label, model._meta.label}:
+            refdata.bump_on_commit(label, using=using or DEFAULT_DB_ALIAS)
+
+
+for _model in refdata.watched_models():
+    post_save.connect(refdata_bump, sender=_model, dispatch_uid=f'refdata:{_model._meta.label}:save')
+    post_delete.connect(refdata_bump, sender=_model, dispatch_uid=f'refdata:{_model._meta.label}:delete')
+    for _field in _model._meta.many_to_many:
+        m2m_changed.connect(
+            refdata_m2m_bump,
+            sender=_field.remote_field.through,
+            dispatch_uid=f'refdata:{_field.remote_field.through._meta.label}:m2m'
+        )
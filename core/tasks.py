@@ -0,0 +1,33 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_export(exporter_path, model_label, pks, file_format, user_id=None, ordering=()):
+    """
+    تصدير كبير في الخلفية إلى MEDIA_ROOT مع إشعار المستخدم برابط التنزيل
+    """
+    try:
+        from .exports import run_export_job
+        
+        url = run_export_job(exporter_path, model_label, pks, file_format, user_id, ordering)
+        logger.info(f"✓ تم التصدير: {url}")
+        return url
+    
+    except Exception as e:
+        logger.error(f"✗ خطأ في التصدير: {str(e)}")
+        raise
+
+
+@shared_task
+def handle_domain_event(handler_path, event_name, payload):
+    """
+    تنفيذ معالج حدث نطاق في الخلفية (EventBus.subscribe(..., background=True))
+    """
+    from .events import EventBus
+    
+    if EventBus.handle_serialized(handler_path, event_name, payload):
+        return f"{event_name} -> {handler_path}"
+    raise RuntimeError(f"فشل المعالج {handler_path} للحدث {event_name}")
@@ -0,0 +1,79 @@
+import re
+
+
+# الحركات العربية (التشكيل) والتطويل
+ARABIC_DIACRITICS_RE = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+
+# توحيد أشكال الحروف المتقاربة
+ARABIC_LETTER_MAP = str.maketrans({
+    'أ': 'ا',
+    'إ': 'ا',
+    'آ': 'ا',
+    'ٱ': 'ا',
+    'ى': 'ي',
+    'ی': 'ي',
+    'ئ': 'ي',
+    'ؤ': 'و',
+    'ة': 'ه',
+    'ک': 'ك',
+})
+
+# الأرقام العربية الهندية والفارسية
+DIGITS_MAP = str.maketrans('٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹', '01234567890123456789')
+
+NON_WORD_RE = re.compile(r'[^\w]+', re.UNICODE)
+
+
+def normalize_digits(value):
+    """تحويل الأرقام العربية والفارسية إلى أرقام لاتينية"""
+    if not value:
+        return ''
+    return str(value).translate(DIGITS_MAP)
+
+
+def normalize_search_text(value):
+    """توحيد النص للبحث: إزالة التشكيل وتوحيد الألف والياء والأرقام"""
+    if not value:
+        return ''
+    text = normalize_digits(value).lower()
+    text = ARABIC_DIACRITICS_RE.sub('', text)
+    text = text.translate(ARABIC_LETTER_MAP)
+    text = NON_WORD_RE.sub(' ', text).replace('_', ' ')
+    return ' '.join(text.split())
+
+
+def search_tokens(value):
+    """تقسيم النص الموحد إلى كلمات فريدة مع الحفاظ على الترتيب"""
+    return list(dict.fromkeys(normalize_search_text(value).split()))
+
+
+def trigrams(value):
+    """الثلاثيات الحرفية للكلمات (بنفس أسلوب pg_trgm)"""
+    grams = set()
+    for token in search_tokens(value):
+        padded = f'  {token} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def normalize_phone(value):
+    """توحيد رقم الهاتف إلى أرقام فقط"""
+    return re.sub(r'\D', '', normalize_digits(value))
+
+
+def phone_variants(value):
+    """صيغ رقم الهاتف المحلية والدولية (966 / 0 / بدون بادئة)"""
+    digits = normalize_phone(value)
+    if not digits:
+        return []
+    variants = [digits]
+    if digits.startswith('00'):
+        digits = digits[2:]
+        variants.append(digits)
+    if digits.startswith('966'):
+        local = digits[3:]
+        variants.extend([local, f'0{local}'])
+    elif digits.startswith('0'):
+        variants.extend([digits[1:], f'966{digits[1:]}'])
+    return list(dict.fromkeys(variants))